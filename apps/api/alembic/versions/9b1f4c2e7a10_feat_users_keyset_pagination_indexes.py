@@ -0,0 +1,32 @@
+"""feat(users): keyset pagination indexes
+
+Revision ID: 9b1f4c2e7a10
+Revises: 3fe24890dc46
+Create Date: 2026-10-18 09:12:41.220318
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9b1f4c2e7a10'
+down_revision: Union[str, Sequence[str], None] = '3fe24890dc46'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_users_created_at_id', 'users', ['created_at', 'id'], unique=False)
+    op.create_index('ix_users_username_prefix', 'users', ['username'], unique=False, postgresql_ops={'username': 'varchar_pattern_ops'})
+    op.create_index('ix_users_email_prefix', 'users', ['email'], unique=False, postgresql_ops={'email': 'varchar_pattern_ops'})
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_users_email_prefix', table_name='users')
+    op.drop_index('ix_users_username_prefix', table_name='users')
+    op.drop_index('ix_users_created_at_id', table_name='users')
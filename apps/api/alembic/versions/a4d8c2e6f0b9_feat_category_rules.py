@@ -0,0 +1,43 @@
+"""feat(categories): auto-categorization rules
+
+Revision ID: a4d8c2e6f0b9
+Revises: f2b6d8a0c4e7
+Create Date: 2026-10-18 16:02:41.517305
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4d8c2e6f0b9'
+down_revision: Union[str, Sequence[str], None] = 'f2b6d8a0c4e7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('category_rules',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('user_id', sa.UUID(), nullable=True),
+    sa.Column('category_id', sa.UUID(), nullable=False),
+    sa.Column('keyword', sa.String(length=100), nullable=False),
+    sa.Column('created_at', postgresql.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', postgresql.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['category_id'], ['categories.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_category_rules_category_id'), 'category_rules', ['category_id'], unique=False)
+    op.create_index(op.f('ix_category_rules_user_id'), 'category_rules', ['user_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_category_rules_user_id'), table_name='category_rules')
+    op.drop_index(op.f('ix_category_rules_category_id'), table_name='category_rules')
+    op.drop_table('category_rules')
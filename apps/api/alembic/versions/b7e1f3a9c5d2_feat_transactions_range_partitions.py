@@ -0,0 +1,136 @@
+"""feat(transactions): monthly range partitions on date
+
+Revision ID: b7e1f3a9c5d2
+Revises: a4d8c2e6f0b9
+Create Date: 2026-10-18 17:20:05.184362
+
+Rebuilds `transactions` as `PARTITION BY RANGE (date)`: one partition per
+UTC month from the oldest row to PARTITION_MONTHS_AHEAD (3) months ahead,
+plus a default partition. Rows are copied in one statement and the indexes
+are built after the copy. The primary key becomes (id, date) and the dedupe
+key (user_id, hash_dedupe, date): a partitioned table's unique keys must
+include the partition key.
+
+Downgrade copies the rows back into a plain table; it fails if two rows of a
+user share a hash_dedupe on different dates, which the old key forbids.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e1f3a9c5d2'
+down_revision: Union[str, Sequence[str], None] = 'a4d8c2e6f0b9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+MONTHS_AHEAD = 3
+# Must stay identical to app.models.transaction.SEARCH_DOCUMENT_SQL.
+SEARCH_DOCUMENT_SQL = (
+    "to_tsvector('simple', coalesce(description, '') || ' ' || coalesce(merchant, '') "
+    "|| ' ' || coalesce(notes, ''))"
+)
+COLUMNS = (
+    "id, user_id, account_id, category_id, transfer_group_id, type, amount, date, description, "
+    "merchant, notes, source, external_id, raw_payload, hash_dedupe, created_at, updated_at"
+)
+
+
+def _columns():
+    return [
+        sa.Column('id', sa.UUID(), nullable=False),
+        sa.Column('user_id', sa.UUID(), nullable=False),
+        sa.Column('account_id', sa.UUID(), nullable=False),
+        sa.Column('category_id', sa.UUID(), nullable=True),
+        sa.Column('transfer_group_id', sa.UUID(), nullable=True),
+        sa.Column('type', postgresql.ENUM('income', 'expense', name='transaction_type', create_type=False), nullable=False),
+        sa.Column('amount', sa.Numeric(precision=18, scale=2), nullable=False),
+        sa.Column('date', postgresql.TIMESTAMP(timezone=True), nullable=False),
+        sa.Column('description', sa.String(length=255), nullable=True),
+        sa.Column('merchant', sa.String(length=100), nullable=True),
+        sa.Column('notes', sa.String(length=500), nullable=True),
+        sa.Column('source', postgresql.ENUM('manual', 'imported', name='transaction_source', create_type=False), nullable=False),
+        sa.Column('external_id', sa.String(length=100), nullable=True),
+        sa.Column('raw_payload', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+        sa.Column('hash_dedupe', sa.String(length=64), nullable=True),
+        sa.Column('created_at', postgresql.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('updated_at', postgresql.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['account_id'], ['accounts.id'], ),
+        sa.ForeignKeyConstraint(['category_id'], ['categories.id'], ),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    ]
+
+
+def _create_indexes() -> None:
+    op.create_index('ix_transactions_account_date', 'transactions', ['account_id', 'date'], unique=False)
+    op.create_index(op.f('ix_transactions_hash_dedupe'), 'transactions', ['hash_dedupe'], unique=False)
+    op.create_index(op.f('ix_transactions_transfer_group_id'), 'transactions', ['transfer_group_id'], unique=False)
+    op.create_index('ix_transactions_user_date', 'transactions', ['user_id', 'date'], unique=False)
+    op.create_index('ix_transactions_search', 'transactions', [sa.text(SEARCH_DOCUMENT_SQL)], unique=False, postgresql_using='gin')
+    op.create_index('ix_transactions_merchant_trgm', 'transactions', ['merchant'], unique=False, postgresql_using='gin', postgresql_ops={'merchant': 'gin_trgm_ops'})
+
+
+def _drop_indexes() -> None:
+    op.drop_index('ix_transactions_merchant_trgm', table_name='transactions')
+    op.drop_index('ix_transactions_search', table_name='transactions')
+    op.drop_index('ix_transactions_user_date', table_name='transactions')
+    op.drop_index(op.f('ix_transactions_transfer_group_id'), table_name='transactions')
+    op.drop_index(op.f('ix_transactions_hash_dedupe'), table_name='transactions')
+    op.drop_index('ix_transactions_account_date', table_name='transactions')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    _drop_indexes()
+    op.rename_table('transactions', 'transactions_unpartitioned')
+    op.execute("ALTER TABLE transactions_unpartitioned RENAME CONSTRAINT transactions_pkey TO transactions_unpartitioned_pkey")
+
+    op.create_table('transactions',
+    *_columns(),
+    sa.PrimaryKeyConstraint('id', 'date'),
+    sa.UniqueConstraint('user_id', 'hash_dedupe', 'date', name='uq_transactions_user_hash_dedupe_date'),
+    postgresql_partition_by='RANGE (date)'
+    )
+    op.execute("CREATE TABLE transactions_default PARTITION OF transactions DEFAULT")
+    op.execute(f"""
+        DO $$
+        DECLARE
+            this_month date := date_trunc('month', now() AT TIME ZONE 'UTC')::date;
+            m date;
+        BEGIN
+            SELECT least(coalesce(date_trunc('month', min(date) AT TIME ZONE 'UTC')::date, this_month), this_month)
+              INTO m FROM transactions_unpartitioned;
+            WHILE m <= this_month + interval '{MONTHS_AHEAD} months' LOOP
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF transactions FOR VALUES FROM (%L) TO (%L)',
+                    'transactions_p' || to_char(m, 'YYYYMM'),
+                    m::timestamp AT TIME ZONE 'UTC',
+                    (m + interval '1 month')::timestamp AT TIME ZONE 'UTC'
+                );
+                m := (m + interval '1 month')::date;
+            END LOOP;
+        END $$
+    """)
+    op.execute(f"INSERT INTO transactions ({COLUMNS}) SELECT {COLUMNS} FROM transactions_unpartitioned")
+    op.drop_table('transactions_unpartitioned')
+    _create_indexes()
+    op.execute("ANALYZE transactions")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _drop_indexes()
+    op.rename_table('transactions', 'transactions_partitioned')
+    op.execute("ALTER TABLE transactions_partitioned RENAME CONSTRAINT transactions_pkey TO transactions_partitioned_pkey")
+
+    op.create_table('transactions',
+    *_columns(),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('user_id', 'hash_dedupe', name='uq_transactions_user_hash_dedupe')
+    )
+    op.execute(f"INSERT INTO transactions ({COLUMNS}) SELECT {COLUMNS} FROM transactions_partitioned")
+    op.drop_table('transactions_partitioned')  # and its partitions
+    _create_indexes()
@@ -0,0 +1,46 @@
+"""feat(accounts): stored account balances
+
+Revision ID: c4d2a8e6f1b3
+Revises: 9b1f4c2e7a10
+Create Date: 2026-10-18 11:04:52.618204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4d2a8e6f1b3'
+down_revision: Union[str, Sequence[str], None] = '9b1f4c2e7a10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('account_balances',
+    sa.Column('account_id', sa.UUID(), nullable=False),
+    sa.Column('currency', sa.String(length=3), nullable=False),
+    sa.Column('balance', sa.Numeric(precision=18, scale=2), server_default=sa.text('0'), nullable=False),
+    sa.Column('transaction_count', sa.Integer(), server_default=sa.text('0'), nullable=False),
+    sa.Column('created_at', postgresql.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', postgresql.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['account_id'], ['accounts.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('account_id', 'currency')
+    )
+    # Backfill from existing history; afterwards the app keeps it current.
+    op.execute(
+        "INSERT INTO account_balances (account_id, currency, balance, transaction_count) "
+        "SELECT t.account_id, a.currency, "
+        "SUM(CASE WHEN t.type = 'income' THEN t.amount ELSE -t.amount END), COUNT(*) "
+        "FROM transactions t JOIN accounts a ON a.id = t.account_id "
+        "GROUP BY t.account_id, a.currency"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('account_balances')
@@ -0,0 +1,28 @@
+"""feat(users): updated_at index for conditional listing
+
+Revision ID: c9a3e5f7b1d4
+Revises: b7e1f3a9c5d2
+Create Date: 2026-10-18 18:02:37.514208
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c9a3e5f7b1d4'
+down_revision: Union[str, Sequence[str], None] = 'b7e1f3a9c5d2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_users_updated_at', 'users', ['updated_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_users_updated_at', table_name='users')
@@ -0,0 +1,42 @@
+"""feat(transactions): dedupe keys unique across dates
+
+Revision ID: d5f1a7c3e9b2
+Revises: c9a3e5f7b1d4
+Create Date: 2026-10-18 19:41:12.305817
+
+The partitioned `transactions` can only keep (user_id, hash_dedupe, date)
+unique, so a re-exported line with the same external_id and a new posting
+date was imported twice. `transaction_dedupe_keys` holds (user_id,
+hash_dedupe) unique across dates; it is backfilled from existing rows.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5f1a7c3e9b2'
+down_revision: Union[str, Sequence[str], None] = 'c9a3e5f7b1d4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'transaction_dedupe_keys',
+        sa.Column('user_id', sa.UUID(), nullable=False),
+        sa.Column('hash_dedupe', sa.String(length=64), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('user_id', 'hash_dedupe'),
+    )
+    op.execute(
+        "INSERT INTO transaction_dedupe_keys (user_id, hash_dedupe) "
+        "SELECT DISTINCT user_id, hash_dedupe FROM transactions WHERE hash_dedupe IS NOT NULL"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('transaction_dedupe_keys')
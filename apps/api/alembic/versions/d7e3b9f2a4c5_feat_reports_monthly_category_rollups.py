@@ -0,0 +1,42 @@
+"""feat(reports): monthly category rollups
+
+Revision ID: d7e3b9f2a4c5
+Revises: c4d2a8e6f1b3
+Create Date: 2026-10-18 12:27:09.481733
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd7e3b9f2a4c5'
+down_revision: Union[str, Sequence[str], None] = 'c4d2a8e6f1b3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('monthly_category_rollups',
+    sa.Column('user_id', sa.UUID(), nullable=False),
+    sa.Column('month', sa.Date(), nullable=False),
+    sa.Column('category_id', sa.UUID(), nullable=False),
+    sa.Column('type', postgresql.ENUM('income', 'expense', name='transaction_type', create_type=False), nullable=False),
+    sa.Column('total', sa.Numeric(precision=18, scale=2), server_default=sa.text('0'), nullable=False),
+    sa.Column('transaction_count', sa.Integer(), server_default=sa.text('0'), nullable=False),
+    sa.Column('created_at', postgresql.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', postgresql.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id', 'month', 'category_id', 'type')
+    )
+    # Filled by `python -m app.commands.rollups` (batched, short locks)
+    # rather than in this migration.
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('monthly_category_rollups')
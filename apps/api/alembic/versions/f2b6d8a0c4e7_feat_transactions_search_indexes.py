@@ -0,0 +1,37 @@
+"""feat(transactions): full-text and trigram search indexes
+
+Revision ID: f2b6d8a0c4e7
+Revises: e1a5c7d9b3f6
+Create Date: 2026-10-18 16:05:12.482913
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2b6d8a0c4e7'
+down_revision: Union[str, Sequence[str], None] = 'e1a5c7d9b3f6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Must stay identical to app.models.transaction.SEARCH_DOCUMENT_SQL.
+SEARCH_DOCUMENT_SQL = (
+    "to_tsvector('simple', coalesce(description, '') || ' ' || coalesce(merchant, '') "
+    "|| ' ' || coalesce(notes, ''))"
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.create_index('ix_transactions_search', 'transactions', [sa.text(SEARCH_DOCUMENT_SQL)], unique=False, postgresql_using='gin')
+    op.create_index('ix_transactions_merchant_trgm', 'transactions', ['merchant'], unique=False, postgresql_using='gin', postgresql_ops={'merchant': 'gin_trgm_ops'})
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_transactions_merchant_trgm', table_name='transactions')
+    op.drop_index('ix_transactions_search', table_name='transactions')
@@ -0,0 +1,46 @@
+"""
+Verify or rebuild stored account balances against `transactions`.
+
+    uv run python -m app.commands.balances verify           # exit 1 on drift
+    uv run python -m app.commands.balances rebuild [--account <uuid> ...]
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+from typing import List, Optional, Sequence
+from uuid import UUID
+
+from app.db.session import SessionLocal
+from app.services.balance import BalanceDrift, BalanceService
+
+
+def print_drifts(drifts: List[BalanceDrift]) -> None:
+    for d in drifts:
+        print(
+            f"{d.account_id} {d.currency}: stored {d.stored_balance} ({d.stored_count} tx), "
+            f"actual {d.actual_balance} ({d.actual_count} tx), "
+            f"drift {d.stored_balance - d.actual_balance}"
+        )
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("action", choices=["verify", "rebuild"])
+    parser.add_argument("--account", dest="accounts", type=UUID, action="append",
+                        help="limit to one account (repeatable)")
+    args = parser.parse_args(argv)
+
+    with SessionLocal() as db:
+        if args.action == "verify":
+            drifts = BalanceService.verify(db, args.accounts)
+        else:
+            drifts = BalanceService.rebuild(db, args.accounts)
+    print_drifts(drifts)
+    verb = "found" if args.action == "verify" else "corrected"
+    print(f"{len(drifts)} drifted balance(s) {verb}")
+    return 1 if drifts and args.action == "verify" else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
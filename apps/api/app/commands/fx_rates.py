@@ -0,0 +1,36 @@
+"""
+Load FX rates from a local CSV file (`base,quote,date,rate`), so conversion
+works without any network access.
+
+    uv run python -m app.commands.fx_rates rates.csv [more.csv ...]
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+from typing import Optional, Sequence
+
+from app.db.session import SessionLocal
+from app.exceptions.fx import InvalidFxRatesFileError
+from app.services.fx import load_rates
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("paths", nargs="+", metavar="FILE")
+    args = parser.parse_args(argv)
+
+    with SessionLocal() as db:
+        for path in args.paths:
+            with open(path, newline="", encoding="utf-8-sig") as stream:
+                try:
+                    loaded = load_rates(db, stream)
+                except InvalidFxRatesFileError as exc:
+                    print(f"{path}: {exc} {exc.meta}", file=sys.stderr)
+                    return 1
+            print(f"{path}: loaded {loaded} rate(s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,76 @@
+"""
+Manage the monthly partitions of `transactions` (Postgres only). Run
+`ensure` after migrations on deploy and daily from cron, so future months
+exist before their rows arrive; the API itself never runs DDL.
+
+    uv run python -m app.commands.partitions list
+    uv run python -m app.commands.partitions ensure [--months-ahead 3] [--from 2020-01]
+    uv run python -m app.commands.partitions detach --before 2021-01 [--archive-schema archive]
+
+`detach` removes whole months from `transactions` without touching their rows
+(they stay in the detached tables). Stored balances and rollups keep those
+amounts, so do not run `balances rebuild` or `rollups` afterwards unless that
+is what you want.
+"""
+from __future__ import annotations
+
+import argparse
+import re
+import sys
+from datetime import date, datetime
+from typing import Optional, Sequence
+
+from app.core.config import settings
+from app.db.partitions import (
+    DEFAULT_PARTITION,
+    detach_partitions,
+    ensure_partitions,
+    is_partitioned,
+    list_partitions,
+)
+from app.db.session import get_engine
+
+
+def month(value: str) -> date:
+    return datetime.strptime(value, "%Y-%m").date()
+
+
+def identifier(value: str) -> str:
+    if not re.fullmatch(r"[a-z_][a-z0-9_]*", value):
+        raise argparse.ArgumentTypeError("use a lowercase SQL identifier")
+    return value
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("action", choices=["list", "ensure", "detach"])
+    parser.add_argument("--months-ahead", type=int, default=settings.partition_months_ahead)
+    parser.add_argument("--from", dest="first_month", type=month, metavar="YYYY-MM",
+                        help="ensure: also create the months from this one on")
+    parser.add_argument("--before", type=month, metavar="YYYY-MM",
+                        help="detach: every month before this one")
+    parser.add_argument("--archive-schema", type=identifier, help="detach: move the tables to this schema")
+    args = parser.parse_args(argv)
+    if args.action == "detach" and args.before is None:
+        parser.error("detach needs --before")
+
+    with get_engine().begin() as connection:
+        if not is_partitioned(connection):
+            print("transactions is not a partitioned table (Postgres, after the partitioning migration)")
+            return 1
+        if args.action == "list":
+            for partition in list_partitions(connection):
+                print(f"{partition.name}  {partition.start} .. {partition.end}")
+            stray = connection.exec_driver_sql(f"SELECT count(*) FROM {DEFAULT_PARTITION}").scalar()
+            print(f"{DEFAULT_PARTITION}: {stray} row(s)")
+        elif args.action == "ensure":
+            created = ensure_partitions(connection, args.months_ahead, first_month=args.first_month)
+            print(f"created {len(created)} partition(s): {', '.join(created) or '-'}")
+        else:
+            detached = detach_partitions(connection, args.before, args.archive_schema)
+            print(f"detached {len(detached)} partition(s): {', '.join(detached) or '-'}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,35 @@
+"""
+Rebuild the monthly category rollups from `transactions`, a batch of users
+per DB transaction so locks stay short.
+
+    uv run python -m app.commands.rollups [--batch-size 500] [--user <uuid> ...]
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from typing import Optional, Sequence
+from uuid import UUID
+
+from app.db.session import SessionLocal
+from app.services.rollup import BACKFILL_BATCH_SIZE, RollupService
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-size", type=int, default=BACKFILL_BATCH_SIZE, help="users per batch")
+    parser.add_argument("--user", dest="users", type=UUID, action="append",
+                        help="limit to one user (repeatable)")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    with SessionLocal() as db:
+        result = RollupService.backfill(db, batch_size=args.batch_size, user_ids=args.users)
+    print(f"rebuilt rollups for {result.users} user(s) in {result.batches} batch(es) "
+          f"in {time.perf_counter() - started:.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
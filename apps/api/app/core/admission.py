@@ -0,0 +1,197 @@
+"""
+Admission control for expensive routes. An AdmissionLimiter (a FastAPI
+dependency, or `admit()` inside one) does this before the handler runs and
+before it can take a DB connection or a hashing slot:
+
+1. charges the client's token bucket (`rate` per second, up to `burst`) and
+   answers 429 when it is empty;
+2. takes one of the route's `max_concurrency` slots, queueing for a free one
+   only while the estimated wait stays under ADMISSION_DEADLINE_SECONDS.
+   The estimate is the queue length times the route's recent service time
+   (an EWMA, so Argon2 or DB slowness under load shows up in it) divided by
+   the slots. Over the deadline the request gets 503 at once, so overload
+   costs a fast rejection with Retry-After rather than a 30 s pool timeout.
+
+State is per process and lives on the event loop; clients are told apart by
+their address. FastAPI calls dependencies before it reports body errors, so
+a route whose malformed requests should cost nothing wraps `admit()` in a
+dependency that declares the same body parameters (see app.routers.user):
+FastAPI skips a dependency whose own parameters fail validation.
+"""
+from __future__ import annotations
+
+import asyncio
+import math
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Callable, Deque, Dict, Optional
+
+from fastapi import Request
+
+from app.core.cache import LRUCache
+from app.core.config import settings
+from app.core.metrics import REGISTRY
+from app.exceptions.admission import OverloadedError, RateLimitedError
+
+ADMISSION_REJECTED = REGISTRY.counter(
+    "admission_rejected_total",
+    "Requests turned away before running, by route and reason (rate_limited, overloaded, queue_timeout).",
+    labelnames=("route", "reason"),
+)
+ADMISSION_IN_FLIGHT = REGISTRY.gauge(
+    "admission_in_flight",
+    "Requests holding one of a route's concurrency slots.",
+    labelnames=("route",),
+)
+ADMISSION_QUEUED = REGISTRY.gauge(
+    "admission_queued",
+    "Requests waiting for one of a route's concurrency slots.",
+    labelnames=("route",),
+)
+
+# Weight of the newest sample in the service time average.
+SERVICE_TIME_ALPHA = 0.2
+
+# Every limiter created in this process, by route name (for tests/stats).
+LIMITERS: Dict[str, "AdmissionLimiter"] = {}
+
+class TokenBucket:
+    __slots__ = ("tokens", "updated_at")
+
+    def __init__(self, tokens: float, now: float):
+        self.tokens = tokens
+        self.updated_at = now
+
+    def take(self, rate: float, burst: int, now: float) -> float:
+        """Spend one token; returns 0, or the seconds until one is available."""
+        self.tokens = min(burst, self.tokens + (now - self.updated_at) * rate)
+        self.updated_at = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / rate
+
+def client_key(request: Request) -> str:
+    return request.client.host if request.client else "unknown"
+
+def _retry_after(seconds: float) -> int:
+    return max(1, math.ceil(seconds))
+
+class AdmissionLimiter:
+    def __init__(
+        self,
+        route: str,
+        max_concurrency: int,
+        rate: Optional[float] = None,
+        burst: Optional[int] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        self.route = route
+        self.max_concurrency = max_concurrency
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1, math.ceil(rate or 1))
+        self._clock = clock
+        self.buckets: Optional[LRUCache[str, TokenBucket]] = None
+        if rate:
+            # A bucket left alone this long is full again, same as a new one.
+            self.buckets = LRUCache(
+                f"admission_{route}",
+                maxsize=settings.admission_client_buckets,
+                ttl=self.burst / rate,
+                clock=clock,
+            )
+        self.in_flight = 0
+        self.service_time = 0.0  # seconds, EWMA of admitted requests
+        self._waiters: Deque[asyncio.Future] = deque()
+        LIMITERS[route] = self
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    def estimated_wait(self) -> float:
+        """Seconds a request arriving now would wait for a slot."""
+        if self.in_flight < self.max_concurrency:
+            return 0.0
+        return (self.queued + 1) * self.service_time / self.max_concurrency
+
+    def reset(self) -> None:
+        if self.buckets is not None:
+            self.buckets.clear()
+        self.service_time = 0.0
+
+    def _charge(self, client: str) -> None:
+        if self.buckets is None:
+            return
+        now = self._clock()
+        bucket = self.buckets.get(client)
+        if bucket is None:
+            bucket = TokenBucket(self.burst, now)
+            self.buckets.set(client, bucket)
+        wait = bucket.take(self.rate, self.burst, now)
+        if wait:
+            ADMISSION_REJECTED.inc(route=self.route, reason="rate_limited")
+            raise RateLimitedError(retry_after=_retry_after(wait), meta={"route": self.route})
+
+    async def _acquire(self) -> None:
+        if self.in_flight < self.max_concurrency and not self._waiters:
+            self.in_flight += 1
+            ADMISSION_IN_FLIGHT.set(self.in_flight, route=self.route)
+            return
+        wait = self.estimated_wait()
+        if wait > settings.admission_deadline_seconds:
+            ADMISSION_REJECTED.inc(route=self.route, reason="overloaded")
+            raise OverloadedError(retry_after=_retry_after(wait), meta={"route": self.route})
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        ADMISSION_QUEUED.set(self.queued, route=self.route)
+        try:
+            await asyncio.wait_for(waiter, settings.admission_deadline_seconds)
+        except BaseException as exc:
+            if waiter.done() and not waiter.cancelled():
+                self._release()  # the slot was handed over just as we gave up
+            elif waiter in self._waiters:  # a release may already have skipped it
+                self._waiters.remove(waiter)
+            ADMISSION_QUEUED.set(self.queued, route=self.route)
+            if isinstance(exc, asyncio.TimeoutError):
+                ADMISSION_REJECTED.inc(route=self.route, reason="queue_timeout")
+                raise OverloadedError(retry_after=_retry_after(self.estimated_wait()), meta={"route": self.route})
+            raise
+        # The releasing request handed its slot over: in_flight is unchanged.
+        ADMISSION_QUEUED.set(self.queued, route=self.route)
+
+    def _release(self) -> None:
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.in_flight -= 1
+        ADMISSION_IN_FLIGHT.set(self.in_flight, route=self.route)
+
+    @asynccontextmanager
+    async def admit(self, request: Request) -> AsyncIterator[None]:
+        """Hold a slot (after charging the client's bucket) for the body of the block."""
+        if not settings.admission_control:
+            yield
+            return
+        self._charge(client_key(request))
+        await self._acquire()
+        started = self._clock()
+        try:
+            yield
+        finally:
+            elapsed = self._clock() - started
+            if self.service_time:
+                self.service_time += SERVICE_TIME_ALPHA * (elapsed - self.service_time)
+            else:
+                self.service_time = elapsed
+            self._release()
+
+    async def __call__(self, request: Request) -> AsyncIterator[None]:
+        async with self.admit(request):
+            yield
@@ -0,0 +1,175 @@
+"""
+Small in-process LRU cache with optional TTL, shared by the read-through
+caches (FX rates, categories, ...). Thread-safe; hits, misses and evictions
+are exported per cache through app.core.metrics.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Generic, Hashable, Iterable, Optional, Tuple, TypeVar
+
+from app.core.metrics import REGISTRY
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+CACHE_HITS = REGISTRY.counter(
+    "cache_hits_total",
+    "Lookups answered from an in-process cache.",
+    labelnames=("cache",),
+)
+CACHE_MISSES = REGISTRY.counter(
+    "cache_misses_total",
+    "Lookups not found (or expired) in an in-process cache.",
+    labelnames=("cache",),
+)
+CACHE_EVICTIONS = REGISTRY.counter(
+    "cache_evictions_total",
+    "Entries dropped from an in-process cache to stay under its size bound.",
+    labelnames=("cache",),
+)
+CACHE_ENTRIES = REGISTRY.gauge(
+    "cache_entries",
+    "Entries currently held by an in-process cache.",
+    labelnames=("cache",),
+)
+
+_MISSING = object()
+
+# Every cache created in this process, by name (for stats endpoints/tests).
+CACHES: Dict[str, "LRUCache[Any, Any]"] = {}
+
+class LRUCache(Generic[K, V]):
+    """
+    Least-recently-used cache bounded to `maxsize` entries. With `ttl`
+    (seconds) entries also expire that long after they were stored.
+    """
+    def __init__(
+        self,
+        name: str,
+        maxsize: int,
+        ttl: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._data: "OrderedDict[K, Tuple[V, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Bumped by every invalidation so a load that raced with one is not stored.
+        self._generation = 0
+        CACHE_ENTRIES.set(0, cache=name)
+        CACHES[name] = self
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def _lookup(self, key: K, now: float) -> Any:
+        # Caller holds the lock.
+        entry = self._data.get(key)
+        if entry is None:
+            return _MISSING
+        value, expires_at = entry
+        if expires_at <= now:
+            del self._data[key]
+            return _MISSING
+        self._data.move_to_end(key)
+        return value
+
+    def get(self, key: K, default: Any = None) -> Any:
+        with self._lock:
+            value = self._lookup(key, self._clock())
+            size = len(self._data)
+        CACHE_ENTRIES.set(size, cache=self.name)
+        if value is _MISSING:
+            CACHE_MISSES.inc(cache=self.name)
+            return default
+        CACHE_HITS.inc(cache=self.name)
+        return value
+
+    def get_many(self, keys: Iterable[K]) -> Dict[K, V]:
+        """Cached values for the keys that are present; absent keys are misses."""
+        found: Dict[K, V] = {}
+        misses = 0
+        with self._lock:
+            now = self._clock()
+            for key in keys:
+                value = self._lookup(key, now)
+                if value is _MISSING:
+                    misses += 1
+                else:
+                    found[key] = value
+            size = len(self._data)
+        CACHE_ENTRIES.set(size, cache=self.name)
+        if found:
+            CACHE_HITS.inc(len(found), cache=self.name)
+        if misses:
+            CACHE_MISSES.inc(misses, cache=self.name)
+        return found
+
+    def set(self, key: K, value: V) -> None:
+        self.set_many({key: value})
+
+    def set_many(self, items: Dict[K, V]) -> None:
+        evicted = 0
+        with self._lock:
+            expires_at = self._clock() + self.ttl if self.ttl is not None else float("inf")
+            for key, value in items.items():
+                self._data[key] = (value, expires_at)
+                self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                evicted += 1
+            size = len(self._data)
+        CACHE_ENTRIES.set(size, cache=self.name)
+        if evicted:
+            CACHE_EVICTIONS.inc(evicted, cache=self.name)
+
+    def get_or_load(self, key: K, loader: Callable[[], V]) -> V:
+        """Read-through: return the cached value or store what `loader` returns."""
+        generation = self._generation
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = loader()
+            with self._lock:
+                stale = generation != self._generation
+            if not stale:
+                self.set(key, value)
+        return value
+
+    def invalidate(self, key: K) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+            self._generation += 1
+            size = len(self._data)
+        CACHE_ENTRIES.set(size, cache=self.name)
+
+    def invalidate_where(self, predicate: Callable[[K], bool]) -> int:
+        with self._lock:
+            keys = [key for key in self._data if predicate(key)]
+            for key in keys:
+                del self._data[key]
+            self._generation += 1
+            size = len(self._data)
+        CACHE_ENTRIES.set(size, cache=self.name)
+        return len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._generation += 1
+        CACHE_ENTRIES.set(0, cache=self.name)
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "entries": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": CACHE_HITS.value(cache=self.name),
+            "misses": CACHE_MISSES.value(cache=self.name),
+            "evictions": CACHE_EVICTIONS.value(cache=self.name),
+        }
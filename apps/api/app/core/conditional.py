@@ -0,0 +1,59 @@
+"""
+Conditional GET for collection endpoints. A list is summarised by a
+CollectionVersion (row count and newest `updated_at`, plus a digest of the
+rows where edits can leave both unchanged), which is one query against the
+database, never a per-process cache another worker may have made stale; its
+weak ETag also covers the query string, so every
+page and filter has its own. When the client's If-None-Match still matches,
+the endpoint answers 304 before loading or serializing any rows.
+
+There is no Last-Modified: `updated_at` comes from the database clock when
+the writing transaction started, so a row can commit with a timestamp older
+than a copy the client already has, and HTTP dates only have whole seconds.
+If-Modified-Since is therefore ignored (a full response, never a stale 304).
+"""
+from __future__ import annotations
+
+import hashlib
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Optional
+
+from fastapi import Request, Response
+
+@dataclass(frozen=True)
+class CollectionVersion:
+    count: int
+    updated_at: Optional[datetime]
+    # Hash of the rows themselves: catches edits that leave the count and
+    # newest `updated_at` unchanged.
+    digest: str = ""
+
+    def etag(self, query: str) -> str:
+        stamp = self.updated_at.isoformat() if self.updated_at is not None else ""
+        digest = hashlib.sha1(f"{self.count}|{stamp}|{self.digest}|{query}".encode()).hexdigest()[:24]
+        return f'W/"{digest}"'
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    # Weak comparison: the W/ prefix is ignored on both sides.
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(","))
+
+def validator_headers(request: Request, version: CollectionVersion) -> Dict[str, str]:
+    # no-cache: clients may keep the body but must revalidate before reusing it
+    return {"ETag": version.etag(request.url.query), "Cache-Control": "no-cache"}
+
+def check_not_modified(request: Request, response: Response, version: CollectionVersion) -> Optional[Response]:
+    """
+    Put the validators on `response` (the endpoint's injected Response) and
+    return the 304 to send instead of the list when the client's copy is
+    current, else None.
+    """
+    headers = validator_headers(request, version)
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None and _etag_matches(if_none_match, headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return None
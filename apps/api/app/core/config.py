@@ -1,9 +1,71 @@
 import os
 from dataclasses import dataclass
 
+
+def _env_bool(name: str, default: bool = False) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.getenv(name)
+    return int(value) if value not in (None, "") else default
+
+
+def _env_list(name: str) -> tuple:
+    value = os.getenv(name, "")
+    return tuple(item.strip() for item in value.split(",") if item.strip())
+
+
+def _env_float(name: str, default: float) -> float:
+    value = os.getenv(name)
+    return float(value) if value not in (None, "") else default
+
+
 @dataclass(frozen=True)
 class Settings:
     app_env: str = os.getenv("APP_ENV", "dev")
     database_url: str = os.getenv("DATABASE_URL", "")
+    db_async: bool = _env_bool("DB_ASYNC")
+    # Read-only routes go to these (round-robin); writers read from the primary for a while
+    database_replica_urls: tuple = _env_list("DATABASE_REPLICA_URLS")
+    replica_sticky_seconds: float = _env_float("REPLICA_STICKY_SECONDS", 5.0)
+    replica_sticky_by: str = os.getenv("REPLICA_STICKY_BY", "user")
+    # Server-Timing header with per-request DB time and query count (dev only by default)
+    server_timing: bool = _env_bool("SERVER_TIMING", os.getenv("APP_ENV", "dev") == "dev")
+    # Large list responses skip response_model re-validation (see app.core.serialization)
+    fast_responses: bool = _env_bool("FAST_RESPONSES", True)
+    # Argon2 worker pool (0 workers = hash inline in the calling thread)
+    hash_workers: int = _env_int("HASH_WORKERS", min(4, os.cpu_count() or 1))
+    hash_queue_size: int = _env_int("HASH_QUEUE_SIZE", 32)
+    hash_timeout_seconds: float = _env_float("HASH_TIMEOUT_SECONDS", 5.0)
+    # FX rate lookups cached in-process (see app.services.fx)
+    fx_cache_size: int = _env_int("FX_CACHE_SIZE", 4096)
+    fx_cache_ttl_seconds: float = _env_float("FX_CACHE_TTL_SECONDS", 3600.0)
+    fx_pivot_currency: str = os.getenv("FX_PIVOT_CURRENCY", "USD")
+    # Per-user category sets cached in-process (see app.services.category)
+    category_cache_size: int = _env_int("CATEGORY_CACHE_SIZE", 10_000)
+    category_cache_ttl_seconds: float = _env_float("CATEGORY_CACHE_TTL_SECONDS", 300.0)
+    # Compiled per-user categorization rule matchers (see app.services.categorization)
+    rule_cache_size: int = _env_int("RULE_CACHE_SIZE", 1000)
+    # Monthly `transactions` partitions `partitions ensure` keeps ahead of today (Postgres, see app.db.partitions)
+    partition_months_ahead: int = _env_int("PARTITION_MONTHS_AHEAD", 3)
+    # Responses to POSTs sent with an Idempotency-Key, replayed for retries (see app.core.idempotency)
+    idempotency_ttl_seconds: float = _env_float("IDEMPOTENCY_TTL_SECONDS", 86_400.0)
+    idempotency_cache_size: int = _env_int("IDEMPOTENCY_CACHE_SIZE", 10_000)
+    idempotency_max_body_bytes: int = _env_int("IDEMPOTENCY_MAX_BODY_BYTES", 1_048_576)
+    idempotency_wait_seconds: float = _env_float("IDEMPOTENCY_WAIT_SECONDS", 30.0)
+    # Per-route concurrency limits and per-client token buckets (see app.core.admission)
+    admission_control: bool = _env_bool("ADMISSION_CONTROL", True)
+    admission_deadline_seconds: float = _env_float("ADMISSION_DEADLINE_SECONDS", 2.0)
+    admission_client_buckets: int = _env_int("ADMISSION_CLIENT_BUCKETS", 10_000)
+    admission_signup_concurrency: int = _env_int("ADMISSION_SIGNUP_CONCURRENCY", 2 * min(4, os.cpu_count() or 1))
+    admission_signup_rate: float = _env_float("ADMISSION_SIGNUP_RATE", 1.0)
+    admission_signup_burst: int = _env_int("ADMISSION_SIGNUP_BURST", 10)
+    admission_import_concurrency: int = _env_int("ADMISSION_IMPORT_CONCURRENCY", 4)
+    admission_import_rate: float = _env_float("ADMISSION_IMPORT_RATE", 2.0)
+    admission_import_burst: int = _env_int("ADMISSION_IMPORT_BURST", 10)
 
 settings = Settings()
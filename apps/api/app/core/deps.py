@@ -1,5 +1,10 @@
+from typing import AsyncIterator
+
+from fastapi import Request
 from sqlalchemy.orm import Session
-from app.db.session import SessionLocal
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db import replicas
+from app.db.session import SessionLocal, AsyncSessionLocal, read_sessions, async_read_sessions
 
 def get_db() -> Session:
     db = SessionLocal()
@@ -9,4 +14,41 @@ def get_db() -> Session:
         db.rollback()
         raise
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    db = AsyncSessionLocal()
+    try:
+        yield db
+    except Exception:
+        await db.rollback()
+        raise
+    finally:
+        await db.close()
+
+def _reads_from_primary(sessions: replicas.ReplicaSet, request: Request) -> bool:
+    return bool(sessions.replicas) and replicas.wrote_recently(request.scope)
+
+def get_read_db(request: Request) -> Session:
+    """
+    Session for read-only routes: a replica when DATABASE_REPLICA_URLS is set,
+    the primary when there are none or the caller wrote recently.
+    """
+    db = read_sessions.for_read(sticky=_reads_from_primary(read_sessions, request))()
+    try:
+        yield db
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+async def get_async_read_db(request: Request) -> AsyncIterator[AsyncSession]:
+    db = async_read_sessions.for_read(sticky=_reads_from_primary(async_read_sessions, request))()
+    try:
+        yield db
+    except Exception:
+        await db.rollback()
+        raise
+    finally:
+        await db.close()
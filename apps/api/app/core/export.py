@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import csv
+import io
+import json
+from enum import Enum
+from typing import Any, AsyncIterable, AsyncIterator, Iterable, Iterator, Optional, Sequence
+
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+
+
+class ExportFormat(str, Enum):
+    ndjson = "ndjson"
+    csv = "csv"
+
+
+MEDIA_TYPES = {
+    ExportFormat.ndjson: "application/x-ndjson",
+    ExportFormat.csv: "text/csv",
+}
+
+# OpenAPI `responses` entry for endpoints that can stream an export.
+EXPORT_RESPONSES: dict[int | str, dict[str, Any]] = {
+    200: {
+        "content": {media_type: {} for media_type in MEDIA_TYPES.values()},
+        "description": "JSON page, or a streamed export when `format` / `Accept` asks for one.",
+    },
+}
+
+
+def negotiate_export_format(
+    requested: Optional[ExportFormat],
+    accept: Optional[str],
+) -> Optional[ExportFormat]:
+    """
+    Pick the export format from the `format` query parameter, falling back to
+    the Accept header. None means a regular JSON response.
+    """
+    if requested is not None:
+        return requested
+    for export_format, media_type in MEDIA_TYPES.items():
+        if accept and media_type in accept:
+            return export_format
+    return None
+
+
+def _encode_batch(
+    batch: Sequence[Any],
+    schema: type[BaseModel],
+    export_format: ExportFormat,
+) -> bytes:
+    rows = [schema.model_validate(item).model_dump(mode="json") for item in batch]
+    if export_format is ExportFormat.ndjson:
+        return "".join(json.dumps(row, separators=(",", ":")) + "\n" for row in rows).encode()
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=list(schema.model_fields))
+    writer.writerows(rows)
+    return buffer.getvalue().encode()
+
+
+def _csv_header(schema: type[BaseModel]) -> bytes:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerow(list(schema.model_fields))
+    return buffer.getvalue().encode()
+
+
+def iter_export(
+    batches: Iterable[Sequence[Any]],
+    schema: type[BaseModel],
+    export_format: ExportFormat,
+) -> Iterator[bytes]:
+    """
+    Encode rows batch by batch as they come off a server-side cursor.
+    """
+    if export_format is ExportFormat.csv:
+        yield _csv_header(schema)
+    for batch in batches:
+        yield _encode_batch(batch, schema, export_format)
+
+
+async def aiter_export(
+    batches: AsyncIterable[Sequence[Any]],
+    schema: type[BaseModel],
+    export_format: ExportFormat,
+) -> AsyncIterator[bytes]:
+    """
+    Async counterpart of `iter_export`.
+    """
+    if export_format is ExportFormat.csv:
+        yield _csv_header(schema)
+    async for batch in batches:
+        yield _encode_batch(batch, schema, export_format)
+
+
+def export_response(
+    body: Iterator[bytes] | AsyncIterator[bytes],
+    export_format: ExportFormat,
+    filename: str,
+) -> StreamingResponse:
+    return StreamingResponse(
+        body,
+        media_type=MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{export_format.value}"'},
+    )
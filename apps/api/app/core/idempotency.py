@@ -0,0 +1,144 @@
+"""
+`Idempotency-Key` support for POST routes. The first response to a key is
+stored in-process (LRU with TTL) and replayed, with `Idempotent-Replayed:
+true`, for every retry with the same key, method and path from the same
+client (by address, as admission control tells clients apart), so callers
+that pick the same key never see each other's responses. A retry that
+arrives while the first request is still running waits for it instead of
+running the handler a second time.
+
+Only completed responses under 500 are stored; if the handler raises (a
+DomainError included) or answers 5xx, the key is released and the next retry
+runs again. Reusing a key with a different body is rejected. Multipart bodies
+are not fingerprinted (their boundary changes between retries and uploads
+are not read into memory for this), so there the key alone decides.
+
+The cache is per process: retries that land on another worker run again.
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, List, Tuple, Union
+
+from fastapi import Request, Response
+from fastapi.routing import APIRoute
+
+from app.core.admission import client_key
+from app.core.cache import LRUCache
+from app.core.config import settings
+from app.core.metrics import REGISTRY
+from app.exceptions.idempotency import (
+    IdempotencyKeyReusedError,
+    IdempotencyRequestInProgressError,
+    InvalidIdempotencyKeyError,
+)
+
+IDEMPOTENCY_HEADER = "idempotency-key"
+REPLAYED_HEADER = (b"idempotent-replayed", b"true")
+IDEMPOTENT_METHODS = frozenset({"POST"})
+MAX_KEY_LENGTH = 255
+
+IDEMPOTENT_REQUESTS = REGISTRY.counter(
+    "idempotent_requests_total",
+    "Requests sent with an Idempotency-Key, by outcome (executed, replayed, rejected).",
+    labelnames=("outcome",),
+)
+
+@dataclass
+class InFlight:
+    fingerprint: str
+    done: asyncio.Event = field(default_factory=asyncio.Event)
+
+@dataclass(frozen=True)
+class StoredResponse:
+    fingerprint: str
+    status_code: int
+    headers: List[Tuple[bytes, bytes]]
+    body: bytes
+
+    def replay(self) -> Response:
+        response = Response(self.body, status_code=self.status_code)
+        response.raw_headers = [*self.headers, REPLAYED_HEADER]
+        return response
+
+idempotency_cache: "LRUCache[Tuple[str, str, str, str], Union[InFlight, StoredResponse]]" = LRUCache(
+    "idempotency",
+    maxsize=settings.idempotency_cache_size,
+    ttl=settings.idempotency_ttl_seconds,
+)
+
+async def fingerprint(request: Request) -> str:
+    content_type = request.headers.get("content-type", "")
+    if content_type.startswith("multipart/"):
+        return "multipart"
+    # FastAPI reads the body to parse it anyway; Request caches it.
+    return hashlib.sha256(await request.body()).hexdigest()
+
+def _storable(response: Response) -> bool:
+    body = getattr(response, "body", None)  # streaming responses have none
+    return (
+        body is not None
+        and response.status_code < 500
+        and len(body) <= settings.idempotency_max_body_bytes
+    )
+
+async def run_once(request: Request, handler: Callable[[Request], Awaitable[Response]]) -> Response:
+    """Run `handler` for the first request with this key; replay its response for the rest."""
+    key = request.headers.get(IDEMPOTENCY_HEADER)
+    if key is None:
+        return await handler(request)
+    if not 0 < len(key) <= MAX_KEY_LENGTH:
+        IDEMPOTENT_REQUESTS.inc(outcome="rejected")
+        raise InvalidIdempotencyKeyError()
+
+    cache_key = (client_key(request), request.method, request.url.path, key)
+    request_fingerprint = await fingerprint(request)
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + settings.idempotency_wait_seconds
+    # No await between the lookup and storing our InFlight entry, so one
+    # request per key and process gets to run the handler.
+    while (entry := idempotency_cache.get(cache_key)) is not None:
+        if entry.fingerprint != request_fingerprint:
+            IDEMPOTENT_REQUESTS.inc(outcome="rejected")
+            raise IdempotencyKeyReusedError()
+        if isinstance(entry, StoredResponse):
+            IDEMPOTENT_REQUESTS.inc(outcome="replayed")
+            return entry.replay()
+        try:
+            await asyncio.wait_for(entry.done.wait(), max(0.0, deadline - loop.time()))
+        except asyncio.TimeoutError:
+            IDEMPOTENT_REQUESTS.inc(outcome="rejected")
+            raise IdempotencyRequestInProgressError(retry_after=1)
+        # Stored or released: look again.
+
+    in_flight = InFlight(request_fingerprint)
+    idempotency_cache.set(cache_key, in_flight)
+    IDEMPOTENT_REQUESTS.inc(outcome="executed")
+    try:
+        response = await handler(request)
+    except BaseException:
+        idempotency_cache.invalidate(cache_key)
+        in_flight.done.set()
+        raise
+    if _storable(response):
+        idempotency_cache.set(cache_key, StoredResponse(
+            request_fingerprint, response.status_code, list(response.raw_headers), response.body
+        ))
+    else:
+        idempotency_cache.invalidate(cache_key)
+    in_flight.done.set()
+    return response
+
+class IdempotentRoute(APIRoute):
+    """APIRoute that honours `Idempotency-Key` on POST (pass as a router's `route_class`)."""
+    def get_route_handler(self) -> Callable[[Request], Awaitable[Response]]:
+        handler = super().get_route_handler()
+        if not self.methods & IDEMPOTENT_METHODS:
+            return handler
+
+        async def idempotent_handler(request: Request) -> Response:
+            return await run_once(request, handler)
+
+        return idempotent_handler
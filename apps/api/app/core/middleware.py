@@ -0,0 +1,142 @@
+"""
+ASGI middleware. Written against the raw ASGI interface rather than
+BaseHTTPMiddleware so that it adds no extra task or body buffering per request.
+"""
+from __future__ import annotations
+
+import time
+from typing import Any, Dict, List, Tuple
+
+from app.core.config import settings
+from app.core.metrics import REGISTRY
+from app.db import replicas
+from app.db.query_stats import QueryStats, track_queries
+
+# Seconds; finer at the low end, where most API requests land.
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+HTTP_REQUESTS = REGISTRY.counter(
+    "http_requests_total",
+    "HTTP requests handled, by route template and status code.",
+    labelnames=("method", "route", "status"),
+)
+HTTP_IN_PROGRESS = REGISTRY.gauge(
+    "http_requests_in_progress",
+    "HTTP requests currently being handled.",
+    labelnames=("method",),
+)
+HTTP_LATENCY = REGISTRY.histogram(
+    "http_request_duration_seconds",
+    "Time from receiving a request to sending the last byte of its response.",
+    labelnames=("method", "route", "status"),
+    buckets=LATENCY_BUCKETS,
+)
+
+HTTP_DB_QUERIES = REGISTRY.histogram(
+    "http_request_db_queries",
+    "SQL statements executed per request (high counts usually mean N+1 queries).",
+    labelnames=("method", "route"),
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100),
+)
+
+# Requests that matched no route share one label value instead of one per URL.
+UNMATCHED_ROUTE = "<unmatched>"
+
+def route_template(scope: Dict[str, Any]) -> str:
+    """Path template of the matched route (e.g. /api/v1/users/{user_id}/accounts)."""
+    route = scope.get("route")
+    return getattr(route, "path", None) or UNMATCHED_ROUTE
+
+class MetricsMiddleware:
+    def __init__(self, app: Any) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        method = scope["method"]
+        status = 500  # if the app raises before responding
+
+        async def send_wrapper(message: Dict[str, Any]) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        HTTP_IN_PROGRESS.inc(method=method)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            HTTP_IN_PROGRESS.dec(method=method)
+            route = route_template(scope)
+            HTTP_REQUESTS.inc(method=method, route=route, status=str(status))
+            HTTP_LATENCY.observe(elapsed, method=method, route=route, status=str(status))
+
+def _quote(value: str) -> str:
+    return '"' + value.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+def server_timing(stats: QueryStats, elapsed: float) -> str:
+    """
+    Server-Timing value: total DB time and query count, then the slowest
+    statements (visible in the browser's network panel).
+    """
+    queries = f"{stats.count} {'query' if stats.count == 1 else 'queries'}"
+    metrics = [
+        f"db;dur={stats.seconds * 1000:.2f};desc={_quote(queries)}",
+        f"app;dur={elapsed * 1000:.2f}",
+    ]
+    for i, (seconds, statement) in enumerate(stats.slowest(), start=1):
+        metrics.append(f"sql-{i};dur={seconds * 1000:.2f};desc={_quote(statement)}")
+    return ", ".join(metrics)
+
+class QueryStatsMiddleware:
+    """
+    Tracks the SQL each request runs (see app.db.query_stats). Records the
+    per-route query count and, with SERVER_TIMING, adds a Server-Timing header.
+    """
+    def __init__(self, app: Any, emit_header: bool = settings.server_timing) -> None:
+        self.app = app
+        self.emit_header = emit_header
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        started = time.perf_counter()
+        with track_queries() as stats:
+            async def send_wrapper(message: Dict[str, Any]) -> None:
+                if self.emit_header and message["type"] == "http.response.start":
+                    value = server_timing(stats, time.perf_counter() - started)
+                    headers: List[Tuple[bytes, bytes]] = list(message.get("headers", []))
+                    headers.append((b"server-timing", value.encode("latin-1", "replace")))
+                    message = {**message, "headers": headers}
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                HTTP_DB_QUERIES.observe(stats.count, method=scope["method"], route=route_template(scope))
+
+class ReadYourWritesMiddleware:
+    """
+    Marks the caller of a successful write (see app.db.replicas.sticky_keys)
+    so its next reads go to the primary. Marked when the response starts,
+    before the client can see it and send a follow-up read.
+    """
+    def __init__(self, app: Any) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] != "http" or scope["method"] in replicas.SAFE_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message: Dict[str, Any]) -> None:
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                replicas.record_write(scope)
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
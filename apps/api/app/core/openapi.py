@@ -74,6 +74,18 @@ COMMON_ERROR_RESPONSES: dict[int, dict[str, type[ErrorResponse]]] = {
                 }
             },
         },
+    429: {"model": ErrorResponse,
+          "description": "Too Many Requests",
+          "content": {
+            "application/json": {
+                "example": {
+                    "code":"admission.rate_limited",
+                    "detail":"Too many requests from this client. Please retry later.",
+                    "meta": None
+                    },
+                }
+            },
+        },
     500: {"model": ErrorResponse,
           "description": "Internal Server Error",
           "content": {
@@ -86,4 +98,16 @@ COMMON_ERROR_RESPONSES: dict[int, dict[str, type[ErrorResponse]]] = {
                 }
             },
         },
+    503: {"model": ErrorResponse,
+          "description": "Service Unavailable",
+          "content": {
+            "application/json": {
+                "example": {
+                    "code":"service_unavailable",
+                    "detail":"The service is temporarily unavailable. Please retry later.",
+                    "meta": None
+                    },
+                }
+            },
+        },
 }
\ No newline at end of file
@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+import base64
+import json
+from typing import Any, List
+
+from app.exceptions.pagination import InvalidCursorError
+
+
+def encode_cursor(*values: Any) -> str:
+    """
+    Encode the sort key of the last row of a page into an opaque cursor.
+    Values are serialized as strings (datetimes as ISO 8601, UUIDs as hex).
+    """
+    raw = json.dumps([v.isoformat() if hasattr(v, "isoformat") else str(v) for v in values])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> List[str]:
+    """
+    Decode a cursor produced by `encode_cursor` holding `size` values.
+    Anything else, including well-formed JSON that is not `size` strings,
+    raises InvalidCursorError, so callers only have to parse strings.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except ValueError:
+        raise InvalidCursorError() from None
+    if not isinstance(values, list) or len(values) != size or not all(isinstance(v, str) for v in values):
+        raise InvalidCursorError()
+    return values
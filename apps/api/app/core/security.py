@@ -1,6 +1,156 @@
-from passlib.context import CryptContext
+from __future__ import annotations
 
-pwd_context = CryptContext(
-    schemes=["argon2"],
-    deprecated="auto",
-)
\ No newline at end of file
+import asyncio
+import multiprocessing
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from functools import lru_cache
+from typing import Any, Callable
+
+from app.core.config import settings
+from app.core.metrics import REGISTRY
+from app.exceptions.security import HashingPoolSaturatedError, HashingTimeoutError
+
+@lru_cache(maxsize=None)
+def pwd_context():
+    """
+    The passlib context, built (and passlib imported) on the first hash or
+    verify of the process: the API process never needs it while hashing runs
+    in the pool, and imports of the app for tooling skip it entirely.
+    """
+    from passlib.context import CryptContext
+
+    return CryptContext(
+        schemes=["argon2"],
+        deprecated="auto",
+    )
+
+HASH_QUEUE_DEPTH = REGISTRY.gauge(
+    "password_hash_queue_depth",
+    "Password hash/verify jobs submitted to the pool and not finished yet.",
+)
+HASH_LATENCY = REGISTRY.histogram(
+    "password_hash_duration_seconds",
+    "Time from submission to completion of password hash/verify jobs.",
+    labelnames=("operation",),
+)
+HASH_REJECTED = REGISTRY.counter(
+    "password_hash_rejected_total",
+    "Password hash/verify jobs rejected because the pool was full or timed out.",
+    labelnames=("operation", "reason"),
+)
+
+
+# Never fork(): the API process is multi-threaded by the time the pool starts.
+_START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+
+def _hash(password: str) -> str:
+    return pwd_context().hash(password)
+
+
+def _verify(password: str, password_hash: str) -> bool:
+    return pwd_context().verify(password, password_hash)
+
+
+class PasswordHasher:
+    """
+    Runs Argon2 hash/verify in a dedicated process pool.
+    At most `workers + queue_size` jobs are accepted at once; beyond that the
+    caller gets HashingPoolSaturatedError (503) instead of queueing forever.
+    With `workers=0` jobs run inline, which is what tooling and tests without
+    a pool want.
+    """
+    def __init__(self, workers: int, queue_size: int, timeout: float):
+        self.workers = workers
+        self.capacity = workers + queue_size
+        self.timeout = timeout
+        self._executor: ProcessPoolExecutor | None = None
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context(_START_METHOD),
+                )
+            return self._executor
+
+    def _release(self, operation: str, started: float) -> None:
+        HASH_LATENCY.observe(time.perf_counter() - started, operation=operation)
+        HASH_QUEUE_DEPTH.dec()
+        with self._lock:
+            self._pending -= 1
+
+    def _submit(self, operation: str, fn: Callable[..., Any], *args: Any) -> Future:
+        with self._lock:
+            if self._pending >= self.capacity:
+                HASH_REJECTED.inc(operation=operation, reason="saturated")
+                raise HashingPoolSaturatedError()
+            self._pending += 1
+        HASH_QUEUE_DEPTH.inc()
+        started = time.perf_counter()
+        try:
+            future = self._get_executor().submit(fn, *args)
+        except BaseException:
+            self._release(operation, started)
+            raise
+        future.add_done_callback(lambda _: self._release(operation, started))
+        return future
+
+    def _run(self, operation: str, fn: Callable[..., Any], *args: Any) -> Any:
+        if self.workers == 0:
+            started = time.perf_counter()
+            try:
+                return fn(*args)
+            finally:
+                HASH_LATENCY.observe(time.perf_counter() - started, operation=operation)
+        future = self._submit(operation, fn, *args)
+        try:
+            return future.result(timeout=self.timeout)
+        except TimeoutError:
+            future.cancel()
+            HASH_REJECTED.inc(operation=operation, reason="timeout")
+            raise HashingTimeoutError() from None
+
+    async def _arun(self, operation: str, fn: Callable[..., Any], *args: Any) -> Any:
+        if self.workers == 0:
+            return await asyncio.to_thread(self._run, operation, fn, *args)
+        future = self._submit(operation, fn, *args)
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), self.timeout)
+        except TimeoutError:
+            HASH_REJECTED.inc(operation=operation, reason="timeout")
+            raise HashingTimeoutError() from None
+
+    def hash(self, password: str) -> str:
+        return self._run("hash", _hash, password)
+
+    def verify(self, password: str, password_hash: str) -> bool:
+        return self._run("verify", _verify, password, password_hash)
+
+    async def ahash(self, password: str) -> str:
+        return await self._arun("hash", _hash, password)
+
+    async def averify(self, password: str, password_hash: str) -> bool:
+        return await self._arun("verify", _verify, password, password_hash)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+password_hasher = PasswordHasher(
+    workers=settings.hash_workers,
+    queue_size=settings.hash_queue_size,
+    timeout=settings.hash_timeout_seconds,
+)
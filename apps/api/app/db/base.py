@@ -2,5 +2,14 @@ from app.db.base_class import Base
 from app.models.user import User
 from app.models.account import Account
 from app.models.category import Category
+from app.models.category_rule import CategoryRule
 from app.models.transaction import Transaction
+from app.models.transaction_dedupe_key import TransactionDedupeKey
+from app.models.account_balance import AccountBalance
+from app.models.category_rollup import MonthlyCategoryRollup
+from app.models.fx_rate import FxRate
 
+from app.services.transaction_hooks import register_transaction_hooks
+
+# Balances and rollups follow every ORM write to Transaction, whatever imported the models.
+register_transaction_hooks()
@@ -0,0 +1,157 @@
+"""
+Monthly range partitions of `transactions` (Postgres only).
+
+The table is `PARTITION BY RANGE (date)` with one partition per UTC month,
+named `transactions_pYYYYMM`, plus `transactions_default` for rows outside
+every partition. Queries prune partitions when they compare the raw `date`
+column with timestamptz bounds (see `day_bounds`); wrapping `date` in a
+function (date_trunc, casts) scans every partition.
+
+Creating a partition moves the rows the default partition holds for that
+month into it, so a late import never blocks partition creation. Detaching
+is a catalog change: the month leaves `transactions` (and every query) but
+stays a plain table, optionally moved to an archive schema to dump or drop.
+"""
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Iterable, List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+PARENT_TABLE = "transactions"
+DEFAULT_PARTITION = "transactions_default"
+# Serializes partition DDL between workers starting at the same time.
+_ADVISORY_LOCK_KEY = 0x7472_7061  # "trpa"
+_BOUND = re.compile(r"FROM \('([^']+)'\) TO \('([^']+)'\)")
+
+@dataclass(frozen=True)
+class Partition:
+    name: str
+    start: date  # first day of the month, inclusive
+    end: date    # first day of the next month, exclusive
+
+def month_start(value: date) -> date:
+    return value.replace(day=1)
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+def months(first: date, last: date) -> Iterable[date]:
+    month = month_start(first)
+    while month <= last:
+        yield month
+        month = add_months(month, 1)
+
+def partition_name(month: date) -> str:
+    return f"{PARENT_TABLE}_p{month:%Y%m}"
+
+def _utc_midnight(day: date) -> datetime:
+    return datetime.combine(day, time.min, tzinfo=timezone.utc)
+
+def day_bounds(date_from: Optional[date], date_to: Optional[date]) -> Tuple[Optional[datetime], Optional[datetime]]:
+    """
+    [start, end) timestamptz bounds of the UTC days date_from..date_to
+    (inclusive). Filter with `date >= start` and `date < end` so Postgres
+    can skip the partitions outside the range.
+    """
+    start = _utc_midnight(date_from) if date_from else None
+    end = _utc_midnight(date_to + timedelta(days=1)) if date_to else None
+    return start, end
+
+def is_partitioned(connection: Connection) -> bool:
+    if connection.dialect.name != "postgresql":
+        return False
+    return connection.scalar(
+        text("SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(:t))"),
+        {"t": PARENT_TABLE},
+    )
+
+def list_partitions(connection: Connection) -> List[Partition]:
+    """Monthly partitions currently attached, oldest first (the default partition excluded)."""
+    rows = connection.execute(text(
+        "SELECT c.relname, pg_get_expr(c.relpartbound, c.oid) "
+        "FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+        "WHERE i.inhparent = to_regclass(:t)"
+    ), {"t": PARENT_TABLE})
+    partitions = []
+    for name, bound in rows:
+        match = _BOUND.search(bound)
+        if match:
+            start, end = (datetime.fromisoformat(v).astimezone(timezone.utc).date() for v in match.groups())
+            partitions.append(Partition(name, start, end))
+    return sorted(partitions, key=lambda p: p.start)
+
+def _months_in_default(connection: Connection) -> List[date]:
+    rows = connection.execute(text(
+        f"SELECT DISTINCT date_trunc('month', date AT TIME ZONE 'UTC')::date FROM {DEFAULT_PARTITION}"
+    ))
+    return [month for (month,) in rows]
+
+def create_partition(connection: Connection, month: date) -> str:
+    """
+    Create and attach the partition of `month`, moving in the rows the
+    default partition holds for it. The caller commits.
+    """
+    month = month_start(month)
+    name = partition_name(month)
+    start, end = _utc_midnight(month), _utc_midnight(add_months(month, 1))
+    params = {"start": start, "end": end}
+    connection.execute(text(f"CREATE TABLE {name} (LIKE {PARENT_TABLE} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"))
+    connection.execute(text(
+        f"WITH moved AS (DELETE FROM {DEFAULT_PARTITION} WHERE date >= :start AND date < :end RETURNING *) "
+        f"INSERT INTO {name} SELECT * FROM moved"
+    ), params)
+    # Bounds are literals in DDL; isoformat of an aware datetime is unambiguous.
+    connection.execute(text(
+        f"ALTER TABLE {PARENT_TABLE} ATTACH PARTITION {name} "
+        f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+    ))
+    return name
+
+def ensure_partitions(
+    connection: Connection,
+    months_ahead: int,
+    today: Optional[date] = None,
+    first_month: Optional[date] = None,
+) -> List[str]:
+    """
+    Make sure a partition exists for every month from `first_month` (default:
+    the current one) to `months_ahead` months after the current one, and for
+    every month that has rows in the default partition. Returns the names of
+    the partitions created. Safe to run concurrently; the caller commits.
+    """
+    if not is_partitioned(connection):
+        return []
+    connection.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": _ADVISORY_LOCK_KEY})
+    current = month_start(today or datetime.now(timezone.utc).date())
+    wanted = set(_months_in_default(connection))
+    wanted.update(months(min(first_month or current, current), add_months(current, months_ahead)))
+    existing = {p.start for p in list_partitions(connection)}
+    return [create_partition(connection, m) for m in sorted(wanted - existing)]
+
+def detach_partitions(
+    connection: Connection,
+    before: date,
+    archive_schema: Optional[str] = None,
+) -> List[str]:
+    """
+    Detach every monthly partition that ends on or before `before` (a month
+    start). With `archive_schema` the detached tables are moved there.
+    Stored balances and rollups keep the detached rows' amounts; rebuilding
+    them afterwards would drop those amounts. The caller commits.
+    """
+    detached = []
+    for partition in list_partitions(connection):
+        if partition.end > month_start(before):
+            continue
+        connection.execute(text(f"ALTER TABLE {PARENT_TABLE} DETACH PARTITION {partition.name}"))
+        if archive_schema:
+            connection.execute(text(f'CREATE SCHEMA IF NOT EXISTS "{archive_schema}"'))
+            connection.execute(text(f'ALTER TABLE {partition.name} SET SCHEMA "{archive_schema}"'))
+        detached.append(partition.name)
+    return detached
@@ -0,0 +1,125 @@
+"""
+Per-request SQL statistics from engine cursor events: query count, total DB
+time, the slowest statements and statements repeated within one request
+(the usual N+1 signature). Listeners are installed on the Engine class, so
+they cover the sync engine, the async engine's sync_engine and test engines.
+"""
+from __future__ import annotations
+
+import heapq
+import re
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Iterator, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+SLOWEST_KEPT = 3
+
+@dataclass
+class QueryStats:
+    count: int = 0
+    seconds: float = 0.0
+    statements: Counter = field(default_factory=Counter)
+    # min-heap of (seconds, statement), at most SLOWEST_KEPT entries
+    _slowest: List[Tuple[float, str]] = field(default_factory=list)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def record(self, statement: str, seconds: float) -> None:
+        with self._lock:
+            self.count += 1
+            self.seconds += seconds
+            self.statements[statement] += 1
+            if len(self._slowest) < SLOWEST_KEPT:
+                heapq.heappush(self._slowest, (seconds, statement))
+            elif seconds > self._slowest[0][0]:
+                heapq.heapreplace(self._slowest, (seconds, statement))
+
+    def slowest(self) -> List[Tuple[float, str]]:
+        return sorted(self._slowest, reverse=True)
+
+    def repeated(self, times: int) -> List[Tuple[str, int]]:
+        """Statements run at least `times` times, most repeated first."""
+        return [(sql, n) for sql, n in self.statements.most_common() if n >= times]
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+_current: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+# Process-wide collectors (tests): they see queries from every thread.
+_collectors: List[QueryStats] = []
+
+def current_stats() -> Optional[QueryStats]:
+    return _current.get()
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """Collect the queries run in this context (and threads it starts with copy_context)."""
+    stats = QueryStats()
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+@contextmanager
+def assert_query_budget(
+    max_queries: Optional[int] = None,
+    max_repeats: Optional[int] = None,
+) -> Iterator[QueryStats]:
+    """
+    Fail if the block runs more than `max_queries` statements, or any single
+    statement more than `max_repeats` times. Counts queries from all threads
+    (e.g. a TestClient request), so use it around the request only.
+    """
+    stats = QueryStats()
+    _collectors.append(stats)
+    try:
+        yield stats
+    finally:
+        _collectors.remove(stats)
+    problems = []
+    if max_queries is not None and stats.count > max_queries:
+        problems.append(f"{stats.count} queries, budget is {max_queries}")
+    if max_repeats is not None:
+        problems.extend(f"{n}x (max {max_repeats}): {sql}" for sql, n in stats.repeated(max_repeats + 1))
+    if problems:
+        statements = "\n".join(f"  {n}x {sql}" for sql, n in stats.statements.most_common())
+        raise QueryBudgetExceeded("; ".join(problems) + "\nStatements:\n" + statements)
+
+_WHITESPACE = re.compile(r"\s+")
+
+@lru_cache(maxsize=1024)
+def compact_sql(statement: str, limit: int = 200) -> str:
+    statement = _WHITESPACE.sub(" ", statement).strip()
+    return statement if len(statement) <= limit else statement[: limit - 3] + "..."
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info["query_started"].pop()
+    stats = _current.get()
+    if stats is None and not _collectors:
+        return
+    elapsed = time.perf_counter() - started
+    statement = compact_sql(statement)
+    if stats is not None:
+        stats.record(statement, elapsed)
+    for collector in _collectors:
+        collector.record(statement, elapsed)
+
+@event.listens_for(Engine, "handle_error")
+def _handle_error(context):
+    # after_cursor_execute does not run for failed statements.
+    started = context.connection.info.get("query_started") if context.connection is not None else None
+    if started:
+        started.pop()
@@ -0,0 +1,84 @@
+"""
+Read-replica routing. Read-only routes take their session from
+`get_read_db`, which picks a replica (round-robin) unless the caller wrote
+recently: a successful write marks its keys (the `user_id` in the path,
+unless REPLICA_STICKY_BY=client, and the client address) and for
+REPLICA_STICKY_SECONDS every read sharing one of them goes to the primary,
+so the caller sees its own writes despite replication lag. The client key
+covers reads and writes without a user in the path: signing up, then
+listing users or reading the new user's data; writing under a user, then
+listing users. Without replicas every read goes to the primary.
+
+The recent-writes table is per process; with several workers a caller that
+lands on another worker may read from a replica, unless the balancer pins it.
+"""
+from __future__ import annotations
+
+import itertools
+from typing import Any, Dict, Generic, Optional, Sequence, Tuple, TypeVar
+
+from app.core.cache import LRUCache
+from app.core.config import settings
+
+F = TypeVar("F")
+
+# Methods that never write; any other method that succeeds counts as a write.
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+RECENT_WRITES_MAXSIZE = 100_000
+
+class ReplicaSet(Generic[F]):
+    """A primary session factory and zero or more replica ones."""
+
+    def __init__(self, primary: F, replicas: Sequence[F] = ()):
+        self.primary = primary
+        self.replicas = list(replicas)
+        self._next = itertools.cycle(self.replicas) if self.replicas else None
+
+    def for_read(self, sticky: bool = False) -> F:
+        if sticky or self._next is None:
+            return self.primary
+        return next(self._next)
+
+class RecentWrites:
+    """Keys that wrote within the last `seconds`; 0 disables stickiness."""
+
+    def __init__(self, seconds: float, maxsize: int = RECENT_WRITES_MAXSIZE):
+        self.seconds = seconds
+        self._keys: Optional[LRUCache[str, bool]] = (
+            LRUCache("recent_writes", maxsize, ttl=seconds) if seconds > 0 else None
+        )
+
+    def record(self, key: Optional[str]) -> None:
+        if self._keys is not None and key is not None:
+            self._keys.set(key, True)
+
+    def __contains__(self, key: Optional[str]) -> bool:
+        return self._keys is not None and key is not None and self._keys.get(key, False)
+
+    def clear(self) -> None:
+        if self._keys is not None:
+            self._keys.clear()
+
+def _client_key(scope: Dict[str, Any]) -> Optional[str]:
+    client = scope.get("client")
+    return f"client:{client[0]}" if client else None
+
+def sticky_keys(scope: Dict[str, Any]) -> Tuple[str, ...]:
+    """Who a request writes or reads as: the path's user (if tracked) and the client."""
+    keys = []
+    user_id = scope.get("path_params", {}).get("user_id")
+    if settings.replica_sticky_by != "client" and user_id is not None:
+        keys.append(f"user:{str(user_id).lower()}")
+    client = _client_key(scope)
+    if client is not None:
+        keys.append(client)
+    return tuple(keys)
+
+def record_write(scope: Dict[str, Any]) -> None:
+    for key in sticky_keys(scope):
+        recent_writes.record(key)
+
+def wrote_recently(scope: Dict[str, Any]) -> bool:
+    return any(key in recent_writes for key in sticky_keys(scope))
+
+recent_writes = RecentWrites(settings.replica_sticky_seconds)
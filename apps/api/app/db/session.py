@@ -1,16 +1,195 @@
+"""
+Engines and session factories. Nothing connects or even builds an engine at
+import time: each engine is created on first use (or by `init_engines` at app
+startup), so importing the app for tooling, tests or a cold worker stays cheap
+and a missing DATABASE_URL only fails once a database is actually needed.
+`engine` and `async_engine` stay importable as module attributes.
+"""
+import threading
+import time
+from typing import Any, Callable, Dict, Union
+
 from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 
 from app.core.config import settings
+from app.core.metrics import REGISTRY
+from app.db import base  # noqa: F401 - maps every model and registers the transaction hooks
+from app.db.replicas import ReplicaSet
+
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+psycopg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+def to_async_url(url: str) -> str:
+    """
+    Map a sync DATABASE_URL to the async driver of the same backend
+    (psycopg for Postgres, aiosqlite for SQLite).
+    """
+    parsed = make_url(url)
+    driver = ASYNC_DRIVERS.get(parsed.get_backend_name())
+    if driver is None:
+        raise RuntimeError(f"No async driver configured for '{parsed.drivername}'")
+    return parsed.set(drivername=driver).render_as_string(hide_password=False)
+
+POOL_CHECKED_OUT = REGISTRY.gauge(
+    "db_pool_checked_out",
+    "Connections currently checked out of the pool.",
+    labelnames=("pool",),
+)
+POOL_OVERFLOW = REGISTRY.gauge(
+    "db_pool_overflow",
+    "Connections open beyond pool_size (negative while the pool is still filling).",
+    labelnames=("pool",),
+)
+POOL_SIZE = REGISTRY.gauge(
+    "db_pool_size",
+    "Configured pool_size.",
+    labelnames=("pool",),
+)
+POOL_WAIT = REGISTRY.histogram(
+    "db_pool_wait_seconds",
+    "Time to get a connection from the pool (waiting while it is exhausted, or opening one).",
+    labelnames=("pool",),
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0),
+)
+
+class _TimedCheckout:
+    """Pool mixin recording how long each checkout waited (`_do_get` blocks when exhausted)."""
+    metrics_label = "sync"
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            POOL_WAIT.observe(time.perf_counter() - started, pool=self.metrics_label)
+
+class InstrumentedQueuePool(_TimedCheckout, QueuePool):
+    pass
+
+class InstrumentedAsyncQueuePool(_TimedCheckout, AsyncAdaptedQueuePool):
+    metrics_label = "async"
+
+def _labelled(pool_class: type, label: str) -> type:
+    # A subclass rather than an instance attribute: engine.dispose() recreates the pool from its class.
+    return type(pool_class.__name__, (pool_class,), {"metrics_label": label})
+
+POOL_OPTIONS = dict(pool_pre_ping=True, pool_size=5, max_overflow=10, pool_timeout=30)
+
+# Engines created so far, by pool label ("sync", "async", "replica0", ...).
+_engines: Dict[str, Union[Engine, AsyncEngine]] = {}
+_engines_lock = threading.Lock()
+
+def _database_url() -> str:
+    if not settings.database_url:
+        raise RuntimeError("DATABASE_URL is not set")
+    return settings.database_url
+
+def _get_or_create(label: str, build: Callable[[], Any]) -> Any:
+    engine = _engines.get(label)
+    if engine is None:
+        with _engines_lock:
+            engine = _engines.get(label)
+            if engine is None:
+                engine = _engines[label] = build()
+    return engine
+
+def get_engine() -> Engine:
+    return _get_or_create("sync", lambda: create_engine(
+        _database_url(), future=True, poolclass=InstrumentedQueuePool, **POOL_OPTIONS,
+    ))
+
+def get_async_engine() -> AsyncEngine:
+    return _get_or_create("async", lambda: create_async_engine(
+        to_async_url(_database_url()), poolclass=InstrumentedAsyncQueuePool, **POOL_OPTIONS,
+    ))
+
+def get_replica_engine(index: int) -> Engine:
+    label = f"replica{index}"
+    return _get_or_create(label, lambda: create_engine(
+        settings.database_replica_urls[index], future=True,
+        poolclass=_labelled(InstrumentedQueuePool, label), **POOL_OPTIONS,
+    ))
+
+def get_async_replica_engine(index: int) -> AsyncEngine:
+    label = f"async_replica{index}"
+    return _get_or_create(label, lambda: create_async_engine(
+        to_async_url(settings.database_replica_urls[index]),
+        poolclass=_labelled(InstrumentedAsyncQueuePool, label), **POOL_OPTIONS,
+    ))
+
+def init_engines(db_async: bool) -> None:
+    """Create the engines the app will serve from (called at startup)."""
+    if db_async:
+        get_async_engine()
+        for i in range(len(settings.database_replica_urls)):
+            get_async_replica_engine(i)
+    else:
+        get_engine()
+        for i in range(len(settings.database_replica_urls)):
+            get_replica_engine(i)
+
+async def dispose_engines() -> None:
+    """Close the pooled connections of every engine created so far (called at shutdown)."""
+    for engine in list(_engines.values()):
+        if isinstance(engine, AsyncEngine):
+            await engine.dispose()
+        else:
+            engine.dispose()
+
+def update_pool_gauges() -> None:
+    """Refresh the pool gauges; called right before metrics are rendered."""
+    for label, engine in list(_engines.items()):
+        pool = engine.pool
+        if isinstance(pool, QueuePool):
+            POOL_CHECKED_OUT.set(pool.checkedout(), pool=label)
+            POOL_OVERFLOW.set(pool.overflow(), pool=label)
+            POOL_SIZE.set(pool.size(), pool=label)
+
+class LazySessionMaker(sessionmaker):
+    """sessionmaker bound to its engine on the first session it makes."""
+    def __init__(self, get_bind: Callable[[], Engine], **kw: Any):
+        super().__init__(**kw)
+        self._get_bind = get_bind
+
+    def __call__(self, **local_kw: Any):
+        if self.kw.get("bind") is None:
+            self.configure(bind=self._get_bind())
+        return super().__call__(**local_kw)
+
+class LazyAsyncSessionMaker(async_sessionmaker):
+    def __init__(self, get_bind: Callable[[], AsyncEngine], **kw: Any):
+        super().__init__(**kw)
+        self._get_bind = get_bind
+
+    def __call__(self, **local_kw: Any):
+        if self.kw.get("bind") is None:
+            self.configure(bind=self._get_bind())
+        return super().__call__(**local_kw)
+
+SessionLocal = LazySessionMaker(get_engine, autoflush=False, autocommit=False, future=True)
 
-if not settings.database_url:
-    raise RuntimeError("DATABASE_URL is not set")
+AsyncSessionLocal = LazyAsyncSessionMaker(get_async_engine, autoflush=False, expire_on_commit=False)
 
-engine = create_engine(settings.database_url,
-                       future=True,
-                       pool_pre_ping=True,
-                       pool_size=5,
-                       max_overflow=10,
-                       pool_timeout=30,)
+# Read replicas (DATABASE_REPLICA_URLS); see app.db.replicas for the routing.
+read_sessions = ReplicaSet(SessionLocal, [
+    LazySessionMaker(lambda i=i: get_replica_engine(i), autoflush=False, autocommit=False, future=True)
+    for i in range(len(settings.database_replica_urls))
+])
+async_read_sessions = ReplicaSet(AsyncSessionLocal, [
+    LazyAsyncSessionMaker(lambda i=i: get_async_replica_engine(i), autoflush=False, expire_on_commit=False)
+    for i in range(len(settings.database_replica_urls))
+])
 
-SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
+def __getattr__(name: str) -> Any:
+    # `from app.db.session import engine` keeps working; the engine is built on access.
+    if name == "engine":
+        return get_engine()
+    if name == "async_engine":
+        return get_async_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,9 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from app.exceptions.base import NotFoundError
+
+@dataclass
+class AccountNotFoundError(NotFoundError):
+    """Raised when an account does not exist or does not belong to the user."""
+    code: str = "account.not_found"
+    detail: str = "The requested account does not exist."
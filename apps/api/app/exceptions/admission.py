@@ -0,0 +1,17 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from app.exceptions.base import ServiceUnavailableError, TooManyRequestsError
+
+@dataclass
+class RateLimitedError(TooManyRequestsError):
+    """Raised when a client has used up its request budget for a route."""
+    code: str = "admission.rate_limited"
+    detail: str = "Too many requests from this client. Please retry later."
+    retry_after: int | None = 1
+
+@dataclass
+class OverloadedError(ServiceUnavailableError):
+    """Raised when a route is at its concurrency limit and the wait for a slot would exceed the deadline."""
+    code: str = "admission.overloaded"
+    detail: str = "The server is busy. Please retry later."
+    retry_after: int | None = 1
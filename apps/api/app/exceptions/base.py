@@ -9,6 +9,7 @@ class DomainError(Exception):
     code: str = "domain_error"
     detail: str = "A domain error occurred."
     meta: Dict[str, Any] = field(default_factory=dict)
+    retry_after: Optional[int] = None  # seconds, sent as the Retry-After header
     
     def __str__(self) -> str:
         return self.detail
@@ -43,9 +44,20 @@ class ForbiddenError(DomainError):
     code: str = "forbidden"
     detail: str = "You do not have permission to access this resource."
     
+@dataclass
+class TooManyRequestsError(DomainError):
+    """Raised when a client sends more requests than it is allowed to."""
+    code: str = "too_many_requests"
+    detail: str = "Too many requests. Please retry later."
+
 @dataclass
 class InternalServerError(DomainError):
     """Raised when an internal server error occurs."""
     code: str = "internal_server_error"
     detail: str = "An internal server error occurred."
-    
+
+@dataclass
+class ServiceUnavailableError(DomainError):
+    """Raised when the service is temporarily unable to handle the request."""
+    code: str = "service_unavailable"
+    detail: str = "The service is temporarily unavailable. Please retry later."
@@ -0,0 +1,33 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from app.exceptions.base import ConflictError, NotFoundError
+
+@dataclass
+class CategoryNotFoundError(NotFoundError):
+    """Raised when a category does not exist or is not visible to the user."""
+    code: str = "category.not_found"
+    detail: str = "The requested category does not exist."
+
+@dataclass
+class CategoryAlreadyExistsError(ConflictError):
+    """Raised when the user already has a category with that name."""
+    code: str = "category.already_exists"
+    detail: str = "A category with this name already exists."
+
+@dataclass
+class CategoryInUseError(ConflictError):
+    """Raised when deleting a category that transactions still reference."""
+    code: str = "category.in_use"
+    detail: str = "The category is used by transactions and cannot be deleted."
+
+@dataclass
+class CategoryRuleNotFoundError(NotFoundError):
+    """Raised when a categorization rule does not exist or is not the user's."""
+    code: str = "category_rule.not_found"
+    detail: str = "The requested categorization rule does not exist."
+
+@dataclass
+class CategoryRuleAlreadyExistsError(ConflictError):
+    """Raised when the user already has a rule with that keyword."""
+    code: str = "category_rule.already_exists"
+    detail: str = "A categorization rule with this keyword already exists."
@@ -0,0 +1,15 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from app.exceptions.base import BadRequestError, NotFoundError
+
+@dataclass
+class FxRateNotFoundError(NotFoundError):
+    """Raised when no rate (direct, inverse or via the pivot) exists on or before the date."""
+    code: str = "fx.rate_not_found"
+    detail: str = "No exchange rate is available for the requested currencies and date."
+
+@dataclass
+class InvalidFxRatesFileError(BadRequestError):
+    """Raised when a rates file cannot be parsed."""
+    code: str = "fx.invalid_rates_file"
+    detail: str = "The exchange rates file is invalid."
@@ -0,0 +1,21 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from app.exceptions.base import BadRequestError, ConflictError
+
+@dataclass
+class InvalidIdempotencyKeyError(BadRequestError):
+    """Raised when the Idempotency-Key header is empty or too long."""
+    code: str = "idempotency.invalid_key"
+    detail: str = "The Idempotency-Key header must be 1 to 255 characters long."
+
+@dataclass
+class IdempotencyKeyReusedError(BadRequestError):
+    """Raised when an Idempotency-Key is sent again with a different request body."""
+    code: str = "idempotency.key_reused"
+    detail: str = "This Idempotency-Key was already used with a different request."
+
+@dataclass
+class IdempotencyRequestInProgressError(ConflictError):
+    """Raised when the first request with an Idempotency-Key is still running after the wait."""
+    code: str = "idempotency.in_progress"
+    detail: str = "A request with this Idempotency-Key is still being processed."
@@ -0,0 +1,9 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from app.exceptions.base import BadRequestError
+
+@dataclass
+class InvalidCursorError(BadRequestError):
+    """Raised when a pagination cursor cannot be decoded."""
+    code: str = "pagination.invalid_cursor"
+    detail: str = "The pagination cursor is invalid."
@@ -0,0 +1,9 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from app.exceptions.base import BadRequestError
+
+@dataclass
+class InvalidReportRangeError(BadRequestError):
+    """Raised when a report's start month is after its end month."""
+    code: str = "report.invalid_range"
+    detail: str = "The report start month must not be after the end month."
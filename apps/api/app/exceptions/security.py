@@ -0,0 +1,17 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from app.exceptions.base import ServiceUnavailableError
+
+@dataclass
+class HashingPoolSaturatedError(ServiceUnavailableError):
+    """Raised when the password hashing pool queue is full."""
+    code: str = "security.hashing_saturated"
+    detail: str = "Too many password operations in progress. Please retry later."
+    retry_after: int | None = 1
+
+@dataclass
+class HashingTimeoutError(ServiceUnavailableError):
+    """Raised when a password hashing job does not finish in time."""
+    code: str = "security.hashing_timeout"
+    detail: str = "The password operation timed out. Please retry later."
+    retry_after: int | None = 1
@@ -0,0 +1,15 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from app.exceptions.base import BadRequestError
+
+@dataclass
+class UnsupportedStatementFormatError(BadRequestError):
+    """Raised when a statement's format is not given and cannot be inferred."""
+    code: str = "statement.unsupported_format"
+    detail: str = "The statement format is not supported. Use csv, ofx or camt."
+
+@dataclass
+class InvalidTimezoneError(BadRequestError):
+    """Raised when the statement timezone is not a known IANA zone."""
+    code: str = "statement.invalid_timezone"
+    detail: str = "The timezone is not a valid IANA timezone name."
@@ -0,0 +1,15 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from app.exceptions.base import BadRequestError
+
+@dataclass
+class SameAccountTransferError(BadRequestError):
+    """Raised when a transfer's source and destination are the same account."""
+    code: str = "transfer.same_account"
+    detail: str = "A transfer needs two different accounts."
+
+@dataclass
+class TransferCurrencyMismatchError(BadRequestError):
+    """Raised when the two accounts of a transfer hold different currencies."""
+    code: str = "transfer.currency_mismatch"
+    detail: str = "Both accounts of a transfer must use the same currency."
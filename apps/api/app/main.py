@@ -1,6 +1,7 @@
 from __future__ import annotations
 import logging
-from typing import Any, Dict
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict
 from fastapi import FastAPI, Request
 from fastapi.responses import JSONResponse
 from fastapi.exceptions import RequestValidationError
@@ -14,10 +15,16 @@ from app.exceptions.base import (
     ConflictError,
     UnauthorizedError,
     ForbiddenError,
+    TooManyRequestsError,
     InternalServerError,
+    ServiceUnavailableError,
 )
 
-from app.routers import user
+from app.core.config import settings
+from app.core.middleware import MetricsMiddleware, QueryStatsMiddleware, ReadYourWritesMiddleware
+from app.core.security import password_hasher
+from app.db.session import dispose_engines, init_engines
+from app.routers import account, category, category_rule, report, system, transaction, transfer, user
 
 logger = logging.getLogger("finance_api")
 
@@ -32,14 +39,37 @@ def make_error_payload(
         payload["meta"] = meta
     return payload
 
-def create_app() -> FastAPI:
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    # Engines are lazy; build them here so the first request does not pay for it.
+    # No DDL here: partitions are kept ahead by `app.commands.partitions
+    # ensure` (deploy step and cron), see app.db.partitions.
+    init_engines(app.state.db_async)
+    yield
+    password_hasher.shutdown()
+    await dispose_engines()
+
+def create_app(*, db_async: bool = settings.db_async) -> FastAPI:
     app = FastAPI(
         title="Finance API",
         version="0.1.0",
         description="API for managing finance-related operations.",
+        lifespan=lifespan,
     )
-    # app.include_router(category.router, prefix="/api/v1")
-    app.include_router(user.router, prefix="/api/v1")
+    app.state.db_async = db_async
+    app.include_router(category.router, prefix="/api/v1")
+    app.include_router(category_rule.router, prefix="/api/v1")
+    app.include_router(user.async_router if db_async else user.router, prefix="/api/v1")
+    app.include_router(account.router, prefix="/api/v1")
+    app.include_router(transaction.router, prefix="/api/v1")
+    app.include_router(transfer.router, prefix="/api/v1")
+    app.include_router(report.router, prefix="/api/v1")
+    app.include_router(system.router, prefix="/api/v1")
+    app.include_router(system.metrics_router)
+    if settings.database_replica_urls:
+        app.add_middleware(ReadYourWritesMiddleware)
+    app.add_middleware(QueryStatsMiddleware)
+    app.add_middleware(MetricsMiddleware)
     
     @app.exception_handler(DomainError)
     async def domain_error_handler(
@@ -58,8 +88,12 @@ def create_app() -> FastAPI:
             status_code = 401
         elif isinstance(exc, ForbiddenError):
             status_code = 403
+        elif isinstance(exc, TooManyRequestsError):
+            status_code = 429
         elif isinstance(exc, InternalServerError):
             status_code = 500
+        elif isinstance(exc, ServiceUnavailableError):
+            status_code = 503
         
         logger.info(
             "DomainError: %s %s -> %s (%s)",
@@ -68,11 +102,15 @@ def create_app() -> FastAPI:
             status_code,
             exc.code,
         )
+        headers = None
+        if exc.retry_after is not None:
+            headers = {"Retry-After": str(exc.retry_after)}
         return JSONResponse(status_code=status_code,
                             content=make_error_payload(
                                 code=exc.code,
                                 detail=exc.detail,
-                                meta=exc.meta))
+                                meta=exc.meta),
+                            headers=headers)
     
     @app.exception_handler(RequestValidationError)
     async def response_validation_handler(
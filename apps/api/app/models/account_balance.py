@@ -0,0 +1,20 @@
+from uuid import UUID
+from decimal import Decimal
+
+from app.db.base_class import Base
+from app.models.mixin.timestamp import TimestampMixin
+from sqlalchemy import String, Numeric, Integer, text
+from sqlalchemy import ForeignKey
+from sqlalchemy.orm import Mapped, mapped_column
+
+class AccountBalance(Base, TimestampMixin):
+    """
+    Running balance per account and currency, kept in step with `transactions`
+    by app.services.balance (same DB transaction as every write).
+    """
+    __tablename__ = "account_balances"
+
+    account_id: Mapped[UUID] = mapped_column(ForeignKey("accounts.id", ondelete="CASCADE"), primary_key=True)
+    currency: Mapped[str] = mapped_column(String(3), primary_key=True)
+    balance: Mapped[Decimal] = mapped_column(Numeric(18, 2), nullable=False, server_default=text("0"))
+    transaction_count: Mapped[int] = mapped_column(Integer, nullable=False, server_default=text("0"))
@@ -0,0 +1,31 @@
+import uuid
+from uuid import UUID
+from datetime import date
+from decimal import Decimal
+
+from app.db.base_class import Base
+from app.models.mixin.timestamp import TimestampMixin
+from app.models.transaction import TransactionType
+from sqlalchemy import Date, Integer, Numeric, Enum as SAEnum, text
+from sqlalchemy import ForeignKey
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+# Stands in for "no category" so it can be part of the primary key
+# (NULLs never conflict in unique constraints). The max UUID rather than the
+# nil one: SQLite's numeric affinity would turn an all-zero hex into 0.
+UNCATEGORIZED = uuid.UUID("ffffffff-ffff-ffff-ffff-ffffffffffff")
+
+class MonthlyCategoryRollup(Base, TimestampMixin):
+    """
+    Sum and count of a user's transactions per (UTC) month, category and
+    type, kept in step with `transactions` by app.services.rollup.
+    """
+    __tablename__ = "monthly_category_rollups"
+
+    user_id: Mapped[UUID] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    month: Mapped[date] = mapped_column(Date, primary_key=True)  # first day of the month
+    category_id: Mapped[UUID] = mapped_column(PG_UUID(as_uuid=True), primary_key=True)  # UNCATEGORIZED when none
+    type: Mapped[TransactionType] = mapped_column(SAEnum(TransactionType, name="transaction_type", create_type=True), primary_key=True)
+    total: Mapped[Decimal] = mapped_column(Numeric(18, 2), nullable=False, server_default=text("0"))
+    transaction_count: Mapped[int] = mapped_column(Integer, nullable=False, server_default=text("0"))
@@ -0,0 +1,21 @@
+import uuid
+from uuid import UUID
+
+from app.db.base_class import Base
+from app.models.mixin.timestamp import TimestampMixin
+from sqlalchemy import ForeignKey, String
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+class CategoryRule(Base, TimestampMixin):
+    """
+    Auto-categorization rule: an imported transaction whose merchant or
+    description contains `keyword` (case-insensitive) gets `category_id`.
+    `user_id` is null for global rules, which apply to every user.
+    """
+    __tablename__ = "category_rules"
+
+    id: Mapped[UUID] = mapped_column(PG_UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, nullable=False)
+    user_id: Mapped[UUID | None] = mapped_column(ForeignKey("users.id"), nullable=True, index=True)
+    category_id: Mapped[UUID] = mapped_column(ForeignKey("categories.id", ondelete="CASCADE"), nullable=False, index=True)
+    keyword: Mapped[str] = mapped_column(String(100), nullable=False)
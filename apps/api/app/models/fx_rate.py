@@ -0,0 +1,19 @@
+from datetime import date
+from decimal import Decimal
+
+from app.db.base_class import Base
+from app.models.mixin.timestamp import TimestampMixin
+from sqlalchemy import Date, Numeric, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+class FxRate(Base, TimestampMixin):
+    """
+    1 unit of `base` = `rate` units of `quote`, as published for `date`.
+    A lookup for any day uses the latest rate on or before it.
+    """
+    __tablename__ = "fx_rates"
+
+    base: Mapped[str] = mapped_column(String(3), primary_key=True)
+    quote: Mapped[str] = mapped_column(String(3), primary_key=True)
+    date: Mapped[date] = mapped_column(Date, primary_key=True)
+    rate: Mapped[Decimal] = mapped_column(Numeric(20, 10), nullable=False)
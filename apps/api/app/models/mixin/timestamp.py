@@ -1,16 +1,23 @@
 from datetime import datetime, timezone
 from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy import text, DateTime, func
+from sqlalchemy.dialects import sqlite
+
+# SQLite's CURRENT_TIMESTAMP has second precision; store bound values the same
+# way so keyset comparisons on timestamps behave like they do on Postgres.
+TimestampType = DateTime(timezone=True).with_variant(
+    sqlite.DATETIME(truncate_microseconds=True), "sqlite"
+)
 
 class TimestampMixin:
     created_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True),
+        TimestampType,
         nullable=False,
         server_default=func.now(),
     )
 
     updated_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True),
+        TimestampType,
         nullable=False,
         server_default=func.now(),
         onupdate=func.now(),
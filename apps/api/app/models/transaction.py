@@ -7,12 +7,19 @@ from typing import Any
 
 from app.db.base_class import Base
 from app.models.mixin.timestamp import TimestampMixin
-from sqlalchemy import String, Numeric, Enum as SAEnum, Index, UniqueConstraint
-from sqlalchemy import ForeignKey
+from sqlalchemy import String, Numeric, Enum as SAEnum, Index, UniqueConstraint, JSON
+from sqlalchemy import DDL, ForeignKey, event, text
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.dialects.postgresql import TIMESTAMP, JSONB
 
+# Searched text of a transaction. Postgres only uses the GIN index when a query
+# repeats this exact expression, so the search service selects it verbatim.
+SEARCH_DOCUMENT_SQL = (
+    "to_tsvector('simple', coalesce(description, '') || ' ' || coalesce(merchant, '') "
+    "|| ' ' || coalesce(notes, ''))"
+)
+
 class TransactionType(str, Enum):
     income = "income"
     expense = "expense"
@@ -24,24 +31,64 @@ class TransactionSource(str, Enum):
 class Transaction(Base, TimestampMixin):
     __tablename__ = "transactions"
 
-    id: Mapped[UUID] = mapped_column(PG_UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, nullable=False)
-    user_id: Mapped[UUID] = mapped_column(ForeignKey("users.id"), nullable=False)
-    account_id: Mapped[UUID] = mapped_column(ForeignKey("accounts.id"), nullable=False)
-    category_id: Mapped[UUID | None] = mapped_column(ForeignKey("categories.id"), nullable=True)
-    transfer_group_id: Mapped[UUID | None] = mapped_column(PG_UUID(as_uuid=True), nullable=True, index=True)
-    type: Mapped[TransactionType] = mapped_column(SAEnum(TransactionType,name="transaction_type", create_type=True), nullable=False)  # income, expense
-    amount: Mapped[Decimal] = mapped_column(Numeric(18, 2), nullable=False)
-    date: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), nullable=False)
+    # Postgres partitions the table by `date` (see app.db.partitions), and a
+    # partitioned table's unique keys must include it: hence (id, date) and
+    # (user_id, hash_dedupe, date). `id` alone matches bulk-insert RETURNING rows;
+    # (user_id, hash_dedupe) alone is kept unique by TransactionDedupeKey.
+    id: Mapped[UUID] = mapped_column(PG_UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, nullable=False, insert_sentinel=True)
+    user_id: Mapped[UUID] = mapped_column(ForeignKey("users.id"), nullable=False, active_history=True)
+    account_id: Mapped[UUID] = mapped_column(ForeignKey("accounts.id"), nullable=False, active_history=True)
+    category_id: Mapped[UUID | None] = mapped_column(ForeignKey("categories.id"), nullable=True, active_history=True)
+    transfer_group_id: Mapped[UUID | None] = mapped_column(PG_UUID(as_uuid=True), nullable=True, index=True, active_history=True)
+    type: Mapped[TransactionType] = mapped_column(SAEnum(TransactionType,name="transaction_type", create_type=True), nullable=False, active_history=True)  # income, expense
+    amount: Mapped[Decimal] = mapped_column(Numeric(18, 2), nullable=False, active_history=True)  # old values feed balance/rollup deltas
+    date: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), primary_key=True, nullable=False, active_history=True)
     description: Mapped[str | None] = mapped_column(String(255), nullable=True)
     merchant: Mapped[str | None] = mapped_column(String(100), nullable=True)
     notes: Mapped[str | None] = mapped_column(String(500), nullable=True)
     source: Mapped[TransactionSource] = mapped_column(SAEnum(TransactionSource, name="transaction_source", create_type=True), nullable=False)  # e.g., 'manual', 'imported', etc.
     external_id: Mapped[str | None] = mapped_column(String(100), nullable=True)  # ID from external systems if applicable
-    raw_payload: Mapped[dict[str, Any] | None] = mapped_column(JSONB, nullable=True)  # Store raw JSON or data from external sources
+    raw_payload: Mapped[dict[str, Any] | None] = mapped_column(JSONB().with_variant(JSON(), "sqlite"), nullable=True)  # Store raw JSON or data from external sources
     hash_dedupe: Mapped[str | None] = mapped_column(String(64), nullable=True, index=True)  # SHA-256 hash for deduplication
     
     __table_args__ = (
         Index('ix_transactions_user_date', 'user_id', 'date'),
         Index('ix_transactions_account_date', 'account_id', 'date'),
-        UniqueConstraint('user_id','hash_dedupe', name='uq_transactions_user_hash_dedupe'),
-    )
\ No newline at end of file
+        UniqueConstraint('user_id','hash_dedupe', 'date', name='uq_transactions_user_hash_dedupe_date'),
+        Index('ix_transactions_search', text(SEARCH_DOCUMENT_SQL), postgresql_using='gin').ddl_if(dialect='postgresql'),
+        Index('ix_transactions_merchant_trgm', 'merchant', postgresql_using='gin',
+              postgresql_ops={'merchant': 'gin_trgm_ops'}).ddl_if(dialect='postgresql'),  # fuzzy merchant search
+        {'postgresql_partition_by': 'RANGE (date)'},
+    )
+
+    # The ORM identifies a transaction by id alone; `date` is in the table's
+    # primary key only because Postgres requires it.
+    __mapper_args__ = {'primary_key': [id]}
+
+# Full-text search (see app.services.transaction_search). SQLite (tests, local
+# runs) gets an external-content FTS5 table kept in sync by triggers instead.
+FTS_TABLE = "transactions_fts"
+_FTS_COLUMNS = "description, merchant, notes"
+for statement in (
+    f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5({_FTS_COLUMNS}, content='transactions', "
+    f"content_rowid='rowid', tokenize='unicode61 remove_diacritics 2')",
+    f"CREATE TRIGGER {FTS_TABLE}_insert AFTER INSERT ON transactions BEGIN "
+    f"INSERT INTO {FTS_TABLE}(rowid, {_FTS_COLUMNS}) VALUES (new.rowid, new.description, new.merchant, new.notes); END",
+    f"CREATE TRIGGER {FTS_TABLE}_delete AFTER DELETE ON transactions BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {_FTS_COLUMNS}) "
+    f"VALUES ('delete', old.rowid, old.description, old.merchant, old.notes); END",
+    f"CREATE TRIGGER {FTS_TABLE}_update AFTER UPDATE OF {_FTS_COLUMNS} ON transactions BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {_FTS_COLUMNS}) "
+    f"VALUES ('delete', old.rowid, old.description, old.merchant, old.notes); "
+    f"INSERT INTO {FTS_TABLE}(rowid, {_FTS_COLUMNS}) VALUES (new.rowid, new.description, new.merchant, new.notes); END",
+):
+    event.listen(Transaction.__table__, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+event.listen(Transaction.__table__, "before_drop", DDL(f"DROP TABLE IF EXISTS {FTS_TABLE}").execute_if(dialect="sqlite"))
+# Monthly partitions are added by app.db.partitions.ensure_partitions; until
+# then (and for rows outside every partition) inserts land here.
+event.listen(
+    Transaction.__table__,
+    "after_create",
+    DDL("CREATE TABLE transactions_default PARTITION OF transactions DEFAULT").execute_if(dialect="postgresql"),
+)
+event.listen(Base.metadata, "before_create", DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"))
@@ -0,0 +1,31 @@
+from uuid import UUID
+from typing import Any
+
+from app.db.base_class import Base
+from app.models.transaction import Transaction
+from sqlalchemy import Connection, String, delete, event
+from sqlalchemy import ForeignKey
+from sqlalchemy.orm import Mapped, mapped_column
+
+class TransactionDedupeKey(Base):
+    """
+    Every hash_dedupe a user's transactions carry, unique per user across all
+    dates. `transactions` is partitioned by date, so its own unique key has to
+    include the date; this table is what still skips a re-exported line whose
+    posting date changed (same external_id). app.services.transaction_import
+    claims a key here before inserting its row.
+    """
+    __tablename__ = "transaction_dedupe_keys"
+
+    user_id: Mapped[UUID] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    hash_dedupe: Mapped[str] = mapped_column(String(64), primary_key=True)
+
+def _release_key(mapper: Any, connection: Connection, target: Transaction) -> None:
+    # A deleted line can be imported again.
+    if target.hash_dedupe is not None:
+        connection.execute(delete(TransactionDedupeKey).where(
+            TransactionDedupeKey.user_id == target.user_id,
+            TransactionDedupeKey.hash_dedupe == target.hash_dedupe,
+        ))
+
+event.listen(Transaction, "after_delete", _release_key)
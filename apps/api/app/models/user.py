@@ -3,7 +3,7 @@ from uuid import UUID
 
 from app.db.base_class import Base
 from app.models.mixin.timestamp import TimestampMixin
-from sqlalchemy import String
+from sqlalchemy import String, Index
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -16,4 +16,10 @@ class User(Base, TimestampMixin):
     username: Mapped[str] = mapped_column(String(32), unique=True, nullable=False, index=True)
     email: Mapped[str] = mapped_column(String(50), unique=True, nullable=False, index=True)
     password_hash: Mapped[str] = mapped_column(String(255), nullable=False)
-    
\ No newline at end of file
+
+    __table_args__ = (
+        Index('ix_users_created_at_id', 'created_at', 'id'),  # keyset pagination order
+        Index('ix_users_updated_at', 'updated_at'),  # max(updated_at) for the listing's ETag
+        Index('ix_users_username_prefix', 'username', postgresql_ops={'username': 'varchar_pattern_ops'}),
+        Index('ix_users_email_prefix', 'email', postgresql_ops={'email': 'varchar_pattern_ops'}),
+    )
@@ -0,0 +1,51 @@
+from datetime import date
+from typing import List, Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, Query, status
+from sqlalchemy.orm import Session
+
+from app.core.deps import get_read_db
+from app.core.openapi import COMMON_ERROR_RESPONSES
+from app.schemas.account import AccountBalanceRead, NetWorth
+from app.services.balance import BalanceService
+from app.services.fx import FxService
+
+router = APIRouter(
+    prefix="/users/{user_id}/accounts",
+    tags=["accounts"],
+    responses = COMMON_ERROR_RESPONSES
+)
+
+@router.get(
+    "/net-worth",
+    response_model=NetWorth,
+    status_code=status.HTTP_200_OK
+)
+def get_net_worth(
+    user_id: UUID,
+    currency: str = Query(..., pattern="^[A-Za-z]{3}$"),
+    on: Optional[date] = Query(None, description="Rate date; defaults to today."),
+    db: Session = Depends(get_read_db)
+) -> NetWorth:
+    """
+    All account balances converted to one currency and totalled.
+    Uses the latest FX rate on or before `on` for each currency.
+    """
+    return FxService.net_worth(db=db, user_id=user_id, currency=currency, on=on)
+
+@router.get(
+    "/{account_id}/balance",
+    response_model=List[AccountBalanceRead],
+    status_code=status.HTTP_200_OK
+)
+def get_account_balance(
+    user_id: UUID,
+    account_id: UUID,
+    db: Session = Depends(get_read_db)
+) -> List[AccountBalanceRead]:
+    """
+    Current balance of an account, one entry per currency.
+    Read from the stored running balance, not summed from transactions.
+    """
+    return BalanceService.get_balances(db=db, user_id=user_id, account_id=account_id)
@@ -0,0 +1,85 @@
+from typing import List
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, Request, Response, status
+from sqlalchemy.orm import Session
+
+from app.core.conditional import check_not_modified
+from app.core.deps import get_db, get_read_db
+from app.core.openapi import COMMON_ERROR_RESPONSES
+from app.core.serialization import fast_response
+from app.schemas.category import CategoryCreate, CategoryRead, CategoryUpdate
+from app.services.category import CategoryService
+
+router = APIRouter(
+    prefix="/users/{user_id}/categories",
+    tags=["categories"],
+    responses = COMMON_ERROR_RESPONSES
+)
+
+@router.get(
+    "",
+    response_model=List[CategoryRead],
+    status_code=status.HTTP_200_OK
+)
+def list_categories(
+    user_id: UUID,
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_read_db)
+) -> List[CategoryRead]:
+    """
+    Global categories plus the user's own, served from the category cache
+    once one query has checked it is current. Answers If-None-Match with 304
+    (see app.core.conditional).
+    """
+    not_modified = check_not_modified(request, response, CategoryService.list_categories_version(db=db, user_id=user_id))
+    if not_modified is not None:
+        return not_modified
+    return fast_response(CategoryService.list_categories(db=db, user_id=user_id), headers=response.headers)
+
+@router.post(
+    "",
+    response_model=CategoryRead,
+    status_code=status.HTTP_201_CREATED
+)
+def create_category(
+    user_id: UUID,
+    payload: CategoryCreate,
+    db: Session = Depends(get_db)
+) -> CategoryRead:
+    """
+    Create a category owned by the user.
+    """
+    return CategoryService.create_category(db=db, user_id=user_id, name=payload.name)
+
+@router.patch(
+    "/{category_id}",
+    response_model=CategoryRead,
+    status_code=status.HTTP_200_OK
+)
+def rename_category(
+    user_id: UUID,
+    category_id: UUID,
+    payload: CategoryUpdate,
+    db: Session = Depends(get_db)
+) -> CategoryRead:
+    """
+    Rename one of the user's categories (global ones are read-only).
+    """
+    return CategoryService.rename_category(db=db, user_id=user_id, category_id=category_id, name=payload.name)
+
+@router.delete(
+    "/{category_id}",
+    status_code=status.HTTP_204_NO_CONTENT
+)
+def delete_category(
+    user_id: UUID,
+    category_id: UUID,
+    db: Session = Depends(get_db)
+) -> Response:
+    """
+    Delete one of the user's categories; refused while transactions use it.
+    """
+    CategoryService.delete_category(db=db, user_id=user_id, category_id=category_id)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
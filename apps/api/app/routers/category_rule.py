@@ -0,0 +1,61 @@
+from typing import List
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, Response, status
+from sqlalchemy.orm import Session
+
+from app.core.deps import get_db, get_read_db
+from app.core.openapi import COMMON_ERROR_RESPONSES
+from app.schemas.category import CategoryRuleCreate, CategoryRuleRead
+from app.services.categorization import CategoryRuleService
+
+router = APIRouter(
+    prefix="/users/{user_id}/category-rules",
+    tags=["categories"],
+    responses = COMMON_ERROR_RESPONSES
+)
+
+@router.get(
+    "",
+    response_model=List[CategoryRuleRead],
+    status_code=status.HTTP_200_OK
+)
+def list_rules(
+    user_id: UUID,
+    db: Session = Depends(get_read_db)
+) -> List[CategoryRuleRead]:
+    """
+    Global categorization rules plus the user's own.
+    """
+    return CategoryRuleService.list_rules(db=db, user_id=user_id)
+
+@router.post(
+    "",
+    response_model=CategoryRuleRead,
+    status_code=status.HTTP_201_CREATED
+)
+def create_rule(
+    user_id: UUID,
+    payload: CategoryRuleCreate,
+    db: Session = Depends(get_db)
+) -> CategoryRuleRead:
+    """
+    Imported transactions whose merchant or description contains the
+    keyword are put in the category (a global one or the user's own).
+    """
+    return CategoryRuleService.create_rule(db=db, user_id=user_id, data=payload)
+
+@router.delete(
+    "/{rule_id}",
+    status_code=status.HTTP_204_NO_CONTENT
+)
+def delete_rule(
+    user_id: UUID,
+    rule_id: UUID,
+    db: Session = Depends(get_db)
+) -> Response:
+    """
+    Delete one of the user's rules (global ones are read-only).
+    """
+    CategoryRuleService.delete_rule(db=db, user_id=user_id, rule_id=rule_id)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -0,0 +1,98 @@
+from datetime import date
+from typing import Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, Query, status
+from sqlalchemy.orm import Session
+
+from app.core.deps import get_read_db
+from app.core.openapi import COMMON_ERROR_RESPONSES
+from app.models.transaction import TransactionType
+from app.schemas.analytics import CashFlowReport, RollingAverageReport, TopMerchantsReport
+from app.schemas.report import CategoryReport
+from app.services.analytics import AnalyticsService, Granularity
+from app.services.rollup import RollupService
+
+router = APIRouter(
+    prefix="/users/{user_id}/reports",
+    tags=["reports"],
+    responses = COMMON_ERROR_RESPONSES
+)
+
+@router.get(
+    "/by-category",
+    response_model=CategoryReport,
+    status_code=status.HTTP_200_OK
+)
+def get_category_report(
+    user_id: UUID,
+    from_month: date = Query(..., alias="from", description="Any day of the first month."),
+    to_month: date = Query(..., alias="to", description="Any day of the last month."),
+    type: Optional[TransactionType] = Query(None),
+    by_month: bool = Query(False, description="Break totals down per month."),
+    db: Session = Depends(get_read_db)
+) -> CategoryReport:
+    """
+    Totals per category over a range of months, read from the monthly
+    rollups (never from `transactions`).
+    """
+    return RollupService.category_report(
+        db=db,
+        user_id=user_id,
+        from_month=from_month,
+        to_month=to_month,
+        type=type,
+        by_month=by_month,
+    )
+
+@router.get(
+    "/cash-flow",
+    response_model=CashFlowReport,
+    status_code=status.HTTP_200_OK
+)
+def get_cash_flow(
+    user_id: UUID,
+    start: Optional[date] = Query(None, alias="from"),
+    end: Optional[date] = Query(None, alias="to"),
+    granularity: Granularity = Query(Granularity.month),
+    db: Session = Depends(get_read_db)
+) -> CashFlowReport:
+    """
+    Income vs. expense per day, week or month, with the running net.
+    """
+    return AnalyticsService.cash_flow(db=db, user_id=user_id, start=start, end=end, granularity=granularity)
+
+@router.get(
+    "/rolling-average",
+    response_model=RollingAverageReport,
+    status_code=status.HTTP_200_OK
+)
+def get_rolling_average(
+    user_id: UUID,
+    start: Optional[date] = Query(None, alias="from"),
+    end: Optional[date] = Query(None, alias="to"),
+    window: int = Query(30, ge=1, le=366, description="Window size in days."),
+    db: Session = Depends(get_read_db)
+) -> RollingAverageReport:
+    """
+    Daily net flow with its trailing average over `window` days.
+    """
+    return AnalyticsService.rolling_average(db=db, user_id=user_id, start=start, end=end, window=window)
+
+@router.get(
+    "/top-merchants",
+    response_model=TopMerchantsReport,
+    status_code=status.HTTP_200_OK
+)
+def get_top_merchants(
+    user_id: UUID,
+    start: Optional[date] = Query(None, alias="from"),
+    end: Optional[date] = Query(None, alias="to"),
+    limit: int = Query(10, ge=1, le=100),
+    type: TransactionType = Query(TransactionType.expense),
+    db: Session = Depends(get_read_db)
+) -> TopMerchantsReport:
+    """
+    Merchants with the largest totals in the range.
+    """
+    return AnalyticsService.top_merchants(db=db, user_id=user_id, start=start, end=end, limit=limit, type=type)
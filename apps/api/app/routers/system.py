@@ -0,0 +1,45 @@
+from typing import List
+
+from fastapi import APIRouter, Response, status
+
+from app.core.cache import CACHES
+from app.core.metrics import REGISTRY
+from app.db.session import update_pool_gauges
+from app.schemas.system import CacheStats
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+router = APIRouter(
+    prefix="/system",
+    tags=["system"],
+)
+
+# Served at the root (no /api/v1 prefix), where scrapers look by default.
+metrics_router = APIRouter(tags=["system"])
+
+@router.get(
+    "/caches",
+    response_model=List[CacheStats],
+    status_code=status.HTTP_200_OK
+)
+def get_cache_stats() -> List[CacheStats]:
+    """
+    Per-process cache counters, to size the caches (hit ratio vs entries).
+    """
+    return [
+        CacheStats(name=name, **{key: int(value) for key, value in cache.stats().items()})
+        for name, cache in sorted(CACHES.items())
+    ]
+
+@metrics_router.get(
+    "/metrics",
+    response_class=Response,
+    responses={200: {"content": {PROMETHEUS_CONTENT_TYPE: {}}}},
+)
+def get_metrics() -> Response:
+    """
+    Every metric of this process in the Prometheus text format: request
+    counts and latencies per route, DB pool usage, caches, hashing pool.
+    """
+    update_pool_gauges()
+    return Response(REGISTRY.render(), media_type=PROMETHEUS_CONTENT_TYPE)
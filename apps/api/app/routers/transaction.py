@@ -0,0 +1,145 @@
+from datetime import date
+from typing import AsyncIterator, Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, File, Form, Query, Request, UploadFile, status
+from sqlalchemy.orm import Session
+
+from app.core.admission import AdmissionLimiter
+from app.core.config import settings
+from app.core.deps import get_db, get_read_db
+from app.core.idempotency import IdempotentRoute
+from app.core.openapi import COMMON_ERROR_RESPONSES
+from app.exceptions.statement import UnsupportedStatementFormatError
+from app.schemas.transaction import (
+    StatementImportResult,
+    TransactionImportRequest,
+    TransactionImportResult,
+    TransactionSearchPage,
+)
+from app.services.statement_import import (
+    CsvLayout,
+    StatementFormat,
+    StatementImportService,
+    detect_format,
+)
+from app.services.transaction_import import ImportRow, TransactionImportService
+from app.services.transaction_search import TransactionSearchService
+
+router = APIRouter(
+    prefix="/users/{user_id}/transactions",
+    tags=["transactions"],
+    responses = COMMON_ERROR_RESPONSES,
+    route_class=IdempotentRoute,
+)
+
+# JSON and statement imports share one set of slots and buckets.
+import_admission = AdmissionLimiter(
+    "transactions.import",
+    max_concurrency=settings.admission_import_concurrency,
+    rate=settings.admission_import_rate,
+    burst=settings.admission_import_burst,
+)
+
+# Both declare their route's required parameters so FastAPI validates them
+# first: a malformed import costs no token (see app.core.admission).
+async def admit_import(request: Request, payload: TransactionImportRequest) -> AsyncIterator[None]:
+    async with import_admission.admit(request):
+        yield
+
+async def admit_statement_import(
+    request: Request,
+    account_id: UUID = Form(...),
+    file: UploadFile = File(...),
+) -> AsyncIterator[None]:
+    async with import_admission.admit(request):
+        yield
+
+@router.post(
+    "/import",
+    response_model=TransactionImportResult,
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(admit_import, scope="function")],
+)
+def import_transactions(
+    user_id: UUID,
+    payload: TransactionImportRequest,
+    db: Session = Depends(get_db)
+) -> TransactionImportResult:
+    """
+    Bulk-import statement lines into an account.
+    Duplicates (same hash_dedupe for the user) are skipped and counted.
+    """
+    rows = (ImportRow(**row.model_dump()) for row in payload.rows)
+    return TransactionImportService.import_rows(
+        db=db,
+        user_id=user_id,
+        account_id=payload.account_id,
+        rows=rows,
+    )
+
+@router.post(
+    "/import/statement",
+    response_model=StatementImportResult,
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(admit_statement_import, scope="function")],
+)
+def import_statement(
+    user_id: UUID,
+    account_id: UUID = Form(...),
+    file: UploadFile = File(...),
+    statement_format: Optional[StatementFormat] = Form(None, alias="format"),
+    timezone: str = Form("UTC"),
+    delimiter: str = Form(",", min_length=1, max_length=1),
+    date_format: Optional[str] = Form(None),
+    decimal_comma: bool = Form(False),
+    db: Session = Depends(get_db)
+) -> StatementImportResult:
+    """
+    Upload a bank statement (CSV, OFX or CAMT.053) and import its lines.
+    The file is parsed as a stream; format defaults to the file extension.
+    """
+    statement_format = statement_format or detect_format(file.filename)
+    if statement_format is None:
+        raise UnsupportedStatementFormatError(meta={"filename": file.filename})
+    return StatementImportService.import_statement(
+        db=db,
+        user_id=user_id,
+        account_id=account_id,
+        stream=file.file,
+        statement_format=statement_format,
+        timezone_name=timezone,
+        csv_layout=CsvLayout(
+            delimiter=delimiter,
+            date_format=date_format,
+            decimal_comma=decimal_comma,
+        ),
+    )
+
+@router.get(
+    "/search",
+    response_model=TransactionSearchPage,
+    status_code=status.HTTP_200_OK
+)
+def search_transactions(
+    user_id: UUID,
+    q: str = Query(..., min_length=1, max_length=200, description="Words to find in description, merchant or notes."),
+    date_from: Optional[date] = Query(None, alias="from"),
+    date_to: Optional[date] = Query(None, alias="to"),
+    limit: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="`next_cursor` of the previous page."),
+    db: Session = Depends(get_read_db)
+) -> TransactionSearchPage:
+    """
+    Search the user's transactions, best matches first. Merchant names also
+    match approximately (typos, partial names).
+    """
+    return TransactionSearchService.search(
+        db=db,
+        user_id=user_id,
+        q=q,
+        date_from=date_from,
+        date_to=date_to,
+        limit=limit,
+        cursor=cursor,
+    )
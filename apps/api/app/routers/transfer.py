@@ -0,0 +1,49 @@
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, status
+from sqlalchemy.orm import Session
+
+from app.core.deps import get_db
+from app.core.idempotency import IdempotentRoute
+from app.core.openapi import COMMON_ERROR_RESPONSES
+from app.schemas.transfer import TransferBatchRequest, TransferBatchResult, TransferCreate, TransferRead
+from app.services.transfer import TransferService
+
+router = APIRouter(
+    prefix="/users/{user_id}/transfers",
+    tags=["transfers"],
+    responses = COMMON_ERROR_RESPONSES,
+    route_class=IdempotentRoute,
+)
+
+@router.post(
+    "",
+    response_model=TransferRead,
+    status_code=status.HTTP_201_CREATED
+)
+def create_transfer(
+    user_id: UUID,
+    payload: TransferCreate,
+    db: Session = Depends(get_db)
+) -> TransferRead:
+    """
+    Move money between two of the user's accounts (same currency).
+    Both legs are written in one DB transaction.
+    """
+    return TransferService.create_transfer(db=db, user_id=user_id, data=payload)
+
+@router.post(
+    "/batch",
+    response_model=TransferBatchResult,
+    status_code=status.HTTP_200_OK
+)
+def create_transfers(
+    user_id: UUID,
+    payload: TransferBatchRequest,
+    db: Session = Depends(get_db)
+) -> TransferBatchResult:
+    """
+    Post up to 1000 transfers in one request. Each result carries its index;
+    a failed transfer does not stop the others.
+    """
+    return TransferService.create_transfers(db=db, user_id=user_id, transfers=payload.transfers)
@@ -1,22 +1,59 @@
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Header, Query, Request, Response, status
 from sqlalchemy.orm import Session
-from typing import List 
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import AsyncIterator, Optional
 
-from app.core.deps import get_db
+from app.core.admission import AdmissionLimiter
+from app.core.conditional import check_not_modified
+from app.core.config import settings
+from app.core.deps import get_async_db, get_async_read_db, get_db, get_read_db
+from app.core.export import (
+    EXPORT_RESPONSES,
+    ExportFormat,
+    aiter_export,
+    export_response,
+    iter_export,
+    negotiate_export_format,
+)
+from app.core.idempotency import IdempotentRoute
 from app.core.openapi import COMMON_ERROR_RESPONSES
-from app.schemas.user import (UserCreate, UserRead)
-from app.services.user import UserService
+from app.core.serialization import fast_response
+from app.schemas.user import (UserCreate, UserRead, UserPage)
+from app.services.user import UserService, AsyncUserService
 
 router = APIRouter(
     prefix="/users",
     tags=["users"],
-    responses = COMMON_ERROR_RESPONSES
+    responses = COMMON_ERROR_RESPONSES,
+    route_class=IdempotentRoute,
+)
+
+# Signups are bounded by Argon2 CPU time: shared by both routers' create routes.
+signup_admission = AdmissionLimiter(
+    "users.create",
+    max_concurrency=settings.admission_signup_concurrency,
+    rate=settings.admission_signup_rate,
+    burst=settings.admission_signup_burst,
+)
+
+async def admit_signup(request: Request, payload: UserCreate) -> AsyncIterator[None]:
+    # Declares the body so FastAPI validates it first: a malformed signup costs no token.
+    async with signup_admission.admit(request):
+        yield
+
+# Same contract as `router`, served from the AsyncEngine (DB_ASYNC=true).
+async_router = APIRouter(
+    prefix="/users",
+    tags=["users"],
+    responses = COMMON_ERROR_RESPONSES,
+    route_class=IdempotentRoute,
 )
 
 @router.post(
     "",
     response_model=UserRead,
-    status_code=status.HTTP_201_CREATED
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(admit_signup, scope="function")],
 )
 def create_user(
     payload: UserCreate,
@@ -30,14 +67,94 @@ def create_user(
 
 @router.get(
     "",
-    response_model=List[UserRead],
-    status_code=status.HTTP_200_OK
+    response_model=UserPage,
+    status_code=status.HTTP_200_OK,
+    responses=EXPORT_RESPONSES,
 )
 def get_users(
-    db: Session = Depends(get_db)
-) -> List[UserRead]:
+    request: Request,
+    response: Response,
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = Query(None, description="`next_cursor` of the previous page."),
+    username_prefix: Optional[str] = Query(None, min_length=1, max_length=32),
+    email_prefix: Optional[str] = Query(None, min_length=1, max_length=50),
+    export_format: Optional[ExportFormat] = Query(None, alias="format"),
+    accept: Optional[str] = Header(None),
+    db: Session = Depends(get_read_db)
+) -> UserPage:
+    """
+    Retrieve users one page at a time, ordered by creation date.
+    With `format=ndjson|csv` (or a matching Accept header) every matching
+    user is streamed instead, ignoring `limit` and `cursor`. Pages answer
+    If-None-Match with 304 (see app.core.conditional).
+    """
+    export_format = negotiate_export_format(export_format, accept)
+    if export_format is not None:
+        batches = UserService.iter_users(db=db, username_prefix=username_prefix, email_prefix=email_prefix)
+        return export_response(iter_export(batches, UserRead, export_format), export_format, "users")
+    version = UserService.get_users_version(db=db, username_prefix=username_prefix, email_prefix=email_prefix)
+    not_modified = check_not_modified(request, response, version)
+    if not_modified is not None:
+        return not_modified
+    return fast_response(UserService.get_users(
+        db=db,
+        limit=limit,
+        cursor=cursor,
+        username_prefix=username_prefix,
+        email_prefix=email_prefix,
+    ), headers=response.headers)
+
+@async_router.post(
+    "",
+    response_model=UserRead,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(admit_signup, scope="function")],
+)
+async def create_user_async(
+    payload: UserCreate,
+    db: AsyncSession = Depends(get_async_db)
+) -> UserRead:
+    """
+    Create a new user.
+    """
+    return await AsyncUserService.create_user(db=db, data=payload)
+
+@async_router.get(
+    "",
+    response_model=UserPage,
+    status_code=status.HTTP_200_OK,
+    responses=EXPORT_RESPONSES,
+)
+async def get_users_async(
+    request: Request,
+    response: Response,
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = Query(None, description="`next_cursor` of the previous page."),
+    username_prefix: Optional[str] = Query(None, min_length=1, max_length=32),
+    email_prefix: Optional[str] = Query(None, min_length=1, max_length=50),
+    export_format: Optional[ExportFormat] = Query(None, alias="format"),
+    accept: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_read_db)
+) -> UserPage:
     """
-    Retrieve all users.
+    Retrieve users one page at a time, ordered by creation date.
+    With `format=ndjson|csv` (or a matching Accept header) every matching
+    user is streamed instead, ignoring `limit` and `cursor`. Pages answer
+    If-None-Match with 304 (see app.core.conditional).
     """
-    return UserService.get_users(db=db)
+    export_format = negotiate_export_format(export_format, accept)
+    if export_format is not None:
+        batches = AsyncUserService.iter_users(db=db, username_prefix=username_prefix, email_prefix=email_prefix)
+        return export_response(aiter_export(batches, UserRead, export_format), export_format, "users")
+    version = await AsyncUserService.get_users_version(db=db, username_prefix=username_prefix, email_prefix=email_prefix)
+    not_modified = check_not_modified(request, response, version)
+    if not_modified is not None:
+        return not_modified
+    return fast_response(await AsyncUserService.get_users(
+        db=db,
+        limit=limit,
+        cursor=cursor,
+        username_prefix=username_prefix,
+        email_prefix=email_prefix,
+    ), headers=response.headers)
 
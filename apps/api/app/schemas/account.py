@@ -0,0 +1,39 @@
+from decimal import Decimal
+from datetime import date, datetime
+from typing import List, Optional
+from uuid import UUID
+
+from pydantic import BaseModel, ConfigDict
+
+class AccountBalanceRead(BaseModel):
+    """
+    Docstring para AccountBalanceRead
+    Stored balance of an account in one currency (income minus expenses).
+    """
+    account_id: UUID
+    currency: str
+    balance: Decimal
+    transaction_count: int
+    updated_at: Optional[datetime] = None
+    model_config = ConfigDict(from_attributes=True)
+
+class NetWorthAccount(BaseModel):
+    """
+    Docstring para NetWorthAccount
+    One account balance and its value in the requested currency.
+    """
+    account_id: UUID
+    name: str
+    currency: str
+    balance: Decimal
+    converted: Decimal
+
+class NetWorth(BaseModel):
+    """
+    Docstring para NetWorth
+    Total of every account balance converted to one currency.
+    """
+    currency: str
+    on: date
+    total: Decimal
+    accounts: List[NetWorthAccount]
@@ -0,0 +1,61 @@
+from decimal import Decimal
+from datetime import date
+from typing import List
+
+from pydantic import BaseModel
+
+from app.models.transaction import TransactionType
+
+class CashFlowPoint(BaseModel):
+    """
+    Docstring para CashFlowPoint
+    Flows of one period; `period` is its first day.
+    """
+    period: date
+    income: Decimal
+    expense: Decimal
+    net: Decimal
+    cumulative_net: Decimal
+
+class CashFlowReport(BaseModel):
+    """
+    Docstring para CashFlowReport
+    Income vs. expense per period, with the running net (cash-flow curve).
+    """
+    granularity: str
+    points: List[CashFlowPoint]
+
+class RollingAveragePoint(BaseModel):
+    """
+    Docstring para RollingAveragePoint
+    Net flow of one day and the trailing average ending on it.
+    """
+    day: date
+    net: Decimal
+    rolling_average: Decimal
+    transaction_count: int
+
+class RollingAverageReport(BaseModel):
+    """
+    Docstring para RollingAverageReport
+    Daily net flow with a trailing `window`-day average.
+    """
+    window: int
+    points: List[RollingAveragePoint]
+
+class MerchantTotal(BaseModel):
+    """
+    Docstring para MerchantTotal
+    Total amount and count for one merchant.
+    """
+    merchant: str
+    total: Decimal
+    transaction_count: int
+
+class TopMerchantsReport(BaseModel):
+    """
+    Docstring para TopMerchantsReport
+    Merchants ranked by total, largest first.
+    """
+    type: TransactionType
+    items: List[MerchantTotal]
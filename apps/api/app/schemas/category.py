@@ -0,0 +1,48 @@
+from typing import Optional
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+from app.schemas.timeStamp import TimeStampBase
+
+class CategoryCreate(BaseModel):
+    """
+    Docstring para CategoryCreate
+    Used for creating a user category.
+    """
+    name: str = Field(..., min_length=1, max_length=50)
+
+class CategoryUpdate(BaseModel):
+    """
+    Docstring para CategoryUpdate
+    Used for renaming a user category.
+    """
+    name: str = Field(..., min_length=1, max_length=50)
+
+class CategoryRead(TimeStampBase):
+    """
+    Docstring para CategoryRead
+    A category; `user_id` is null for global (template) categories.
+    """
+    id: UUID
+    user_id: Optional[UUID] = None
+    name: str
+
+class CategoryRuleCreate(BaseModel):
+    """
+    Docstring para CategoryRuleCreate
+    Imported transactions whose merchant or description contains `keyword`
+    (case-insensitive) get `category_id`.
+    """
+    keyword: str = Field(..., min_length=1, max_length=100)
+    category_id: UUID
+
+class CategoryRuleRead(TimeStampBase):
+    """
+    Docstring para CategoryRuleRead
+    A categorization rule; `user_id` is null for global rules.
+    """
+    id: UUID
+    user_id: Optional[UUID] = None
+    category_id: UUID
+    keyword: str
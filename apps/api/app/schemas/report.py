@@ -0,0 +1,30 @@
+from decimal import Decimal
+from datetime import date
+from typing import List, Optional
+from uuid import UUID
+
+from pydantic import BaseModel
+
+from app.models.transaction import TransactionType
+
+class CategoryReportRow(BaseModel):
+    """
+    Docstring para CategoryReportRow
+    Total of one category and type; `month` is set only for monthly reports
+    and `category_id`/`category_name` are null for uncategorized transactions.
+    """
+    month: Optional[date] = None
+    category_id: Optional[UUID] = None
+    category_name: Optional[str] = None
+    type: TransactionType
+    total: Decimal
+    transaction_count: int
+
+class CategoryReport(BaseModel):
+    """
+    Docstring para CategoryReport
+    Spending/income by category between two months, both inclusive.
+    """
+    from_month: date
+    to_month: date
+    items: List[CategoryReportRow]
@@ -0,0 +1,13 @@
+from pydantic import BaseModel
+
+class CacheStats(BaseModel):
+    """
+    Docstring para CacheStats
+    Size and hit/miss/eviction counters of one in-process cache, since start.
+    """
+    name: str
+    entries: int
+    maxsize: int
+    hits: int
+    misses: int
+    evictions: int
@@ -0,0 +1,90 @@
+from decimal import Decimal
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+from app.models.transaction import TransactionType
+
+MAX_IMPORT_ROWS = 100_000
+
+class TransactionImportRow(BaseModel):
+    """
+    Docstring para TransactionImportRow
+    One statement line to import. Naive dates are taken as UTC.
+    """
+    type: TransactionType
+    amount: Decimal = Field(..., gt=0, max_digits=18, decimal_places=2)
+    date: datetime
+    description: Optional[str] = Field(None, max_length=255)
+    merchant: Optional[str] = Field(None, max_length=100)
+    notes: Optional[str] = Field(None, max_length=500)
+    external_id: Optional[str] = Field(None, max_length=100)
+    category_id: Optional[UUID] = None
+    raw_payload: Optional[Dict[str, Any]] = None
+
+class TransactionImportRequest(BaseModel):
+    """
+    Docstring para TransactionImportRequest
+    Rows to import into one account.
+    """
+    account_id: UUID
+    rows: List[TransactionImportRow] = Field(..., min_length=1, max_length=MAX_IMPORT_ROWS)
+
+class TransactionImportResult(BaseModel):
+    """
+    Docstring para TransactionImportResult
+    Outcome of an import: rows already present (same hash_dedupe) are skipped.
+    `categorized` counts received rows without a category that a
+    categorization rule assigned one to.
+    """
+    received: int
+    inserted: int
+    duplicates: int
+    categorized: int = 0
+
+class StageThroughput(BaseModel):
+    """
+    Docstring para StageThroughput
+    Items and time spent in one stage of the statement pipeline.
+    """
+    stage: str
+    items: int
+    seconds: float
+    items_per_second: Optional[float] = None
+
+class StatementImportResult(TransactionImportResult):
+    """
+    Docstring para StatementImportResult
+    Import outcome plus lines the parser rejected and per-stage throughput.
+    """
+    rejected: int = 0
+    errors: List[str] = Field(default_factory=list)
+    stages: List[StageThroughput] = Field(default_factory=list)
+
+class TransactionSearchHit(BaseModel):
+    """
+    Docstring para TransactionSearchHit
+    A transaction matching a search, with its relevance (higher is better).
+    """
+    id: UUID
+    account_id: UUID
+    category_id: Optional[UUID] = None
+    transfer_group_id: Optional[UUID] = None
+    type: TransactionType
+    amount: Decimal
+    date: datetime
+    description: Optional[str] = None
+    merchant: Optional[str] = None
+    notes: Optional[str] = None
+    rank: float
+
+class TransactionSearchPage(BaseModel):
+    """
+    Docstring para TransactionSearchPage
+    One page of search hits ordered by (rank, date, id), best first.
+    Pass `next_cursor` back as `cursor` with the same query for the next page.
+    """
+    items: List[TransactionSearchHit]
+    next_cursor: Optional[str] = None
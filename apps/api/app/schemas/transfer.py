@@ -0,0 +1,61 @@
+from decimal import Decimal
+from datetime import datetime
+from typing import List, Literal, Optional
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+from app.schemas.errors import ErrorResponse
+
+MAX_BATCH_TRANSFERS = 1000
+
+class TransferCreate(BaseModel):
+    """
+    Docstring para TransferCreate
+    Money moved between two of the user's accounts. Naive dates are taken as UTC.
+    """
+    from_account_id: UUID
+    to_account_id: UUID
+    amount: Decimal = Field(..., gt=0, max_digits=18, decimal_places=2)
+    date: datetime
+    description: Optional[str] = Field(None, max_length=255)
+    notes: Optional[str] = Field(None, max_length=500)
+
+class TransferRead(BaseModel):
+    """
+    Docstring para TransferRead
+    A posted transfer: the expense leg and the income leg share transfer_group_id.
+    """
+    transfer_group_id: UUID
+    from_account_id: UUID
+    to_account_id: UUID
+    amount: Decimal
+    date: datetime
+    expense_transaction_id: UUID
+    income_transaction_id: UUID
+
+class TransferBatchRequest(BaseModel):
+    """
+    Docstring para TransferBatchRequest
+    Transfers to post in one request.
+    """
+    transfers: List[TransferCreate] = Field(..., min_length=1, max_length=MAX_BATCH_TRANSFERS)
+
+class TransferBatchItem(BaseModel):
+    """
+    Docstring para TransferBatchItem
+    Outcome of one transfer of a batch, by its position in the request.
+    """
+    index: int
+    status: Literal["created", "failed"]
+    transfer: Optional[TransferRead] = None
+    error: Optional[ErrorResponse] = None
+
+class TransferBatchResult(BaseModel):
+    """
+    Docstring para TransferBatchResult
+    Outcome of a batch: failed transfers do not prevent the others from posting.
+    """
+    created: int
+    failed: int
+    results: List[TransferBatchItem]
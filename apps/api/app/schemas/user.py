@@ -1,4 +1,5 @@
 from pydantic import Field, EmailStr, BaseModel, ConfigDict
+from typing import List, Optional
 from uuid import UUID
 from datetime import datetime
 from app.schemas.timeStamp import TimeStampBase
@@ -25,3 +26,12 @@ class UserRead(TimeStampBase):
     lastname: str
     username: str
     email: str
+
+class UserPage(BaseModel):
+    """
+    One page of users ordered by (created_at, id).
+    Pass `next_cursor` back as `cursor` to fetch the following page;
+    it is null on the last page.
+    """
+    items: List[UserRead]
+    next_cursor: Optional[str] = None
@@ -0,0 +1,244 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date
+from decimal import Decimal
+from enum import Enum
+from typing import List, Optional, Tuple
+from uuid import UUID
+
+import numpy as np
+from sqlalchemy import BigInteger, Select, case, cast, func, select
+from sqlalchemy.orm import Session
+
+from app.db.partitions import day_bounds
+from app.exceptions.report import InvalidReportRangeError
+from app.models.transaction import Transaction, TransactionType
+from app.schemas.analytics import (
+    CashFlowPoint,
+    CashFlowReport,
+    MerchantTotal,
+    RollingAveragePoint,
+    RollingAverageReport,
+    TopMerchantsReport,
+)
+
+FETCH_BATCH_SIZE = 50_000
+SECONDS_PER_DAY = 86_400
+
+class Granularity(str, Enum):
+    day = "day"
+    week = "week"
+    month = "month"
+
+@dataclass(frozen=True)
+class TransactionColumns:
+    """
+    One user's transactions as parallel NumPy arrays.
+    `amount` is signed minor units (cents): income > 0, expense < 0.
+    `day` is days since 1970-01-01 (UTC). Categories and merchants are
+    factorized: `category`/`merchant` index into `categories`/`merchants`.
+    Transfer legs between the user's own accounts are left out.
+    """
+    amount: np.ndarray      # int64
+    day: np.ndarray         # int64
+    category: np.ndarray    # intp
+    merchant: np.ndarray    # intp
+    categories: np.ndarray  # object: UUID | None
+    merchants: np.ndarray   # object: str ("" when missing)
+
+    def __len__(self) -> int:
+        return len(self.amount)
+
+def _epoch_seconds_sql(dialect_name: str):
+    if dialect_name == "postgresql":
+        return cast(func.floor(func.extract("epoch", Transaction.date)), BigInteger)
+    return cast(func.strftime("%s", Transaction.date), BigInteger)
+
+def _columns_query(dialect_name: str, user_id: UUID, start: Optional[date], end: Optional[date]) -> Select:
+    # Done in SQL so the driver hands back plain ints, not Decimal/datetime objects.
+    minor = cast(func.round(Transaction.amount * 100), BigInteger)
+    signed = case((Transaction.type == TransactionType.income, minor), else_=-minor)
+    stmt = select(
+        signed,
+        _epoch_seconds_sql(dialect_name),
+        Transaction.category_id,
+        func.coalesce(Transaction.merchant, ""),
+    ).where(Transaction.user_id == user_id, Transaction.transfer_group_id.is_(None))
+    lower, upper = day_bounds(start, end)
+    if lower is not None:
+        stmt = stmt.where(Transaction.date >= lower)
+    if upper is not None:
+        stmt = stmt.where(Transaction.date < upper)
+    return stmt
+
+def fetch_columns(
+    db: Session,
+    user_id: UUID,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    batch_size: int = FETCH_BATCH_SIZE,
+) -> TransactionColumns:
+    """
+    Pull the columns the analytics need in bulk, `batch_size` rows at a
+    time, straight into arrays (no ORM objects).
+    """
+    if start is not None and end is not None and start > end:
+        raise InvalidReportRangeError(meta={"from": start.isoformat(), "to": end.isoformat()})
+    stmt = _columns_query(db.get_bind().dialect.name, user_id, start, end)
+    result = db.execute(stmt.execution_options(yield_per=batch_size))
+    amounts: List[np.ndarray] = []
+    seconds: List[np.ndarray] = []
+    category_ids: List[object] = []
+    merchant_names: List[object] = []
+    for rows in result.partitions():
+        amount, second, category, merchant = zip(*rows)
+        amounts.append(np.fromiter(amount, dtype=np.int64, count=len(rows)))
+        seconds.append(np.fromiter(second, dtype=np.int64, count=len(rows)))
+        category_ids.extend(category)
+        merchant_names.extend(merchant)
+    amount = np.concatenate(amounts) if amounts else np.empty(0, np.int64)
+    second = np.concatenate(seconds) if seconds else np.empty(0, np.int64)
+    categories, category_codes = _factorize(category_ids)
+    merchants, merchant_codes = _factorize(merchant_names)
+    return TransactionColumns(
+        amount=amount,
+        day=second // SECONDS_PER_DAY,
+        category=category_codes,
+        merchant=merchant_codes,
+        categories=categories,
+        merchants=merchants,
+    )
+
+def _factorize(values: List[object]) -> Tuple[np.ndarray, np.ndarray]:
+    """Distinct values and, per input, the index of its value (dict-based: works for UUID/None)."""
+    codes = np.empty(len(values), dtype=np.intp)
+    index: dict = {}
+    for i, value in enumerate(values):
+        codes[i] = index.setdefault(value, len(index))
+    uniques = np.empty(len(index), dtype=object)
+    for value, code in index.items():
+        uniques[code] = value
+    return uniques, codes
+
+def _bucket(day: np.ndarray, granularity: Granularity) -> np.ndarray:
+    """Start day (days since epoch) of the period each day falls in."""
+    if granularity is Granularity.day:
+        return day
+    if granularity is Granularity.week:
+        # 1970-01-01 was a Thursday; weeks start on Monday.
+        return day - (day + 3) % 7
+    months = day.astype("datetime64[D]").astype("datetime64[M]")
+    return months.astype("datetime64[D]").astype(np.int64)
+
+def _group_sum(keys: np.ndarray, values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Exact int64 sum of `values` per distinct key, keys ascending."""
+    uniques, inverse = np.unique(keys, return_inverse=True)
+    sums = np.zeros(len(uniques), dtype=np.int64)
+    np.add.at(sums, inverse, values)
+    return uniques, sums
+
+def _money(minor: int | np.integer) -> Decimal:
+    return Decimal(int(minor)).scaleb(-2)
+
+def _day(days: int | np.integer) -> date:
+    return date.fromordinal(date(1970, 1, 1).toordinal() + int(days))
+
+def cash_flow(cols: TransactionColumns, granularity: Granularity) -> List[CashFlowPoint]:
+    """Income, expense, net and running net per period."""
+    if not len(cols):
+        return []
+    bucket = _bucket(cols.day, granularity)
+    periods, income = _group_sum(bucket, np.where(cols.amount > 0, cols.amount, 0))
+    _, expense = _group_sum(bucket, np.where(cols.amount < 0, -cols.amount, 0))
+    net = income - expense
+    cumulative = np.cumsum(net)
+    return [
+        CashFlowPoint(
+            period=_day(periods[i]),
+            income=_money(income[i]),
+            expense=_money(expense[i]),
+            net=_money(net[i]),
+            cumulative_net=_money(cumulative[i]),
+        )
+        for i in range(len(periods))
+    ]
+
+def rolling_average(cols: TransactionColumns, window: int) -> List[RollingAveragePoint]:
+    """
+    Daily net flow (every calendar day in range, zero-filled) and its
+    trailing `window`-day mean.
+    """
+    if not len(cols):
+        return []
+    first = int(cols.day.min())
+    offset = cols.day - first
+    counts = np.bincount(offset)
+    net = np.zeros(len(counts), dtype=np.int64)
+    np.add.at(net, offset, cols.amount)
+    csum = np.concatenate(([0], np.cumsum(net)))
+    idx = np.arange(len(net))
+    lo = np.maximum(idx + 1 - window, 0)
+    mean = (csum[idx + 1] - csum[lo]) / (idx + 1 - lo)
+    return [
+        RollingAveragePoint(
+            day=_day(first + i),
+            net=_money(net[i]),
+            rolling_average=Decimal(str(round(float(mean[i]) / 100, 2))),
+            transaction_count=int(counts[i]),
+        )
+        for i in range(len(net))
+    ]
+
+def top_merchants(cols: TransactionColumns, n: int, type: TransactionType) -> List[MerchantTotal]:
+    """The `n` merchants with the largest income or expense total."""
+    mask = cols.amount > 0 if type is TransactionType.income else cols.amount < 0
+    mask &= cols.merchants[cols.merchant] != ""
+    if not mask.any():
+        return []
+    totals = np.zeros(len(cols.merchants), dtype=np.int64)
+    np.add.at(totals, cols.merchant[mask], np.abs(cols.amount[mask]))
+    counts = np.bincount(cols.merchant[mask], minlength=len(cols.merchants))
+    candidates = np.flatnonzero(counts)
+    if len(candidates) > n:
+        candidates = candidates[np.argpartition(-totals[candidates], n - 1)[:n]]
+    ranked = candidates[np.lexsort((cols.merchants[candidates].astype(str), -totals[candidates]))]
+    return [
+        MerchantTotal(merchant=cols.merchants[i], total=_money(totals[i]), transaction_count=int(counts[i]))
+        for i in ranked
+    ]
+
+class AnalyticsService:
+    @staticmethod
+    def cash_flow(
+        db: Session,
+        user_id: UUID,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        granularity: Granularity = Granularity.month,
+    ) -> CashFlowReport:
+        cols = fetch_columns(db, user_id, start, end)
+        return CashFlowReport(granularity=granularity, points=cash_flow(cols, granularity))
+
+    @staticmethod
+    def rolling_average(
+        db: Session,
+        user_id: UUID,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        window: int = 30,
+    ) -> RollingAverageReport:
+        cols = fetch_columns(db, user_id, start, end)
+        return RollingAverageReport(window=window, points=rolling_average(cols, window))
+
+    @staticmethod
+    def top_merchants(
+        db: Session,
+        user_id: UUID,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        limit: int = 10,
+        type: TransactionType = TransactionType.expense,
+    ) -> TopMerchantsReport:
+        cols = fetch_columns(db, user_id, start, end)
+        return TopMerchantsReport(type=type, items=top_merchants(cols, limit, type))
@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List, Optional
+from uuid import UUID
+
+from sqlalchemy import Connection, case, delete, func, insert, select, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from app.exceptions.account import AccountNotFoundError
+from app.models.account import Account
+from app.models.account_balance import AccountBalance
+from app.models.transaction import Transaction, TransactionType
+from app.schemas.account import AccountBalanceRead
+from app.services.transaction_deltas import ZERO, TransactionDeltas
+
+def signed_amount(type_: TransactionType | str, amount: Decimal) -> Decimal:
+    """Income adds to the balance, expense subtracts (amounts are stored positive)."""
+    return amount if TransactionType(type_) is TransactionType.income else -amount
+
+# Same rule as signed_amount, for SQL aggregates over `transactions`.
+SIGNED_AMOUNT_SQL = case(
+    (Transaction.type == TransactionType.income, Transaction.amount),
+    else_=-Transaction.amount,
+)
+
+def apply_balance_deltas(connection: Connection, deltas: TransactionDeltas) -> None:
+    """
+    Add signed amounts and counts to the stored balances with one upsert,
+    on whatever connection (and so DB transaction) wrote the transactions.
+    """
+    per_account: Dict[UUID, List[Any]] = defaultdict(lambda: [ZERO, 0])
+    for key, (amount, count) in deltas.items():
+        per_account[key.account_id][0] += signed_amount(key.type, amount)
+        per_account[key.account_id][1] += count
+    per_account = {account_id: d for account_id, d in per_account.items() if d[0] or d[1]}
+    if not per_account:
+        return
+    currencies = dict(connection.execute(
+        select(Account.id, Account.currency).where(Account.id.in_(per_account))
+    ).all())
+    values = [
+        {
+            "account_id": account_id,
+            "currency": currencies[account_id],
+            "balance": amount,
+            "transaction_count": count,
+        }
+        for account_id, (amount, count) in per_account.items()
+        if account_id in currencies
+    ]
+    dialect_insert = pg_insert if connection.dialect.name == "postgresql" else sqlite_insert
+    stmt = dialect_insert(AccountBalance)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[AccountBalance.account_id, AccountBalance.currency],
+        set_={
+            "balance": AccountBalance.balance + stmt.excluded.balance,
+            "transaction_count": AccountBalance.transaction_count + stmt.excluded.transaction_count,
+            "updated_at": func.now(),
+        },
+    )
+    connection.execute(stmt, values)
+
+@dataclass(frozen=True, slots=True)
+class BalanceDrift:
+    account_id: UUID
+    currency: str
+    stored_balance: Decimal
+    actual_balance: Decimal
+    stored_count: int
+    actual_count: int
+
+def _actual_balances(account_ids: Optional[Iterable[UUID]] = None):
+    stmt = (
+        select(
+            Transaction.account_id,
+            Account.currency,
+            func.coalesce(func.sum(SIGNED_AMOUNT_SQL), 0),
+            func.count(),
+        )
+        .join(Account, Account.id == Transaction.account_id)
+        .group_by(Transaction.account_id, Account.currency)
+    )
+    if account_ids is not None:
+        stmt = stmt.where(Transaction.account_id.in_(list(account_ids)))
+    return stmt
+
+class BalanceService:
+    @staticmethod
+    def get_balances(db: Session, user_id: UUID, account_id: UUID) -> List[AccountBalanceRead]:
+        """
+        Stored balances of one of the user's accounts: a primary-key lookup,
+        independent of how many transactions the account has.
+        """
+        account = db.scalar(
+            select(Account).where(Account.id == account_id, Account.user_id == user_id)
+        )
+        if account is None:
+            raise AccountNotFoundError()
+        rows = db.scalars(
+            select(AccountBalance).where(AccountBalance.account_id == account_id)
+        ).all()
+        if not rows:
+            return [AccountBalanceRead(account_id=account_id, currency=account.currency, balance=ZERO, transaction_count=0)]
+        return [AccountBalanceRead.model_validate(row) for row in rows]
+
+    @staticmethod
+    def verify(db: Session, account_ids: Optional[Iterable[UUID]] = None) -> List[BalanceDrift]:
+        """
+        Recompute balances from `transactions` and report every stored
+        balance that disagrees (including missing or orphaned rows).
+        """
+        account_ids = None if account_ids is None else list(account_ids)
+        actual = {
+            (account_id, currency): (Decimal(str(total)).quantize(ZERO), count)
+            for account_id, currency, total, count in db.execute(_actual_balances(account_ids))
+        }
+        stored_stmt = select(
+            AccountBalance.account_id,
+            AccountBalance.currency,
+            AccountBalance.balance,
+            AccountBalance.transaction_count,
+        )
+        if account_ids is not None:
+            stored_stmt = stored_stmt.where(AccountBalance.account_id.in_(account_ids))
+        stored = {
+            (account_id, currency): (Decimal(str(balance)).quantize(ZERO), count)
+            for account_id, currency, balance, count in db.execute(stored_stmt)
+        }
+        drifts: List[BalanceDrift] = []
+        for key in sorted(actual.keys() | stored.keys(), key=lambda k: (str(k[0]), k[1])):
+            stored_balance, stored_count = stored.get(key, (ZERO, 0))
+            actual_balance, actual_count = actual.get(key, (ZERO, 0))
+            if (stored_balance, stored_count) != (actual_balance, actual_count):
+                drifts.append(BalanceDrift(
+                    account_id=key[0],
+                    currency=key[1],
+                    stored_balance=stored_balance,
+                    actual_balance=actual_balance,
+                    stored_count=stored_count,
+                    actual_count=actual_count,
+                ))
+        return drifts
+
+    @staticmethod
+    def rebuild(db: Session, account_ids: Optional[Iterable[UUID]] = None) -> List[BalanceDrift]:
+        """
+        Replace stored balances with values recomputed from `transactions`.
+        Returns the drift that was corrected. On Postgres, writers to
+        `transactions` are blocked until the rebuild commits.
+        """
+        account_ids = None if account_ids is None else list(account_ids)
+        if db.get_bind().dialect.name == "postgresql":
+            db.execute(text("LOCK TABLE transactions IN SHARE MODE"))
+        drifts = BalanceService.verify(db, account_ids)
+        clear = delete(AccountBalance)
+        if account_ids is not None:
+            clear = clear.where(AccountBalance.account_id.in_(account_ids))
+        db.execute(clear)
+        db.execute(
+            insert(AccountBalance).from_select(
+                ["account_id", "currency", "balance", "transaction_count"],
+                _actual_balances(account_ids),
+            )
+        )
+        db.commit()
+        return drifts
@@ -0,0 +1,240 @@
+from __future__ import annotations
+
+import bisect
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, FrozenSet, Iterable, List, Mapping, NamedTuple, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import func, or_, select
+from sqlalchemy.orm import Session
+
+from app.core.cache import LRUCache
+from app.core.config import settings
+from app.core.metrics import REGISTRY
+from app.exceptions.category import CategoryRuleAlreadyExistsError, CategoryRuleNotFoundError
+from app.models.category_rule import CategoryRule
+from app.schemas.category import CategoryRuleCreate, CategoryRuleRead
+from app.services.category import CategoryService
+
+MATCHER_BUILDS = REGISTRY.counter(
+    "category_rule_matcher_builds_total",
+    "Categorization matchers compiled because a user's rules (or the global ones) changed.",
+)
+
+# (rule count, newest created_at) of the rules a user sees. Rules are never
+# edited in place, so any create or delete changes it.
+Fingerprint = Tuple[int, Any]
+_END = ""  # trie key marking the end of a keyword
+_WORD = re.compile(r"\w")
+
+class _Target(NamedTuple):
+    rank: Tuple[bool, int]  # (user's own rule, keyword length): higher wins
+    category_id: UUID
+
+def _trie_pattern(keywords: Iterable[str]) -> str:
+    """
+    One regex matching any of `keywords`, shaped like their trie: shared
+    prefixes are matched once and each alternation branches on a single
+    character. Longer keywords win at the same position.
+    """
+    root: Dict[str, Dict] = {}
+    for keyword in keywords:
+        node = root
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[_END] = {}
+
+    def emit(node: Dict[str, Dict]) -> str:
+        branches = [re.escape(char) + emit(child) for char, child in sorted(node.items()) if char != _END]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+        return f"(?:{body})?" if _END in node else body
+
+    return emit(root)
+
+def _whole_word_pattern(keywords: Iterable[str]) -> re.Pattern[str]:
+    """
+    The trie regex, matching only where no word character touches either end
+    (so "uber" is not found in "tuberia"). Lookarounds rather than word
+    boundaries, so keywords that start or end with punctuation work too.
+    """
+    return re.compile(rf"(?<!\w)({_trie_pattern(keywords)})(?!\w)")
+
+def _ends_word(text: str, end: int) -> bool:
+    return _WORD.match(text, end) is None
+
+def _can_hide(key: str, rank: Tuple[bool, int], keywords: List[str], targets: Mapping[str, _Target]) -> bool:
+    """
+    Whether a keyword ranked above `rank` may start inside `key` (after a
+    non-word character of it), where a match of `key` would consume it.
+    `keywords` is `targets` sorted.
+    """
+    for i in range(1, len(key)):
+        if not _ends_word(key, i - 1):
+            continue
+        # Keywords that start with the rest of `key`, or that it starts with.
+        rest = key[i:]
+        at = bisect.bisect_left(keywords, rest)
+        while at < len(keywords) and keywords[at].startswith(rest):
+            if targets[keywords[at]].rank > rank:
+                return True
+            at += 1
+        if any(rest[:n] in targets and targets[rest[:n]].rank > rank for n in range(1, len(rest))):
+            return True
+    return False
+
+@dataclass(frozen=True)
+class RuleMatcher:
+    """
+    Compiled rules of one user. `targets` is keyed by the casefolded keyword.
+    Keywords only match whole words; among every keyword found in a text,
+    overlapping ones included, the user's own rules beat global ones, then
+    the longest keyword wins, then the first found.
+
+    The pattern finds the longest keyword at each position, so `winners`
+    maps it to the best of it and the shorter keywords it starts with, and
+    `hiding` lists the keywords a better one can start inside: only a match
+    of those needs the slower scan for overlapping matches.
+    """
+    fingerprint: Fingerprint = (0, None)
+    pattern: Optional[re.Pattern[str]] = None
+    targets: Mapping[str, _Target] = field(default_factory=dict)
+    winners: Mapping[str, _Target] = field(default_factory=dict)
+    hiding: FrozenSet[str] = frozenset()
+
+    @classmethod
+    def build(
+        cls,
+        user_id: UUID,
+        rules: Iterable[Tuple[Optional[UUID], UUID, str]],
+        fingerprint: Fingerprint = (0, None),
+    ) -> "RuleMatcher":
+        """`rules` are (user_id, category_id, keyword); a user's rule overrides a global one with the same keyword."""
+        targets: Dict[str, _Target] = {}
+        for owner, category_id, keyword in rules:
+            key = keyword.strip().casefold()
+            own = owner == user_id
+            if key and (key not in targets or own):
+                targets[key] = _Target((own, len(key)), category_id)
+        MATCHER_BUILDS.inc()
+        pattern = _whole_word_pattern(targets) if targets else None
+        # A shorter keyword matches where a longer one does when the longer
+        # one's next character ends a word.
+        winners = {
+            key: max(
+                (targets[key[:n]] for n in range(1, len(key) + 1) if key[:n] in targets and _ends_word(key, n)),
+                key=lambda target: target.rank,
+            )
+            for key in targets
+        }
+        keywords = sorted(targets)
+        hiding = frozenset(key for key in targets if _can_hide(key, winners[key].rank, keywords, targets))
+        return cls(fingerprint=fingerprint, pattern=pattern, targets=targets, winners=winners, hiding=hiding)
+
+    def _overlapping_matches(self, text: str) -> List[str]:
+        """The longest keyword at every position one starts, overlaps included."""
+        found = []
+        match = self.pattern.search(text)
+        while match is not None:
+            found.append(match.group(1))
+            match = self.pattern.search(text, match.start() + 1)
+        return found
+
+    def category_for(self, merchant: Optional[str], description: Optional[str]) -> Optional[UUID]:
+        if self.pattern is None:
+            return None
+        text = f"{merchant or ''}\n{description or ''}".casefold()
+        found = self.pattern.findall(text)
+        if not self.hiding.isdisjoint(found):
+            found = self._overlapping_matches(text)
+        best: Optional[_Target] = None
+        for keyword in found:
+            target = self.winners[keyword]
+            if best is None or target.rank > best.rank:
+                best = target
+        return best.category_id if best else None
+
+    def assign(self, values: List[Dict[str, Any]]) -> int:
+        """
+        Set `category_id` on the rows (insert values) that have none, in one
+        pass over the batch. Returns how many rows got a category.
+        """
+        if self.pattern is None:
+            return 0
+        assigned = 0
+        for row in values:
+            if row["category_id"] is None:
+                category_id = self.category_for(row["merchant"], row["description"])
+                if category_id is not None:
+                    row["category_id"] = category_id
+                    assigned += 1
+        return assigned
+
+# Matchers are checked against the rules' fingerprint on every use, so a rule
+# changed through another worker is picked up without a TTL.
+matcher_cache: LRUCache[UUID, RuleMatcher] = LRUCache("category_rules", maxsize=settings.rule_cache_size)
+
+def _visible(user_id: UUID):
+    return or_(CategoryRule.user_id.is_(None), CategoryRule.user_id == user_id)
+
+def rule_matcher(db: Session, user_id: UUID) -> RuleMatcher:
+    """
+    The user's compiled matcher: one aggregate query to fingerprint the
+    rules, and a rebuild only when it differs from the cached one.
+    """
+    count, newest = db.execute(
+        select(func.count(), func.max(CategoryRule.created_at)).where(_visible(user_id))
+    ).one()
+    fingerprint = (count, newest)
+    cached = matcher_cache.get(user_id)
+    if cached is not None and cached.fingerprint == fingerprint:
+        return cached
+    rules = db.execute(
+        select(CategoryRule.user_id, CategoryRule.category_id, CategoryRule.keyword).where(_visible(user_id))
+    )
+    matcher = RuleMatcher.build(user_id, rules, fingerprint)
+    matcher_cache.set(user_id, matcher)
+    return matcher
+
+def invalidate_user(user_id: UUID) -> None:
+    matcher_cache.invalidate(user_id)
+
+class CategoryRuleService:
+    @staticmethod
+    def list_rules(db: Session, user_id: UUID) -> List[CategoryRuleRead]:
+        """Global rules plus the user's own, by keyword."""
+        rules = db.scalars(
+            select(CategoryRule).where(_visible(user_id)).order_by(func.lower(CategoryRule.keyword), CategoryRule.id)
+        )
+        return [CategoryRuleRead.model_validate(rule) for rule in rules]
+
+    @staticmethod
+    def create_rule(db: Session, user_id: UUID, data: CategoryRuleCreate) -> CategoryRuleRead:
+        keyword = data.keyword.strip()
+        CategoryService.require_ids(db, user_id, [data.category_id])
+        duplicate = db.scalar(
+            select(CategoryRule.id).where(
+                CategoryRule.user_id == user_id,
+                func.lower(CategoryRule.keyword) == keyword.lower(),
+            )
+        )
+        if duplicate is not None:
+            raise CategoryRuleAlreadyExistsError(meta={"keyword": keyword})
+        rule = CategoryRule(user_id=user_id, category_id=data.category_id, keyword=keyword)
+        db.add(rule)
+        db.commit()
+        db.refresh(rule)
+        invalidate_user(user_id)
+        return CategoryRuleRead.model_validate(rule)
+
+    @staticmethod
+    def delete_rule(db: Session, user_id: UUID, rule_id: UUID) -> None:
+        # Global rules are read-only for users.
+        rule = db.scalar(select(CategoryRule).where(CategoryRule.id == rule_id, CategoryRule.user_id == user_id))
+        if rule is None:
+            raise CategoryRuleNotFoundError(meta={"rule_id": str(rule_id)})
+        db.delete(rule)
+        db.commit()
+        invalidate_user(user_id)
@@ -0,0 +1,229 @@
+from __future__ import annotations
+
+import hashlib
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from datetime import datetime
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import delete, exists, func, or_, select
+from sqlalchemy.orm import Session
+
+from app.core.cache import LRUCache
+from app.core.conditional import CollectionVersion
+from app.core.config import settings
+from app.exceptions.category import CategoryAlreadyExistsError, CategoryInUseError, CategoryNotFoundError
+from app.models.category import Category
+from app.models.category_rule import CategoryRule
+from app.models.transaction import Transaction
+from app.schemas.category import CategoryRead
+
+def _digest(rows: Iterable[Tuple[UUID, str, Optional[datetime]]]) -> str:
+    """Hash of (id, name, updated_at) rows, in any order."""
+    lines = sorted(f"{id_}|{name}|{updated_at.isoformat() if updated_at else ''}" for id_, name, updated_at in rows)
+    return hashlib.sha1("\n".join(lines).encode()).hexdigest()
+
+@dataclass(frozen=True)
+class CategorySet:
+    """
+    An immutable snapshot of categories. `by_name` is keyed by the
+    casefolded name; in a user's view their own categories win over a
+    global one with the same name. `digest` hashes every item's id, name and
+    `updated_at`, the same way list_categories_version hashes the table.
+    """
+    items: Tuple[CategoryRead, ...] = ()
+    by_id: Mapping[UUID, CategoryRead] = field(default_factory=dict)
+    by_name: Mapping[str, CategoryRead] = field(default_factory=dict)
+    digest: str = ""
+
+    @classmethod
+    def build(cls, items: Iterable[CategoryRead]) -> "CategorySet":
+        items = tuple(sorted(items, key=lambda c: (c.name.casefold(), c.user_id is not None, str(c.id))))
+        by_name: Dict[str, CategoryRead] = {}
+        for item in items:
+            key = item.name.casefold()
+            if key not in by_name or item.user_id is not None:
+                by_name[key] = item
+        return cls(
+            items=items,
+            by_id=MappingProxyType({item.id: item for item in items}),
+            by_name=MappingProxyType(by_name),
+            digest=_digest((item.id, item.name, item.updated_at) for item in items),
+        )
+
+# Global categories change only through migrations/admin tasks: loaded once
+# per process, no TTL. Per-user sets are bounded and expire as a safety net.
+global_cache: LRUCache[None, CategorySet] = LRUCache("categories_global", maxsize=1)
+user_cache: LRUCache[UUID, CategorySet] = LRUCache(
+    "categories",
+    maxsize=settings.category_cache_size,
+    ttl=settings.category_cache_ttl_seconds,
+)
+
+def _load(db: Session, user_id: Optional[UUID]) -> CategorySet:
+    owner = Category.user_id.is_(None) if user_id is None else Category.user_id == user_id
+    rows = db.scalars(select(Category).where(owner)).all()
+    return CategorySet.build(CategoryRead.model_validate(row) for row in rows)
+
+def global_categories(db: Session) -> CategorySet:
+    return global_cache.get_or_load(None, lambda: _load(db, None))
+
+def user_categories(db: Session, user_id: UUID) -> CategorySet:
+    """The user's own categories only (see visible_categories for the merged view)."""
+    return user_cache.get_or_load(user_id, lambda: _load(db, user_id))
+
+def visible_categories(db: Session, user_id: UUID) -> CategorySet:
+    """Global categories plus the user's own, from the caches."""
+    return CategorySet.build(global_categories(db).items + user_categories(db, user_id).items)
+
+def _reload_user_categories(db: Session, user_id: UUID) -> CategorySet:
+    """
+    Re-read the user's set on a cache miss by id: the category may have been
+    created through another worker, whose invalidation never reached this one.
+    """
+    categories = _load(db, user_id)
+    user_cache.set(user_id, categories)
+    return categories
+
+def invalidate_user(user_id: UUID) -> None:
+    user_cache.invalidate(user_id)
+
+def invalidate_global() -> None:
+    """Call after changing global categories outside this service (e.g. a seed script)."""
+    global_cache.clear()
+
+class CategoryService:
+    @staticmethod
+    def list_categories(db: Session, user_id: UUID) -> List[CategoryRead]:
+        return list(visible_categories(db, user_id).items)
+
+    @staticmethod
+    def list_categories_version(db: Session, user_id: UUID) -> CollectionVersion:
+        """
+        Validator of list_categories, from one narrow query rather than the
+        caches: a write through another worker leaves this worker's sets
+        stale until their TTL (the global one never expires), and a 304 must
+        not confirm a stale list. The digest catches a rename or delete that
+        leaves the count and newest `updated_at` as they were. A cached set
+        that no longer matches is reloaded, so the body served with the new
+        validator is current too.
+        """
+        rows = db.execute(
+            select(Category.id, Category.user_id, Category.name, Category.updated_at)
+            .where(or_(Category.user_id.is_(None), Category.user_id == user_id))
+        ).all()
+        digests: Dict[Optional[UUID], str] = {
+            owner: _digest((id_, name, updated_at) for id_, row_owner, name, updated_at in rows if row_owner == owner)
+            for owner in (None, user_id)
+        }
+        if global_categories(db).digest != digests[None]:
+            global_cache.set(None, _load(db, None))
+        if user_categories(db, user_id).digest != digests[user_id]:
+            _reload_user_categories(db, user_id)
+        return CollectionVersion(
+            count=len(rows),
+            updated_at=max((row.updated_at for row in rows if row.updated_at is not None), default=None),
+            digest=digests[None] + digests[user_id],
+        )
+
+    @staticmethod
+    def get_category(db: Session, user_id: UUID, category_id: UUID) -> CategoryRead:
+        category = CategoryService.resolve_id(db, user_id, category_id)
+        if category is None:
+            raise CategoryNotFoundError(meta={"category_id": str(category_id)})
+        return category
+
+    @staticmethod
+    def resolve_id(db: Session, user_id: UUID, category_id: UUID) -> Optional[CategoryRead]:
+        category = global_categories(db).by_id.get(category_id) or user_categories(db, user_id).by_id.get(category_id)
+        if category is None:
+            category = _reload_user_categories(db, user_id).by_id.get(category_id)
+        return category
+
+    @staticmethod
+    def resolve_name(db: Session, user_id: UUID, name: str) -> Optional[CategoryRead]:
+        """Case-insensitive; the user's own category wins over a global one."""
+        key = name.strip().casefold()
+        return user_categories(db, user_id).by_name.get(key) or global_categories(db).by_name.get(key)
+
+    @staticmethod
+    def require_ids(db: Session, user_id: UUID, category_ids: Iterable[Optional[UUID]]) -> None:
+        """
+        Raise CategoryNotFoundError unless every (non-null) id is visible to
+        the user. Callers are about to write the ids, so they are checked with
+        one query rather than against the caches, which may still hold a
+        category deleted through another worker. Caches that disagree with
+        the database are dropped.
+        """
+        ids = {c for c in category_ids if c is not None}
+        if not ids:
+            return
+        found = set(db.scalars(
+            select(Category.id).where(
+                Category.id.in_(ids),
+                or_(Category.user_id.is_(None), Category.user_id == user_id),
+            )
+        ))
+        global_ids, own_ids = global_categories(db).by_id, user_categories(db, user_id).by_id
+        if any((c in found) != (c in global_ids or c in own_ids) for c in ids):
+            invalidate_user(user_id)
+            if any(c in global_ids for c in ids - found):
+                invalidate_global()
+        unknown = ids - found
+        if unknown:
+            raise CategoryNotFoundError(meta={"category_ids": sorted(str(c) for c in unknown)})
+
+    @staticmethod
+    def create_category(db: Session, user_id: UUID, name: str) -> CategoryRead:
+        name = name.strip()
+        _ensure_unique(db, user_id, name)
+        category = Category(user_id=user_id, name=name)
+        db.add(category)
+        db.commit()
+        db.refresh(category)
+        invalidate_user(user_id)
+        return CategoryRead.model_validate(category)
+
+    @staticmethod
+    def rename_category(db: Session, user_id: UUID, category_id: UUID, name: str) -> CategoryRead:
+        category = _owned(db, user_id, category_id)
+        name = name.strip()
+        if name != category.name:
+            _ensure_unique(db, user_id, name, exclude=category_id)
+            category.name = name
+            db.commit()
+            db.refresh(category)
+            invalidate_user(user_id)
+        return CategoryRead.model_validate(category)
+
+    @staticmethod
+    def delete_category(db: Session, user_id: UUID, category_id: UUID) -> None:
+        category = _owned(db, user_id, category_id)
+        if db.scalar(select(exists().where(Transaction.category_id == category_id))):
+            raise CategoryInUseError(meta={"category_id": str(category_id)})
+        # Explicit for SQLite; on Postgres the foreign key cascades too. Cached
+        # rule matchers notice through their fingerprint.
+        db.execute(delete(CategoryRule).where(CategoryRule.category_id == category_id))
+        db.delete(category)
+        db.commit()
+        invalidate_user(user_id)
+
+def _owned(db: Session, user_id: UUID, category_id: UUID) -> Category:
+    # Global categories are read-only for users.
+    category = db.scalar(
+        select(Category).where(Category.id == category_id, Category.user_id == user_id)
+    )
+    if category is None:
+        raise CategoryNotFoundError(meta={"category_id": str(category_id)})
+    return category
+
+def _ensure_unique(db: Session, user_id: UUID, name: str, exclude: Optional[UUID] = None) -> None:
+    stmt = select(Category.id).where(
+        Category.user_id == user_id,
+        func.lower(Category.name) == name.lower(),
+    )
+    if exclude is not None:
+        stmt = stmt.where(Category.id != exclude)
+    if db.scalar(stmt) is not None:
+        raise CategoryAlreadyExistsError(meta={"name": name})
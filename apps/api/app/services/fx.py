@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+import csv
+from datetime import date
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+from typing import Dict, Iterable, List, Optional, Sequence, Set, TextIO, Tuple
+from uuid import UUID
+
+import numpy as np
+from sqlalchemy import func, select, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from app.core.cache import LRUCache
+from app.core.config import settings
+from app.exceptions.fx import FxRateNotFoundError, InvalidFxRatesFileError
+from app.models.account import Account
+from app.models.account_balance import AccountBalance
+from app.models.fx_rate import FxRate
+from app.schemas.account import NetWorth, NetWorthAccount
+
+CENTS = Decimal("0.01")
+LOAD_BATCH_SIZE = 1000
+
+Pair = Tuple[str, str]
+# (base, quote, on) -> rate, or None when no rate exists (cached too)
+RateKey = Tuple[str, str, date]
+
+rate_cache: LRUCache[RateKey, Optional[Decimal]] = LRUCache(
+    "fx_rates",
+    maxsize=settings.fx_cache_size,
+    ttl=settings.fx_cache_ttl_seconds,
+)
+
+def _latest_rates(db: Session, pairs: Set[Pair], on: date) -> Dict[Pair, Decimal]:
+    """Latest stored rate on or before `on` for each pair, in one query."""
+    if not pairs:
+        return {}
+    in_pairs = tuple_(FxRate.base, FxRate.quote).in_(sorted(pairs))
+    latest = (
+        select(FxRate.base, FxRate.quote, func.max(FxRate.date).label("date"))
+        .where(in_pairs, FxRate.date <= on)
+        .group_by(FxRate.base, FxRate.quote)
+        .subquery()
+    )
+    stmt = select(FxRate.base, FxRate.quote, FxRate.rate).join(
+        latest,
+        (FxRate.base == latest.c.base) & (FxRate.quote == latest.c.quote) & (FxRate.date == latest.c.date),
+    )
+    return {(base, quote): Decimal(rate) for base, quote, rate in db.execute(stmt)}
+
+def _resolve(stored: Dict[Pair, Decimal], base: str, quote: str) -> Optional[Decimal]:
+    """Direct rate, else the inverse of the opposite pair."""
+    if base == quote:
+        return Decimal(1)
+    if (base, quote) in stored:
+        return stored[(base, quote)]
+    inverse = stored.get((quote, base))
+    return Decimal(1) / inverse if inverse else None
+
+def get_rates(db: Session, pairs: Iterable[Pair], on: date) -> Dict[Pair, Optional[Decimal]]:
+    """
+    Rates for many pairs at once: cache first, then a single query for
+    every miss (direct, inverse and through the pivot currency).
+    """
+    pivot = settings.fx_pivot_currency
+    wanted = {(base.upper(), quote.upper()) for base, quote in pairs}
+    rates: Dict[Pair, Optional[Decimal]] = {pair: Decimal(1) for pair in wanted if pair[0] == pair[1]}
+    keys = [(base, quote, on) for base, quote in wanted if base != quote]
+    cached = rate_cache.get_many(keys)
+    rates.update({(base, quote): rate for (base, quote, _), rate in cached.items()})
+    missing = [(base, quote) for base, quote, _ in keys if (base, quote, on) not in cached]
+    if not missing:
+        return rates
+    needed: Set[Pair] = set()
+    for base, quote in missing:
+        for a, b in ((base, quote), (base, pivot), (pivot, quote)):
+            needed.update({(a, b), (b, a)})
+    stored = _latest_rates(db, {pair for pair in needed if pair[0] != pair[1]}, on)
+    loaded: Dict[RateKey, Optional[Decimal]] = {}
+    for base, quote in missing:
+        rate = _resolve(stored, base, quote)
+        if rate is None:
+            to_pivot, from_pivot = _resolve(stored, base, pivot), _resolve(stored, pivot, quote)
+            rate = to_pivot * from_pivot if to_pivot and from_pivot else None
+        rates[(base, quote)] = rate
+        loaded[(base, quote, on)] = rate
+    rate_cache.set_many(loaded)
+    return rates
+
+def _require(rates: Dict[Pair, Optional[Decimal]], pair: Pair, on: date) -> Decimal:
+    rate = rates.get(pair)
+    if rate is None:
+        raise FxRateNotFoundError(meta={"base": pair[0], "quote": pair[1], "date": on.isoformat()})
+    return rate
+
+def convert(
+    db: Session,
+    amounts: Sequence[Decimal],
+    currencies: Sequence[str],
+    target: str,
+    on: date,
+) -> List[Decimal]:
+    """Convert each amount from its currency to `target`, rounded to cents."""
+    target = target.upper()
+    rates = get_rates(db, {(c, target) for c in currencies}, on)
+    return [
+        (amount * _require(rates, (currency.upper(), target), on)).quantize(CENTS, rounding=ROUND_HALF_UP)
+        for amount, currency in zip(amounts, currencies)
+    ]
+
+def convert_minor(
+    db: Session,
+    amounts: np.ndarray,
+    currencies: Sequence[str],
+    target: str,
+    on: date,
+) -> np.ndarray:
+    """
+    Vectorized variant for analytics: int64 minor units in, int64 minor
+    units of `target` out (float64 rates; exact to the cent below ~1e13).
+    """
+    target = target.upper()
+    codes, inverse = np.unique(np.char.upper(np.asarray(currencies, dtype=str)), return_inverse=True)
+    rates = get_rates(db, {(str(c), target) for c in codes}, on)
+    factors = np.array([float(_require(rates, (str(c), target), on)) for c in codes], dtype=np.float64)
+    return np.rint(np.asarray(amounts, dtype=np.int64) * factors[inverse]).astype(np.int64)
+
+def load_rates(db: Session, stream: TextIO) -> int:
+    """
+    Upsert rates from CSV with a `base,quote,date,rate` header (ISO dates),
+    e.g. an offline export of ECB or Banxico reference rates.
+    """
+    reader = csv.DictReader(stream)
+    missing = {"base", "quote", "date", "rate"} - set(reader.fieldnames or ())
+    if missing:
+        raise InvalidFxRatesFileError(meta={"missing_columns": sorted(missing)})
+    dialect_insert = pg_insert if db.get_bind().dialect.name == "postgresql" else sqlite_insert
+    stmt = dialect_insert(FxRate)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[FxRate.base, FxRate.quote, FxRate.date],
+        set_={"rate": stmt.excluded.rate, "updated_at": func.now()},
+    )
+    loaded = 0
+    batch: List[Dict[str, object]] = []
+    for line, row in enumerate(reader, start=2):
+        try:
+            value = {
+                "base": row["base"].strip().upper(),
+                "quote": row["quote"].strip().upper(),
+                "date": date.fromisoformat(row["date"].strip()),
+                "rate": Decimal(row["rate"].strip()),
+            }
+            if len(value["base"]) != 3 or len(value["quote"]) != 3 or value["rate"] <= 0:
+                raise ValueError
+        except (ValueError, InvalidOperation, AttributeError):
+            raise InvalidFxRatesFileError(meta={"line": line}) from None
+        batch.append(value)
+        if len(batch) == LOAD_BATCH_SIZE:
+            db.execute(stmt, batch)
+            loaded += len(batch)
+            batch.clear()
+    if batch:
+        db.execute(stmt, batch)
+        loaded += len(batch)
+    db.commit()
+    # New rates can change any cached answer, including cached "no rate".
+    rate_cache.clear()
+    return loaded
+
+class FxService:
+    @staticmethod
+    def net_worth(db: Session, user_id: UUID, currency: str, on: Optional[date] = None) -> NetWorth:
+        """
+        Sum of the user's stored account balances converted to `currency`,
+        with every rate resolved in one batch.
+        """
+        on = on or date.today()
+        currency = currency.upper()
+        rows = db.execute(
+            select(Account.id, Account.name, AccountBalance.currency, AccountBalance.balance)
+            .join(AccountBalance, AccountBalance.account_id == Account.id)
+            .where(Account.user_id == user_id)
+            .order_by(Account.name, Account.id)
+        ).all()
+        converted = convert(db, [Decimal(r.balance) for r in rows], [r.currency for r in rows], currency, on)
+        accounts = [
+            NetWorthAccount(
+                account_id=r.id,
+                name=r.name,
+                currency=r.currency,
+                balance=r.balance,
+                converted=value,
+            )
+            for r, value in zip(rows, converted)
+        ]
+        return NetWorth(currency=currency, on=on, total=sum(converted, Decimal("0.00")), accounts=accounts)
@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import date
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import Connection, Date, delete, func, insert, literal, select, text
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID, insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from app.exceptions.report import InvalidReportRangeError
+from app.models.category_rollup import UNCATEGORIZED, MonthlyCategoryRollup
+from app.models.transaction import Transaction, TransactionType
+from app.models.user import User
+from app.schemas.report import CategoryReport, CategoryReportRow
+from app.services.category import visible_categories
+from app.services.transaction_deltas import ZERO, TransactionDeltas
+
+BACKFILL_BATCH_SIZE = 500
+
+RollupKey = Tuple[UUID, date, UUID, TransactionType]
+
+# pg_advisory_xact_lock(class, key) namespace for a user's rollups.
+_ADVISORY_LOCK_CLASS = 0x726F_6C6C  # "roll"
+
+def _dialect_insert(connection: Connection):
+    return pg_insert if connection.dialect.name == "postgresql" else sqlite_insert
+
+def lock_user_rollups(connection: Connection, user_ids: Iterable[UUID]) -> None:
+    """
+    Serialize writers of these users' rollups (incremental deltas and
+    rebuilds) until the DB transaction ends. Locks are taken in key order so
+    two writers can't deadlock. On SQLite writers are serialized already.
+    """
+    if connection.dialect.name != "postgresql":
+        return
+    keys = sorted({int.from_bytes(user_id.bytes[:4], "big", signed=True) for user_id in user_ids})
+    if keys:
+        connection.execute(
+            text("SELECT pg_advisory_xact_lock(:cls, :key)"),
+            [{"cls": _ADVISORY_LOCK_CLASS, "key": key} for key in keys],
+        )
+
+def apply_rollup_deltas(connection: Connection, deltas: TransactionDeltas) -> None:
+    """
+    Add the deltas to the monthly rollups with one upsert, on the connection
+    (and so DB transaction) that wrote the transactions. Transfer legs are
+    not income or expense and stay out of the rollups.
+    """
+    per_rollup: Dict[RollupKey, List[Any]] = defaultdict(lambda: [ZERO, 0])
+    for key, (amount, count) in deltas.items():
+        if key.transfer:
+            continue
+        entry = per_rollup[(key.user_id, key.month, key.category_id or UNCATEGORIZED, key.type)]
+        entry[0] += amount
+        entry[1] += count
+    values = [
+        {"user_id": user_id, "month": month, "category_id": category_id, "type": type_,
+         "total": amount, "transaction_count": count}
+        for (user_id, month, category_id, type_), (amount, count) in per_rollup.items()
+        if amount or count
+    ]
+    if not values:
+        return
+    lock_user_rollups(connection, {value["user_id"] for value in values})
+    stmt = _dialect_insert(connection)(MonthlyCategoryRollup)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[
+            MonthlyCategoryRollup.user_id,
+            MonthlyCategoryRollup.month,
+            MonthlyCategoryRollup.category_id,
+            MonthlyCategoryRollup.type,
+        ],
+        set_={
+            "total": MonthlyCategoryRollup.total + stmt.excluded.total,
+            "transaction_count": MonthlyCategoryRollup.transaction_count + stmt.excluded.transaction_count,
+            "updated_at": func.now(),
+        },
+    )
+    connection.execute(stmt, values)
+
+def _month_sql(dialect_name: str):
+    """SQL twin of transaction_deltas.month_of."""
+    if dialect_name == "postgresql":
+        return func.date_trunc("month", func.timezone("UTC", Transaction.date)).cast(Date)
+    return func.date(Transaction.date, "start of month")
+
+def _recompute_query(dialect_name: str, user_ids: List[UUID]):
+    month = _month_sql(dialect_name)
+    category = func.coalesce(Transaction.category_id, literal(UNCATEGORIZED, PG_UUID(as_uuid=True)))
+    return (
+        select(
+            Transaction.user_id,
+            month,
+            category,
+            Transaction.type,
+            func.sum(Transaction.amount),
+            func.count(),
+        )
+        .where(Transaction.user_id.in_(user_ids), Transaction.transfer_group_id.is_(None))
+        .group_by(Transaction.user_id, month, category, Transaction.type)
+    )
+
+@dataclass(frozen=True, slots=True)
+class RollupBackfillResult:
+    users: int
+    batches: int
+
+class RollupService:
+    @staticmethod
+    def rebuild_users(db: Session, user_ids: List[UUID]) -> None:
+        """
+        Recompute the rollups of a few users from `transactions`. Writes of
+        these users' transactions wait until the caller commits.
+        """
+        connection = db.connection()
+        # Taken before the delete: a writer that already applied its deltas
+        # has committed by then, so the recompute sees its rows, and one
+        # that hasn't adds its deltas to the rebuilt rows afterwards.
+        lock_user_rollups(connection, user_ids)
+        db.execute(delete(MonthlyCategoryRollup).where(MonthlyCategoryRollup.user_id.in_(user_ids)))
+        db.execute(insert(MonthlyCategoryRollup).from_select(
+            ["user_id", "month", "category_id", "type", "total", "transaction_count"],
+            _recompute_query(connection.dialect.name, user_ids),
+        ))
+
+    @staticmethod
+    def backfill(
+        db: Session,
+        batch_size: int = BACKFILL_BATCH_SIZE,
+        user_ids: Optional[Iterable[UUID]] = None,
+    ) -> RollupBackfillResult:
+        """
+        Rebuild rollups `batch_size` users at a time, committing after each
+        batch so no lock is held for longer than one batch.
+        """
+        users = batches = 0
+        explicit = sorted(user_ids) if user_ids is not None else None
+        last_id: Optional[UUID] = None
+        while True:
+            if explicit is not None:
+                batch = explicit[users:users + batch_size]
+            else:
+                stmt = select(User.id).order_by(User.id).limit(batch_size)
+                if last_id is not None:
+                    stmt = stmt.where(User.id > last_id)
+                batch = list(db.scalars(stmt))
+            if not batch:
+                break
+            RollupService.rebuild_users(db, batch)
+            db.commit()
+            users += len(batch)
+            batches += 1
+            last_id = batch[-1]
+        return RollupBackfillResult(users=users, batches=batches)
+
+    @staticmethod
+    def category_report(
+        db: Session,
+        user_id: UUID,
+        from_month: date,
+        to_month: date,
+        type: Optional[TransactionType] = None,
+        by_month: bool = False,
+    ) -> CategoryReport:
+        """
+        Totals per category between two months (inclusive), read only from
+        the rollups: cost grows with months x categories, not transactions.
+        """
+        from_month, to_month = from_month.replace(day=1), to_month.replace(day=1)
+        if from_month > to_month:
+            raise InvalidReportRangeError(meta={"from": from_month.isoformat(), "to": to_month.isoformat()})
+        R = MonthlyCategoryRollup
+        total = func.sum(R.total)
+        columns = [R.category_id, R.type, total, func.sum(R.transaction_count)]
+        group_by = [R.category_id, R.type]
+        if by_month:
+            columns.insert(0, R.month)
+            group_by.insert(0, R.month)
+        stmt = (
+            select(*columns)
+            .where(R.user_id == user_id, R.month >= from_month, R.month <= to_month)
+            .group_by(*group_by)
+            .having(func.sum(R.transaction_count) != 0)
+            .order_by(*([R.month] if by_month else []), total.desc(), R.category_id)
+        )
+        if type is not None:
+            stmt = stmt.where(R.type == type)
+        names = visible_categories(db, user_id).by_id
+        items = []
+        for row in db.execute(stmt):
+            month, rest = (row[0], row[1:]) if by_month else (None, row)
+            category_id, type_, amount, count = rest
+            category_id = None if category_id == UNCATEGORIZED else category_id
+            category = names.get(category_id) if category_id is not None else None
+            items.append(CategoryReportRow(
+                month=month,
+                category_id=category_id,
+                category_name=category.name if category else None,
+                type=type_,
+                total=amount,
+                transaction_count=count,
+            ))
+        return CategoryReport(from_month=from_month, to_month=to_month, items=items)
@@ -0,0 +1,456 @@
+from __future__ import annotations
+
+import codecs
+import csv
+import re
+import time
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass, field, replace
+from datetime import datetime, timedelta, timezone, tzinfo
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+from enum import Enum
+from itertools import islice
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Optional
+from uuid import UUID
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from sqlalchemy.orm import Session
+
+from app.core.metrics import REGISTRY
+from app.exceptions.statement import InvalidTimezoneError
+from app.models.transaction import TransactionType
+from app.schemas.transaction import StageThroughput, StatementImportResult
+from app.services.transaction_import import (
+    IMPORT_BATCH_SIZE,
+    ImportRow,
+    TransactionImportService,
+    compute_hash_dedupe,
+)
+
+CHUNK_SIZE = 64 * 1024
+MAX_ERROR_SAMPLES = 20
+CENTS = Decimal("0.01")
+MAX_AMOUNT = Decimal("9999999999999999.99")  # Numeric(18, 2)
+
+STAGE_ITEMS = REGISTRY.counter(
+    "statement_import_stage_items_total",
+    "Items produced by each stage of the statement import pipeline.",
+    labelnames=("format", "stage"),
+)
+STAGE_SECONDS = REGISTRY.counter(
+    "statement_import_stage_seconds_total",
+    "Time spent in each stage of the statement import pipeline (exclusive).",
+    labelnames=("format", "stage"),
+)
+
+# A parsed statement line before normalization: every value is still text.
+RawRecord = Dict[str, Any]
+
+class StatementFormat(str, Enum):
+    csv = "csv"
+    ofx = "ofx"
+    camt = "camt"
+
+@dataclass(frozen=True)
+class CsvLayout:
+    """
+    Column mapping for CSV statements. Either `amount` (signed) or the
+    `debit`/`credit` pair must be present in the header.
+    """
+    date: str = "date"
+    amount: str = "amount"
+    debit: str = "debit"
+    credit: str = "credit"
+    description: str = "description"
+    merchant: str = "merchant"
+    external_id: str = "external_id"
+    delimiter: str = ","
+    date_format: Optional[str] = None  # strptime format; ISO 8601 when None
+    decimal_comma: bool = False
+    encoding: str = "utf-8-sig"
+
+class StatementRecordError(ValueError):
+    pass
+
+# --- Pipeline bookkeeping -------------------------------------------------
+
+@dataclass
+class PipelineStats:
+    """
+    Per-stage item counts and timings. Each stage wraps the previous one, so
+    the time measured around a stage's next() includes its upstream; the
+    report subtracts it to get the time spent in the stage itself.
+    """
+    statement_format: StatementFormat
+    order: List[str] = field(default_factory=list)
+    items: Dict[str, int] = field(default_factory=dict)
+    inclusive: Dict[str, float] = field(default_factory=dict)
+    rejected: int = 0
+    errors: List[str] = field(default_factory=list)
+
+    def timed(self, stage: str, iterable: Iterable[Any], weight=None) -> Iterator[Any]:
+        # Registered eagerly: the generator body only starts on first next(),
+        # which happens downstream-first.
+        self.order.append(stage)
+        self.items[stage] = 0
+        self.inclusive[stage] = 0.0
+        return self._timed(stage, iter(iterable), weight)
+
+    def _timed(self, stage: str, iterator: Iterator[Any], weight) -> Iterator[Any]:
+        while True:
+            started = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                self.inclusive[stage] += time.perf_counter() - started
+                return
+            self.inclusive[stage] += time.perf_counter() - started
+            self.items[stage] += weight(item) if weight else 1
+            yield item
+
+    def reject(self, position: int, error: Exception) -> None:
+        self.rejected += 1
+        if len(self.errors) < MAX_ERROR_SAMPLES:
+            self.errors.append(f"record {position}: {error}")
+
+    def report(self, total_seconds: float) -> List[StageThroughput]:
+        stages: List[StageThroughput] = []
+        upstream = 0.0
+        for stage in self.order + ["load"]:
+            if stage == "load":
+                items = self.items[self.order[-1]] if self.order else 0
+                inclusive = total_seconds
+            else:
+                items = self.items[stage]
+                inclusive = self.inclusive[stage]
+            seconds = max(inclusive - upstream, 0.0)
+            upstream = inclusive
+            STAGE_ITEMS.inc(items, format=self.statement_format.value, stage=stage)
+            STAGE_SECONDS.inc(seconds, format=self.statement_format.value, stage=stage)
+            stages.append(StageThroughput(
+                stage=stage,
+                items=items,
+                seconds=round(seconds, 6),
+                items_per_second=round(items / seconds, 1) if seconds > 0 else None,
+            ))
+        return stages
+
+# --- Stage 1: read ----------------------------------------------------------
+
+def read_chunks(stream: BinaryIO, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    while chunk := stream.read(chunk_size):
+        yield chunk
+
+def _decode(chunks: Iterable[bytes], encoding: str) -> Iterator[str]:
+    decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+    for chunk in chunks:
+        if text := decoder.decode(chunk):
+            yield text
+    if tail := decoder.decode(b"", final=True):
+        yield tail
+
+def _lines(texts: Iterable[str]) -> Iterator[str]:
+    """
+    Split decoded text into lines, keeping line endings (csv needs them to
+    handle quoted newlines). Only the current partial line is buffered.
+    """
+    pending = ""
+    for text in texts:
+        pending += text
+        lines = pending.splitlines(keepends=True)
+        pending = lines.pop() if lines and not lines[-1].endswith(("\n", "\r")) else ""
+        yield from lines
+    if pending:
+        yield pending
+
+# --- Stage 2: parse ---------------------------------------------------------
+
+def _debit_credit_amount(debit: Optional[str], credit: Optional[str], decimal_comma: bool) -> Optional[str]:
+    """
+    Signed amount of a debit/credit row. Some banks fill the idle column with
+    0.00, so the side with a non-zero amount wins; a row that is zero on both
+    sides is left for normalize to reject.
+    """
+    def nonzero(value: Optional[str]) -> bool:
+        if not value or not value.strip():
+            return False
+        try:
+            return _parse_amount(value, decimal_comma) != 0
+        except StatementRecordError:
+            return True  # reported by normalize
+    if nonzero(debit):
+        return f"-{debit.strip().lstrip('-')}"
+    if nonzero(credit):
+        return credit
+    return debit or credit
+
+def parse_csv(chunks: Iterable[bytes], layout: CsvLayout) -> Iterator[RawRecord]:
+    reader = csv.DictReader(_lines(_decode(chunks, layout.encoding)), delimiter=layout.delimiter)
+    for row in reader:
+        if not any(row.values()):
+            continue
+        amount = row.get(layout.amount)
+        if not amount:
+            amount = _debit_credit_amount(row.get(layout.debit), row.get(layout.credit), layout.decimal_comma)
+        yield {
+            "date": row.get(layout.date),
+            "amount": amount,
+            "description": row.get(layout.description),
+            "merchant": row.get(layout.merchant),
+            "external_id": row.get(layout.external_id),
+            "raw_payload": {k: v for k, v in row.items() if k is not None},
+        }
+
+OFX_TAG = re.compile(r"<(\w+)>([^<\r\n]*)")
+
+def parse_ofx(chunks: Iterable[bytes], encoding: str = "latin-1") -> Iterator[RawRecord]:
+    """
+    OFX 1.x (SGML, unclosed leaf tags) and 2.x (XML). Only the current
+    <STMTTRN> block is buffered.
+    """
+    buffer = ""
+    for text in _decode(chunks, encoding):
+        buffer += text
+        while True:
+            start = buffer.find("<STMTTRN>")
+            end = buffer.find("</STMTTRN>", start)
+            if start < 0:
+                buffer = buffer[-len("<STMTTRN>"):]
+                break
+            if end < 0:
+                buffer = buffer[start:]
+                break
+            block = buffer[start + len("<STMTTRN>"):end]
+            buffer = buffer[end + len("</STMTTRN>"):]
+            tags = {name.upper(): value.strip() for name, value in OFX_TAG.findall(block)}
+            yield {
+                "date": tags.get("DTPOSTED"),
+                "amount": tags.get("TRNAMT"),
+                "description": tags.get("MEMO") or tags.get("NAME"),
+                "merchant": tags.get("NAME"),
+                "external_id": tags.get("FITID"),
+                "raw_payload": tags,
+            }
+
+def _local(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+def _find(element: ET.Element, path: str) -> Optional[ET.Element]:
+    """
+    Namespace-agnostic lookup of a '/'-separated path of local names.
+    """
+    current: Optional[ET.Element] = element
+    for name in path.split("/"):
+        if current is None:
+            return None
+        current = next((child for child in current if _local(child.tag) == name), None)
+    return current
+
+def _text(element: ET.Element, *paths: str) -> Optional[str]:
+    for path in paths:
+        found = _find(element, path)
+        if found is not None and found.text and found.text.strip():
+            return found.text.strip()
+    return None
+
+def parse_camt(chunks: Iterable[bytes]) -> Iterator[RawRecord]:
+    """
+    ISO 20022 camt.053/camt.052 entries (<Ntry>), parsed incrementally;
+    each entry is cleared once read so memory does not grow with the file.
+    """
+    parser = ET.XMLPullParser(events=("start", "end"))
+    parents: List[ET.Element] = []
+    for chunk in chunks:
+        parser.feed(chunk)
+        for event, element in parser.read_events():
+            if event == "start":
+                parents.append(element)
+                continue
+            parents.pop()
+            if _local(element.tag) != "Ntry":
+                continue
+            amount = _text(element, "Amt")
+            if amount and _text(element, "CdtDbtInd") == "DBIT":
+                amount = f"-{amount}"
+            party = "RltdPties/Cdtr/Nm" if amount and amount.startswith("-") else "RltdPties/Dbtr/Nm"
+            yield {
+                "date": _text(element, "BookgDt/Dt", "BookgDt/DtTm", "ValDt/Dt", "ValDt/DtTm"),
+                "amount": amount,
+                "description": _text(element, "NtryDtls/TxDtls/RmtInf/Ustrd", "AddtlNtryInf"),
+                "merchant": _text(element, f"NtryDtls/TxDtls/{party}"),
+                "external_id": _text(element, "AcctSvcrRef", "NtryRef", "NtryDtls/TxDtls/Refs/AcctSvcrRef"),
+                "raw_payload": None,
+            }
+            element.clear()
+            if parents:
+                parents[-1].remove(element)
+    parser.close()
+
+# --- Stage 3: normalize -----------------------------------------------------
+
+def _parse_amount(value: Optional[str], decimal_comma: bool = False) -> Decimal:
+    if not value or not value.strip():
+        raise StatementRecordError("missing amount")
+    text = value.strip().replace(" ", "").replace("\u00a0", "")
+    negative = text.startswith("(") and text.endswith(")")
+    text = text.strip("()")
+    if decimal_comma:
+        text = text.replace(".", "").replace(",", ".")
+    else:
+        text = text.replace(",", "")
+    try:
+        amount = Decimal(text).quantize(CENTS, rounding=ROUND_HALF_UP)
+    except InvalidOperation:
+        raise StatementRecordError(f"invalid amount {value!r}") from None
+    if abs(amount) > MAX_AMOUNT:
+        raise StatementRecordError(f"amount out of range {value!r}")
+    return -amount if negative else amount
+
+OFX_DATE = re.compile(r"^(\d{8})(\d{6})?(?:\.\d+)?(?:\[([+-]?\d+(?:\.\d+)?)(?::\w+)?\])?")
+
+def _parse_date(value: Optional[str], tz: tzinfo, date_format: Optional[str] = None) -> datetime:
+    if not value or not value.strip():
+        raise StatementRecordError("missing date")
+    text = value.strip()
+    try:
+        if date_format:
+            parsed = datetime.strptime(text, date_format)
+        elif match := OFX_DATE.match(text):
+            day, clock, offset = match.groups()
+            parsed = datetime.strptime(day + (clock or "000000"), "%Y%m%d%H%M%S")
+            if offset is not None:
+                parsed = parsed.replace(tzinfo=timezone(timedelta(hours=float(offset))))
+        else:
+            parsed = datetime.fromisoformat(text)
+    except ValueError:
+        raise StatementRecordError(f"invalid date {value!r}") from None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=tz)
+    return parsed.astimezone(timezone.utc)
+
+def _clip(value: Optional[str], size: int) -> Optional[str]:
+    if value is None:
+        return None
+    value = " ".join(value.split())
+    return value[:size] or None
+
+def normalize(
+    records: Iterable[RawRecord],
+    stats: PipelineStats,
+    tz: tzinfo = timezone.utc,
+    date_format: Optional[str] = None,
+    decimal_comma: bool = False,
+) -> Iterator[ImportRow]:
+    """
+    Turn raw records into ImportRows: Decimal(18,2) amounts, tz-aware UTC
+    dates, sign mapped to income/expense. Bad records are counted and skipped.
+    """
+    for position, record in enumerate(records, start=1):
+        try:
+            amount = _parse_amount(record.get("amount"), decimal_comma)
+            if amount == 0:
+                raise StatementRecordError("zero amount")
+            yield ImportRow(
+                type=TransactionType.expense if amount < 0 else TransactionType.income,
+                amount=abs(amount),
+                date=_parse_date(record.get("date"), tz, date_format),
+                description=_clip(record.get("description"), 255),
+                merchant=_clip(record.get("merchant"), 100),
+                external_id=_clip(record.get("external_id"), 100),
+                raw_payload=record.get("raw_payload"),
+            )
+        except StatementRecordError as exc:
+            stats.reject(position, exc)
+
+# --- Stage 4/5: hash and batch ------------------------------------------------
+
+def hash_rows(rows: Iterable[ImportRow], account_id: UUID) -> Iterator[ImportRow]:
+    for row in rows:
+        yield replace(row, hash_dedupe=compute_hash_dedupe(account_id, row))
+
+def batch_rows(rows: Iterable[ImportRow], batch_size: int) -> Iterator[List[ImportRow]]:
+    iterator = iter(rows)
+    while batch := list(islice(iterator, batch_size)):
+        yield batch
+
+def build_pipeline(
+    stream: BinaryIO,
+    statement_format: StatementFormat,
+    account_id: UUID,
+    stats: PipelineStats,
+    batch_size: int = IMPORT_BATCH_SIZE,
+    chunk_size: int = CHUNK_SIZE,
+    tz: tzinfo = timezone.utc,
+    csv_layout: CsvLayout = CsvLayout(),
+) -> Iterator[List[ImportRow]]:
+    """
+    read -> parse -> normalize -> hash -> batch, all lazy generators.
+    Memory is bounded by one chunk plus one batch, whatever the file size.
+    """
+    chunks = stats.timed("read", read_chunks(stream, chunk_size), weight=len)
+    if statement_format is StatementFormat.csv:
+        records = parse_csv(chunks, csv_layout)
+    elif statement_format is StatementFormat.ofx:
+        records = parse_ofx(chunks)
+    else:
+        records = parse_camt(chunks)
+    records = stats.timed("parse", records)
+    date_format = csv_layout.date_format if statement_format is StatementFormat.csv else None
+    decimal_comma = csv_layout.decimal_comma if statement_format is StatementFormat.csv else False
+    rows = stats.timed("normalize", normalize(records, stats, tz, date_format, decimal_comma))
+    rows = stats.timed("hash", hash_rows(rows, account_id))
+    return stats.timed("batch", batch_rows(rows, batch_size), weight=len)
+
+def detect_format(filename: Optional[str]) -> Optional[StatementFormat]:
+    suffix = (filename or "").rsplit(".", 1)[-1].lower()
+    return {
+        "csv": StatementFormat.csv,
+        "ofx": StatementFormat.ofx,
+        "qfx": StatementFormat.ofx,
+        "xml": StatementFormat.camt,
+    }.get(suffix)
+
+class StatementImportService:
+    @staticmethod
+    def import_statement(
+        db: Session,
+        user_id: UUID,
+        account_id: UUID,
+        stream: BinaryIO,
+        statement_format: StatementFormat,
+        batch_size: int = IMPORT_BATCH_SIZE,
+        chunk_size: int = CHUNK_SIZE,
+        timezone_name: str = "UTC",
+        csv_layout: CsvLayout = CsvLayout(),
+    ) -> StatementImportResult:
+        """
+        Parse a bank statement file and bulk-import its lines into an account.
+        """
+        try:
+            tz = ZoneInfo(timezone_name)
+        except (ZoneInfoNotFoundError, ValueError):
+            raise InvalidTimezoneError(meta={"timezone": timezone_name}) from None
+        stats = PipelineStats(statement_format=statement_format)
+        batches = build_pipeline(
+            stream,
+            statement_format,
+            account_id,
+            stats,
+            batch_size=batch_size,
+            chunk_size=chunk_size,
+            tz=tz,
+            csv_layout=csv_layout,
+        )
+        started = time.perf_counter()
+        result = TransactionImportService.import_batches(
+            db=db,
+            user_id=user_id,
+            account_id=account_id,
+            batches=batches,
+        )
+        return StatementImportResult(
+            **result.model_dump(),
+            rejected=stats.rejected,
+            errors=stats.errors,
+            stages=stats.report(time.perf_counter() - started),
+        )
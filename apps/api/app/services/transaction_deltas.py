@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from typing import Any, Dict, List, NamedTuple, Optional
+from uuid import UUID
+
+from sqlalchemy import inspect
+from sqlalchemy.orm import Session
+
+from app.models.transaction import Transaction, TransactionType
+
+ZERO = Decimal("0.00")
+# Changing any of these moves a transaction between aggregates.
+AGGREGATE_FIELDS = ("user_id", "account_id", "category_id", "transfer_group_id", "type", "amount", "date")
+
+class DeltaKey(NamedTuple):
+    """Finest grain every derived aggregate (balances, rollups) is built from."""
+    user_id: UUID
+    account_id: UUID
+    category_id: Optional[UUID]
+    type: TransactionType
+    month: date
+    # A transfer leg: it moves a balance but is neither income nor expense
+    # in the reports, so rollups skip it.
+    transfer: bool = False
+
+def to_utc(value: datetime) -> datetime:
+    """A transaction date in UTC; naive values are taken to be UTC already."""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+def month_of(value: datetime) -> date:
+    """First day of the (UTC) month a transaction date falls in."""
+    value = to_utc(value)
+    return date(value.year, value.month, 1)
+
+class TransactionDeltas(defaultdict):
+    """
+    DeltaKey -> [amount, count]. Amounts are unsigned like Transaction.amount;
+    removals carry negative amount and count.
+    """
+    def __init__(self) -> None:
+        super().__init__(lambda: [ZERO, 0])
+
+    def add(self, key: DeltaKey, amount: Any, count: int) -> None:
+        entry = self[key]
+        entry[0] += Decimal(str(amount)) * (1 if count > 0 else -1)
+        entry[1] += count
+
+    @classmethod
+    def from_items(cls, items: Dict[DeltaKey, List[Any]]) -> "TransactionDeltas":
+        deltas = cls()
+        deltas.update(items)
+        return deltas
+
+    def merge(self, other: "TransactionDeltas") -> None:
+        for key, (amount, count) in other.items():
+            entry = self[key]
+            entry[0] += amount
+            entry[1] += count
+
+    def nonzero(self) -> Dict[DeltaKey, List[Any]]:
+        return {key: value for key, value in self.items() if value[0] or value[1]}
+
+def _committed(obj: Transaction, key: str) -> Any:
+    """Value of `key` as last flushed (before pending changes)."""
+    history = inspect(obj).attrs[key].load_history()
+    if history.deleted:
+        return history.deleted[0]
+    return history.unchanged[0] if history.unchanged else None
+
+def _key(values: Dict[str, Any]) -> DeltaKey:
+    return DeltaKey(
+        user_id=values["user_id"],
+        account_id=values["account_id"],
+        category_id=values["category_id"],
+        type=TransactionType(values["type"]),
+        month=month_of(values["date"]),
+        transfer=values["transfer_group_id"] is not None,
+    )
+
+def _current(obj: Transaction) -> Dict[str, Any]:
+    return {name: getattr(obj, name) for name in AGGREGATE_FIELDS}
+
+def _previous(obj: Transaction) -> Dict[str, Any]:
+    return {name: _committed(obj, name) for name in AGGREGATE_FIELDS}
+
+def collect_flush_deltas(session: Session) -> TransactionDeltas:
+    """
+    Deltas implied by the Transaction objects about to be flushed. Must run
+    before the flush: deleted rows (and old values) are gone afterwards.
+    """
+    deltas = TransactionDeltas()
+    for obj in session.new:
+        if isinstance(obj, Transaction):
+            values = _current(obj)
+            deltas.add(_key(values), values["amount"], 1)
+    for obj in session.deleted:
+        if isinstance(obj, Transaction):
+            values = _previous(obj)
+            deltas.add(_key(values), values["amount"], -1)
+    for obj in session.dirty:
+        if not isinstance(obj, Transaction) or obj in session.deleted:
+            continue
+        state = inspect(obj)
+        if not any(state.attrs[name].history.has_changes() for name in AGGREGATE_FIELDS):
+            continue
+        previous, current = _previous(obj), _current(obj)
+        deltas.add(_key(previous), previous["amount"], -1)
+        deltas.add(_key(current), current["amount"], 1)
+    return deltas
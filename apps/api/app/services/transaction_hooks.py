@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+from typing import Any
+
+from sqlalchemy import Connection, event
+from sqlalchemy.orm import Session
+
+from app.services.balance import apply_balance_deltas
+from app.services.rollup import apply_rollup_deltas
+from app.services.transaction_deltas import TransactionDeltas, collect_flush_deltas
+
+PENDING_DELTAS_KEY = "transaction_deltas"
+
+def apply_transaction_deltas(connection: Connection, deltas: TransactionDeltas) -> None:
+    """
+    Bring every aggregate derived from `transactions` (account balances,
+    monthly category rollups) up to date, in the caller's DB transaction.
+    """
+    deltas = TransactionDeltas.from_items(deltas.nonzero())
+    if deltas:
+        apply_balance_deltas(connection, deltas)
+        apply_rollup_deltas(connection, deltas)
+
+def _collect(session: Session, flush_context: Any, instances: Any) -> None:
+    deltas = collect_flush_deltas(session)
+    if deltas:
+        session.info.setdefault(PENDING_DELTAS_KEY, TransactionDeltas()).merge(deltas)
+
+def _apply(session: Session, flush_context: Any) -> None:
+    # After the flush, so new accounts/users the rows point at exist.
+    pending = session.info.pop(PENDING_DELTAS_KEY, None)
+    if pending:
+        apply_transaction_deltas(session.connection(), pending)
+
+def _discard(session: Session, *args: Any) -> None:
+    session.info.pop(PENDING_DELTAS_KEY, None)
+
+_LISTENERS = (("before_flush", _collect), ("after_flush", _apply), ("after_soft_rollback", _discard))
+
+def register_transaction_hooks() -> None:
+    """
+    Listen on every Session, sync and async (AsyncSession wraps a Session).
+    app.db.base calls this next to the models, so the hooks never depend on
+    which service happened to be imported; calling it again is a no-op.
+    Core/bulk statements bypass these hooks and must call
+    apply_transaction_deltas themselves (see TransactionImportService).
+    """
+    for name, listener in _LISTENERS:
+        if not event.contains(Session, name, listener):
+            event.listen(Session, name, listener)
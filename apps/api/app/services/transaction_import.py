@@ -0,0 +1,238 @@
+from __future__ import annotations
+
+import hashlib
+import uuid
+from dataclasses import dataclass
+from datetime import date, datetime
+from decimal import Decimal
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from app.exceptions.account import AccountNotFoundError
+from app.models.account import Account
+from app.models.transaction import Transaction, TransactionSource, TransactionType
+from app.models.transaction_dedupe_key import TransactionDedupeKey
+from app.schemas.transaction import TransactionImportResult
+from app.services.categorization import rule_matcher
+from app.services.category import CategoryService
+from app.services.transaction_deltas import DeltaKey, TransactionDeltas, month_of, to_utc
+from app.services.transaction_hooks import apply_transaction_deltas
+
+IMPORT_BATCH_SIZE = 5000
+# (category_id, type, month, amount, count) of the rows a merge inserted
+InsertedGroup = Tuple[Optional[UUID], TransactionType, date, Decimal, int]
+STAGING_TABLE = "transactions_import_staging"
+IMPORT_COLUMNS = (
+    "id", "user_id", "account_id", "category_id", "type", "amount", "date",
+    "description", "merchant", "notes", "source", "external_id", "raw_payload",
+    "hash_dedupe",
+)
+
+@dataclass(frozen=True, slots=True)
+class ImportRow:
+    """
+    A normalized statement line, ready to be written to `transactions`.
+    """
+    type: TransactionType
+    amount: Decimal
+    date: datetime
+    description: Optional[str] = None
+    merchant: Optional[str] = None
+    notes: Optional[str] = None
+    external_id: Optional[str] = None
+    category_id: Optional[UUID] = None
+    raw_payload: Optional[Dict[str, Any]] = None
+    hash_dedupe: Optional[str] = None  # computed on write when not precomputed
+
+def compute_hash_dedupe(account_id: UUID, row: ImportRow) -> str:
+    """
+    SHA-256 identifying a statement line within a user's data.
+    The bank's external_id is used when present; otherwise the line content.
+    The date is not part of an external_id hash, so a line the bank re-exports
+    with a new posting date is still a duplicate (see TransactionDedupeKey).
+    """
+    if row.external_id:
+        parts = [str(account_id), "ext", row.external_id]
+    else:
+        parts = [
+            str(account_id),
+            TransactionType(row.type).value,
+            f"{Decimal(row.amount).quantize(Decimal('0.01'))}",
+            to_utc(row.date).isoformat(),
+            (row.description or "").strip().lower(),
+            (row.merchant or "").strip().lower(),
+        ]
+    return hashlib.sha256("\x1f".join(parts).encode()).hexdigest()
+
+def _chunks(rows: Iterable[ImportRow], size: int) -> Iterator[List[ImportRow]]:
+    iterator = iter(rows)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+def _to_values(user_id: UUID, account_id: UUID, row: ImportRow) -> Dict[str, Any]:
+    return {
+        "id": uuid.uuid4(),
+        "user_id": user_id,
+        "account_id": account_id,
+        "category_id": row.category_id,
+        "type": TransactionType(row.type).value,
+        "amount": Decimal(row.amount).quantize(Decimal("0.01")),
+        "date": to_utc(row.date),
+        "description": row.description,
+        "merchant": row.merchant,
+        "notes": row.notes,
+        "source": TransactionSource.imported.value,
+        "external_id": row.external_id,
+        "raw_payload": row.raw_payload,
+        "hash_dedupe": row.hash_dedupe or compute_hash_dedupe(account_id, row),
+    }
+
+def _first_per_hash(values: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """The first row of each hash_dedupe in the batch; the rest are duplicates."""
+    first: Dict[str, Dict[str, Any]] = {}
+    for row in values:
+        first.setdefault(row["hash_dedupe"], row)
+    return list(first.values())
+
+def _merge_with_copy(db: Session, values: List[Dict[str, Any]]) -> List[InsertedGroup]:
+    """
+    COPY the batch into a temp staging table, then in one statement claim
+    its dedupe keys (ON CONFLICT DO NOTHING) and insert into `transactions`
+    the rows whose key was claimed.
+    """
+    from psycopg.types.json import Jsonb  # only reached on psycopg; keeps the driver out of app imports
+
+    columns = ", ".join(IMPORT_COLUMNS)
+    raw = db.connection().connection.driver_connection
+    with raw.cursor() as cur:
+        cur.execute(
+            f"CREATE TEMP TABLE IF NOT EXISTS {STAGING_TABLE} "
+            f"(LIKE transactions INCLUDING DEFAULTS) ON COMMIT DROP"
+        )
+        with cur.copy(f"COPY {STAGING_TABLE} ({columns}) FROM STDIN") as copy:
+            for row in values:
+                payload = row["raw_payload"]
+                copy.write_row([
+                    Jsonb(payload) if name == "raw_payload" and payload is not None else row[name]
+                    for name in IMPORT_COLUMNS
+                ])
+        cur.execute(
+            f"WITH claimed AS ("
+            f"INSERT INTO {TransactionDedupeKey.__tablename__} (user_id, hash_dedupe) "
+            f"SELECT user_id, hash_dedupe FROM {STAGING_TABLE} "
+            f"ON CONFLICT DO NOTHING "
+            f"RETURNING user_id, hash_dedupe), "
+            f"inserted AS ("
+            f"INSERT INTO transactions ({columns}) "
+            f"SELECT {columns} FROM {STAGING_TABLE} "
+            f"WHERE (user_id, hash_dedupe) IN (SELECT user_id, hash_dedupe FROM claimed) "
+            f"ON CONFLICT (user_id, hash_dedupe, date) DO NOTHING "
+            f"RETURNING category_id, type, amount, date) "
+            f"SELECT category_id, type, date_trunc('month', date AT TIME ZONE 'UTC')::date, "
+            f"sum(amount), count(*) "
+            f"FROM inserted GROUP BY 1, 2, 3"
+        )
+        groups = cur.fetchall()
+        cur.execute(f"TRUNCATE {STAGING_TABLE}")
+    return [(category_id, TransactionType(type_), month, amount, count)
+            for category_id, type_, month, amount, count in groups]
+
+def _merge_with_insert(db: Session, values: List[Dict[str, Any]]) -> List[InsertedGroup]:
+    """
+    Fallback for SQLite (tests) and Postgres drivers without COPY support:
+    claim the dedupe keys, then a multi-row INSERT of the rows whose key was
+    claimed.
+    """
+    dialect_insert = pg_insert if db.get_bind().dialect.name == "postgresql" else sqlite_insert
+    claim = (
+        dialect_insert(TransactionDedupeKey)
+        .on_conflict_do_nothing()
+        .returning(TransactionDedupeKey.hash_dedupe)
+    )
+    claimed = set(db.scalars(claim, [
+        {"user_id": row["user_id"], "hash_dedupe": row["hash_dedupe"]} for row in values
+    ]))
+    values = [row for row in values if row["hash_dedupe"] in claimed]
+    if not values:
+        return []
+    stmt = (
+        dialect_insert(Transaction)
+        .on_conflict_do_nothing(index_elements=["user_id", "hash_dedupe", "date"])
+        .returning(Transaction.category_id, Transaction.type, Transaction.amount, Transaction.date)
+    )
+    return [
+        (category_id, type_, month_of(posted), amount, 1)
+        for category_id, type_, amount, posted in db.execute(stmt, values)
+    ]
+
+class TransactionImportService:
+    @staticmethod
+    def import_rows(
+        db: Session,
+        user_id: UUID,
+        account_id: UUID,
+        rows: Iterable[ImportRow],
+        batch_size: int = IMPORT_BATCH_SIZE,
+    ) -> TransactionImportResult:
+        """
+        Bulk-import statement lines into one of the user's accounts.
+        Lines whose hash_dedupe already exists for the user are skipped.
+        """
+        return TransactionImportService.import_batches(
+            db=db,
+            user_id=user_id,
+            account_id=account_id,
+            batches=_chunks(rows, batch_size),
+        )
+
+    @staticmethod
+    def import_batches(
+        db: Session,
+        user_id: UUID,
+        account_id: UUID,
+        batches: Iterable[List[ImportRow]],
+    ) -> TransactionImportResult:
+        """
+        Same as import_rows for callers that already batch their rows
+        (e.g. the statement pipeline). Batches are consumed lazily and the
+        whole import commits once at the end. Rows without a category get one
+        from the user's categorization rules when a keyword matches.
+        """
+        owned = db.scalar(
+            select(Account.id).where(Account.id == account_id, Account.user_id == user_id)
+        )
+        if owned is None:
+            raise AccountNotFoundError()
+
+        bind = db.get_bind()
+        use_copy = bind.dialect.name == "postgresql" and bind.dialect.driver == "psycopg"
+        merge = _merge_with_copy if use_copy else _merge_with_insert
+
+        matcher = rule_matcher(db, user_id)
+        received = inserted = categorized = 0
+        deltas = TransactionDeltas()
+        for batch in batches:
+            CategoryService.require_ids(db, user_id, {row.category_id for row in batch})
+            values = [_to_values(user_id, account_id, row) for row in batch]
+            received += len(values)
+            values = _first_per_hash(values)
+            categorized += matcher.assign(values)
+            for category_id, type_, month, amount, count in merge(db, values):
+                deltas.add(DeltaKey(user_id, account_id, category_id, type_, month), amount, count)
+                inserted += count
+        # Core inserts skip the ORM flush hooks; update balances and rollups
+        # from the rows actually inserted, in the same commit.
+        apply_transaction_deltas(db.connection(), deltas)
+        db.commit()
+        return TransactionImportResult(
+            received=received,
+            inserted=inserted,
+            duplicates=received - inserted,
+            categorized=categorized,
+        )
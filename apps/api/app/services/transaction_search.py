@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import re
+from datetime import date, datetime
+from typing import Optional, Sequence
+from uuid import UUID
+
+from sqlalchemy import (
+    Float, Numeric, Row, Select, cast, column, func, literal, literal_column, or_, select, table, tuple_, type_coerce,
+)
+from sqlalchemy.orm import Session
+
+from app.core.pagination import decode_cursor, encode_cursor
+from app.core.serialization import build_rows
+from app.db.partitions import day_bounds
+from app.exceptions.pagination import InvalidCursorError
+from app.models.transaction import FTS_TABLE, SEARCH_DOCUMENT_SQL, Transaction
+from app.schemas.transaction import TransactionSearchHit, TransactionSearchPage
+
+SEARCH_COLUMNS = [getattr(Transaction, name) for name in TransactionSearchHit.model_fields if name != "rank"]
+MAX_QUERY_TERMS = 8
+# Ranks are rounded so the cursor can compare them exactly.
+RANK_DIGITS = 6
+_TERM = re.compile(r"\w+")
+
+def fts5_query(q: str) -> Optional[str]:
+    """
+    FTS5 MATCH expression for free text: every word as a quoted prefix term,
+    all required. Quoting keeps FTS5 syntax in user input from being parsed.
+    """
+    terms = _TERM.findall(q)[:MAX_QUERY_TERMS]
+    return " ".join(f'"{term}"*' for term in terms) or None
+
+def _postgres_hits(q: str) -> Select:
+    """
+    Full-text match on the indexed tsvector, or a fuzzy (trigram word
+    similarity) match on merchant; rank is the better of the two scores.
+    """
+    document = literal_column(SEARCH_DOCUMENT_SQL)
+    tsquery = func.websearch_to_tsquery(literal_column("'simple'"), q)
+    score = func.greatest(
+        func.ts_rank(document, tsquery),
+        func.word_similarity(q, func.coalesce(Transaction.merchant, "")),
+    )
+    rank = cast(func.round(cast(score, Numeric), RANK_DIGITS), Float)
+    return (
+        select(*SEARCH_COLUMNS, rank.label("rank"))
+        .where(or_(document.op("@@")(tsquery), literal(q).op("<%")(Transaction.merchant)))
+    )
+
+def _sqlite_hits(q: str) -> Select:
+    """FTS5 fallback (tests, local runs): word-prefix match, ranked by bm25 (lower is better)."""
+    fts = table(FTS_TABLE, column("rowid"))
+    # MATCH and bm25() take the FTS table itself (i.e. its hidden column of the same name).
+    fts_table = literal_column(FTS_TABLE)
+    rank = type_coerce(func.round(-func.bm25(fts_table), RANK_DIGITS), Float)
+    return (
+        select(*SEARCH_COLUMNS, rank.label("rank"))
+        .join_from(Transaction, fts, fts.c.rowid == literal_column("transactions.rowid"))
+        .where(fts_table.op("MATCH")(fts5_query(q)))
+    )
+
+def _search_query(
+    dialect_name: str,
+    user_id: UUID,
+    q: str,
+    date_from: Optional[date],
+    date_to: Optional[date],
+    limit: int,
+    cursor: Optional[str],
+) -> Select:
+    """
+    One page of the user's matching transactions ordered by (rank, date, id)
+    descending, as a keyset query. Fetches one extra row to know whether
+    another page exists.
+    """
+    inner = _postgres_hits(q) if dialect_name == "postgresql" else _sqlite_hits(q)
+    start, end = day_bounds(date_from, date_to)
+    inner = inner.where(Transaction.user_id == user_id)
+    if start is not None:
+        inner = inner.where(Transaction.date >= start)
+    if end is not None:
+        inner = inner.where(Transaction.date < end)
+
+    hits = inner.subquery("hits")
+    stmt = (
+        select(hits)
+        .order_by(hits.c.rank.desc(), hits.c.date.desc(), hits.c.id.desc())
+        .limit(limit + 1)
+    )
+    if cursor:
+        rank_value, posted, transaction_id = decode_cursor(cursor, size=3)
+        try:
+            after = (float(rank_value), datetime.fromisoformat(posted), UUID(transaction_id))
+        except ValueError:
+            raise InvalidCursorError() from None
+        key_types = [Float(), Transaction.date.type, Transaction.id.type]
+        stmt = stmt.where(tuple_(hits.c.rank, hits.c.date, hits.c.id) < tuple_(*after, types=key_types))
+    return stmt
+
+def _to_page(rows: Sequence[Row], limit: int) -> TransactionSearchPage:
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].rank, rows[-1].date, rows[-1].id)
+    return TransactionSearchPage.model_construct(items=build_rows(TransactionSearchHit, rows), next_cursor=next_cursor)
+
+class TransactionSearchService:
+    @staticmethod
+    def search(
+        db: Session,
+        user_id: UUID,
+        q: str,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+    ) -> TransactionSearchPage:
+        """
+        Rank the user's transactions in [date_from, date_to] (UTC days) by how
+        well description, merchant and notes match `q`. Postgres uses the GIN
+        full-text index plus trigram similarity on merchant (typos, partial
+        names); SQLite matches word prefixes through FTS5.
+        """
+        dialect_name = db.get_bind().dialect.name
+        if dialect_name != "postgresql" and fts5_query(q) is None:
+            return TransactionSearchPage(items=[])
+        stmt = _search_query(dialect_name, user_id, q, date_from, date_to, limit, cursor)
+        return _to_page(db.execute(stmt).all(), limit)
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import uuid
+from decimal import Decimal
+from typing import Any, Dict, List, Sequence, Union
+from uuid import UUID
+
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+
+from app.exceptions.account import AccountNotFoundError
+from app.exceptions.base import DomainError
+from app.exceptions.transfer import SameAccountTransferError, TransferCurrencyMismatchError
+from app.models.account import Account
+from app.models.transaction import Transaction, TransactionSource, TransactionType
+from app.schemas.errors import ErrorResponse
+from app.schemas.transfer import TransferBatchItem, TransferBatchResult, TransferCreate, TransferRead
+from app.services.transaction_deltas import DeltaKey, TransactionDeltas, month_of, to_utc
+from app.services.transaction_hooks import apply_transaction_deltas
+
+def _account_currencies(db: Session, user_id: UUID, transfers: Sequence[TransferCreate]) -> Dict[UUID, str]:
+    """Currency of every account the transfers touch that the user owns, in one query."""
+    account_ids = {t.from_account_id for t in transfers} | {t.to_account_id for t in transfers}
+    rows = db.execute(
+        select(Account.id, Account.currency).where(Account.user_id == user_id, Account.id.in_(account_ids))
+    )
+    return {account_id: currency for account_id, currency in rows}
+
+def _validate(transfer: TransferCreate, currencies: Dict[UUID, str]) -> DomainError | None:
+    if transfer.from_account_id == transfer.to_account_id:
+        return SameAccountTransferError()
+    missing = [str(a) for a in (transfer.from_account_id, transfer.to_account_id) if a not in currencies]
+    if missing:
+        return AccountNotFoundError(meta={"account_ids": missing})
+    source, target = currencies[transfer.from_account_id], currencies[transfer.to_account_id]
+    if source != target:
+        return TransferCurrencyMismatchError(meta={"from_currency": source, "to_currency": target})
+    return None
+
+def _leg(user_id: UUID, group_id: UUID, account_id: UUID, type_: TransactionType, transfer: TransferCreate) -> Dict[str, Any]:
+    return {
+        "id": uuid.uuid4(),
+        "user_id": user_id,
+        "account_id": account_id,
+        "category_id": None,
+        "transfer_group_id": group_id,
+        "type": type_,
+        "amount": transfer.amount.quantize(Decimal("0.01")),
+        "date": to_utc(transfer.date),
+        "description": transfer.description,
+        "notes": transfer.notes,
+        "source": TransactionSource.manual,
+    }
+
+def _post(db: Session, user_id: UUID, transfers: Sequence[TransferCreate]) -> List[Union[TransferRead, DomainError]]:
+    """
+    Validate every transfer against one ownership query, then write both legs
+    of all valid ones with a single multi-row INSERT and one commit.
+    """
+    currencies = _account_currencies(db, user_id, transfers)
+    outcomes: List[Union[TransferRead, DomainError]] = []
+    values: List[Dict[str, Any]] = []
+    deltas = TransactionDeltas()
+    for transfer in transfers:
+        error = _validate(transfer, currencies)
+        if error is not None:
+            outcomes.append(error)
+            continue
+        group_id = uuid.uuid4()
+        expense = _leg(user_id, group_id, transfer.from_account_id, TransactionType.expense, transfer)
+        income = _leg(user_id, group_id, transfer.to_account_id, TransactionType.income, transfer)
+        values += [expense, income]
+        for leg in (expense, income):
+            key = DeltaKey(user_id, leg["account_id"], None, leg["type"], month_of(leg["date"]), transfer=True)
+            deltas.add(key, leg["amount"], 1)
+        outcomes.append(TransferRead(
+            transfer_group_id=group_id,
+            from_account_id=transfer.from_account_id,
+            to_account_id=transfer.to_account_id,
+            amount=expense["amount"],
+            date=expense["date"],
+            expense_transaction_id=expense["id"],
+            income_transaction_id=income["id"],
+        ))
+    if values:
+        db.execute(insert(Transaction), values)
+        # Core inserts skip the ORM flush hooks (see TransactionImportService).
+        apply_transaction_deltas(db.connection(), deltas)
+        db.commit()
+    return outcomes
+
+class TransferService:
+    @staticmethod
+    def create_transfer(db: Session, user_id: UUID, data: TransferCreate) -> TransferRead:
+        """
+        Move money between two of the user's accounts: an expense leg on the
+        source and an income leg on the destination, committed together.
+        """
+        outcome = _post(db, user_id, [data])[0]
+        if isinstance(outcome, DomainError):
+            raise outcome
+        return outcome
+
+    @staticmethod
+    def create_transfers(db: Session, user_id: UUID, transfers: Sequence[TransferCreate]) -> TransferBatchResult:
+        """
+        Post many transfers at once. Invalid transfers are reported by index
+        and skipped; the valid ones are written in the same commit.
+        """
+        results = []
+        for index, outcome in enumerate(_post(db, user_id, transfers)):
+            if isinstance(outcome, DomainError):
+                error = ErrorResponse(code=outcome.code, detail=outcome.detail, meta=outcome.meta or None)
+                results.append(TransferBatchItem(index=index, status="failed", error=error))
+            else:
+                results.append(TransferBatchItem(index=index, status="created", transfer=outcome))
+        created = sum(1 for r in results if r.status == "created")
+        return TransferBatchResult(created=created, failed=len(results) - created, results=results)
@@ -1,9 +1,99 @@
+from datetime import datetime
+from typing import AsyncIterator, Iterator, Optional, Sequence
 from uuid import UUID, uuid4
-from app.core.security import pwd_context
+from app.core.conditional import CollectionVersion
+from app.core.pagination import encode_cursor, decode_cursor
+from app.core.serialization import build_rows
+from app.core.security import password_hasher
+from sqlalchemy import Row, Select, func, or_, select, tuple_
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.exceptions.pagination import InvalidCursorError
 from app.exceptions.user import UsernameAlreadyExistsError, EmailAlreadyExistsError, UserNotFoundError
 from app.models.user import User
-from app.schemas.user import UserCreate
+from app.schemas.user import UserCreate, UserPage, UserRead
+
+def _like_prefix(value: str) -> str:
+    """
+    LIKE pattern matching values that start with `value` (escape char '/').
+    Built client-side so Postgres can plan it against the *_prefix indexes.
+    """
+    return value.replace("/", "//").replace("%", "/%").replace("_", "/_") + "%"
+
+# Only the columns UserRead exposes; pages and exports never load password hashes or ORM state.
+USER_READ_COLUMNS = [getattr(User, name) for name in UserRead.model_fields]
+EXPORT_BATCH_SIZE = 1000
+
+def _filter_users(
+    stmt: Select,
+    username_prefix: Optional[str] = None,
+    email_prefix: Optional[str] = None,
+) -> Select:
+    if username_prefix:
+        stmt = stmt.where(User.username.like(_like_prefix(username_prefix), escape="/"))
+    if email_prefix:
+        stmt = stmt.where(User.email.like(_like_prefix(email_prefix), escape="/"))
+    return stmt
+
+def _users_export_query(
+    username_prefix: Optional[str] = None,
+    email_prefix: Optional[str] = None,
+) -> Select:
+    """
+    Full ordered scan for exports, read through a server-side cursor.
+    """
+    stmt = select(*USER_READ_COLUMNS).order_by(User.created_at, User.id)
+    stmt = _filter_users(stmt, username_prefix, email_prefix)
+    return stmt.execution_options(yield_per=EXPORT_BATCH_SIZE)
+
+def _users_page_query(
+    limit: int,
+    cursor: Optional[str] = None,
+    username_prefix: Optional[str] = None,
+    email_prefix: Optional[str] = None,
+) -> Select:
+    """
+    Keyset query for one page of users ordered by (created_at, id).
+    Fetches one extra row to know whether another page exists.
+    """
+    stmt = select(*USER_READ_COLUMNS).order_by(User.created_at, User.id).limit(limit + 1)
+    if cursor:
+        created_at, user_id = decode_cursor(cursor, size=2)
+        try:
+            after = (datetime.fromisoformat(created_at), UUID(user_id))
+        except ValueError:
+            raise InvalidCursorError() from None
+        key_types = [User.created_at.type, User.id.type]
+        stmt = stmt.where(tuple_(User.created_at, User.id) > tuple_(*after, types=key_types))
+    return _filter_users(stmt, username_prefix, email_prefix)
+
+def _users_version_query(
+    username_prefix: Optional[str] = None,
+    email_prefix: Optional[str] = None,
+) -> Select:
+    """Row count and newest updated_at of the matching users (see app.core.conditional)."""
+    stmt = select(func.count(), func.max(User.updated_at)).select_from(User)
+    return _filter_users(stmt, username_prefix, email_prefix)
+
+def _to_page(rows: Sequence[Row], limit: int) -> UserPage:
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id)
+    # Items are validated once, from the rows; the page wrapper needs no check.
+    return UserPage.model_construct(items=build_rows(UserRead, rows), next_cursor=next_cursor)
+
+def _conflicts_query(data: UserCreate) -> Select:
+    """Users holding the new username or email: both uniqueness checks in one query."""
+    return select(User.username, User.email).where(
+        or_(User.username == data.username, User.email == data.email)
+    ).limit(2)
+
+def _check_unique(conflicts: Sequence[Row], data: UserCreate) -> None:
+    if any(row.username == data.username for row in conflicts):
+        raise UsernameAlreadyExistsError()
+    if conflicts:
+        raise EmailAlreadyExistsError()
 
 class UserService:
     @staticmethod
@@ -14,11 +104,8 @@ class UserService:
         """
         Create a new user in the database.
         """
-        if db.query(User).filter(User.username == data.username).first():
-            raise UsernameAlreadyExistsError()
-        if db.query(User).filter(User.email == data.email).first():
-            raise EmailAlreadyExistsError()
-        password_hash = pwd_context.hash(data.password)
+        _check_unique(db.execute(_conflicts_query(data)).all(), data)
+        password_hash = password_hasher.hash(data.password)
         user = User(
             name=data.name,
             lastname=data.lastname,
@@ -33,9 +120,105 @@ class UserService:
     
     @staticmethod
     def get_users(
-        db: Session
-    ) -> list:
+        db: Session,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        username_prefix: Optional[str] = None,
+        email_prefix: Optional[str] = None,
+    ) -> UserPage:
+        """
+        Retrieve one page of users, optionally filtered by username/email prefix.
+        """
+        stmt = _users_page_query(limit, cursor, username_prefix, email_prefix)
+        return _to_page(db.execute(stmt).all(), limit)
+
+    @staticmethod
+    def get_users_version(
+        db: Session,
+        username_prefix: Optional[str] = None,
+        email_prefix: Optional[str] = None,
+    ) -> CollectionVersion:
+        """
+        Validator of the users listing (count and newest updated_at, one aggregate query).
+        """
+        count, updated_at = db.execute(_users_version_query(username_prefix, email_prefix)).one()
+        return CollectionVersion(count, updated_at)
+
+    @staticmethod
+    def iter_users(
+        db: Session,
+        username_prefix: Optional[str] = None,
+        email_prefix: Optional[str] = None,
+    ) -> Iterator[Sequence[Row]]:
+        """
+        Stream every matching user in batches, without buffering the table.
+        """
+        result = db.execute(_users_export_query(username_prefix, email_prefix))
+        yield from result.partitions()
+
+class AsyncUserService:
+    """
+    Async counterpart of UserService, used when the API runs on the AsyncEngine.
+    """
+    @staticmethod
+    async def create_user(
+        db: AsyncSession,
+        data: UserCreate
+    ) -> User:
+        """
+        Create a new user in the database.
+        """
+        _check_unique((await db.execute(_conflicts_query(data))).all(), data)
+        password_hash = await password_hasher.ahash(data.password)
+        user = User(
+            name=data.name,
+            lastname=data.lastname,
+            username=data.username,
+            email=data.email,
+            password_hash=password_hash
+        )
+        db.add(user)
+        await db.commit()
+        await db.refresh(user)
+        return user
+
+    @staticmethod
+    async def get_users(
+        db: AsyncSession,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        username_prefix: Optional[str] = None,
+        email_prefix: Optional[str] = None,
+    ) -> UserPage:
+        """
+        Retrieve one page of users, optionally filtered by username/email prefix.
+        """
+        stmt = _users_page_query(limit, cursor, username_prefix, email_prefix)
+        result = await db.execute(stmt)
+        return _to_page(result.all(), limit)
+
+    @staticmethod
+    async def get_users_version(
+        db: AsyncSession,
+        username_prefix: Optional[str] = None,
+        email_prefix: Optional[str] = None,
+    ) -> CollectionVersion:
+        """
+        Validator of the users listing (count and newest updated_at, one aggregate query).
+        """
+        result = await db.execute(_users_version_query(username_prefix, email_prefix))
+        count, updated_at = result.one()
+        return CollectionVersion(count, updated_at)
+
+    @staticmethod
+    async def iter_users(
+        db: AsyncSession,
+        username_prefix: Optional[str] = None,
+        email_prefix: Optional[str] = None,
+    ) -> AsyncIterator[Sequence[Row]]:
         """
-        Retrieve all users from the database.
+        Stream every matching user in batches, without buffering the table.
         """
-        return db.query(User).all()
\ No newline at end of file
+        result = await db.stream(_users_export_query(username_prefix, email_prefix))
+        async for partition in result.partitions():
+            yield partition
@@ -0,0 +1,130 @@
+"""
+Vectorized analytics (column fetch + NumPy) against a pure-ORM baseline
+(load Transaction objects, aggregate in Python loops) on synthetic rows.
+
+Runs against --database-url / BENCH_DATABASE_URL (e.g. a local Postgres
+scratch database; see benchmarks.harness) and otherwise a throwaway SQLite
+file as stand-in:
+
+    uv run python -m benchmarks.analytics --rows 1000000
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import time
+import uuid
+from collections import defaultdict
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+
+from benchmarks.harness import add_database_argument, reset_schema, use_scratch_database
+
+use_scratch_database()
+
+from sqlalchemy import insert, select
+
+from app.db.base import Account, Base, Transaction, User
+from app.db.session import SessionLocal, engine
+from app.models.account import AccountType
+from app.models.transaction import TransactionSource, TransactionType
+from app.services.analytics import Granularity, cash_flow, fetch_columns, rolling_average, top_merchants
+
+MERCHANTS = [f"Merchant {i}" for i in range(2_000)]
+
+
+def seed(rows: int, seed_value: int = 42) -> uuid.UUID:
+    """Insert `rows` transactions for one user with Core executemany (no ORM, no hooks)."""
+    reset_schema(Base.metadata, engine)
+    rng = random.Random(seed_value)
+    user_id, account_id = uuid.uuid4(), uuid.uuid4()
+    start = datetime(2016, 1, 1, tzinfo=timezone.utc)
+    with engine.begin() as conn:
+        conn.execute(insert(User), [{
+            "id": user_id, "name": "Bench", "lastname": "User", "username": "bench",
+            "email": "bench@example.com", "password_hash": "x",
+        }])
+        conn.execute(insert(Account), [{
+            "id": account_id, "user_id": user_id, "name": "Checking",
+            "type": AccountType.debit, "currency": "MXN",
+        }])
+        batch = []
+        for i in range(rows):
+            batch.append({
+                "id": uuid.uuid4(),
+                "user_id": user_id,
+                "account_id": account_id,
+                "type": TransactionType.income if rng.random() < 0.1 else TransactionType.expense,
+                "amount": Decimal(rng.randrange(100, 500_000)).scaleb(-2),
+                "date": start + timedelta(seconds=rng.randrange(10 * 365 * 86_400)),
+                "merchant": rng.choice(MERCHANTS),
+                "source": TransactionSource.imported,
+            })
+            if len(batch) == 50_000:
+                conn.execute(insert(Transaction), batch)
+                batch.clear()
+        if batch:
+            conn.execute(insert(Transaction), batch)
+    return user_id
+
+
+def orm_baseline(user_id: uuid.UUID) -> dict:
+    """What the reports would cost written naively against ORM objects."""
+    with SessionLocal() as db:
+        months = defaultdict(lambda: [Decimal("0"), Decimal("0")])
+        daily = defaultdict(Decimal)
+        merchants = defaultdict(Decimal)
+        for tx in db.scalars(select(Transaction).where(Transaction.user_id == user_id)):
+            when = tx.date.astimezone(timezone.utc) if tx.date.tzinfo else tx.date
+            month = date(when.year, when.month, 1)
+            signed = tx.amount if tx.type is TransactionType.income else -tx.amount
+            months[month][tx.type is TransactionType.expense] += tx.amount
+            daily[when.date()] += signed
+            if tx.type is TransactionType.expense and tx.merchant:
+                merchants[tx.merchant] += tx.amount
+        running = Decimal("0")
+        for month in sorted(months):
+            running += months[month][0] - months[month][1]
+        top = sorted(merchants.items(), key=lambda kv: -kv[1])[:10]
+    return {"months": len(months), "days": len(daily), "top": top[0][0] if top else None}
+
+
+def vectorized(user_id: uuid.UUID) -> dict:
+    with SessionLocal() as db:
+        cols = fetch_columns(db, user_id)
+    fetched = time.perf_counter()
+    months = cash_flow(cols, Granularity.month)
+    days = rolling_average(cols, 30)
+    top = top_merchants(cols, 10, TransactionType.expense)
+    return {"months": len(months), "days": len(days), "top": top[0].merchant if top else None, "_fetched": fetched}
+
+
+def timed(fn, *args):
+    started = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - started, started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--skip-orm", action="store_true", help="only time the vectorized path")
+    add_database_argument(parser)
+    args = parser.parse_args()
+
+    print(f"database: {engine.url.render_as_string(hide_password=True)}")
+    started = time.perf_counter()
+    user_id = seed(args.rows)
+    print(f"seeded {args.rows} rows in {time.perf_counter() - started:.1f}s")
+
+    result, seconds, began = timed(vectorized, user_id)
+    fetch = result.pop("_fetched") - began
+    print(f"vectorized: {seconds:>7.2f}s (fetch {fetch:.2f}s, compute {seconds - fetch:.2f}s) -> {result}")
+    if not args.skip_orm:
+        baseline, orm_seconds, _ = timed(orm_baseline, user_id)
+        print(f"       orm: {orm_seconds:>7.2f}s -> {baseline}")
+        print(f"   speedup: {orm_seconds / seconds:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Rule-based categorization of an import batch: `--rows` synthetic statement
+lines (default 100k) against `--rules` keyword rules (default 1k).
+
+* `categorize.per_rule`: the naive loop, one compiled regex per rule tried
+  in turn on every row (on `--baseline-rows`, it is slow)
+* `categorize.matcher`: `RuleMatcher.assign`, all rules in one trie-shaped
+  regex, one scan per row
+* `categorize.build`: compiling the matcher (what a rule change costs)
+
+Results are in seconds per row; `ops_per_sec` is rows/s:
+
+    uv run python -m benchmarks.categorize --output categorize.json
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import re
+import sys
+import uuid
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.services.categorization import RuleMatcher
+from benchmarks.harness import Result, compare, environment, format_seconds, load_results, measure, write_results
+
+SYLLABLES = ["ca", "fe", "mar", "to", "lu", "pe", "xo", "ri", "ban", "co", "sol", "ta", "ve", "ni", "gar", "mo"]
+# Filler made of letters no syllable uses, so only the chosen keyword can match.
+FILLER = "dhjkqwyz"
+
+
+def make_rules(count: int, rng: random.Random) -> List[Tuple[Optional[uuid.UUID], uuid.UUID, str]]:
+    categories = [uuid.uuid4() for _ in range(40)]
+    keywords = set()
+    while len(keywords) < count:
+        name = "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4)))
+        keywords.add(f"{name} {rng.choice(SYLLABLES)}{rng.choice(SYLLABLES)}" if rng.random() < 0.3 else name)
+    return [(None, rng.choice(categories), keyword) for keyword in sorted(keywords)]
+
+
+def make_rows(count: int, keywords: List[str], rng: random.Random, hit_ratio: float = 0.7) -> List[Dict[str, Any]]:
+    rows = []
+    for i in range(count):
+        merchant = rng.choice(keywords).upper() if rng.random() < hit_ratio else "".join(rng.choices(FILLER, k=8))
+        rows.append({
+            "category_id": None,
+            "merchant": f"POS*{merchant} #{i % 9973}",
+            "description": f"{''.join(rng.choices(FILLER, k=6))} {rng.randrange(10**6):06d}",
+        })
+    return rows
+
+
+def per_rule(rules: List[Tuple[Optional[uuid.UUID], uuid.UUID, str]], rows: List[Dict[str, Any]]) -> int:
+    """The baseline: first rule whose regex matches, one search per rule."""
+    compiled = [
+        (re.compile(rf"(?<!\w){re.escape(keyword)}(?!\w)", re.IGNORECASE), category_id)
+        for _, category_id, keyword in rules
+    ]
+    assigned = 0
+    for row in rows:
+        text = f"{row['merchant'] or ''}\n{row['description'] or ''}"
+        for pattern, category_id in compiled:
+            if pattern.search(text):
+                row["category_id"] = category_id
+                assigned += 1
+                break
+    return assigned
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--rules", type=int, default=1000)
+    parser.add_argument("--baseline-rows", type=int, default=5000)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--output", default="categorize-results.json")
+    parser.add_argument("--compare", metavar="BASELINE_JSON")
+    parser.add_argument("--threshold", type=float, default=0.2, help="median slowdown that counts as a regression")
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    rules = make_rules(args.rules, rng)
+    rows = make_rows(args.rows, [keyword for _, _, keyword in rules], rng)
+    baseline_rows = rows[:args.baseline_rows]
+    user_id = uuid.uuid4()
+    matcher = RuleMatcher.build(user_id, rules)
+
+    def reset() -> None:
+        for row in rows:
+            row["category_id"] = None
+
+    per_rule_samples = measure(lambda: per_rule(rules, baseline_rows), repeats=args.repeats, setup=reset)
+    reset()
+    per_rule_assigned = per_rule(rules, baseline_rows)
+    matcher_samples = measure(lambda: matcher.assign(rows), repeats=args.repeats, setup=reset)
+    reset()
+    matcher_assigned = matcher.assign(rows)
+    results = [
+        Result.from_samples("categorize.per_rule", {"rows": len(baseline_rows), "rules": args.rules},
+                            per_rule_samples, ops=len(baseline_rows), assigned=per_rule_assigned),
+        Result.from_samples("categorize.matcher", {"rows": args.rows, "rules": args.rules},
+                            matcher_samples, ops=args.rows, assigned=matcher_assigned),
+        Result.from_samples("categorize.build", {"rules": args.rules},
+                            measure(lambda: RuleMatcher.build(user_id, rules), repeats=args.repeats)),
+    ]
+    for result in results:
+        print(f"{result.key:<44} median {format_seconds(result.median):>9} "
+              f"{result.ops_per_sec:>14,.0f} ops/s  {result.extra}")
+
+    write_results(args.output, environment("n/a"), results)
+    print(f"results written to {args.output}")
+    if args.compare:
+        regressions = compare(load_results(args.compare), results, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} regression(s) over {args.threshold:.0%}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
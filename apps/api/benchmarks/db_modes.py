@@ -0,0 +1,101 @@
+"""
+Requests/second of the sync (threadpool + Session) and async (AsyncEngine +
+AsyncSession) request paths, side by side.
+
+Runs against --database-url / BENCH_DATABASE_URL (e.g. a local Postgres
+scratch database; see benchmarks.harness) and otherwise a throwaway SQLite
+file as stand-in:
+
+    uv run python -m benchmarks.db_modes --requests 2000 --concurrency 64
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+
+from benchmarks.harness import add_database_argument, reset_schema, use_scratch_database
+
+use_scratch_database()
+
+import httpx
+
+from app.core.security import pwd_context
+from app.db.base import Base
+from app.db.session import engine, async_engine, SessionLocal
+from app.main import create_app
+from app.models.user import User
+
+
+def seed_users(count: int) -> None:
+    reset_schema(Base.metadata, engine)
+    password_hash = pwd_context().hash("password123")
+    with SessionLocal() as db:
+        db.add_all(
+            User(
+                name="Bench",
+                lastname="User",
+                username=f"bench{i}",
+                email=f"bench{i}@example.com",
+                password_hash=password_hash,
+            )
+            for i in range(count)
+        )
+        db.commit()
+
+
+async def run_mode(db_async: bool, requests: int, concurrency: int) -> dict:
+    app = create_app(db_async=db_async)
+    transport = httpx.ASGITransport(app=app)
+    queue: asyncio.Queue[int] = asyncio.Queue()
+    for i in range(requests):
+        queue.put_nowait(i)
+    errors = 0
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        await client.get("/api/v1/users")  # warm up pool and routes
+
+        async def worker() -> None:
+            nonlocal errors
+            while not queue.empty():
+                queue.get_nowait()
+                res = await client.get("/api/v1/users")
+                if res.status_code != 200:
+                    errors += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    return {
+        "mode": "async" if db_async else "sync",
+        "requests": requests,
+        "concurrency": concurrency,
+        "seconds": round(elapsed, 3),
+        "rps": round(requests / elapsed, 1),
+        "errors": errors,
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--users", type=int, default=50, help="rows returned by each GET /users")
+    add_database_argument(parser)
+    args = parser.parse_args()
+
+    seed_users(args.users)
+    print(f"database: {engine.url.render_as_string(hide_password=True)}")
+    for db_async in (False, True):
+        result = await run_mode(db_async, args.requests, args.concurrency)
+        print(
+            f"{result['mode']:>5}: {result['rps']:>8} req/s "
+            f"({result['requests']} requests, concurrency {result['concurrency']}, "
+            f"{result['errors']} errors, {result['seconds']}s)"
+        )
+    await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,219 @@
+"""
+Shared pieces of the benchmark scripts: the scratch database they run
+against, timing with warmup and repeats, summary statistics,
+machine-readable results and run-to-run comparison.
+
+Benchmarks drop and recreate every table, so they never use DATABASE_URL:
+scripts call `use_scratch_database()` before importing the app, which takes
+`--database-url` or BENCH_DATABASE_URL (refusing databases whose name does
+not say they are scratch) and otherwise creates a throwaway SQLite file.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Sequence, Union
+
+from sqlalchemy import MetaData
+from sqlalchemy.engine import URL, Engine, make_url
+
+BENCH_DATABASE_ENV = "BENCH_DATABASE_URL"
+# A database benchmarks may wipe has one of these in its name (or file name).
+SCRATCH_MARKERS = ("bench", "scratch")
+
+
+def is_scratch_database(url: Union[str, URL]) -> bool:
+    url = make_url(url)
+    database = url.database or ""
+    if url.get_backend_name() == "sqlite" and database in ("", ":memory:"):
+        return True
+    name = os.path.basename(database).lower()
+    return any(marker in name for marker in SCRATCH_MARKERS)
+
+
+def add_database_argument(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--database-url", metavar="URL",
+        help=f"scratch database whose tables are dropped and reseeded (default ${BENCH_DATABASE_ENV}, "
+             f"else a throwaway SQLite file); its name must contain {' or '.join(SCRATCH_MARKERS)}",
+    )
+
+
+def use_scratch_database() -> str:
+    """
+    Set DATABASE_URL for this process and the servers it spawns to the
+    benchmark database; call before anything imports the app. Exits when the
+    requested database is not a scratch one.
+    """
+    parser = argparse.ArgumentParser(add_help=False)
+    add_database_argument(parser)
+    url = parser.parse_known_args()[0].database_url or os.getenv(BENCH_DATABASE_ENV)
+    if not url:
+        url = f"sqlite:///{tempfile.mkdtemp(prefix='finance-bench-')}/bench.db"
+    elif not is_scratch_database(url):
+        sys.exit(
+            f"refusing to benchmark against {make_url(url).render_as_string(hide_password=True)}: "
+            f"benchmarks drop every table, so the database name must contain {' or '.join(SCRATCH_MARKERS)}"
+        )
+    os.environ["DATABASE_URL"] = url
+    # Replicas of some other database would serve reads the seed never wrote.
+    os.environ["DATABASE_REPLICA_URLS"] = ""
+    return url
+
+
+def reset_schema(metadata: MetaData, engine: Engine) -> None:
+    """Drop and recreate every table (checked again here, this is the destructive step)."""
+    if not is_scratch_database(engine.url):
+        raise RuntimeError(f"not a scratch database: {engine.url.render_as_string(hide_password=True)}")
+    metadata.drop_all(bind=engine)
+    metadata.create_all(bind=engine)
+
+
+def percentile(sorted_values: Sequence[float], q: float) -> float:
+    """Nearest-rank percentile (q in 0..100) of already sorted values."""
+    if not sorted_values:
+        return float("nan")
+    rank = max(1, min(len(sorted_values), round(q / 100 * len(sorted_values) + 0.5)))
+    return sorted_values[rank - 1]
+
+
+@dataclass
+class Result:
+    name: str
+    params: Dict[str, Any]
+    repeats: int
+    # seconds per operation
+    min: float
+    median: float
+    mean: float
+    p95: float
+    stdev: float
+    ops_per_sec: float
+    extra: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def key(self) -> str:
+        params = ",".join(f"{k}={v}" for k, v in sorted(self.params.items()))
+        return f"{self.name}[{params}]" if params else self.name
+
+    @classmethod
+    def from_samples(cls, name: str, params: Dict[str, Any], samples: List[float], ops: int = 1, **extra: Any) -> "Result":
+        """`samples` are seconds per repeat; each repeat ran `ops` operations."""
+        per_op = sorted(s / ops for s in samples)
+        median = statistics.median(per_op)
+        return cls(
+            name=name,
+            params=params,
+            repeats=len(samples),
+            min=per_op[0],
+            median=median,
+            mean=statistics.fmean(per_op),
+            p95=percentile(per_op, 95),
+            stdev=statistics.stdev(per_op) if len(per_op) > 1 else 0.0,
+            ops_per_sec=1 / median if median else float("inf"),
+            extra=extra,
+        )
+
+
+def measure(
+    fn: Callable[[], Any],
+    repeats: int,
+    warmup: int = 1,
+    setup: Optional[Callable[[], Any]] = None,
+) -> List[float]:
+    """
+    Seconds taken by each of `repeats` calls of `fn`, after `warmup` untimed
+    calls. `setup` runs before every call, outside the timing.
+    """
+    samples: List[float] = []
+    for i in range(warmup + repeats):
+        if setup is not None:
+            setup()
+        started = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - started
+        if i >= warmup:
+            samples.append(elapsed)
+    return samples
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def environment(database_url: str) -> Dict[str, Any]:
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "database": database_url.split("://", 1)[0],
+        "argv": sys.argv[1:],
+    }
+
+
+def write_results(path: str, meta: Dict[str, Any], results: List[Result]) -> None:
+    with open(path, "w") as fh:
+        json.dump({"meta": meta, "results": [asdict(r) | {"key": r.key} for r in results]}, fh, indent=2)
+        fh.write("\n")
+
+
+def load_results(path: str) -> Dict[str, Dict[str, Any]]:
+    with open(path) as fh:
+        return {r["key"]: r for r in json.load(fh)["results"]}
+
+
+def compare(baseline: Dict[str, Dict[str, Any]], results: List[Result], threshold: float) -> List[str]:
+    """
+    Print median changes against a previous run; return the keys that got
+    slower by more than `threshold` (0.2 = 20%).
+    """
+    regressions: List[str] = []
+    print(f"\n{'benchmark':<58} {'baseline':>10} {'current':>10} {'change':>8}")
+    for result in results:
+        old = baseline.get(result.key)
+        if old is None:
+            print(f"{result.key:<58} {'-':>10} {format_seconds(result.median):>10} {'new':>8}")
+            continue
+        change = result.median / old["median"] - 1
+        flag = ""
+        if change > threshold:
+            regressions.append(result.key)
+            flag = "  REGRESSION"
+        print(
+            f"{result.key:<58} {format_seconds(old['median']):>10} "
+            f"{format_seconds(result.median):>10} {change:>+7.1%}{flag}"
+        )
+    return regressions
+
+
+def free_port() -> int:
+    """A TCP port on 127.0.0.1 that nothing listens on right now (for a server under test)."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def format_seconds(value: float) -> str:
+    if value >= 1:
+        return f"{value:.2f}s"
+    if value >= 1e-3:
+        return f"{value * 1e3:.2f}ms"
+    return f"{value * 1e6:.1f}us"
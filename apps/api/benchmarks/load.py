@@ -0,0 +1,372 @@
+"""
+Load generator: runs `app.main:app` under uvicorn (or targets --url) and
+drives it with a weighted mix of finance traffic from `--concurrency`
+concurrent clients for `--duration` seconds. Reports throughput, error rate
+and p50/p95/p99 latency per operation and overall, plus the server's DB pool
+wait (from /metrics), to size pool settings and worker counts.
+
+Seeds synthetic users, accounts and transactions first, into
+--database-url / BENCH_DATABASE_URL (a Postgres scratch database, see
+benchmarks.harness; its tables are dropped and recreated) and otherwise a
+throwaway SQLite file, which serializes writers: use Postgres for anything
+but a smoke run.
+
+    uv run python -m benchmarks.load --users 1000 --transactions 200 \\
+        --concurrency 64 --duration 60 --workers 4 \\
+        --mix signup=1,list_users=4,categories=4,import=2,category_report=4,cash_flow=2,balance=6
+
+Overload: compare p99 and the 503 share with and without admission control
+(the server's per-client token buckets are off, since every load client
+shares one address):
+
+    uv run python -m benchmarks.load --mix signup=1 --concurrency 200 --admission off
+    uv run python -m benchmarks.load --mix signup=1 --concurrency 200 --admission on
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+import subprocess
+import sys
+import time
+import uuid
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from benchmarks.harness import (
+    add_database_argument,
+    environment,
+    free_port,
+    percentile,
+    reset_schema,
+    use_scratch_database,
+)
+
+use_scratch_database()
+
+import httpx
+from sqlalchemy import insert
+
+from app.db.base import Account, Base, Transaction, User
+from app.db.session import SessionLocal, engine
+from app.models.account import AccountType
+from app.models.transaction import TransactionSource, TransactionType
+from app.services.balance import BalanceService
+from app.services.rollup import RollupService
+
+DEFAULT_MIX = "signup=1,list_users=4,categories=4,import=2,category_report=4,cash_flow=2,balance=6"
+SEED_BATCH_SIZE = 20_000
+MERCHANTS = [f"Merchant {i}" for i in range(500)]
+
+
+@dataclass(frozen=True)
+class SeededAccount:
+    user_id: str
+    account_id: str
+
+
+def seed(users: int, transactions_per_user: int, rng: random.Random) -> List[SeededAccount]:
+    """Users with one account each and `transactions_per_user` rows over ~3 years."""
+    reset_schema(Base.metadata, engine)
+    accounts: List[SeededAccount] = []
+    start = datetime(2023, 1, 1, tzinfo=timezone.utc)
+    batch: List[dict] = []
+    with engine.begin() as conn:
+        for i in range(users):
+            user_id, account_id = uuid.uuid4(), uuid.uuid4()
+            conn.execute(insert(User), [{
+                "id": user_id, "name": "Load", "lastname": "User", "username": f"load{i}",
+                "email": f"load{i}@example.com", "password_hash": "x",
+            }])
+            conn.execute(insert(Account), [{
+                "id": account_id, "user_id": user_id, "name": "Checking",
+                "type": AccountType.debit, "currency": "MXN",
+            }])
+            accounts.append(SeededAccount(str(user_id), str(account_id)))
+            for _ in range(transactions_per_user):
+                batch.append({
+                    "id": uuid.uuid4(),
+                    "user_id": user_id,
+                    "account_id": account_id,
+                    "type": TransactionType.income if rng.random() < 0.1 else TransactionType.expense,
+                    "amount": Decimal(rng.randrange(100, 500_000)).scaleb(-2),
+                    "date": start + timedelta(seconds=rng.randrange(3 * 365 * 86_400)),
+                    "merchant": rng.choice(MERCHANTS),
+                    "source": TransactionSource.imported,
+                })
+                if len(batch) == SEED_BATCH_SIZE:
+                    conn.execute(insert(Transaction), batch)
+                    batch.clear()
+        if batch:
+            conn.execute(insert(Transaction), batch)
+    # Core inserts bypass the flush hooks: derive balances and rollups once.
+    with SessionLocal() as db:
+        BalanceService.rebuild(db)
+        db.commit()
+        RollupService.backfill(db)
+    return accounts
+
+
+class Traffic:
+    """The operations of the mix; each returns the HTTP status it got."""
+
+    def __init__(self, client: httpx.AsyncClient, accounts: List[SeededAccount], rng: random.Random):
+        self.client = client
+        self.accounts = accounts
+        self.rng = rng
+        self.signups = 0
+
+    def _account(self) -> SeededAccount:
+        return self.rng.choice(self.accounts)
+
+    async def signup(self) -> int:
+        self.signups += 1
+        tag = f"{os.getpid()}x{self.signups}x{self.rng.randrange(10**9)}"
+        res = await self.client.post("/api/v1/users", json={
+            "name": "New", "lastname": "User", "username": f"s{tag}"[:32],
+            "email": f"s{tag}@example.com"[:50], "password": "password123",
+        })
+        return res.status_code
+
+    async def list_users(self) -> int:
+        return (await self.client.get("/api/v1/users", params={"limit": 50})).status_code
+
+    async def categories(self) -> int:
+        return (await self.client.get(f"/api/v1/users/{self._account().user_id}/categories")).status_code
+
+    async def import_(self) -> int:
+        account = self._account()
+        today = datetime.now(timezone.utc)
+        rows = [
+            {
+                "type": "expense",
+                "amount": f"{self.rng.randrange(100, 100_000) / 100:.2f}",
+                "date": (today - timedelta(minutes=self.rng.randrange(60 * 24 * 30))).isoformat(),
+                "merchant": self.rng.choice(MERCHANTS),
+                "external_id": uuid.uuid4().hex,
+            }
+            for _ in range(50)
+        ]
+        res = await self.client.post(
+            f"/api/v1/users/{account.user_id}/transactions/import",
+            json={"account_id": account.account_id, "rows": rows},
+        )
+        return res.status_code
+
+    async def category_report(self) -> int:
+        first = date(2023, 1, 1) + timedelta(days=self.rng.randrange(365))
+        params = {"from": first.isoformat(), "to": (first + timedelta(days=365)).isoformat()}
+        res = await self.client.get(f"/api/v1/users/{self._account().user_id}/reports/by-category", params=params)
+        return res.status_code
+
+    async def cash_flow(self) -> int:
+        res = await self.client.get(f"/api/v1/users/{self._account().user_id}/reports/cash-flow")
+        return res.status_code
+
+    async def balance(self) -> int:
+        account = self._account()
+        res = await self.client.get(f"/api/v1/users/{account.user_id}/accounts/{account.account_id}/balance")
+        return res.status_code
+
+    def operations(self) -> Dict[str, Callable[[], Awaitable[int]]]:
+        return {
+            "signup": self.signup,
+            "list_users": self.list_users,
+            "categories": self.categories,
+            "import": self.import_,
+            "category_report": self.category_report,
+            "cash_flow": self.cash_flow,
+            "balance": self.balance,
+        }
+
+
+def parse_mix(value: str) -> Dict[str, float]:
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        mix[name.strip()] = float(weight or 1)
+    return mix
+
+
+async def run_load(
+    base_url: str,
+    accounts: List[SeededAccount],
+    mix: Dict[str, float],
+    concurrency: int,
+    duration: float,
+    seed_value: int,
+) -> Tuple[Dict[str, List[float]], Dict[str, Dict[str, int]], float]:
+    """Latencies (seconds) and status counts per operation, and the elapsed time."""
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    statuses: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        async def worker(index: int) -> None:
+            rng = random.Random(seed_value + index)
+            operations = Traffic(client, accounts, rng).operations()
+            unknown = set(mix) - set(operations)
+            if unknown:
+                raise SystemExit(f"unknown operations in --mix: {sorted(unknown)}")
+            names, weights = list(mix), list(mix.values())
+            while time.perf_counter() < deadline:
+                name = rng.choices(names, weights)[0]
+                started = time.perf_counter()
+                try:
+                    status = str(await operations[name]())
+                except httpx.HTTPError as exc:
+                    status = type(exc).__name__
+                latencies[name].append(time.perf_counter() - started)
+                statuses[name][status] += 1
+
+        started = time.perf_counter()
+        deadline = started + duration
+        await asyncio.gather(*(worker(i) for i in range(concurrency)))
+        return latencies, statuses, time.perf_counter() - started
+
+
+def summarize(latencies: Dict[str, List[float]], statuses: Dict[str, Dict[str, int]], elapsed: float) -> dict:
+    def row(samples: List[float], counts: Dict[str, int]) -> dict:
+        ordered = sorted(samples)
+        total = len(ordered)
+        errors = sum(n for status, n in counts.items() if not status.startswith(("2", "3")))
+        return {
+            "requests": total,
+            "rps": round(total / elapsed, 1),
+            "error_rate": round(errors / total, 4) if total else 0.0,
+            "p50_ms": round(percentile(ordered, 50) * 1000, 2),
+            "p95_ms": round(percentile(ordered, 95) * 1000, 2),
+            "p99_ms": round(percentile(ordered, 99) * 1000, 2),
+            "max_ms": round(ordered[-1] * 1000, 2) if ordered else None,
+            "statuses": dict(counts),
+        }
+
+    operations = {name: row(latencies[name], statuses[name]) for name in sorted(latencies)}
+    everything: Dict[str, int] = defaultdict(int)
+    for counts in statuses.values():
+        for status, n in counts.items():
+            everything[status] += n
+    overall = row([s for samples in latencies.values() for s in samples], everything)
+    return {"elapsed_seconds": round(elapsed, 2), "overall": overall, "operations": operations}
+
+
+def pool_wait(base_url: str) -> Optional[dict]:
+    """Average DB pool checkout time seen by the (one) worker that answers /metrics."""
+    try:
+        text = httpx.get(f"{base_url}/metrics", timeout=10).text
+    except httpx.HTTPError:
+        return None
+    values = dict(re.findall(r'^(db_pool_wait_seconds_(?:sum|count)\{pool="sync"\}) (\S+)$', text, re.M))
+    total = float(values.get('db_pool_wait_seconds_sum{pool="sync"}', 0))
+    count = float(values.get('db_pool_wait_seconds_count{pool="sync"}', 0))
+    return {"checkouts": int(count), "avg_wait_ms": round(total / count * 1000, 3) if count else None}
+
+
+def start_server(workers: int, admission: bool = True) -> Tuple[subprocess.Popen, str]:
+    port = free_port()
+    env = os.environ | {
+        "SERVER_TIMING": "false",
+        "ADMISSION_CONTROL": str(admission).lower(),
+        "ADMISSION_SIGNUP_RATE": "0",
+        "ADMISSION_IMPORT_RATE": "0",
+    }
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--workers", str(workers), "--log-level", "warning", "--no-access-log"],
+        env=env,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    for _ in range(300):
+        if process.poll() is not None:
+            raise SystemExit("uvicorn exited during startup")
+        try:
+            httpx.get(f"{base_url}/metrics", timeout=1)
+            return process, base_url
+        except httpx.HTTPError:
+            time.sleep(0.1)
+    process.terminate()
+    raise SystemExit("uvicorn did not start within 30s")
+
+
+def print_report(report: dict) -> None:
+    header = f"{'operation':<16} {'requests':>9} {'req/s':>8} {'errors':>7} {'p50':>9} {'p95':>9} {'p99':>9}"
+    print(header)
+    print("-" * len(header))
+    for name, row in list(report["operations"].items()) + [("overall", report["overall"])]:
+        print(
+            f"{name:<16} {row['requests']:>9} {row['rps']:>8} {row['error_rate']:>7.2%} "
+            f"{row['p50_ms']:>7.1f}ms {row['p95_ms']:>7.1f}ms {row['p99_ms']:>7.1f}ms"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="target an already running server (skips seeding and uvicorn)")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--concurrency", type=int, default=32, help="concurrent clients")
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds of load")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="operation=weight,...")
+    parser.add_argument("--users", type=int, default=200, help="seeded users (one account each)")
+    parser.add_argument("--transactions", type=int, default=200, help="seeded transactions per user")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--admission", choices=["on", "off"], default="on",
+                        help="the server's admission control (concurrency limits and load shedding)")
+    parser.add_argument("--output", help="also write the report as JSON")
+    add_database_argument(parser)
+    args = parser.parse_args()
+    mix = parse_mix(args.mix)
+    rng = random.Random(args.seed)
+
+    process = None
+    if args.url:
+        base_url = args.url.rstrip("/")
+        with httpx.Client(base_url=base_url) as client:
+            accounts = [
+                SeededAccount(user["id"], "")
+                for user in client.get("/api/v1/users", params={"limit": 500}).json()["items"]
+            ]
+        mix.pop("balance", None)  # account ids are not discoverable over the API
+    else:
+        print(f"database: {engine.url.render_as_string(hide_password=True)}")
+        started = time.perf_counter()
+        accounts = seed(args.users, args.transactions, rng)
+        print(f"seeded {args.users} users / {args.users * args.transactions} transactions "
+              f"in {time.perf_counter() - started:.1f}s")
+        engine.dispose()
+        process, base_url = start_server(args.workers, admission=args.admission == "on")
+    try:
+        print(f"load: {args.concurrency} clients for {args.duration:.0f}s against {base_url} "
+              f"({args.workers} worker(s)), mix {mix}, admission {args.admission}")
+        latencies, statuses, elapsed = asyncio.run(
+            run_load(base_url, accounts, mix, args.concurrency, args.duration, args.seed)
+        )
+        report = summarize(latencies, statuses, elapsed)
+        report["pool"] = pool_wait(base_url)
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait(timeout=30)
+
+    print_report(report)
+    if report["pool"]:
+        print(f"db pool (one worker): {report['pool']['checkouts']} checkouts, "
+              f"avg wait {report['pool']['avg_wait_ms']} ms")
+    if args.output:
+        report["meta"] = environment(engine.url.render_as_string(hide_password=True)) | {
+            "workers": args.workers, "concurrency": args.concurrency, "duration": args.duration, "mix": mix,
+            "admission": args.admission,
+        }
+        with open(args.output, "w") as fh:
+            json.dump(report, fh, indent=2)
+            fh.write("\n")
+        print(f"report written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
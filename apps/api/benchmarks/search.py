@@ -0,0 +1,183 @@
+"""
+Transaction search: the indexed search (`GET /users/{user_id}/transactions/search`,
+full-text + trigram on Postgres, FTS5 on SQLite) against an `ILIKE '%q%'`
+baseline over description/merchant/notes, for one user among `--rows`
+synthetic transactions (default 10M, spread over `--users`).
+
+Postgres (--database-url / BENCH_DATABASE_URL, a scratch database, see
+benchmarks.harness) is seeded with generate_series in the database; the
+SQLite fallback inserts from Python, so keep `--rows` small there:
+
+    uv run python -m benchmarks.search --rows 10000000 --users 2000 --output search.json
+    uv run python -m benchmarks.search --rows 200000 --skip-seed   # reuse the seeded table
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from typing import List
+
+from benchmarks.harness import (
+    Result,
+    add_database_argument,
+    compare,
+    environment,
+    format_seconds,
+    load_results,
+    measure,
+    reset_schema,
+    use_scratch_database,
+    write_results,
+)
+
+use_scratch_database()
+
+from sqlalchemy import insert, or_, select, text
+
+from app.core.config import settings
+from app.db.base import Account, Base, Transaction, User
+from app.db.partitions import ensure_partitions
+from app.db.session import SessionLocal, engine
+from app.models.account import AccountType
+from app.models.transaction import TransactionSource, TransactionType
+from app.services.transaction_search import SEARCH_COLUMNS, TransactionSearchService
+
+BRANDS = ["Starbucks", "Oxxo", "Walmart", "Costco", "Liverpool", "Uber", "Netflix", "Spotify", "Amazon",
+          "Soriana", "Chedraui", "Sanborns", "Telcel", "Pemex", "Cinepolis", "Farmacias Guadalajara"]
+PLACES = ["Reforma", "Polanco", "Centro", "Roma", "Condesa", "Satelite", "Coyoacan", "Online"]
+WORDS = ["groceries", "coffee", "fuel", "rent", "subscription", "dinner", "pharmacy", "tickets",
+         "taxi", "phone", "gift", "books", "parking", "lunch", "hardware", "insurance"]
+# (label, query): exact brand, brand with a typo, description word, two words
+QUERIES = [("brand", "starbucks"), ("typo", "starbuks"), ("word", "pharmacy"), ("two_words", "coffee reforma")]
+SEED_BATCH_SIZE = 20_000
+
+
+def seed_accounts(users: int) -> List[uuid.UUID]:
+    reset_schema(Base.metadata, engine)
+    user_ids = [uuid.uuid4() for _ in range(users)]
+    with engine.begin() as conn:
+        conn.execute(insert(User), [
+            {"id": u, "name": "Bench", "lastname": "User", "username": f"search{i}",
+             "email": f"search{i}@example.com", "password_hash": "x"}
+            for i, u in enumerate(user_ids)
+        ])
+        conn.execute(insert(Account), [
+            {"id": u, "user_id": u, "name": "Checking", "type": AccountType.debit, "currency": "MXN"}
+            for u in user_ids
+        ])
+    return user_ids
+
+
+def seed_postgres(per_user: int) -> None:
+    """Every account gets `per_user` rows, generated inside Postgres."""
+    merchants = [f"{brand} {place}" for brand in BRANDS for place in PLACES]
+    with engine.begin() as conn:
+        ensure_partitions(conn, settings.partition_months_ahead, first_month=date(2020, 1, 1))
+        conn.execute(text(
+            "INSERT INTO transactions (id, user_id, account_id, type, amount, date, merchant, description, source) "
+            "SELECT gen_random_uuid(), a.user_id, a.id, 'expense', round((random() * 2000)::numeric, 2), "
+            "timestamptz '2020-01-01' + random() * interval '6 years', "
+            "(:merchants)[1 + floor(random() * cardinality(:merchants))::int], "
+            "'Card purchase ' || (:words)[1 + floor(random() * cardinality(:words))::int], 'imported' "
+            "FROM accounts a CROSS JOIN generate_series(1, :per_user)"
+        ), {"merchants": merchants, "words": WORDS, "per_user": per_user})
+        conn.execute(text("ANALYZE transactions"))
+
+
+def seed_python(user_ids: List[uuid.UUID], per_user: int, rng: random.Random) -> None:
+    start = datetime(2020, 1, 1, tzinfo=timezone.utc)
+    with engine.begin() as conn:
+        batch = []
+        for user_id in user_ids:
+            for _ in range(per_user):
+                batch.append({
+                    "id": uuid.uuid4(), "user_id": user_id, "account_id": user_id,
+                    "type": TransactionType.expense, "amount": Decimal(rng.randrange(1, 200_000)).scaleb(-2),
+                    "date": start + timedelta(seconds=rng.randrange(6 * 365 * 86_400)),
+                    "merchant": f"{rng.choice(BRANDS)} {rng.choice(PLACES)}",
+                    "description": f"Card purchase {rng.choice(WORDS)}",
+                    "source": TransactionSource.imported,
+                })
+                if len(batch) == SEED_BATCH_SIZE:
+                    conn.execute(insert(Transaction), batch)
+                    batch.clear()
+        if batch:
+            conn.execute(insert(Transaction), batch)
+
+
+def ilike_search(db, user_id: uuid.UUID, q: str, limit: int = 50):
+    """The unindexed baseline: substring match, newest first."""
+    pattern = f"%{q}%"
+    stmt = (
+        select(*SEARCH_COLUMNS)
+        .where(Transaction.user_id == user_id)
+        .where(or_(
+            Transaction.description.ilike(pattern),
+            Transaction.merchant.ilike(pattern),
+            Transaction.notes.ilike(pattern),
+        ))
+        .order_by(Transaction.date.desc())
+        .limit(limit)
+    )
+    return db.execute(stmt).all()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument("--repeats", type=int, default=20)
+    parser.add_argument("--skip-seed", action="store_true", help="search the already seeded tables")
+    parser.add_argument("--output", default="search-results.json")
+    parser.add_argument("--compare", metavar="BASELINE_JSON")
+    parser.add_argument("--threshold", type=float, default=0.2, help="median slowdown that counts as a regression")
+    add_database_argument(parser)
+    args = parser.parse_args()
+
+    database_url = engine.url.render_as_string(hide_password=True)
+    print(f"database: {database_url}")
+    per_user = max(1, args.rows // args.users)
+    if args.skip_seed:
+        with engine.connect() as conn:
+            user_ids = [row[0] for row in conn.execute(select(User.id).limit(1))]
+    else:
+        started = time.perf_counter()
+        user_ids = seed_accounts(args.users)
+        if engine.dialect.name == "postgresql":
+            seed_postgres(per_user)
+        else:
+            seed_python(user_ids, per_user, random.Random(42))
+        print(f"seeded {args.users * per_user:,} transactions in {time.perf_counter() - started:.1f}s")
+    user_id = user_ids[0]
+
+    results: List[Result] = []
+    params = {"rows": args.users * per_user}
+    with SessionLocal() as db:
+        for label, q in QUERIES:
+            for name, run in (
+                ("search.indexed", lambda: TransactionSearchService.search(db, user_id, q, limit=50).items),
+                ("search.ilike", lambda: ilike_search(db, user_id, q)),
+            ):
+                samples = measure(run, repeats=args.repeats)
+                result = Result.from_samples(name, params | {"q": label}, samples, hits=len(run()))
+                results.append(result)
+                print(f"{result.key:<58} median {format_seconds(result.median):>9} "
+                      f"p95 {format_seconds(result.p95):>9} hits={result.extra['hits']}")
+
+    write_results(args.output, environment(database_url), results)
+    print(f"results written to {args.output}")
+    if args.compare:
+        regressions = compare(load_results(args.compare), results, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} regression(s) over {args.threshold:.0%}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
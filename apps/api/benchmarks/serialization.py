@@ -0,0 +1,107 @@
+"""
+One `GET /api/v1/users` page, query to response body. Default path: load User
+entities, validate them into UserPage, let FastAPI re-validate against
+response_model, jsonable_encoder, stdlib json. Fast path (UserService +
+FastJSONResponse): load only UserRead's columns, validate once through a
+cached TypeAdapter, dump with it and encode with orjson.
+
+Runs against --database-url / BENCH_DATABASE_URL (a scratch database, see
+benchmarks.harness) and otherwise a throwaway SQLite file:
+
+    uv run python -m benchmarks.serialization --rows 500 --repeat 200
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from benchmarks.harness import add_database_argument, reset_schema, use_scratch_database
+
+use_scratch_database()
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute, serialize_response
+from sqlalchemy import insert, select
+
+from app.core.serialization import FastJSONResponse
+from app.db.base import Base, User
+from app.db.session import SessionLocal, engine
+from app.main import app
+from app.schemas.user import UserPage
+from app.services.user import UserService
+
+
+def seed(rows: int) -> None:
+    reset_schema(Base.metadata, engine)
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    with engine.begin() as conn:
+        conn.execute(insert(User), [
+            {
+                "id": uuid.uuid4(),
+                "name": "John",
+                "lastname": "Doe",
+                "username": f"user{i}",
+                "email": f"user{i}@example.com",
+                "password_hash": "x",
+                "created_at": start + timedelta(seconds=i),
+                "updated_at": start + timedelta(seconds=i),
+            }
+            for i in range(rows)
+        ])
+
+
+def users_route() -> APIRoute:
+    return next(
+        route for route in app.routes
+        if isinstance(route, APIRoute) and route.path == "/api/v1/users" and "GET" in route.methods
+    )
+
+
+def default_path(db, rows: int, field) -> bytes:
+    users = db.scalars(select(User).order_by(User.created_at, User.id).limit(rows)).all()
+    page = UserPage(items=users, next_cursor=None)
+    content = asyncio.run(serialize_response(field=field, response_content=page, is_coroutine=True))
+    db.expunge_all()
+    return JSONResponse(content).body
+
+
+def fast_path(db, rows: int) -> bytes:
+    page = UserService.get_users(db=db, limit=rows)
+    return FastJSONResponse(page).body
+
+
+def best_of(fn, repeat: int, *args) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=500, help="users per page (the API allows up to 500)")
+    parser.add_argument("--repeat", type=int, default=200)
+    add_database_argument(parser)
+    args = parser.parse_args()
+
+    print(f"database: {engine.url.render_as_string(hide_password=True)}")
+    seed(args.rows)
+    field = users_route().response_field
+    with SessionLocal() as db:
+        body = fast_path(db, args.rows)
+        assert default_path(db, args.rows, field) == body, "fast path changed the response body"
+        default = best_of(default_path, args.repeat, db, args.rows, field)
+        fast = best_of(fast_path, args.repeat, db, args.rows)
+    print(f"rows: {args.rows}, body: {len(body) / 1024:.1f} KiB, best of {args.repeat}")
+    print(f"default: {default * 1000:>8.2f} ms")
+    print(f"   fast: {fast * 1000:>8.2f} ms")
+    print(f"speedup: {default / fast:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""
+Cold start: how long a fresh worker takes to import the app and to answer
+its first request, which is what an autoscaled replica pays before serving.
+
+* `startup.import`: `import app.main` in a new interpreter
+* `startup.first_request`: spawning `uvicorn app.main:app` until the first
+  `GET /api/v1/users?limit=1` (a database read) answers 200
+
+Each repeat is a new process. Runs against --database-url /
+BENCH_DATABASE_URL (a scratch database, see benchmarks.harness; its tables
+are created if missing) and otherwise a throwaway SQLite file:
+
+    uv run python -m benchmarks.startup --output startup.json
+    uv run python -m benchmarks.startup --importtime   # slowest imports
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+from typing import List
+
+from benchmarks.harness import (
+    Result,
+    add_database_argument,
+    compare,
+    environment,
+    format_seconds,
+    free_port,
+    load_results,
+    use_scratch_database,
+    write_results,
+)
+
+use_scratch_database()
+
+import httpx
+
+IMPORT_SNIPPET = "import time; t = time.perf_counter(); import app.main; print(time.perf_counter() - t)"
+POLL_INTERVAL = 0.005
+
+
+def create_schema() -> None:
+    # In a child process, so this one never imports the app.
+    subprocess.run(
+        [sys.executable, "-c",
+         "from app.db.base import Base; from app.db.session import engine; Base.metadata.create_all(bind=engine)"],
+        check=True,
+    )
+
+
+def time_import() -> float:
+    out = subprocess.run([sys.executable, "-c", IMPORT_SNIPPET], capture_output=True, text=True, check=True)
+    return float(out.stdout.strip())
+
+
+def time_first_request(timeout: float = 60.0) -> float:
+    port = free_port()
+    url = f"http://127.0.0.1:{port}/api/v1/users?limit=1"
+    # One client for all polls: building one (and its SSL context) per attempt costs more than the poll interval.
+    client = httpx.Client(timeout=timeout)
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--log-level", "warning", "--no-access-log"],
+    )
+    try:
+        while time.perf_counter() - started < timeout:
+            if process.poll() is not None:
+                raise RuntimeError("uvicorn exited during startup")
+            try:
+                if client.get(url).status_code == 200:
+                    return time.perf_counter() - started
+            except httpx.TransportError:
+                pass
+            time.sleep(POLL_INTERVAL)
+        raise RuntimeError(f"no answer from {url} within {timeout:.0f}s")
+    finally:
+        client.close()
+        process.terminate()
+        process.wait(timeout=30)
+
+
+def print_importtime(limit: int) -> None:
+    """The app's slowest imports by cumulative time, from `python -X importtime`."""
+    out = subprocess.run([sys.executable, "-X", "importtime", "-c", "import app.main"],
+                         capture_output=True, text=True, check=True)
+    rows = []
+    for line in out.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if cumulative.strip().isdigit():  # skips the header line
+            rows.append((int(cumulative), name.strip()))
+    print(f"{'cumulative':>12}  module")
+    for cumulative, name in sorted(rows, reverse=True)[:limit]:
+        print(f"{format_seconds(cumulative / 1e6):>12}  {name}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeats", type=int, default=10)
+    parser.add_argument("--output", default="startup-results.json")
+    parser.add_argument("--compare", metavar="BASELINE_JSON")
+    parser.add_argument("--threshold", type=float, default=0.2, help="median slowdown that counts as a regression")
+    parser.add_argument("--importtime", type=int, nargs="?", const=25, metavar="N",
+                        help="only print the N slowest imports (default 25)")
+    add_database_argument(parser)
+    args = parser.parse_args()
+
+    if args.importtime:
+        print_importtime(args.importtime)
+        return 0
+
+    database_url = os.environ["DATABASE_URL"]
+    create_schema()
+    time_import()  # warm the OS file cache and bytecode
+    results: List[Result] = [
+        Result.from_samples("startup.import", {}, [time_import() for _ in range(args.repeats)]),
+        Result.from_samples("startup.first_request", {}, [time_first_request() for _ in range(args.repeats)]),
+    ]
+    for result in results:
+        print(f"{result.key:<24} median {format_seconds(result.median):>9} p95 {format_seconds(result.p95):>9}")
+
+    write_results(args.output, environment(database_url), results)
+    print(f"results written to {args.output}")
+    if args.compare:
+        regressions = compare(load_results(args.compare), results, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} regression(s) over {args.threshold:.0%}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
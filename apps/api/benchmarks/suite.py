@@ -0,0 +1,254 @@
+"""
+Benchmark suite for the API hot paths, driven through TestClient against the
+real app: Argon2 hashing and user creation, user listing/export at 1k and
+100k rows, transaction bulk import and error-handler throughput.
+
+Runs against --database-url / BENCH_DATABASE_URL (a Postgres scratch
+database, see benchmarks.harness; its tables are dropped and recreated) and
+otherwise a throwaway SQLite file as stand-in. Results go to a JSON file;
+pass a previous one with --compare to flag regressions:
+
+    uv run python -m benchmarks.suite --output before.json
+    uv run python -m benchmarks.suite --output after.json --compare before.json
+"""
+from __future__ import annotations
+
+import argparse
+import itertools
+import logging
+import os
+import sys
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List
+
+from benchmarks.harness import (
+    Result,
+    add_database_argument,
+    compare,
+    environment,
+    format_seconds,
+    load_results,
+    measure,
+    reset_schema,
+    use_scratch_database,
+    write_results,
+)
+
+use_scratch_database()
+
+# Every request comes from one TestClient address: measure the handlers, not
+# the signup/import token buckets and concurrency limits (benchmarks.load has
+# --admission for that).
+os.environ.setdefault("ADMISSION_CONTROL", "false")
+
+from fastapi.testclient import TestClient
+from sqlalchemy import insert
+
+from app.core.security import password_hasher
+from app.db.base import Account, Base, User
+from app.db.session import engine
+from app.main import create_app
+from app.models.account import AccountType
+
+SEED_BATCH_SIZE = 10_000
+_unique = itertools.count()
+
+
+def reset_database() -> None:
+    reset_schema(Base.metadata, engine)
+
+
+def seed_users(count: int) -> None:
+    """`count` users via Core executemany; they share one precomputed hash."""
+    reset_database()
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    with engine.begin() as conn:
+        for offset in range(0, count, SEED_BATCH_SIZE):
+            conn.execute(insert(User), [
+                {
+                    "id": uuid.uuid4(),
+                    "name": "Bench",
+                    "lastname": "User",
+                    "username": f"bench{i}",
+                    "email": f"bench{i}@example.com",
+                    "password_hash": "x",
+                    "created_at": start + timedelta(seconds=i),
+                    "updated_at": start + timedelta(seconds=i),
+                }
+                for i in range(offset, min(offset + SEED_BATCH_SIZE, count))
+            ])
+
+
+def seed_account() -> tuple[uuid.UUID, uuid.UUID]:
+    user_id, account_id = uuid.uuid4(), uuid.uuid4()
+    with engine.begin() as conn:
+        conn.execute(insert(User), [{
+            "id": user_id, "name": "Bench", "lastname": "Owner", "username": f"owner{user_id.hex[:8]}",
+            "email": f"owner{user_id.hex[:8]}@example.com", "password_hash": "x",
+        }])
+        conn.execute(insert(Account), [{
+            "id": account_id, "user_id": user_id, "name": "Checking",
+            "type": AccountType.debit, "currency": "MXN",
+        }])
+    return user_id, account_id
+
+
+def check(response, status: int) -> None:
+    if response.status_code != status:
+        raise RuntimeError(f"expected {status}, got {response.status_code}: {response.text[:200]}")
+
+
+def bench_users_create(client: TestClient, args: argparse.Namespace) -> List[Result]:
+    results = [Result.from_samples(
+        "security.argon2_hash", {},
+        measure(lambda: password_hasher.hash("password123"), repeats=args.repeats),
+    )]
+
+    def create() -> None:
+        n = next(_unique)
+        check(client.post("/api/v1/users", json={
+            "name": "Bench",
+            "lastname": "User",
+            "username": f"new{n}",
+            "email": f"new{n}@example.com",
+            "password": "password123",
+        }), 201)
+
+    results.append(Result.from_samples("users.create", {}, measure(create, repeats=args.repeats)))
+    return results
+
+
+def bench_users_list(client: TestClient, args: argparse.Namespace) -> List[Result]:
+    results = []
+    for rows in args.user_rows:
+        seed_users(rows)
+        params = {"rows": rows}
+        for limit in (50, 500):
+            results.append(Result.from_samples(
+                "users.list", params | {"limit": limit},
+                measure(lambda: check(client.get("/api/v1/users", params={"limit": limit}), 200),
+                        repeats=args.repeats * 2),
+            ))
+        results.append(Result.from_samples(
+            "users.list.prefix", params,
+            measure(lambda: check(client.get("/api/v1/users", params={"username_prefix": "bench99"}), 200),
+                    repeats=args.repeats * 2),
+        ))
+        export = Result.from_samples(
+            "users.export.ndjson", params,
+            measure(lambda: check(client.get("/api/v1/users", params={"format": "ndjson"}), 200),
+                    repeats=max(3, args.repeats // 5)),
+        )
+        export.extra["rows_per_sec"] = round(rows / export.median)
+        results.append(export)
+    return results
+
+
+def bench_transactions_import(client: TestClient, args: argparse.Namespace) -> List[Result]:
+    reset_database()
+    user_id, account_id = seed_account()
+    url = f"/api/v1/users/{user_id}/transactions/import"
+    results = []
+    for batch in (1_000, 10_000):
+        payload: Dict = {}
+
+        def build() -> None:
+            start = datetime(2020, 1, 1, tzinfo=timezone.utc)
+            payload["body"] = {
+                "account_id": str(account_id),
+                "rows": [
+                    {
+                        "type": "expense" if i % 10 else "income",
+                        "amount": f"{(i % 50_000) / 100 + 1:.2f}",
+                        "date": (start + timedelta(minutes=i)).isoformat(),
+                        "merchant": f"Merchant {i % 500}",
+                        "external_id": uuid.uuid4().hex,
+                    }
+                    for i in range(batch)
+                ],
+            }
+
+        samples = measure(
+            lambda: check(client.post(url, json=payload["body"]), 200),
+            repeats=max(3, args.repeats // 4),
+            setup=build,
+        )
+        result = Result.from_samples("transactions.import", {"rows": batch}, samples)
+        result.extra["rows_per_sec"] = round(batch / result.median)
+        results.append(result)
+    return results
+
+
+def bench_errors(client: TestClient, args: argparse.Namespace) -> List[Result]:
+    reset_database()
+    user_id, _ = seed_account()
+    per_repeat = 100
+    cases: Dict[str, Callable[[], None]] = {
+        # DomainError -> 404 after one query
+        "errors.domain_404": lambda: check(
+            client.get(f"/api/v1/users/{user_id}/accounts/{uuid.uuid4()}/balance"), 404),
+        # RequestValidationError -> 422, no database
+        "errors.validation_422": lambda: check(client.post("/api/v1/users", json={}), 422),
+        # no route -> 404 from the router
+        "errors.not_found_route": lambda: check(client.get("/api/v1/nope"), 404),
+    }
+    results = []
+    for name, call in cases.items():
+        def burst(call=call) -> None:
+            for _ in range(per_repeat):
+                call()
+
+        results.append(Result.from_samples(name, {}, measure(burst, repeats=args.repeats), ops=per_repeat))
+    return results
+
+
+BENCHMARKS: Dict[str, Callable[[TestClient, argparse.Namespace], List[Result]]] = {
+    "users.create": bench_users_create,
+    "users.list": bench_users_list,
+    "transactions.import": bench_transactions_import,
+    "errors": bench_errors,
+}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", default="benchmark-results.json")
+    parser.add_argument("--compare", metavar="BASELINE_JSON")
+    parser.add_argument("--threshold", type=float, default=0.2, help="median slowdown that counts as a regression")
+    parser.add_argument("--only", action="append", choices=sorted(BENCHMARKS), help="run only these groups")
+    parser.add_argument("--repeats", type=int, default=20)
+    parser.add_argument("--user-rows", type=lambda v: [int(x) for x in v.split(",")], default=[1_000, 100_000])
+    add_database_argument(parser)
+    args = parser.parse_args()
+
+    # Error handlers log (with tracebacks); keep the formatting cost, not the terminal I/O.
+    devnull = open(os.devnull, "w")
+    logging.basicConfig(stream=devnull, level=logging.INFO, force=True)
+
+    database_url = engine.url.render_as_string(hide_password=True)
+    print(f"database: {database_url}")
+    reset_database()
+    results: List[Result] = []
+    with TestClient(create_app()) as client:
+        for name in args.only or BENCHMARKS:
+            for result in BENCHMARKS[name](client, args):
+                results.append(result)
+                extra = "".join(f" {k}={v}" for k, v in result.extra.items())
+                print(
+                    f"{result.key:<58} median {format_seconds(result.median):>9} "
+                    f"p95 {format_seconds(result.p95):>9} ({result.ops_per_sec:,.0f}/s){extra}"
+                )
+
+    write_results(args.output, environment(database_url), results)
+    print(f"results written to {args.output}")
+    if args.compare:
+        regressions = compare(load_results(args.compare), results, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} regression(s) over {args.threshold:.0%}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
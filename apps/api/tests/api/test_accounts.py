@@ -0,0 +1,58 @@
+# tests/api/test_accounts.py
+import uuid
+
+from app.models.account import Account, AccountType
+from app.models.user import User
+
+
+def make_account(db_session):
+    user = User(name="John", lastname="Doe", username="jdoe", email="john@doe.com", password_hash="x")
+    db_session.add(user)
+    db_session.flush()
+    account = Account(user_id=user.id, name="Checking", type=AccountType.debit, currency="MXN")
+    db_session.add(account)
+    db_session.commit()
+    return user, account
+
+
+def test_account_balance_after_import(client, db_session):
+    user, account = make_account(db_session)
+    payload = {
+        "account_id": str(account.id),
+        "rows": [
+            {"type": "income", "amount": "1000", "date": "2026-01-06"},
+            {"type": "expense", "amount": "12.30", "date": "2026-01-05T10:00:00Z"},
+        ],
+    }
+    client.post(f"/api/v1/users/{user.id}/transactions/import", json=payload)
+
+    res = client.get(f"/api/v1/users/{user.id}/accounts/{account.id}/balance")
+
+    assert res.status_code == 200
+    [balance] = res.json()
+    assert balance["currency"] == "MXN"
+    assert balance["balance"] == "987.70"
+    assert balance["transaction_count"] == 2
+
+
+def test_account_balance_unknown_account(client, db_session):
+    user, _ = make_account(db_session)
+
+    res = client.get(f"/api/v1/users/{user.id}/accounts/{uuid.uuid4()}/balance")
+
+    assert res.status_code == 404
+    assert res.json()["code"] == "account.not_found"
+
+
+def test_net_worth_without_rates(client, db_session):
+    user, account = make_account(db_session)
+    payload = {"account_id": str(account.id), "rows": [{"type": "income", "amount": "10", "date": "2026-01-06"}]}
+    client.post(f"/api/v1/users/{user.id}/transactions/import", json=payload)
+
+    res = client.get(f"/api/v1/users/{user.id}/accounts/net-worth", params={"currency": "MXN"})
+    assert res.status_code == 200
+    assert res.json()["total"] == "10.00"
+
+    res = client.get(f"/api/v1/users/{user.id}/accounts/net-worth", params={"currency": "USD"})
+    assert res.status_code == 404
+    assert res.json()["code"] == "fx.rate_not_found"
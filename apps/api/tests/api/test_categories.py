@@ -0,0 +1,133 @@
+# tests/api/test_categories.py
+import uuid
+
+import pytest
+from sqlalchemy import update
+
+from app.models.account import Account, AccountType
+from app.models.category import Category
+from app.models.user import User
+from app.services import category as category_service
+
+
+@pytest.fixture(autouse=True)
+def clear_category_caches():
+    category_service.global_cache.clear()
+    category_service.user_cache.clear()
+    yield
+    category_service.user_cache.clear()
+    category_service.global_cache.clear()
+
+
+def make_user(db_session):
+    user = User(name="John", lastname="Doe", username="jdoe", email="john@doe.com", password_hash="x")
+    db_session.add(user)
+    db_session.commit()
+    return user
+
+
+def test_category_crud(client, db_session):
+    user = make_user(db_session)
+    base = f"/api/v1/users/{user.id}/categories"
+
+    res = client.post(base, json={"name": "Coffee"})
+    assert res.status_code == 201
+    category_id = res.json()["id"]
+
+    res = client.patch(f"{base}/{category_id}", json={"name": "Cafe"})
+    assert res.status_code == 200
+    assert [c["name"] for c in client.get(base).json()] == ["Cafe"]
+
+    assert client.post(base, json={"name": "cafe"}).json()["code"] == "category.already_exists"
+    assert client.delete(f"{base}/{category_id}").status_code == 204
+    assert client.get(base).json() == []
+
+
+def test_import_rejects_unknown_category(client, db_session):
+    user = make_user(db_session)
+    account = Account(user_id=user.id, name="Checking", type=AccountType.debit, currency="MXN")
+    db_session.add(account)
+    db_session.commit()
+    row = {"type": "expense", "amount": "1", "date": "2026-01-01", "category_id": str(uuid.uuid4())}
+    payload = {"account_id": str(account.id), "rows": [row]}
+
+    res = client.post(f"/api/v1/users/{user.id}/transactions/import", json=payload)
+
+    assert res.status_code == 404
+    assert res.json()["code"] == "category.not_found"
+
+
+def test_cache_stats(client):
+    res = client.get("/api/v1/system/caches")
+
+    assert res.status_code == 200
+    names = {c["name"] for c in res.json()}
+    assert {"categories", "categories_global", "fx_rates"} <= names
+
+
+def test_category_rules_categorize_imports(client, db_session):
+    user = make_user(db_session)
+    account = Account(user_id=user.id, name="Checking", type=AccountType.debit, currency="MXN")
+    db_session.add(account)
+    db_session.commit()
+    category_id = client.post(f"/api/v1/users/{user.id}/categories", json={"name": "Coffee"}).json()["id"]
+    rules = f"/api/v1/users/{user.id}/category-rules"
+
+    res = client.post(rules, json={"keyword": "starbucks", "category_id": category_id})
+    assert res.status_code == 201
+    rule_id = res.json()["id"]
+    assert client.post(rules, json={"keyword": "x", "category_id": str(uuid.uuid4())}).status_code == 404
+
+    row = {"type": "expense", "amount": "3.50", "date": "2026-01-01", "merchant": "Starbucks Reforma"}
+    res = client.post(f"/api/v1/users/{user.id}/transactions/import", json={"account_id": str(account.id), "rows": [row]})
+    assert res.json()["categorized"] == 1
+
+    assert [r["keyword"] for r in client.get(rules).json()] == ["starbucks"]
+    assert client.delete(f"{rules}/{rule_id}").status_code == 204
+    assert client.delete(f"{rules}/{rule_id}").json()["code"] == "category_rule.not_found"
+
+
+def test_list_categories_sees_a_write_made_through_another_worker(client, db_session):
+    user = make_user(db_session)
+    base = f"/api/v1/users/{user.id}/categories"
+    rent_id = uuid.UUID(client.post(base, json={"name": "Rent"}).json()["id"])
+    global_food = Category(user_id=None, name="Food")
+    db_session.add(global_food)
+    db_session.commit()
+    first = client.get(base)
+
+    # Another worker renames both; only its own caches are invalidated.
+    db_session.execute(update(Category).where(Category.id == rent_id).values(name="Housing"))
+    db_session.execute(update(Category).where(Category.id == global_food.id).values(name="Groceries"))
+    db_session.commit()
+    again = client.get(base, headers={"If-None-Match": first.headers["etag"]})
+
+    assert [c["name"] for c in first.json()] == ["Food", "Rent"]
+    assert again.status_code == 200
+    assert [c["name"] for c in again.json()] == ["Groceries", "Housing"]
+    assert client.get(base, headers={"If-None-Match": again.headers["etag"]}).status_code == 304
+
+
+def test_list_categories_not_modified(client, db_session, query_budget):
+    user = make_user(db_session)
+    base = f"/api/v1/users/{user.id}/categories"
+    client.post(base, json={"name": "Coffee"})
+    res = client.post(base, json={"name": "Rent"})
+    rent_id = res.json()["id"]
+
+    first = client.get(base)
+    etag = first.headers["etag"]
+    with query_budget(max_queries=1):  # the version query; both sets are cached
+        unchanged = client.get(base, headers={"If-None-Match": etag})
+    # Same count, and within one second (SQLite keeps whole seconds) the same newest updated_at.
+    client.patch(f"{base}/{rent_id}", json={"name": "Housing"})
+    renamed = client.get(base, headers={"If-None-Match": etag})
+    client.delete(f"{base}/{rent_id}")
+    deleted = client.get(base, headers={"If-None-Match": renamed.headers["etag"]})
+
+    assert "last-modified" not in first.headers
+    assert unchanged.status_code == 304
+    assert renamed.status_code == 200
+    assert [c["name"] for c in renamed.json()] == ["Coffee", "Housing"]
+    assert deleted.status_code == 200
+    assert [c["name"] for c in deleted.json()] == ["Coffee"]
@@ -0,0 +1,117 @@
+# tests/api/test_read_replicas.py
+import dataclasses
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+import app.main as main
+from app.core import deps
+from app.db import replicas
+from app.db.base_class import Base
+from app.db.replicas import RecentWrites, ReplicaSet
+from app.models.user import User
+from app.services import category as category_service
+
+
+@pytest.fixture
+def databases(tmp_path, monkeypatch):
+    """
+    Two SQLite files standing in for a primary and a replica that never
+    catches up, both with the same user. Returns (user_id, primary, replica).
+    """
+    factories = []
+    user_id = uuid.uuid4()
+    for name in ("primary", "replica"):
+        engine = create_engine(f"sqlite:///{tmp_path}/{name}.db", connect_args={"check_same_thread": False})
+        Base.metadata.create_all(bind=engine)
+        factory = sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
+        with factory() as db:
+            db.add(User(id=user_id, name=name, lastname="Doe", username=name, email=f"{name}@doe.com", password_hash="x"))
+            db.commit()
+        factories.append(factory)
+    primary, replica = factories
+
+    monkeypatch.setattr(deps, "SessionLocal", primary)
+    monkeypatch.setattr(deps, "read_sessions", ReplicaSet(primary, [replica]))
+    monkeypatch.setattr(replicas, "recent_writes", RecentWrites(60))
+    monkeypatch.setattr(main, "settings", dataclasses.replace(main.settings, database_replica_urls=("replica",)))
+    category_service.global_cache.clear()
+    category_service.user_cache.clear()
+    yield user_id, primary, replica
+    category_service.user_cache.clear()
+    category_service.global_cache.clear()
+
+
+def test_reads_go_to_the_replica(databases):
+    with TestClient(main.create_app()) as client:
+        users = client.get("/api/v1/users").json()["items"]
+
+    assert [u["username"] for u in users] == ["replica"]
+
+
+def test_writer_reads_its_own_writes_from_the_primary(databases):
+    user_id, _, _ = databases
+    base = f"/api/v1/users/{user_id}/categories"
+
+    with TestClient(main.create_app()) as client:
+        assert client.post(base, json={"name": "Coffee"}).status_code == 201
+
+        assert [c["name"] for c in client.get(base).json()] == ["Coffee"]
+
+    assert f"user:{user_id}" in replicas.recent_writes
+    assert f"user:{uuid.uuid4()}" not in replicas.recent_writes
+
+
+def test_sign_up_sticks_the_client_to_the_primary(databases):
+    payload = {"name": "John", "lastname": "Doe", "username": "jdoe", "email": "john@doe.com", "password": "password123"}
+
+    with TestClient(main.create_app()) as client:
+        res = client.post("/api/v1/users", json=payload)
+        assert res.status_code == 201
+        new_id = res.json()["id"]
+
+        users = client.get("/api/v1/users").json()["items"]
+        categories = client.get(f"/api/v1/users/{new_id}/categories")
+
+    assert sorted(u["username"] for u in users) == ["jdoe", "primary"]
+    assert categories.status_code == 200
+
+
+def test_write_under_a_user_sticks_the_client_for_collection_reads(databases):
+    user_id, primary, _ = databases
+
+    with TestClient(main.create_app()) as client:
+        assert client.post(f"/api/v1/users/{user_id}/categories", json={"name": "Coffee"}).status_code == 201
+        with primary() as db:  # a change the replica hasn't caught up with
+            db.get(User, user_id).username = "renamed"
+            db.commit()
+
+        users = client.get("/api/v1/users").json()["items"]
+
+    assert [u["username"] for u in users] == ["renamed"]
+    assert f"user:{user_id}" in replicas.recent_writes
+    assert "client:testclient" in replicas.recent_writes
+
+
+def test_without_stickiness_writers_read_from_the_replica(databases, monkeypatch):
+    user_id, _, _ = databases
+    base = f"/api/v1/users/{user_id}/categories"
+    monkeypatch.setattr(replicas, "recent_writes", RecentWrites(0))
+
+    with TestClient(main.create_app()) as client:
+        assert client.post(base, json={"name": "Coffee"}).status_code == 201
+
+        assert client.get(base).json() == []
+
+
+def test_failed_writes_do_not_stick(databases):
+    user_id, _, _ = databases
+    base = f"/api/v1/users/{user_id}/categories"
+
+    with TestClient(main.create_app()) as client:
+        assert client.post(base, json={}).status_code == 422
+
+    assert f"user:{user_id}" not in replicas.recent_writes
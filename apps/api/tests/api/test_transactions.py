@@ -0,0 +1,139 @@
+# tests/api/test_transactions.py
+import uuid
+
+from app.models.account import Account, AccountType
+from app.models.user import User
+
+
+def make_account(db_session):
+    user = User(name="John", lastname="Doe", username="jdoe", email="john@doe.com", password_hash="x")
+    db_session.add(user)
+    db_session.flush()
+    account = Account(user_id=user.id, name="Checking", type=AccountType.debit, currency="MXN")
+    db_session.add(account)
+    db_session.commit()
+    return user, account
+
+
+def test_import_transactions_reports_counts(client, db_session):
+    user, account = make_account(db_session)
+    payload = {
+        "account_id": str(account.id),
+        "rows": [
+            {"type": "expense", "amount": "12.30", "date": "2026-01-05T10:00:00Z", "merchant": "Cafe"},
+            {"type": "income", "amount": "1000", "date": "2026-01-06", "external_id": "PAY-1"},
+        ],
+    }
+
+    res = client.post(f"/api/v1/users/{user.id}/transactions/import", json=payload)
+    assert res.status_code == 200
+    assert res.json() == {"received": 2, "inserted": 2, "duplicates": 0, "categorized": 0}
+
+    res = client.post(f"/api/v1/users/{user.id}/transactions/import", json=payload)
+    assert res.json() == {"received": 2, "inserted": 0, "duplicates": 2, "categorized": 0}
+
+
+def test_import_transactions_unknown_account(client, db_session):
+    user, _ = make_account(db_session)
+    payload = {
+        "account_id": str(uuid.uuid4()),
+        "rows": [{"type": "expense", "amount": "1", "date": "2026-01-05T10:00:00Z"}],
+    }
+
+    res = client.post(f"/api/v1/users/{user.id}/transactions/import", json=payload)
+
+    assert res.status_code == 404
+    assert res.json()["code"] == "account.not_found"
+
+
+def test_import_statement_upload_detects_format(client, db_session):
+    user, account = make_account(db_session)
+    ofx = b"<OFX><STMTTRN><DTPOSTED>20260105<TRNAMT>-9.99<FITID>A1<NAME>Stream</STMTTRN></OFX>"
+
+    res = client.post(
+        f"/api/v1/users/{user.id}/transactions/import/statement",
+        data={"account_id": str(account.id)},
+        files={"file": ("january.ofx", ofx, "application/x-ofx")},
+    )
+
+    assert res.status_code == 200
+    body = res.json()
+    assert (body["received"], body["inserted"], body["rejected"]) == (1, 1, 0)
+
+
+def test_import_statement_upload_unknown_format(client, db_session):
+    user, account = make_account(db_session)
+
+    res = client.post(
+        f"/api/v1/users/{user.id}/transactions/import/statement",
+        data={"account_id": str(account.id)},
+        files={"file": ("january.pdf", b"%PDF", "application/pdf")},
+    )
+
+    assert res.status_code == 400
+    assert res.json()["code"] == "statement.unsupported_format"
+
+
+def test_category_report_reads_rollups(client, db_session):
+    user, account = make_account(db_session)
+    payload = {
+        "account_id": str(account.id),
+        "rows": [
+            {"type": "expense", "amount": "12.30", "date": "2026-01-05T10:00:00Z"},
+            {"type": "expense", "amount": "7.70", "date": "2026-03-05T10:00:00Z"},
+        ],
+    }
+    client.post(f"/api/v1/users/{user.id}/transactions/import", json=payload)
+
+    res = client.get(f"/api/v1/users/{user.id}/reports/by-category", params={"from": "2026-01-01", "to": "2026-12-31"})
+
+    assert res.status_code == 200
+    assert res.json()["items"] == [
+        {"month": None, "category_id": None, "category_name": None, "type": "expense", "total": "20.00", "transaction_count": 2},
+    ]
+
+    res = client.get(f"/api/v1/users/{user.id}/reports/by-category", params={"from": "2026-02-01", "to": "2026-01-01"})
+    assert res.status_code == 400
+    assert res.json()["code"] == "report.invalid_range"
+
+
+def test_analytics_endpoints(client, db_session):
+    user, account = make_account(db_session)
+    payload = {
+        "account_id": str(account.id),
+        "rows": [
+            {"type": "income", "amount": "1000", "date": "2026-01-06", "merchant": "Employer"},
+            {"type": "expense", "amount": "12.30", "date": "2026-01-05T10:00:00Z", "merchant": "Cafe"},
+        ],
+    }
+    client.post(f"/api/v1/users/{user.id}/transactions/import", json=payload)
+    base = f"/api/v1/users/{user.id}/reports"
+
+    cash_flow = client.get(f"{base}/cash-flow").json()
+    assert cash_flow["points"] == [{
+        "period": "2026-01-01", "income": "1000.00", "expense": "12.30",
+        "net": "987.70", "cumulative_net": "987.70",
+    }]
+    assert len(client.get(f"{base}/rolling-average", params={"window": 7}).json()["points"]) == 2
+    top = client.get(f"{base}/top-merchants", params={"type": "income"}).json()
+    assert top["items"] == [{"merchant": "Employer", "total": "1000.00", "transaction_count": 1}]
+
+
+def test_search_transactions(client, db_session):
+    user, account = make_account(db_session)
+    payload = {
+        "account_id": str(account.id),
+        "rows": [
+            {"type": "expense", "amount": "12.30", "date": "2026-01-05T10:00:00Z", "merchant": "Starbucks"},
+            {"type": "expense", "amount": "99.00", "date": "2026-01-06T10:00:00Z", "merchant": "Amazon"},
+        ],
+    }
+    client.post(f"/api/v1/users/{user.id}/transactions/import", json=payload)
+
+    res = client.get(f"/api/v1/users/{user.id}/transactions/search", params={"q": "starbucks", "limit": 10})
+
+    assert res.status_code == 200
+    body = res.json()
+    assert [hit["merchant"] for hit in body["items"]] == ["Starbucks"]
+    assert body["items"][0]["amount"] == "12.30"
+    assert body["next_cursor"] is None
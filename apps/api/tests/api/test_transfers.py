@@ -0,0 +1,62 @@
+# tests/api/test_transfers.py
+import uuid
+
+from app.models.account import Account, AccountType
+from app.models.user import User
+
+
+def make_accounts(db_session):
+    user = User(name="John", lastname="Doe", username="jdoe", email="john@doe.com", password_hash="x")
+    db_session.add(user)
+    db_session.flush()
+    checking = Account(user_id=user.id, name="Checking", type=AccountType.debit, currency="MXN")
+    savings = Account(user_id=user.id, name="Savings", type=AccountType.debit, currency="MXN")
+    db_session.add_all([checking, savings])
+    db_session.commit()
+    return user, checking, savings
+
+
+def test_create_transfer(client, db_session):
+    user, checking, savings = make_accounts(db_session)
+    payload = {
+        "from_account_id": str(checking.id),
+        "to_account_id": str(savings.id),
+        "amount": "250.00",
+        "date": "2026-03-01T12:00:00Z",
+    }
+
+    res = client.post(f"/api/v1/users/{user.id}/transfers", json=payload)
+
+    assert res.status_code == 201
+    assert res.json()["amount"] == "250.00"
+    balance = client.get(f"/api/v1/users/{user.id}/accounts/{savings.id}/balance").json()
+    assert balance[0]["balance"] == "250.00"
+
+
+def test_create_transfer_same_account(client, db_session):
+    user, checking, _ = make_accounts(db_session)
+    payload = {
+        "from_account_id": str(checking.id),
+        "to_account_id": str(checking.id),
+        "amount": "1",
+        "date": "2026-03-01",
+    }
+
+    res = client.post(f"/api/v1/users/{user.id}/transfers", json=payload)
+
+    assert res.status_code == 400
+    assert res.json()["code"] == "transfer.same_account"
+
+
+def test_batch_transfers_report_per_item(client, db_session):
+    user, checking, savings = make_accounts(db_session)
+    good = {"from_account_id": str(checking.id), "to_account_id": str(savings.id), "amount": "5", "date": "2026-03-01"}
+    bad = good | {"to_account_id": str(uuid.uuid4())}
+
+    res = client.post(f"/api/v1/users/{user.id}/transfers/batch", json={"transfers": [good, bad, good]})
+
+    assert res.status_code == 200
+    body = res.json()
+    assert (body["created"], body["failed"]) == (2, 1)
+    assert [r["status"] for r in body["results"]] == ["created", "failed", "created"]
+    assert body["results"][1]["error"]["code"] == "account.not_found"
@@ -51,8 +51,267 @@ def test_get_users(client):
     res = client.get("/api/v1/users")
 
     assert res.status_code == 200
-    users = res.json()
+    body = res.json()
+    users = body["items"]
 
     assert isinstance(users, list)
     assert len(users) == 1
     assert users[0]["username"] == "jdoe"
+    assert body["next_cursor"] is None
+
+
+def test_get_users_pages_with_cursor(client):
+    for i in range(5):
+        client.post("/api/v1/users", json={
+            "name": "John",
+            "lastname": "Doe",
+            "username": f"jdoe{i}",
+            "email": f"john{i}@doe.com",
+            "password": "password123",
+        })
+
+    seen = []
+    cursor = None
+    while True:
+        params = {"limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        body = client.get("/api/v1/users", params=params).json()
+        seen.extend(u["username"] for u in body["items"])
+        cursor = body["next_cursor"]
+        if cursor is None:
+            break
+
+    assert sorted(seen) == [f"jdoe{i}" for i in range(5)]
+    assert len(seen) == len(set(seen))
+
+
+def test_get_users_filters_by_prefix(client):
+    for username, email in [("alice", "alice@example.com"), ("alan", "al@other.com"), ("bob", "bob@example.com")]:
+        client.post("/api/v1/users", json={
+            "name": "Test",
+            "lastname": "User",
+            "username": username,
+            "email": email,
+            "password": "password123",
+        })
+
+    res = client.get("/api/v1/users", params={"username_prefix": "al"})
+    assert sorted(u["username"] for u in res.json()["items"]) == ["alan", "alice"]
+
+    res = client.get("/api/v1/users", params={"email_prefix": "bob@"})
+    assert [u["username"] for u in res.json()["items"]] == ["bob"]
+
+
+def test_get_users_invalid_cursor(client):
+    res = client.get("/api/v1/users", params={"cursor": "not-a-cursor"})
+
+    assert res.status_code == 400
+    assert res.json()["code"] == "pagination.invalid_cursor"
+
+
+def test_get_users_cursor_with_non_string_values_is_invalid(client):
+    import base64
+
+    for raw in (b"[1, null]", b'{"a": 1}', b'["2026-01-01T00:00:00"]'):
+        cursor = base64.urlsafe_b64encode(raw).decode()
+        res = client.get("/api/v1/users", params={"cursor": cursor})
+
+        assert res.status_code == 400
+        assert res.json()["code"] == "pagination.invalid_cursor"
+
+
+def test_create_user_returns_503_when_hashing_pool_is_full(client, monkeypatch):
+    from app.core.security import password_hasher
+    from app.exceptions.security import HashingPoolSaturatedError
+
+    def saturated(password):
+        raise HashingPoolSaturatedError()
+
+    monkeypatch.setattr(password_hasher, "hash", saturated)
+
+    res = client.post("/api/v1/users", json={
+        "name": "John",
+        "lastname": "Doe",
+        "username": "jdoe",
+        "email": "john@doe.com",
+        "password": "password123",
+    })
+
+    assert res.status_code == 503
+    assert res.headers["retry-after"] == "1"
+    assert res.json()["code"] == "security.hashing_saturated"
+
+
+def _create_users(client, count):
+    for i in range(count):
+        client.post("/api/v1/users", json={
+            "name": "John",
+            "lastname": "Doe",
+            "username": f"jdoe{i}",
+            "email": f"john{i}@doe.com",
+            "password": "password123",
+        })
+
+
+def test_export_users_ndjson(client):
+    import json
+
+    _create_users(client, 3)
+
+    res = client.get("/api/v1/users", params={"format": "ndjson", "limit": 1})
+
+    assert res.status_code == 200
+    assert res.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in res.text.splitlines()]
+    assert sorted(r["username"] for r in rows) == ["jdoe0", "jdoe1", "jdoe2"]
+    assert "password_hash" not in rows[0]
+
+
+def test_export_users_csv_via_accept_header(client):
+    import csv
+    import io
+
+    _create_users(client, 2)
+
+    res = client.get(
+        "/api/v1/users",
+        params={"username_prefix": "jdoe1"},
+        headers={"Accept": "text/csv"},
+    )
+
+    assert res.status_code == 200
+    assert res.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(res.text)))
+    assert [r["username"] for r in rows] == ["jdoe1"]
+    assert set(rows[0]) == {"id", "name", "lastname", "username", "email", "created_at", "updated_at"}
+
+
+def test_get_users_fast_and_default_responses_match(client, monkeypatch):
+    import dataclasses
+
+    from app.core import serialization
+
+    _create_users(client, 3)
+
+    fast = client.get("/api/v1/users", params={"limit": 2})
+    monkeypatch.setattr(serialization, "settings", dataclasses.replace(serialization.settings, fast_responses=False))
+    default = client.get("/api/v1/users", params={"limit": 2})
+
+    assert fast.status_code == default.status_code == 200
+    assert fast.content == default.content
+
+
+def test_create_user_query_budget(client, query_budget):
+    payload = {
+        "name": "John",
+        "lastname": "Doe",
+        "username": "jdoe",
+        "email": "john@doe.com",
+        "password": "password123",
+    }
+
+    # one uniqueness check, the INSERT and the refresh
+    with query_budget(max_queries=3, max_repeats=1):
+        res = client.post("/api/v1/users", json=payload)
+
+    assert res.status_code == 201
+
+
+def test_get_users_query_budget_and_server_timing(client, query_budget):
+    _create_users(client, 5)
+
+    # The listing's version (count, newest updated_at), then the page.
+    with query_budget(max_queries=2):
+        res = client.get("/api/v1/users")
+
+    assert len(res.json()["items"]) == 5
+    timing = res.headers["server-timing"]
+    assert timing.startswith("db;dur=")
+    assert 'desc="2 queries"' in timing
+    assert 'sql-1;dur=' in timing
+
+
+def test_create_user_retry_with_idempotency_key_is_replayed(client):
+    from app.core.idempotency import idempotency_cache
+    idempotency_cache.clear()
+    payload = {
+        "name": "John",
+        "lastname": "Doe",
+        "username": "retry",
+        "email": "retry@doe.com",
+        "password": "password123",
+    }
+    headers = {"Idempotency-Key": "signup-3f1c"}
+
+    first = client.post("/api/v1/users", json=payload, headers=headers)
+    retry = client.post("/api/v1/users", json=payload, headers=headers)
+    idempotency_cache.clear()
+
+    assert first.status_code == retry.status_code == 201
+    assert retry.json() == first.json()
+    assert retry.headers["idempotent-replayed"] == "true"
+
+
+def test_get_users_not_modified(client, query_budget):
+    _create_users(client, 3)
+    first = client.get("/api/v1/users", params={"limit": 2})
+    etag = first.headers["etag"]
+
+    with query_budget(max_queries=1):
+        unchanged = client.get("/api/v1/users", params={"limit": 2}, headers={"If-None-Match": etag})
+    since = client.get("/api/v1/users", params={"limit": 2}, headers={"If-Modified-Since": "Fri, 01 Jan 2100 00:00:00 GMT"})
+    other_page = client.get("/api/v1/users", params={"limit": 3}, headers={"If-None-Match": etag})
+    client.post("/api/v1/users", json={
+        "name": "Jane", "lastname": "Doe", "username": "jane", "email": "jane@doe.com", "password": "password123",
+    })
+    changed = client.get("/api/v1/users", params={"limit": 2}, headers={"If-None-Match": etag})
+
+    assert first.headers["cache-control"] == "no-cache"
+    assert unchanged.status_code == 304
+    assert since.status_code == 200 and "last-modified" not in first.headers
+    assert unchanged.content == b""
+    assert unchanged.headers["etag"] == etag
+    assert other_page.status_code == 200
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+
+
+def test_create_user_rate_limited_per_client(client, monkeypatch):
+    from app.routers.user import signup_admission
+
+    monkeypatch.setattr(signup_admission, "burst", 2)
+    monkeypatch.setattr(signup_admission, "rate", 0.01)
+    statuses = []
+    for i in range(3):
+        res = client.post("/api/v1/users", json={
+            "name": "John",
+            "lastname": "Doe",
+            "username": f"burst{i}",
+            "email": f"burst{i}@doe.com",
+            "password": "password123",
+        })
+        statuses.append(res.status_code)
+
+    assert statuses == [201, 201, 429]
+    assert res.json()["code"] == "admission.rate_limited"
+    assert int(res.headers["retry-after"]) >= 1
+
+
+def test_malformed_signup_does_not_spend_a_token(client, monkeypatch):
+    from app.routers.user import signup_admission
+
+    monkeypatch.setattr(signup_admission, "burst", 1)
+    monkeypatch.setattr(signup_admission, "rate", 0.01)
+
+    invalid = [client.post("/api/v1/users", json={}).status_code for _ in range(3)]
+    res = client.post("/api/v1/users", json={
+        "name": "John",
+        "lastname": "Doe",
+        "username": "valid",
+        "email": "valid@doe.com",
+        "password": "password123",
+    })
+
+    assert invalid == [422, 422, 422]
+    assert res.status_code == 201
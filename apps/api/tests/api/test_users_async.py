@@ -0,0 +1,43 @@
+# tests/api/test_users_async.py
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+PAYLOAD = {
+    "name": "John",
+    "lastname": "Doe",
+    "username": "jdoe",
+    "email": "john@doe.com",
+    "password": "password123",
+}
+
+
+async def test_create_and_list_users(async_client):
+    res = await async_client.post("/api/v1/users", json=PAYLOAD)
+    assert res.status_code == 201
+    assert res.json()["username"] == "jdoe"
+
+    res = await async_client.get("/api/v1/users")
+    assert res.status_code == 200
+    users = res.json()["items"]
+    assert len(users) == 1
+    assert users[0]["email"] == "john@doe.com"
+
+
+async def test_create_user_username_conflict(async_client):
+    await async_client.post("/api/v1/users", json=PAYLOAD)
+    res = await async_client.post("/api/v1/users", json=PAYLOAD)
+
+    assert res.status_code == 409
+    assert res.json()["code"] == "user.username_already_exists"
+
+
+async def test_export_users_ndjson(async_client):
+    await async_client.post("/api/v1/users", json=PAYLOAD)
+
+    res = await async_client.get("/api/v1/users", params={"format": "ndjson"})
+
+    assert res.status_code == 200
+    lines = res.text.splitlines()
+    assert len(lines) == 1
+    assert '"username":"jdoe"' in lines[0]
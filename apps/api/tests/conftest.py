@@ -1,12 +1,17 @@
 # tests/conftest.py
+import httpx
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
 
-from app.main import app
+from app.main import app, create_app
+from app.db import base  # noqa: F401 - registers every model on Base.metadata
 from app.db.base_class import Base
-from app.core.deps import get_db
+from app.core.admission import LIMITERS
+from app.core.deps import get_async_db, get_async_read_db, get_db, get_read_db
+from app.db.query_stats import assert_query_budget
 
 # --- Test database (SQLite in-memory) ---
 SQLALCHEMY_DATABASE_URL = "sqlite+pysqlite:///:memory:"
@@ -27,6 +32,14 @@ TestingSessionLocal = sessionmaker(
 Base.metadata.create_all(bind=engine)
 
 
+@pytest.fixture(autouse=True)
+def reset_admission_limiters():
+    """Token buckets are per client, and every test client has the same address."""
+    for limiter in LIMITERS.values():
+        limiter.reset()
+    yield
+
+
 @pytest.fixture
 def db_session():
     """
@@ -56,8 +69,61 @@ def client(db_session):
             pass
 
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
 
     with TestClient(app) as c:
         yield c
 
     app.dependency_overrides.clear()
+
+
+@pytest.fixture
+def query_budget():
+    """
+    Opt-in SQL budget for a block of a test:
+
+        with query_budget(max_queries=3, max_repeats=1):
+            client.post(...)
+    """
+    return assert_query_budget
+
+
+# --- Async stack (aiosqlite in-memory, one database per test) ---
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+async def async_db_session():
+    """
+    Provides an AsyncSession bound to a fresh in-memory SQLite database.
+    """
+    async_engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with async_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    session = AsyncSession(async_engine, autoflush=False, expire_on_commit=False)
+    try:
+        yield session
+    finally:
+        await session.close()
+        await async_engine.dispose()
+
+
+@pytest.fixture
+async def async_client(async_db_session):
+    """
+    httpx AsyncClient against an app built with DB_ASYNC enabled.
+    """
+    async_app = create_app(db_async=True)
+
+    async def override_get_async_db():
+        yield async_db_session
+
+    async_app.dependency_overrides[get_async_db] = override_get_async_db
+    async_app.dependency_overrides[get_async_read_db] = override_get_async_db
+
+    transport = httpx.ASGITransport(app=async_app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+        yield c
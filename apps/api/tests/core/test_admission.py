@@ -0,0 +1,110 @@
+# tests/core/test_admission.py
+import asyncio
+import dataclasses
+
+import httpx
+import pytest
+from fastapi import APIRouter, Depends
+
+from app.core import admission
+from app.core.admission import AdmissionLimiter, TokenBucket
+from app.main import create_app
+
+pytestmark = pytest.mark.anyio
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def client_for(limiter, release=None):
+    router = APIRouter()
+
+    @router.post("/work", dependencies=[Depends(limiter, scope="function")])
+    async def work():
+        if release is not None:
+            await release.wait()
+        return {"ok": True}
+
+    app = create_app()
+    app.include_router(router)
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+
+
+def test_token_bucket_refills_at_rate():
+    bucket = TokenBucket(2, now=0.0)
+
+    assert bucket.take(rate=0.5, burst=2, now=0.0) == 0
+    assert bucket.take(rate=0.5, burst=2, now=0.0) == 0
+    assert bucket.take(rate=0.5, burst=2, now=0.0) == pytest.approx(2.0)
+    assert bucket.take(rate=0.5, burst=2, now=2.0) == 0
+
+
+async def test_client_over_its_rate_gets_429():
+    clock = FakeClock()
+    limiter = AdmissionLimiter("test.rate", max_concurrency=10, rate=0.5, burst=2, clock=clock)
+    async with client_for(limiter) as client:
+        statuses = [(await client.post("/work")).status_code for _ in range(2)]
+        limited = await client.post("/work")
+        clock.now = 2.0
+        refilled = await client.post("/work")
+
+    assert statuses == [200, 200]
+    assert limited.status_code == 429
+    assert limited.json()["code"] == "admission.rate_limited"
+    assert limited.headers["retry-after"] == "2"
+    assert refilled.status_code == 200
+
+
+async def test_requests_over_the_limit_queue_for_a_slot():
+    limiter = AdmissionLimiter("test.queue", max_concurrency=1)
+    release = asyncio.Event()
+    async with client_for(limiter, release) as client:
+        requests = [asyncio.create_task(client.post("/work")) for _ in range(3)]
+        await asyncio.sleep(0.05)
+        assert (limiter.in_flight, limiter.queued) == (1, 2)
+        release.set()
+        responses = await asyncio.gather(*requests)
+
+    assert [r.status_code for r in responses] == [200, 200, 200]
+    assert (limiter.in_flight, limiter.queued) == (0, 0)
+
+
+async def test_sheds_when_the_estimated_wait_exceeds_the_deadline():
+    limiter = AdmissionLimiter("test.shed", max_concurrency=2)
+    limiter.service_time = 3.0  # two queued requests ahead would wait 3 s
+    release = asyncio.Event()
+    async with client_for(limiter, release) as client:
+        running = [asyncio.create_task(client.post("/work")) for _ in range(3)]
+        await asyncio.sleep(0.05)
+        shed = await client.post("/work")
+        release.set()
+        await asyncio.gather(*running)
+
+    assert shed.status_code == 503
+    assert shed.json() == {
+        "code": "admission.overloaded",
+        "detail": "The server is busy. Please retry later.",
+        "meta": {"route": "test.shed"},
+    }
+    assert shed.headers["retry-after"] == "3"
+
+
+async def test_queued_request_gives_up_at_the_deadline(monkeypatch):
+    monkeypatch.setattr(admission, "settings", dataclasses.replace(admission.settings, admission_deadline_seconds=0.05))
+    limiter = AdmissionLimiter("test.timeout", max_concurrency=1)
+    release = asyncio.Event()
+    async with client_for(limiter, release) as client:
+        first = asyncio.create_task(client.post("/work"))
+        await asyncio.sleep(0.01)
+        timed_out = await client.post("/work")
+        release.set()
+        await first
+
+    assert timed_out.status_code == 503
+    assert timed_out.json()["code"] == "admission.overloaded"
+    assert (limiter.in_flight, limiter.queued) == (0, 0)
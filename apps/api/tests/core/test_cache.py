@@ -0,0 +1,72 @@
+# tests/core/test_cache.py
+from app.core.cache import LRUCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_lru_evicts_least_recently_used():
+    cache = LRUCache("test_lru", maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # "b" is now the oldest
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get_many(["a", "c"]) == {"a": 1, "c": 3}
+    assert cache.stats()["evictions"] == 1
+
+
+def test_ttl_expires_entries():
+    clock = FakeClock()
+    cache = LRUCache("test_ttl", maxsize=10, ttl=30, clock=clock)
+    cache.set("rate", 17.5)
+
+    clock.now = 29
+    assert cache.get("rate") == 17.5
+    clock.now = 30
+    assert cache.get("rate") is None
+    assert len(cache) == 0
+
+
+def test_counters_and_read_through():
+    cache = LRUCache("test_counters", maxsize=10)
+    loads = []
+
+    def load():
+        loads.append(1)
+        return "value"
+
+    assert cache.get_or_load("k", load) == "value"
+    assert cache.get_or_load("k", load) == "value"
+    cache.get_many(["k", "missing"])
+
+    stats = cache.stats()
+    assert len(loads) == 1
+    assert (stats["hits"], stats["misses"]) == (2, 2)
+
+
+def test_invalidation():
+    cache = LRUCache("test_invalidate", maxsize=10)
+    cache.set_many({("u1", 1): "a", ("u1", 2): "b", ("u2", 1): "c"})
+
+    assert cache.invalidate_where(lambda key: key[0] == "u1") == 2
+    cache.invalidate(("u2", 1))
+
+    assert len(cache) == 0
+
+
+def test_load_racing_an_invalidation_is_not_stored():
+    cache = LRUCache("test_race", maxsize=4)
+
+    def loader():
+        cache.invalidate("a")  # a write lands while the value is being loaded
+        return 1
+
+    assert cache.get_or_load("a", loader) == 1
+    assert cache.get("a") is None
@@ -0,0 +1,47 @@
+# tests/core/test_conditional.py
+from datetime import datetime, timezone
+
+from fastapi import Response
+from starlette.requests import Request
+
+from app.core.conditional import CollectionVersion, check_not_modified
+
+
+def make_request(query="", **headers):
+    return Request({
+        "type": "http",
+        "method": "GET",
+        "path": "/things",
+        "query_string": query.encode(),
+        "headers": [(name.replace("_", "-").encode(), value.encode()) for name, value in headers.items()],
+    })
+
+
+def test_etag_covers_version_and_query():
+    version = CollectionVersion(3, datetime(2026, 10, 18, 12, 0, 0, 250_000, tzinfo=timezone.utc))
+
+    assert version.etag("limit=2") == CollectionVersion(3, version.updated_at).etag("limit=2")
+    assert version.etag("limit=2") != version.etag("limit=3")
+    assert version.etag("limit=2") != CollectionVersion(4, version.updated_at).etag("limit=2")
+    assert version.etag("limit=2") != CollectionVersion(3, version.updated_at, digest="x").etag("limit=2")
+
+
+def test_if_none_match_lists_weak_tags():
+    version = CollectionVersion(1, datetime(2026, 10, 18, tzinfo=timezone.utc))
+    etag = version.etag("")
+    opaque = etag.removeprefix("W/")
+
+    assert check_not_modified(make_request(if_none_match=f'"other", {opaque}'), Response(), version).status_code == 304
+    assert check_not_modified(make_request(if_none_match="*"), Response(), version) is not None
+    assert check_not_modified(make_request(if_none_match='"other"'), Response(), version) is None
+
+
+def test_if_modified_since_is_ignored():
+    # updated_at is taken when the writing transaction starts and HTTP dates
+    # have whole seconds: a date can't prove the list is unchanged.
+    version = CollectionVersion(1, datetime(2026, 10, 18, 9, 30, tzinfo=timezone.utc))
+    response = Response()
+
+    assert check_not_modified(make_request(if_modified_since="Sun, 18 Oct 2026 10:00:00 GMT"), response, version) is None
+    assert "last-modified" not in response.headers
+    assert response.headers["etag"] == version.etag("")
@@ -0,0 +1,136 @@
+# tests/core/test_idempotency.py
+import asyncio
+import dataclasses
+
+import httpx
+import pytest
+from fastapi import APIRouter, Body
+
+from app.core import idempotency
+from app.core.idempotency import IdempotentRoute, idempotency_cache
+from app.exceptions.base import ConflictError
+from app.main import create_app
+
+pytestmark = pytest.mark.anyio
+
+
+class Endpoint:
+    """A POST route that counts its calls and can be held open or made to fail."""
+    def __init__(self):
+        self.calls = 0
+        self.release = asyncio.Event()
+        self.release.set()
+        self.fail = False
+
+    def app(self):
+        router = APIRouter(route_class=IdempotentRoute)
+
+        @router.post("/things", status_code=201)
+        async def create_thing(payload: dict = Body(...)):
+            self.calls += 1
+            await self.release.wait()
+            if self.fail:
+                raise ConflictError(code="thing.exists")
+            return {"call": self.calls, **payload}
+
+        app = create_app()
+        app.include_router(router)
+        return app
+
+
+@pytest.fixture
+def endpoint():
+    idempotency_cache.clear()
+    yield Endpoint()
+    idempotency_cache.clear()
+
+
+def client_for(endpoint, address="127.0.0.1"):
+    transport = httpx.ASGITransport(app=endpoint.app(), client=(address, 123))
+    return httpx.AsyncClient(transport=transport, base_url="http://test")
+
+
+async def test_retry_replays_the_stored_response(endpoint):
+    async with client_for(endpoint) as client:
+        first = await client.post("/things", json={"name": "a"}, headers={"Idempotency-Key": "k1"})
+        retry = await client.post("/things", json={"name": "a"}, headers={"Idempotency-Key": "k1"})
+        other = await client.post("/things", json={"name": "a"}, headers={"Idempotency-Key": "k2"})
+        plain = await client.post("/things", json={"name": "a"})
+
+    assert endpoint.calls == 3
+    assert (first.status_code, retry.status_code) == (201, 201)
+    assert retry.json() == first.json() == {"call": 1, "name": "a"}
+    assert retry.headers["idempotent-replayed"] == "true"
+    assert "idempotent-replayed" not in first.headers
+    assert other.json()["call"] == 2 and plain.json()["call"] == 3
+
+
+async def test_keys_are_scoped_to_the_client(endpoint):
+    async with client_for(endpoint, "10.0.0.1") as first, client_for(endpoint, "10.0.0.2") as second:
+        mine = await first.post("/things", json={"name": "a"}, headers={"Idempotency-Key": "k"})
+        same_body = await second.post("/things", json={"name": "a"}, headers={"Idempotency-Key": "k"})
+        other_body = await second.post("/things", json={"name": "b"}, headers={"Idempotency-Key": "k2"})
+        reused = await first.post("/things", json={"name": "b"}, headers={"Idempotency-Key": "k2"})
+
+    assert endpoint.calls == 4
+    assert [r.status_code for r in (mine, same_body, other_body, reused)] == [201, 201, 201, 201]
+    assert same_body.json() == {"call": 2, "name": "a"}
+    assert "idempotent-replayed" not in same_body.headers
+    assert reused.json() == {"call": 4, "name": "b"}
+
+
+async def test_concurrent_duplicates_wait_for_the_first_request(endpoint):
+    endpoint.release.clear()
+    async with client_for(endpoint) as client:
+        requests = [
+            asyncio.create_task(client.post("/things", json={"name": "a"}, headers={"Idempotency-Key": "k"}))
+            for _ in range(3)
+        ]
+        await asyncio.sleep(0.05)
+        endpoint.release.set()
+        responses = await asyncio.gather(*requests)
+
+    assert endpoint.calls == 1
+    assert {r.json()["call"] for r in responses} == {1}
+    assert sorted(r.headers.get("idempotent-replayed", "") for r in responses) == ["", "true", "true"]
+
+
+async def test_key_reused_with_another_body_is_rejected(endpoint):
+    async with client_for(endpoint) as client:
+        await client.post("/things", json={"name": "a"}, headers={"Idempotency-Key": "k"})
+        res = await client.post("/things", json={"name": "b"}, headers={"Idempotency-Key": "k"})
+        too_long = await client.post("/things", json={"name": "a"}, headers={"Idempotency-Key": "x" * 256})
+
+    assert res.status_code == 400
+    assert res.json()["code"] == "idempotency.key_reused"
+    assert too_long.json()["code"] == "idempotency.invalid_key"
+    assert endpoint.calls == 1
+
+
+async def test_errors_are_not_stored(endpoint):
+    endpoint.fail = True
+    async with client_for(endpoint) as client:
+        failed = await client.post("/things", json={"name": "a"}, headers={"Idempotency-Key": "k"})
+        endpoint.fail = False
+        retried = await client.post("/things", json={"name": "a"}, headers={"Idempotency-Key": "k"})
+
+    assert failed.status_code == 409
+    assert retried.status_code == 201
+    assert "idempotent-replayed" not in retried.headers
+    assert endpoint.calls == 2
+
+
+async def test_duplicate_gives_up_waiting_with_retry_after(endpoint, monkeypatch):
+    monkeypatch.setattr(idempotency, "settings", dataclasses.replace(idempotency.settings, idempotency_wait_seconds=0.05))
+    endpoint.release.clear()
+    async with client_for(endpoint) as client:
+        first = asyncio.create_task(client.post("/things", json={"name": "a"}, headers={"Idempotency-Key": "k"}))
+        await asyncio.sleep(0.01)
+        duplicate = await client.post("/things", json={"name": "a"}, headers={"Idempotency-Key": "k"})
+        endpoint.release.set()
+        await first
+
+    assert duplicate.status_code == 409
+    assert duplicate.json()["code"] == "idempotency.in_progress"
+    assert duplicate.headers["retry-after"] == "1"
+    assert endpoint.calls == 1
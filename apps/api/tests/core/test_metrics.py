@@ -0,0 +1,54 @@
+# tests/core/test_metrics.py
+import uuid
+
+from app.core.metrics import Registry
+from app.core.middleware import HTTP_IN_PROGRESS, HTTP_LATENCY, HTTP_REQUESTS, UNMATCHED_ROUTE
+
+
+def test_histogram_buckets_and_render():
+    registry = Registry()
+    latency = registry.histogram("latency_seconds", "Latency.", labelnames=("route",), buckets=(0.1, 1.0))
+
+    for value in (0.05, 0.1, 0.5, 3.0):
+        latency.observe(value, route="/a")
+
+    lines = registry.render().splitlines()
+    assert 'latency_seconds_bucket{route="/a",le="0.1"} 2' in lines
+    assert 'latency_seconds_bucket{route="/a",le="1"} 3' in lines
+    assert 'latency_seconds_bucket{route="/a",le="+Inf"} 4' in lines
+    assert 'latency_seconds_count{route="/a"} 4' in lines
+    assert latency.count(route="/a") == 4
+
+
+def test_requests_are_recorded_per_route_template(client, db_session):
+    route = "/api/v1/users/{user_id}/categories"
+    labels = {"method": "GET", "route": route, "status": "200"}
+    before = HTTP_REQUESTS.value(**labels)
+
+    client.get(f"/api/v1/users/{uuid.uuid4()}/categories")
+    client.get(f"/api/v1/users/{uuid.uuid4()}/categories")
+
+    assert HTTP_REQUESTS.value(**labels) == before + 2
+    assert HTTP_LATENCY.count(**labels) >= 2
+    assert HTTP_IN_PROGRESS.value(method="GET") == 0
+
+
+def test_unmatched_paths_share_one_label(client):
+    before = HTTP_REQUESTS.value(method="GET", route=UNMATCHED_ROUTE, status="404")
+
+    client.get("/nope/1")
+    client.get("/nope/2")
+
+    assert HTTP_REQUESTS.value(method="GET", route=UNMATCHED_ROUTE, status="404") == before + 2
+
+
+def test_metrics_endpoint(client):
+    client.get("/api/v1/system/caches")
+
+    res = client.get("/metrics")
+
+    assert res.status_code == 200
+    assert res.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert 'http_requests_total{method="GET",route="/api/v1/system/caches",status="200"}' in res.text
+    assert 'db_pool_checked_out{pool="sync"}' in res.text
+    assert "# TYPE http_request_duration_seconds histogram" in res.text
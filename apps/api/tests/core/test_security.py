@@ -0,0 +1,67 @@
+# tests/core/test_security.py
+import time
+
+import pytest
+
+from app.core import security
+from app.core.security import PasswordHasher
+from app.exceptions.security import HashingPoolSaturatedError, HashingTimeoutError
+
+
+def test_hash_and_verify_in_process_pool():
+    hasher = PasswordHasher(workers=1, queue_size=0, timeout=10)
+    try:
+        password_hash = hasher.hash("password123")
+
+        assert password_hash.startswith("$argon2")
+        assert hasher.verify("password123", password_hash) is True
+        assert hasher.verify("wrong-password", password_hash) is False
+        assert hasher.pending == 0
+    finally:
+        hasher.shutdown()
+
+
+def test_inline_mode_skips_pool():
+    hasher = PasswordHasher(workers=0, queue_size=0, timeout=10)
+
+    password_hash = hasher.hash("password123")
+
+    assert hasher.verify("password123", password_hash) is True
+    assert hasher._executor is None
+
+
+def test_full_queue_is_rejected():
+    hasher = PasswordHasher(workers=1, queue_size=0, timeout=10)
+    try:
+        hasher._submit("hash", time.sleep, 1)
+
+        with pytest.raises(HashingPoolSaturatedError) as exc_info:
+            hasher.hash("password123")
+
+        assert exc_info.value.retry_after == 1
+        assert security.HASH_REJECTED.value(operation="hash", reason="saturated") >= 1
+    finally:
+        hasher.shutdown()
+
+
+def test_slow_job_times_out():
+    hasher = PasswordHasher(workers=1, queue_size=1, timeout=0.05)
+    try:
+        hasher._submit("hash", time.sleep, 1)
+
+        with pytest.raises(HashingTimeoutError):
+            hasher.hash("password123")
+    finally:
+        hasher.shutdown()
+
+
+@pytest.mark.anyio
+async def test_async_hash_uses_pool():
+    hasher = PasswordHasher(workers=1, queue_size=0, timeout=10)
+    try:
+        password_hash = await hasher.ahash("password123")
+
+        assert await hasher.averify("password123", password_hash) is True
+        assert security.HASH_LATENCY.count(operation="hash") >= 1
+    finally:
+        hasher.shutdown()
@@ -0,0 +1,61 @@
+# tests/core/test_serialization.py
+import uuid
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from typing import List, Optional
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+from app.core.serialization import build_rows, dumps, type_adapter
+from app.models.transaction import TransactionType
+
+
+class Row(BaseModel):
+    id: uuid.UUID
+    when: datetime
+    amount: Decimal
+    type: TransactionType
+    note: Optional[str] = None
+
+
+class Page(BaseModel):
+    items: List[Row]
+    next_cursor: Optional[str] = None
+
+
+class Obj:
+    def __init__(self, **kwargs):
+        self.__dict__.update(kwargs)
+
+
+def default_body(content) -> bytes:
+    return JSONResponse(jsonable_encoder(content)).body
+
+
+def test_matches_default_encoding_byte_for_byte():
+    objs = [
+        Obj(id=uuid.uuid4(), when=datetime(2026, 1, 5, 10, tzinfo=timezone.utc), amount=Decimal("12.30"),
+            type=TransactionType.expense, note="café"),
+        Obj(id=uuid.uuid4(), when=datetime(2026, 1, 5, 10, 0, 0, 123456, tzinfo=timezone(timedelta(hours=-6))),
+            amount=Decimal("1000"), type=TransactionType.income, note=None),
+        Obj(id=uuid.uuid4(), when=datetime(2026, 1, 5), amount=Decimal("0.01"), type=TransactionType.expense, note=None),
+    ]
+    page = Page.model_construct(items=build_rows(Row, objs), next_cursor="abc")
+
+    assert dumps(page) == default_body(Page.model_validate(page.model_dump()))
+    assert dumps(page.items) == default_body(page.items)
+    assert dumps([]) == b"[]"
+
+
+def test_build_rows_reads_attributes():
+    obj = Obj(id=uuid.uuid4(), when=datetime(2026, 1, 5), amount=1, type="income", extra="ignored")
+
+    [row] = build_rows(Row, [obj])
+
+    assert (row.amount, row.type, row.note) == (Decimal(1), TransactionType.income, None)
+
+
+def test_type_adapters_are_cached():
+    assert type_adapter(List[Row]) is type_adapter(List[Row])
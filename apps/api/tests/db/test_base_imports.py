@@ -1,4 +1,8 @@
 # tests/db/test_base_imports.py
+import subprocess
+import sys
+
+
 def test_db_base_imports_models():
     # Si esto falla, normalmente se rompe Alembic/autogenerate o el mapeo de modelos.
     import app.db.base as base  # noqa: F401
@@ -13,3 +17,33 @@ def test_db_base_imports_models():
     assert Account.__tablename__
     assert Category.__tablename__
     assert Transaction.__tablename__
+
+
+def test_transaction_hooks_do_not_depend_on_which_service_is_imported():
+    # A fresh interpreter that only imports the models (as a script would)
+    # still gets balances maintained on a plain ORM write.
+    code = (
+        "import sys\n"
+        "from datetime import datetime, timezone\n"
+        "from decimal import Decimal\n"
+        "from sqlalchemy import create_engine, select\n"
+        "from sqlalchemy.orm import Session\n"
+        "from app.db.base import Account, AccountBalance, Base, Transaction, User\n"
+        "from app.models.account import AccountType\n"
+        "from app.models.transaction import TransactionSource, TransactionType\n"
+        "assert 'app.services.transaction_import' not in sys.modules\n"
+        "engine = create_engine('sqlite://')\n"
+        "Base.metadata.create_all(engine)\n"
+        "with Session(engine) as db:\n"
+        "    user = User(name='A', lastname='B', username='ab', email='a@b.com', password_hash='x')\n"
+        "    db.add(user); db.flush()\n"
+        "    account = Account(user_id=user.id, name='Checking', type=AccountType.debit, currency='MXN')\n"
+        "    db.add(account); db.flush()\n"
+        "    db.add(Transaction(user_id=user.id, account_id=account.id, type=TransactionType.income,\n"
+        "                       amount=Decimal('10.00'), date=datetime(2026, 1, 5, tzinfo=timezone.utc),\n"
+        "                       source=TransactionSource.manual))\n"
+        "    db.commit()\n"
+        "    balance = db.scalar(select(AccountBalance.balance).where(AccountBalance.account_id == account.id))\n"
+        "    assert balance == Decimal('10.00'), balance\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
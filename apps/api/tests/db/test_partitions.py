@@ -0,0 +1,100 @@
+# tests/db/test_partitions.py
+from datetime import date, datetime, timezone
+from types import SimpleNamespace
+
+from sqlalchemy import create_engine
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateTable
+
+from app.commands import partitions as partitions_command
+from app.db.partitions import (
+    add_months,
+    day_bounds,
+    detach_partitions,
+    ensure_partitions,
+    partition_name,
+)
+from app.models.transaction import Transaction
+
+
+class FakeConnection:
+    """Answers the catalog queries of app.db.partitions and records every statement."""
+    dialect = SimpleNamespace(name="postgresql")
+
+    def __init__(self, attached=(), in_default=()):
+        self.attached = [
+            (partition_name(m), f"FOR VALUES FROM ('{m} 00:00:00+00') TO ('{add_months(m, 1)} 00:00:00+00')")
+            for m in attached
+        ] + [("transactions_default", "DEFAULT")]
+        self.in_default = [(m,) for m in in_default]
+        self.statements = []
+
+    def scalar(self, statement, params=None):
+        return True
+
+    def execute(self, statement, params=None):
+        sql = str(statement)
+        self.statements.append(sql)
+        if "pg_inherits" in sql:
+            return self.attached
+        if "DISTINCT date_trunc" in sql:
+            return self.in_default
+        return []
+
+
+def test_month_helpers_and_day_bounds():
+    assert add_months(date(2026, 11, 1), 2) == date(2027, 1, 1)
+    assert add_months(date(2026, 1, 1), -1) == date(2025, 12, 1)
+    assert partition_name(date(2026, 3, 1)) == "transactions_p202603"
+    assert day_bounds(date(2026, 1, 1), date(2026, 1, 31)) == (
+        datetime(2026, 1, 1, tzinfo=timezone.utc),
+        datetime(2026, 2, 1, tzinfo=timezone.utc),
+    )
+    assert day_bounds(None, None) == (None, None)
+
+
+def test_postgres_ddl_partitions_by_date():
+    ddl = str(CreateTable(Transaction.__table__).compile(dialect=postgresql.dialect()))
+
+    assert "PARTITION BY RANGE (date)" in ddl
+    assert "PRIMARY KEY (id, date)" in ddl
+    assert "UNIQUE (user_id, hash_dedupe, date)" in ddl
+
+
+def test_ensure_creates_missing_months_and_months_found_in_default():
+    connection = FakeConnection(attached=[date(2026, 10, 1)], in_default=[date(2024, 5, 1)])
+
+    created = ensure_partitions(connection, months_ahead=2, today=date(2026, 10, 18))
+
+    assert created == ["transactions_p202405", "transactions_p202611", "transactions_p202612"]
+    assert "pg_advisory_xact_lock" in connection.statements[0]
+    moves = [s for s in connection.statements if s.startswith("WITH moved AS (DELETE FROM transactions_default")]
+    attaches = [s for s in connection.statements if "ATTACH PARTITION" in s]
+    assert len(moves) == 3
+    assert attaches[0].endswith(
+        "ATTACH PARTITION transactions_p202405 FOR VALUES FROM ('2024-05-01T00:00:00+00:00') TO ('2024-06-01T00:00:00+00:00')"
+    )
+
+
+def test_ensure_backfills_from_first_month():
+    connection = FakeConnection(attached=[date(2026, 10, 1)])
+
+    created = ensure_partitions(connection, months_ahead=0, today=date(2026, 10, 2), first_month=date(2026, 8, 1))
+
+    assert created == ["transactions_p202608", "transactions_p202609"]
+
+
+def test_detach_old_partitions_into_archive_schema():
+    connection = FakeConnection(attached=[date(2025, 12, 1), date(2026, 1, 1), date(2026, 2, 1)])
+
+    detached = detach_partitions(connection, before=date(2026, 2, 1), archive_schema="archive")
+
+    assert detached == ["transactions_p202512", "transactions_p202601"]
+    assert "ALTER TABLE transactions_p202601 SET SCHEMA \"archive\"" in connection.statements
+
+
+def test_command_refuses_a_table_that_is_not_partitioned(tmp_path, monkeypatch, capsys):
+    engine = create_engine(f"sqlite:///{tmp_path}/partitions.db")
+    monkeypatch.setattr(partitions_command, "get_engine", lambda: engine)
+    assert partitions_command.main(["list"]) == 1
+    assert "not a partitioned table" in capsys.readouterr().out
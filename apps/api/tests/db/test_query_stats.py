@@ -0,0 +1,42 @@
+# tests/db/test_query_stats.py
+import pytest
+from sqlalchemy import select, text
+
+from app.db.query_stats import QueryBudgetExceeded, track_queries
+from app.models.user import User
+
+
+def test_track_queries_counts_and_ranks(db_session):
+    with track_queries() as stats:
+        for _ in range(3):
+            db_session.execute(select(User.id).where(User.username == "x")).all()
+        db_session.execute(text("SELECT 1")).all()
+
+    assert stats.count == 4
+    assert stats.seconds > 0
+    assert len(stats.slowest()) == 3
+    [(statement, times)] = stats.repeated(2)
+    assert times == 3 and statement.startswith("SELECT users.id FROM users WHERE")
+
+
+def test_queries_outside_tracking_are_not_recorded(db_session):
+    with track_queries() as stats:
+        pass
+    db_session.execute(text("SELECT 1")).all()
+
+    assert stats.count == 0
+
+
+def test_budget_passes_and_fails(db_session, query_budget):
+    with query_budget(max_queries=2, max_repeats=1):
+        db_session.execute(text("SELECT 1")).all()
+
+    with pytest.raises(QueryBudgetExceeded, match="3 queries, budget is 2"):
+        with query_budget(max_queries=2):
+            for _ in range(3):
+                db_session.execute(text("SELECT 1")).all()
+
+    with pytest.raises(QueryBudgetExceeded, match=r"2x \(max 1\): SELECT 2"):
+        with query_budget(max_repeats=1):
+            db_session.execute(text("SELECT 2")).all()
+            db_session.execute(text("SELECT 2")).all()
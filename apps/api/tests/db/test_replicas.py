@@ -0,0 +1,45 @@
+# tests/db/test_replicas.py
+import dataclasses
+
+from app.db import replicas
+from app.db.replicas import RecentWrites, ReplicaSet, sticky_keys
+
+
+def test_reads_rotate_over_replicas_and_sticky_reads_use_the_primary():
+    sessions = ReplicaSet("primary", ["r1", "r2"])
+
+    assert [sessions.for_read() for _ in range(4)] == ["r1", "r2", "r1", "r2"]
+    assert sessions.for_read(sticky=True) == "primary"
+
+
+def test_without_replicas_reads_use_the_primary():
+    assert ReplicaSet("primary").for_read() == "primary"
+
+
+def test_recent_writes_expire_and_can_be_disabled():
+    recent = RecentWrites(60)
+    recent.record("user:1")
+    recent.record(None)
+
+    assert "user:1" in recent
+    assert "user:2" not in recent
+    assert None not in recent
+
+    recent._keys._clock = lambda: float("inf")
+    assert "user:1" not in recent
+
+    disabled = RecentWrites(0)
+    disabled.record("user:1")
+    assert "user:1" not in disabled
+
+
+def test_sticky_keys_by_user_and_client(monkeypatch):
+    scope = {"path_params": {"user_id": "ABC"}, "client": ("10.0.0.1", 5000)}
+
+    assert sticky_keys(scope) == ("user:abc", "client:10.0.0.1")
+    # No user in the path (sign-up, listing users): only the client.
+    assert sticky_keys({"path_params": {}, "client": ("10.0.0.1", 5000)}) == ("client:10.0.0.1",)
+    assert sticky_keys({"path_params": {}}) == ()
+
+    monkeypatch.setattr(replicas, "settings", dataclasses.replace(replicas.settings, replica_sticky_by="client"))
+    assert sticky_keys(scope) == ("client:10.0.0.1",)
@@ -0,0 +1,57 @@
+# tests/db/test_session.py
+import dataclasses
+import os
+import subprocess
+import sys
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.db import session
+from app.main import create_app
+
+
+@pytest.fixture
+def no_engines(monkeypatch):
+    monkeypatch.setattr(session, "_engines", {})
+
+
+def test_importing_the_app_builds_no_engine_and_skips_passlib():
+    env = {k: v for k, v in os.environ.items() if k != "DATABASE_URL"}
+    code = (
+        "import sys, app.main\n"
+        "from app.db import session\n"
+        "assert not session._engines, session._engines\n"
+        "assert 'passlib' not in sys.modules\n"
+    )
+    subprocess.run([sys.executable, "-c", code], env=env, check=True)
+
+
+def test_engine_is_created_once_on_first_session(no_engines, monkeypatch):
+    monkeypatch.setattr(session, "settings", dataclasses.replace(session.settings, database_url="sqlite://"))
+    factory = session.LazySessionMaker(session.get_engine, future=True)
+
+    with factory() as db:
+        assert isinstance(db, Session)
+        assert db.get_bind() is session.get_engine() is session.engine
+    assert list(session._engines) == ["sync"]
+
+
+def test_missing_database_url_fails_on_first_use(no_engines, monkeypatch):
+    monkeypatch.setattr(session, "settings", dataclasses.replace(session.settings, database_url=""))
+
+    with pytest.raises(RuntimeError, match="DATABASE_URL"):
+        session.get_engine()
+
+
+def test_async_startup_builds_only_async_engines(no_engines, monkeypatch):
+    monkeypatch.setattr(session, "settings", dataclasses.replace(session.settings, database_url="sqlite://"))
+    with TestClient(create_app(db_async=True)):
+        assert list(session._engines) == ["async"]
+
+
+def test_pool_gauges_do_not_create_engines(no_engines):
+    session.update_pool_gauges()
+
+    assert session._engines == {}
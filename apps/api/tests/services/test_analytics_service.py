@@ -0,0 +1,132 @@
+# tests/services/test_analytics_service.py
+import random
+from collections import defaultdict
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+
+import pytest
+
+from app.exceptions.report import InvalidReportRangeError
+from app.models.account import Account, AccountType
+from app.models.transaction import Transaction, TransactionSource, TransactionType
+from app.models.user import User
+from app.services.analytics import AnalyticsService, Granularity, fetch_columns
+
+
+def make_account(db_session):
+    user = User(name="John", lastname="Doe", username="jdoe", email="john@doe.com", password_hash="x")
+    db_session.add(user)
+    db_session.flush()
+    account = Account(user_id=user.id, name="Checking", type=AccountType.debit, currency="MXN")
+    db_session.add(account)
+    db_session.commit()
+    return user, account
+
+
+def add_tx(db_session, user, account, type_, amount, when, merchant=None):
+    db_session.add(Transaction(
+        user_id=user.id,
+        account_id=account.id,
+        type=type_,
+        amount=Decimal(amount),
+        date=when,
+        merchant=merchant,
+        source=TransactionSource.manual,
+    ))
+
+
+def utc(y, m, d, h=12):
+    return datetime(y, m, d, h, tzinfo=timezone.utc)
+
+
+def test_fetch_columns_uses_signed_minor_units(db_session):
+    user, account = make_account(db_session)
+    add_tx(db_session, user, account, TransactionType.income, "0.10", utc(2026, 1, 1), "Bank")
+    add_tx(db_session, user, account, TransactionType.expense, "12.30", utc(2026, 1, 2), "Cafe")
+    db_session.commit()
+
+    cols = fetch_columns(db_session, user.id, batch_size=1)
+
+    assert sorted(cols.amount.tolist()) == [-1230, 10]
+    assert sorted(cols.day.tolist()) == [(date(2026, 1, 1) - date(1970, 1, 1)).days, (date(2026, 1, 2) - date(1970, 1, 1)).days]
+    assert sorted(cols.merchants.tolist()) == ["Bank", "Cafe"]
+
+
+def test_cash_flow_matches_python_baseline(db_session):
+    user, account = make_account(db_session)
+    rng = random.Random(7)
+    expected = defaultdict(lambda: [Decimal("0"), Decimal("0")])
+    for _ in range(300):
+        when = utc(2025, 1, 1) + timedelta(days=rng.randrange(700), hours=rng.randrange(24))
+        type_ = rng.choice(list(TransactionType))
+        amount = Decimal(rng.randrange(1, 100_000)).scaleb(-2)
+        add_tx(db_session, user, account, type_, amount, when)
+        expected[date(when.year, when.month, 1)][type_ is TransactionType.expense] += amount
+    db_session.commit()
+
+    report = AnalyticsService.cash_flow(db_session, user.id, granularity=Granularity.month)
+
+    running = Decimal("0")
+    for point in report.points:
+        income, expense = expected[point.period]
+        running += income - expense
+        assert (point.income, point.expense, point.net, point.cumulative_net) == (income, expense, income - expense, running)
+    assert len(report.points) == len(expected)
+
+
+def test_weekly_buckets_start_on_monday(db_session):
+    user, account = make_account(db_session)
+    add_tx(db_session, user, account, TransactionType.expense, "1.00", utc(2026, 1, 4))  # Sunday
+    add_tx(db_session, user, account, TransactionType.expense, "2.00", utc(2026, 1, 5))  # Monday
+    db_session.commit()
+
+    report = AnalyticsService.cash_flow(db_session, user.id, granularity=Granularity.week)
+
+    assert [(p.period, p.expense) for p in report.points] == [
+        (date(2025, 12, 29), Decimal("1.00")),
+        (date(2026, 1, 5), Decimal("2.00")),
+    ]
+
+
+def test_rolling_average_fills_gaps(db_session):
+    user, account = make_account(db_session)
+    add_tx(db_session, user, account, TransactionType.income, "30.00", utc(2026, 3, 1))
+    add_tx(db_session, user, account, TransactionType.expense, "6.00", utc(2026, 3, 4))
+    db_session.commit()
+
+    report = AnalyticsService.rolling_average(db_session, user.id, window=3)
+
+    assert [(p.day.day, p.net, p.rolling_average, p.transaction_count) for p in report.points] == [
+        (1, Decimal("30.00"), Decimal("30.0"), 1),
+        (2, Decimal("0.00"), Decimal("15.0"), 0),
+        (3, Decimal("0.00"), Decimal("10.0"), 0),
+        (4, Decimal("-6.00"), Decimal("-2.0"), 1),
+    ]
+
+
+def test_top_merchants_ranks_by_total(db_session):
+    user, account = make_account(db_session)
+    for merchant, amount in [("Cafe", "5.00"), ("Cafe", "6.00"), ("Grocer", "50.00"), ("Kiosk", "1.00"), (None, "999.00")]:
+        add_tx(db_session, user, account, TransactionType.expense, amount, utc(2026, 1, 1), merchant)
+    add_tx(db_session, user, account, TransactionType.income, "500.00", utc(2026, 1, 1), "Employer")
+    db_session.commit()
+
+    report = AnalyticsService.top_merchants(db_session, user.id, limit=2)
+
+    assert [(m.merchant, m.total, m.transaction_count) for m in report.items] == [
+        ("Grocer", Decimal("50.00"), 1),
+        ("Cafe", Decimal("11.00"), 2),
+    ]
+
+
+def test_date_range_is_inclusive_and_validated(db_session):
+    user, account = make_account(db_session)
+    add_tx(db_session, user, account, TransactionType.expense, "1.00", utc(2026, 1, 31, 23))
+    add_tx(db_session, user, account, TransactionType.expense, "2.00", utc(2026, 2, 1, 0))
+    db_session.commit()
+
+    report = AnalyticsService.cash_flow(db_session, user.id, start=date(2026, 1, 1), end=date(2026, 1, 31))
+    assert [p.expense for p in report.points] == [Decimal("1.00")]
+
+    with pytest.raises(InvalidReportRangeError):
+        fetch_columns(db_session, user.id, start=date(2026, 2, 1), end=date(2026, 1, 1))
@@ -0,0 +1,140 @@
+# tests/services/test_balance_service.py
+import uuid
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import pytest
+
+from app.commands.balances import main as balances_command
+from app.exceptions.account import AccountNotFoundError
+from app.models.account import Account, AccountType
+from app.models.account_balance import AccountBalance
+from app.models.transaction import Transaction, TransactionSource, TransactionType
+from app.models.user import User
+from app.services.balance import BalanceService
+from app.services.transaction_import import ImportRow, TransactionImportService
+
+
+def make_account(db_session, name="Checking", currency="MXN", user=None):
+    if user is None:
+        user = User(name="John", lastname="Doe", username="jdoe", email="john@doe.com", password_hash="x")
+        db_session.add(user)
+        db_session.flush()
+    account = Account(user_id=user.id, name=name, type=AccountType.debit, currency=currency)
+    db_session.add(account)
+    db_session.commit()
+    return user, account
+
+
+def make_tx(user, account, type_, amount):
+    return Transaction(
+        user_id=user.id,
+        account_id=account.id,
+        type=type_,
+        amount=Decimal(amount),
+        date=datetime(2026, 1, 5, tzinfo=timezone.utc),
+        source=TransactionSource.manual,
+    )
+
+
+def balance_of(db_session, account):
+    [balance] = BalanceService.get_balances(db_session, account.user_id, account.id)
+    return balance.balance, balance.transaction_count
+
+
+def test_balance_follows_insert_update_and_delete(db_session):
+    user, account = make_account(db_session)
+    assert balance_of(db_session, account) == (Decimal("0.00"), 0)
+
+    salary = make_tx(user, account, TransactionType.income, "1000.00")
+    coffee = make_tx(user, account, TransactionType.expense, "45.50")
+    db_session.add_all([salary, coffee])
+    db_session.commit()
+    assert balance_of(db_session, account) == (Decimal("954.50"), 2)
+
+    coffee.amount = Decimal("50.00")
+    db_session.commit()
+    assert balance_of(db_session, account) == (Decimal("950.00"), 2)
+
+    coffee.type = TransactionType.income
+    db_session.commit()
+    assert balance_of(db_session, account) == (Decimal("1050.00"), 2)
+
+    db_session.delete(salary)
+    db_session.commit()
+    assert balance_of(db_session, account) == (Decimal("50.00"), 1)
+    assert BalanceService.verify(db_session) == []
+
+
+def test_moving_a_transaction_between_accounts(db_session):
+    user, checking = make_account(db_session)
+    _, savings = make_account(db_session, name="Savings", user=user)
+    tx = make_tx(user, checking, TransactionType.income, "200.00")
+    db_session.add(tx)
+    db_session.commit()
+
+    tx.account_id = savings.id
+    db_session.commit()
+
+    assert balance_of(db_session, checking) == (Decimal("0.00"), 0)
+    assert balance_of(db_session, savings) == (Decimal("200.00"), 1)
+
+
+def test_rolled_back_writes_do_not_touch_balances(db_session):
+    user, account = make_account(db_session)
+    savepoint = db_session.begin_nested()
+    db_session.add(make_tx(user, account, TransactionType.income, "10.00"))
+    db_session.flush()
+    savepoint.rollback()
+
+    assert db_session.query(AccountBalance).count() == 0
+
+
+def test_bulk_import_updates_balance(db_session):
+    user, account = make_account(db_session)
+    rows = [
+        ImportRow(type=TransactionType.income, amount=Decimal("100.00"), date=datetime(2026, 1, 1, tzinfo=timezone.utc)),
+        ImportRow(type=TransactionType.expense, amount=Decimal("30.25"), date=datetime(2026, 1, 2, tzinfo=timezone.utc)),
+    ]
+
+    TransactionImportService.import_rows(db_session, user.id, account.id, rows)
+    TransactionImportService.import_rows(db_session, user.id, account.id, rows)  # all duplicates
+
+    assert balance_of(db_session, account) == (Decimal("69.75"), 2)
+
+
+def test_verify_reports_drift_and_rebuild_fixes_it(db_session):
+    user, account = make_account(db_session)
+    db_session.add(make_tx(user, account, TransactionType.income, "500.00"))
+    db_session.commit()
+    stored = db_session.get(AccountBalance, (account.id, "MXN"))
+    stored.balance = Decimal("1.00")
+    db_session.commit()
+
+    [drift] = BalanceService.verify(db_session)
+    assert (drift.stored_balance, drift.actual_balance) == (Decimal("1.00"), Decimal("500.00"))
+
+    assert len(BalanceService.rebuild(db_session)) == 1
+    assert BalanceService.verify(db_session) == []
+    assert balance_of(db_session, account) == (Decimal("500.00"), 1)
+
+
+def test_get_balances_for_foreign_account(db_session):
+    _, account = make_account(db_session)
+
+    with pytest.raises(AccountNotFoundError):
+        BalanceService.get_balances(db_session, uuid.uuid4(), account.id)
+
+
+def test_balances_command_exit_code(db_session, monkeypatch, capsys):
+    user, account = make_account(db_session)
+    db_session.add(make_tx(user, account, TransactionType.income, "5.00"))
+    db_session.commit()
+    db_session.query(AccountBalance).delete()
+    db_session.commit()
+    monkeypatch.setattr("app.commands.balances.SessionLocal", lambda: db_session)
+
+    assert balances_command(["verify"]) == 1
+    assert balances_command(["rebuild"]) == 0
+    assert balances_command(["verify"]) == 0
+    assert "0 drifted balance(s) found" in capsys.readouterr().out
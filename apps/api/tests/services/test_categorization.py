@@ -0,0 +1,146 @@
+# tests/services/test_categorization.py
+import re
+import uuid
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import pytest
+
+from app.exceptions.category import CategoryRuleAlreadyExistsError, CategoryRuleNotFoundError
+from app.models.account import Account, AccountType
+from app.models.category import Category
+from app.models.category_rule import CategoryRule
+from app.models.transaction import Transaction, TransactionType
+from app.models.user import User
+from app.schemas.category import CategoryRuleCreate
+from app.services import categorization
+from app.services.categorization import MATCHER_BUILDS, CategoryRuleService, RuleMatcher, _trie_pattern, rule_matcher
+from app.services.category import CategoryService
+from app.services.transaction_import import ImportRow, TransactionImportService
+
+USER = uuid.uuid4()
+COFFEE, FOOD, TRAVEL = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+
+
+@pytest.fixture(autouse=True)
+def clear_matcher_cache():
+    categorization.matcher_cache.clear()
+    yield
+    categorization.matcher_cache.clear()
+
+
+@pytest.fixture
+def account(db_session):
+    user = User(name="John", lastname="Doe", username="jdoe", email="john@doe.com", password_hash="x")
+    db_session.add(user)
+    db_session.flush()
+    account = Account(user_id=user.id, name="Checking", type=AccountType.debit, currency="MXN")
+    db_session.add(account)
+    db_session.commit()
+    return account
+
+
+def test_trie_pattern_matches_whole_keywords_longest_first():
+    pattern = re.compile(_trie_pattern(["uber", "uber eats", "ub*r", "oxxo"]))
+
+    assert pattern.findall("uber eats #12 / oxxo / ub*r / ube") == ["uber eats", "oxxo", "ub*r"]
+
+
+def test_matcher_prefers_own_then_longest_keyword():
+    matcher = RuleMatcher.build(USER, [
+        (None, TRAVEL, "Uber"),
+        (None, FOOD, "uber eats"),
+        (None, FOOD, "starbucks"),
+        (USER, COFFEE, "STARBUCKS"),
+        (USER, COFFEE, "cafe"),
+    ])
+
+    assert matcher.category_for("UBER *EATS", "uber trip") == TRAVEL
+    assert matcher.category_for("Uber Eats MX", None) == FOOD
+    assert matcher.category_for(None, "pos starbucks reforma") == COFFEE
+    assert matcher.category_for("uber eats", "cafe") == COFFEE  # own rule beats a longer global one
+    assert matcher.category_for("walmart", "groceries") is None
+
+
+def test_matcher_needs_whole_words_and_sees_overlapping_keywords():
+    matcher = RuleMatcher.build(USER, [
+        (None, TRAVEL, "uber"),
+        (None, FOOD, "pago oxxo"),
+        (USER, COFFEE, "oxxo gas"),
+        (USER, FOOD, "7-eleven"),
+    ])
+
+    assert matcher.category_for("Tuberia Nacional", None) is None  # "uber" inside a word
+    assert matcher.category_for("uber-x", None) == TRAVEL
+    # The global keyword consumes "oxxo" first; the user's overlapping rule still wins.
+    assert matcher.category_for("PAGO OXXO GAS 123", None) == COFFEE
+    assert matcher.category_for("7-ELEVEN #12", None) == FOOD
+    assert matcher.category_for("17-eleven", None) is None
+
+    shorter_own = RuleMatcher.build(USER, [(None, FOOD, "uber eats"), (USER, TRAVEL, "uber")])
+    assert shorter_own.category_for("UBER EATS", None) == TRAVEL
+    assert shorter_own.category_for("UBEREATS", None) is None
+
+
+def test_assign_only_fills_rows_without_category():
+    matcher = RuleMatcher.build(USER, [(USER, COFFEE, "starbucks")])
+    rows = [
+        {"category_id": None, "merchant": "Starbucks", "description": None},
+        {"category_id": FOOD, "merchant": "Starbucks", "description": None},
+        {"category_id": None, "merchant": "Oxxo", "description": None},
+    ]
+
+    assert matcher.assign(rows) == 1
+    assert [r["category_id"] for r in rows] == [COFFEE, FOOD, None]
+    assert RuleMatcher().assign(rows) == 0
+
+
+def test_import_categorizes_rows_from_rules(db_session, account):
+    coffee = CategoryService.create_category(db_session, account.user_id, "Coffee")
+    db_session.add(Category(id=TRAVEL, name="Travel"))
+    db_session.add(CategoryRule(category_id=TRAVEL, keyword="uber"))
+    db_session.commit()
+    CategoryRuleService.create_rule(db_session, account.user_id, CategoryRuleCreate(keyword="Starbucks", category_id=coffee.id))
+    rows = [
+        ImportRow(type=TransactionType.expense, amount=Decimal("1"), date=datetime(2026, 1, i + 1, tzinfo=timezone.utc),
+                  merchant=merchant, description="card purchase")
+        for i, merchant in enumerate(["STARBUCKS RFM", "Uber BV", "Oxxo"])
+    ]
+
+    result = TransactionImportService.import_rows(db_session, account.user_id, account.id, rows)
+
+    assert result.categorized == 2
+    stored = dict(db_session.query(Transaction.merchant, Transaction.category_id))
+    assert stored == {"STARBUCKS RFM": coffee.id, "Uber BV": TRAVEL, "Oxxo": None}
+
+
+def test_matcher_is_rebuilt_only_when_rules_change(db_session, account):
+    coffee = CategoryService.create_category(db_session, account.user_id, "Coffee")
+    builds = MATCHER_BUILDS.value()
+
+    rule_matcher(db_session, account.user_id)
+    rule_matcher(db_session, account.user_id)
+    assert MATCHER_BUILDS.value() == builds + 1
+
+    # Written behind the service's back, as another worker would.
+    db_session.add(CategoryRule(user_id=account.user_id, category_id=coffee.id, keyword="cafe"))
+    db_session.commit()
+    assert rule_matcher(db_session, account.user_id).category_for("Cafe Punta", None) == coffee.id
+    assert MATCHER_BUILDS.value() == builds + 2
+
+
+def test_rule_crud_and_category_delete(db_session, account):
+    user_id = account.user_id
+    coffee = CategoryService.create_category(db_session, user_id, "Coffee")
+    rule = CategoryRuleService.create_rule(db_session, user_id, CategoryRuleCreate(keyword=" cafe ", category_id=coffee.id))
+
+    assert rule.keyword == "cafe"
+    with pytest.raises(CategoryRuleAlreadyExistsError):
+        CategoryRuleService.create_rule(db_session, user_id, CategoryRuleCreate(keyword="CAFE", category_id=coffee.id))
+    assert [r.keyword for r in CategoryRuleService.list_rules(db_session, user_id)] == ["cafe"]
+
+    CategoryService.delete_category(db_session, user_id, coffee.id)
+    assert CategoryRuleService.list_rules(db_session, user_id) == []
+    assert rule_matcher(db_session, user_id).category_for("cafe", None) is None
+    with pytest.raises(CategoryRuleNotFoundError):
+        CategoryRuleService.delete_rule(db_session, user_id, rule.id)
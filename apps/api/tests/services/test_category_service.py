@@ -0,0 +1,154 @@
+# tests/services/test_category_service.py
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import delete
+
+from app.core.cache import CACHE_HITS, CACHE_MISSES
+from app.exceptions.category import CategoryAlreadyExistsError, CategoryInUseError, CategoryNotFoundError
+from app.models.account import Account, AccountType
+from app.models.category import Category
+from app.models.transaction import Transaction, TransactionSource, TransactionType
+from app.models.user import User
+from app.services import category as category_service
+from app.services.category import CategoryService, invalidate_global
+
+
+@pytest.fixture(autouse=True)
+def clear_category_caches():
+    category_service.global_cache.clear()
+    category_service.user_cache.clear()
+    yield
+    category_service.global_cache.clear()
+    category_service.user_cache.clear()
+
+
+@pytest.fixture
+def user(db_session):
+    user = User(name="John", lastname="Doe", username="jdoe", email="john@doe.com", password_hash="x")
+    db_session.add(user)
+    db_session.add_all([Category(name="Food"), Category(name="Rent")])
+    db_session.commit()
+    return user
+
+
+def test_lists_global_and_own_categories(db_session, user):
+    CategoryService.create_category(db_session, user.id, "Coffee")
+
+    names = [c.name for c in CategoryService.list_categories(db_session, user.id)]
+
+    assert names == ["Coffee", "Food", "Rent"]
+
+
+def test_repeated_reads_are_served_from_cache(db_session, user, monkeypatch):
+    hits = CACHE_HITS.value(cache="categories")
+    misses = CACHE_MISSES.value(cache="categories")
+    CategoryService.list_categories(db_session, user.id)
+    monkeypatch.setattr(category_service, "_load", lambda *args: pytest.fail("queried the database"))
+
+    CategoryService.list_categories(db_session, user.id)
+    food = CategoryService.resolve_name(db_session, user.id, " food ")
+    assert CategoryService.resolve_id(db_session, user.id, food.id) == food
+    assert CACHE_MISSES.value(cache="categories") == misses + 1
+    assert CACHE_HITS.value(cache="categories") == hits + 2
+
+
+def test_global_categories_are_loaded_once_per_process(db_session, user):
+    CategoryService.list_categories(db_session, user.id)
+    db_session.add(Category(name="Travel"))
+    db_session.commit()
+
+    assert CategoryService.resolve_name(db_session, user.id, "travel") is None
+    invalidate_global()
+    assert CategoryService.resolve_name(db_session, user.id, "travel") is not None
+
+
+def test_writes_invalidate_the_user_set(db_session, user):
+    assert CategoryService.resolve_name(db_session, user.id, "Coffee") is None
+
+    created = CategoryService.create_category(db_session, user.id, "Coffee")
+    assert CategoryService.resolve_name(db_session, user.id, "coffee") == created
+
+    renamed = CategoryService.rename_category(db_session, user.id, created.id, "Cafe")
+    assert CategoryService.resolve_name(db_session, user.id, "coffee") is None
+    assert CategoryService.resolve_name(db_session, user.id, "cafe") == renamed
+
+    CategoryService.delete_category(db_session, user.id, created.id)
+    assert CategoryService.resolve_id(db_session, user.id, created.id) is None
+
+
+def test_own_category_shadows_global_name(db_session, user):
+    own = CategoryService.create_category(db_session, user.id, "food")
+
+    assert CategoryService.resolve_name(db_session, user.id, "Food") == own
+
+
+def test_duplicate_names_are_rejected(db_session, user):
+    CategoryService.create_category(db_session, user.id, "Coffee")
+
+    with pytest.raises(CategoryAlreadyExistsError):
+        CategoryService.create_category(db_session, user.id, "COFFEE")
+
+
+def test_global_categories_are_read_only(db_session, user):
+    food = CategoryService.resolve_name(db_session, user.id, "Food")
+
+    with pytest.raises(CategoryNotFoundError):
+        CategoryService.rename_category(db_session, user.id, food.id, "Groceries")
+
+
+def test_category_in_use_cannot_be_deleted(db_session, user):
+    coffee = CategoryService.create_category(db_session, user.id, "Coffee")
+    account = Account(user_id=user.id, name="Checking", type=AccountType.debit, currency="MXN")
+    db_session.add(account)
+    db_session.flush()
+    db_session.add(Transaction(
+        user_id=user.id,
+        account_id=account.id,
+        category_id=coffee.id,
+        type=TransactionType.expense,
+        amount=Decimal("3.50"),
+        date=datetime(2026, 1, 5, tzinfo=timezone.utc),
+        source=TransactionSource.manual,
+    ))
+    db_session.commit()
+
+    with pytest.raises(CategoryInUseError):
+        CategoryService.delete_category(db_session, user.id, coffee.id)
+
+
+def test_require_ids_rejects_other_users_categories(db_session, user):
+    other = User(name="Jane", lastname="Doe", username="jane", email="jane@doe.com", password_hash="x")
+    db_session.add(other)
+    db_session.commit()
+    theirs = CategoryService.create_category(db_session, other.id, "Secret")
+    food = CategoryService.resolve_name(db_session, user.id, "Food")
+
+    CategoryService.require_ids(db_session, user.id, [food.id, None])
+    with pytest.raises(CategoryNotFoundError):
+        CategoryService.require_ids(db_session, user.id, [food.id, theirs.id])
+
+
+def test_require_ids_rejects_a_category_deleted_elsewhere(db_session, user):
+    coffee = CategoryService.create_category(db_session, user.id, "Coffee")
+    CategoryService.require_ids(db_session, user.id, [coffee.id])  # caches the user's set
+    # Deleted through another worker: this process's cache was not invalidated.
+    db_session.execute(delete(Category).where(Category.id == coffee.id))
+    db_session.commit()
+
+    with pytest.raises(CategoryNotFoundError):
+        CategoryService.require_ids(db_session, user.id, [coffee.id])
+    assert CategoryService.resolve_id(db_session, user.id, coffee.id) is None
+
+
+def test_require_ids_accepts_a_category_created_elsewhere(db_session, user):
+    food = CategoryService.resolve_name(db_session, user.id, "Food")
+    CategoryService.require_ids(db_session, user.id, [food.id])  # caches the user's set
+    # Created through another worker: this process's cache was not invalidated.
+    coffee = Category(user_id=user.id, name="Coffee")
+    db_session.add(coffee)
+    db_session.commit()
+
+    CategoryService.require_ids(db_session, user.id, [food.id, coffee.id])
+    assert CategoryService.resolve_id(db_session, user.id, coffee.id).name == "Coffee"
@@ -0,0 +1,116 @@
+# tests/services/test_fx_service.py
+import io
+from datetime import date, datetime, timezone
+from decimal import Decimal
+
+import numpy as np
+import pytest
+
+from app.exceptions.fx import FxRateNotFoundError, InvalidFxRatesFileError
+from app.models.account import Account, AccountType
+from app.models.transaction import Transaction, TransactionSource, TransactionType
+from app.models.user import User
+from app.services import fx
+from app.services.fx import FxService, convert, convert_minor, get_rates, load_rates
+
+RATES = """base,quote,date,rate
+USD,MXN,2026-01-01,17.00
+USD,MXN,2026-02-01,18.00
+EUR,USD,2026-01-01,1.10
+"""
+
+
+@pytest.fixture(autouse=True)
+def clear_rate_cache():
+    fx.rate_cache.clear()
+    yield
+    fx.rate_cache.clear()
+
+
+@pytest.fixture
+def rates(db_session):
+    load_rates(db_session, io.StringIO(RATES))
+
+
+def test_latest_rate_on_or_before_date(db_session, rates):
+    got = get_rates(db_session, [("USD", "MXN")], date(2026, 1, 31))
+    assert got[("USD", "MXN")] == Decimal("17.00")
+
+    got = get_rates(db_session, [("USD", "MXN")], date(2026, 3, 15))
+    assert got[("USD", "MXN")] == Decimal("18.00")
+
+    assert get_rates(db_session, [("USD", "MXN")], date(2025, 12, 31))[("USD", "MXN")] is None
+
+
+def test_inverse_and_pivot_rates(db_session, rates):
+    got = get_rates(db_session, [("MXN", "USD"), ("EUR", "MXN"), ("MXN", "MXN")], date(2026, 1, 15))
+
+    assert got[("MXN", "USD")] == Decimal(1) / Decimal("17.00")
+    assert got[("EUR", "MXN")] == Decimal("1.10") * Decimal("17.00")
+    assert got[("MXN", "MXN")] == Decimal(1)
+
+
+def test_repeated_lookups_are_served_from_cache(db_session, rates, monkeypatch):
+    on = date(2026, 1, 15)
+    get_rates(db_session, [("USD", "MXN"), ("EUR", "MXN")], on)
+    monkeypatch.setattr(fx, "_latest_rates", lambda *args: pytest.fail("queried the database"))
+
+    assert convert(db_session, [Decimal("10"), Decimal("2")], ["usd", "EUR"], "mxn", on) == [
+        Decimal("170.00"),
+        Decimal("37.40"),
+    ]
+
+
+def test_convert_minor_is_vectorized(db_session, rates):
+    amounts = np.array([100, 250, -1000], dtype=np.int64)
+
+    got = convert_minor(db_session, amounts, ["USD", "MXN", "EUR"], "MXN", date(2026, 1, 15))
+
+    assert got.tolist() == [1700, 250, -18700]
+
+
+def test_missing_rate_raises(db_session, rates):
+    with pytest.raises(FxRateNotFoundError):
+        convert(db_session, [Decimal("1")], ["JPY"], "MXN", date(2026, 1, 15))
+
+
+def test_loading_rates_replaces_values_and_clears_cache(db_session, rates):
+    on = date(2026, 1, 15)
+    assert get_rates(db_session, [("USD", "MXN")], on)[("USD", "MXN")] == Decimal("17.00")
+
+    load_rates(db_session, io.StringIO("base,quote,date,rate\nusd,mxn,2026-01-01,16.50\n"))
+
+    assert get_rates(db_session, [("USD", "MXN")], on)[("USD", "MXN")] == Decimal("16.50")
+
+
+@pytest.mark.parametrize("content", [
+    "base,quote,rate\nUSD,MXN,17\n",
+    "base,quote,date,rate\nUSD,MXN,2026-13-01,17\n",
+    "base,quote,date,rate\nUSD,MXN,2026-01-01,-1\n",
+])
+def test_invalid_rates_file(db_session, content):
+    with pytest.raises(InvalidFxRatesFileError):
+        load_rates(db_session, io.StringIO(content))
+
+
+def test_net_worth_converts_stored_balances(db_session, rates):
+    user = User(name="John", lastname="Doe", username="jdoe", email="john@doe.com", password_hash="x")
+    db_session.add(user)
+    db_session.flush()
+    for name, currency, amount in [("Pesos", "MXN", "1000.00"), ("Dollars", "USD", "100.00")]:
+        account = Account(user_id=user.id, name=name, type=AccountType.debit, currency=currency)
+        db_session.add(account)
+        db_session.flush()
+        db_session.add(Transaction(
+            user_id=user.id, account_id=account.id, type=TransactionType.income,
+            amount=Decimal(amount), date=datetime(2026, 1, 2, tzinfo=timezone.utc), source=TransactionSource.manual,
+        ))
+    db_session.commit()
+
+    worth = FxService.net_worth(db_session, user.id, "mxn", date(2026, 1, 15))
+
+    assert worth.total == Decimal("2700.00")
+    assert [(a.name, a.converted) for a in worth.accounts] == [
+        ("Dollars", Decimal("1700.00")),
+        ("Pesos", Decimal("1000.00")),
+    ]
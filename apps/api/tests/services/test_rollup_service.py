@@ -0,0 +1,187 @@
+# tests/services/test_rollup_service.py
+import uuid
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from types import SimpleNamespace
+
+import pytest
+
+from app.commands.rollups import main as rollups_command
+from app.exceptions.report import InvalidReportRangeError
+from app.models.account import Account, AccountType
+from app.models.category import Category
+from app.models.category_rollup import MonthlyCategoryRollup
+from app.models.transaction import Transaction, TransactionSource, TransactionType
+from app.models.user import User
+from app.services import rollup
+from app.services.rollup import RollupService, apply_rollup_deltas
+from app.services.transaction_deltas import DeltaKey, TransactionDeltas
+from app.services.transaction_import import ImportRow, TransactionImportService
+
+
+def make_fixture(db_session, username="jdoe"):
+    user = User(name="John", lastname="Doe", username=username, email=f"{username}@doe.com", password_hash="x")
+    db_session.add(user)
+    db_session.flush()
+    account = Account(user_id=user.id, name="Checking", type=AccountType.debit, currency="MXN")
+    food = Category(user_id=user.id, name="Food")
+    db_session.add_all([account, food])
+    db_session.commit()
+    return user, account, food
+
+
+def make_tx(user, account, amount, day, category=None, type_=TransactionType.expense):
+    return Transaction(
+        user_id=user.id,
+        account_id=account.id,
+        category_id=category.id if category else None,
+        type=type_,
+        amount=Decimal(amount),
+        date=day,
+        source=TransactionSource.manual,
+    )
+
+
+def report(db_session, user_id, **kwargs):
+    kwargs.setdefault("from_month", date(2025, 1, 1))
+    kwargs.setdefault("to_month", date(2026, 12, 1))
+    result = RollupService.category_report(db_session, user_id, **kwargs)
+    return [(r.month, r.category_id, r.type, r.total, r.transaction_count) for r in result.items]
+
+
+def test_writes_update_rollups_incrementally(db_session):
+    user, account, food = make_fixture(db_session)
+    lunch = make_tx(user, account, "20.00", datetime(2026, 1, 10, tzinfo=timezone.utc), food)
+    dinner = make_tx(user, account, "30.00", datetime(2026, 1, 20, tzinfo=timezone.utc), food)
+    rent = make_tx(user, account, "500.00", datetime(2026, 2, 1, tzinfo=timezone.utc))
+    db_session.add_all([lunch, dinner, rent])
+    db_session.commit()
+
+    assert report(db_session, user.id) == [
+        (None, None, TransactionType.expense, Decimal("500.00"), 1),
+        (None, food.id, TransactionType.expense, Decimal("50.00"), 2),
+    ]
+
+    dinner.date = datetime(2026, 2, 3, tzinfo=timezone.utc)
+    rent.category_id = food.id
+    db_session.delete(lunch)
+    db_session.commit()
+
+    assert report(db_session, user.id, by_month=True) == [
+        (date(2026, 2, 1), food.id, TransactionType.expense, Decimal("530.00"), 2),
+    ]
+
+
+def test_month_boundaries_are_utc(db_session):
+    user, account, food = make_fixture(db_session)
+    # 2026-01-31 23:00 in Mexico City is already February in UTC.
+    late = datetime.fromisoformat("2026-01-31T23:00:00-06:00")
+    TransactionImportService.import_rows(
+        db_session, user.id, account.id,
+        [ImportRow(type=TransactionType.expense, amount=Decimal("9.99"), date=late, category_id=food.id)],
+    )
+
+    [row] = report(db_session, user.id, by_month=True)
+    assert row[0] == date(2026, 2, 1)
+    assert row[1:] == (food.id, TransactionType.expense, Decimal("9.99"), 1)
+
+
+def test_report_filters_by_range_and_type(db_session):
+    user, account, food = make_fixture(db_session)
+    db_session.add_all([
+        make_tx(user, account, "10.00", datetime(2025, 6, 1, tzinfo=timezone.utc), food),
+        make_tx(user, account, "99.00", datetime(2026, 6, 1, tzinfo=timezone.utc), food),
+        make_tx(user, account, "1000.00", datetime(2026, 6, 2, tzinfo=timezone.utc), type_=TransactionType.income),
+    ])
+    db_session.commit()
+
+    rows = report(db_session, user.id, from_month=date(2026, 6, 15), to_month=date(2026, 6, 15),
+                  type=TransactionType.expense)
+
+    assert rows == [(None, food.id, TransactionType.expense, Decimal("99.00"), 1)]
+
+
+def test_report_rejects_inverted_range(db_session):
+    user, _, _ = make_fixture(db_session)
+
+    with pytest.raises(InvalidReportRangeError):
+        report(db_session, user.id, from_month=date(2026, 2, 1), to_month=date(2026, 1, 1))
+
+
+def test_backfill_rebuilds_in_batches(db_session, monkeypatch, capsys):
+    users = []
+    for i in range(3):
+        user, account, food = make_fixture(db_session, username=f"user{i}")
+        db_session.add(make_tx(user, account, "5.00", datetime(2026, 3, 1, tzinfo=timezone.utc), food))
+        db_session.commit()
+        users.append(user.id)
+    expected = {u: report(db_session, u) for u in users}
+    db_session.query(MonthlyCategoryRollup).delete()
+    db_session.commit()
+    monkeypatch.setattr("app.commands.rollups.SessionLocal", lambda: db_session)
+
+    assert rollups_command(["--batch-size", "2"]) == 0
+
+    assert "3 user(s) in 2 batch(es)" in capsys.readouterr().out
+    assert {u: report(db_session, u) for u in users} == expected
+
+
+def test_backfill_replaces_drifted_rows(db_session):
+    user, account, food = make_fixture(db_session)
+    db_session.add(make_tx(user, account, "12.00", datetime(2026, 4, 1, tzinfo=timezone.utc), food))
+    db_session.commit()
+    db_session.query(MonthlyCategoryRollup).update({"total": Decimal("1.00")})
+    db_session.commit()
+
+    result = RollupService.backfill(db_session, user_ids=[user.id])
+
+    assert (result.users, result.batches) == (1, 1)
+    assert report(db_session, user.id) == [(None, food.id, TransactionType.expense, Decimal("12.00"), 1)]
+
+
+class RecordingConnection:
+    """A Postgres connection that only records the SQL it is given."""
+    dialect = SimpleNamespace(name="postgresql")
+
+    def __init__(self):
+        self.statements = []
+
+    def execute(self, statement, params=None):
+        self.statements.append(str(statement))
+
+
+def test_rollup_writers_take_the_users_lock_first():
+    user_a, user_b = sorted([uuid.uuid4(), uuid.uuid4()])
+    deltas = TransactionDeltas()
+    deltas.add(DeltaKey(user_b, uuid.uuid4(), None, TransactionType.expense, date(2026, 1, 1)), "5.00", 1)
+    connection = RecordingConnection()
+    apply_rollup_deltas(connection, deltas)
+
+    session = SimpleNamespace(connection=lambda: connection, execute=connection.execute)
+    RollupService.rebuild_users(session, [user_a, user_b])
+
+    locks = [i for i, sql in enumerate(connection.statements) if "pg_advisory_xact_lock" in sql]
+    assert locks == [0, 2]
+    assert connection.statements[1].startswith("INSERT INTO monthly_category_rollups")
+    assert connection.statements[3].startswith("DELETE FROM monthly_category_rollups")
+
+
+def test_write_landing_during_a_rebuild_is_counted_once(db_session, monkeypatch):
+    user, account, food = make_fixture(db_session)
+    db_session.add(make_tx(user, account, "10.00", datetime(2026, 3, 1, tzinfo=timezone.utc), food))
+    db_session.commit()
+    lock = rollup.lock_user_rollups
+    writes = []
+
+    def lock_then_let_a_writer_in(connection, user_ids):
+        lock(connection, user_ids)
+        if not writes:  # the rebuild's lock; the write below takes it again
+            writes.append(make_tx(user, account, "5.00", datetime(2026, 3, 2, tzinfo=timezone.utc), food))
+            db_session.add(writes[0])
+            db_session.flush()  # applies its deltas through apply_rollup_deltas
+
+    monkeypatch.setattr(rollup, "lock_user_rollups", lock_then_let_a_writer_in)
+    RollupService.rebuild_users(db_session, [user.id])
+    db_session.commit()
+
+    assert report(db_session, user.id) == [(None, food.id, TransactionType.expense, Decimal("15.00"), 2)]
@@ -0,0 +1,217 @@
+# tests/services/test_statement_import.py
+import io
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import pytest
+
+from app.exceptions.statement import InvalidTimezoneError
+from app.models.account import Account, AccountType
+from app.models.transaction import Transaction, TransactionType
+from app.models.user import User
+from app.services.statement_import import (
+    CsvLayout,
+    PipelineStats,
+    StatementFormat,
+    StatementImportService,
+    normalize,
+    parse_camt,
+    parse_csv,
+    parse_ofx,
+    read_chunks,
+)
+
+
+CSV_STATEMENT = (
+    "date,amount,description,merchant,external_id\n"
+    "2026-01-05,-12.30,Coffee,Cafe,TX-1\n"
+    "2026-01-06,1000,Payroll,,TX-2\n"
+    "not-a-date,5,Broken,,TX-3\n"
+    '2026-01-07,-4.50,"Multi\nline",Kiosk,TX-4\n'
+).encode()
+
+OFX_STATEMENT = b"""OFXHEADER:100
+DATA:OFXSGML
+<OFX><BANKMSGSRSV1><STMTTRNRS><STMTRS><BANKTRANLIST>
+<STMTTRN>
+<TRNTYPE>DEBIT
+<DTPOSTED>20260105120000[-6:CST]
+<TRNAMT>-25.00
+<FITID>OFX-1
+<NAME>GROCER
+<MEMO>Weekly groceries
+</STMTTRN>
+<STMTTRN>
+<TRNTYPE>CREDIT
+<DTPOSTED>20260106
+<TRNAMT>300.00
+<FITID>OFX-2
+<NAME>EMPLOYER
+</STMTTRN>
+</BANKTRANLIST></STMTRS></STMTTRNRS></BANKMSGSRSV1></OFX>
+"""
+
+CAMT_STATEMENT = b"""<?xml version="1.0" encoding="UTF-8"?>
+<Document xmlns="urn:iso:std:iso:20022:tech:xsd:camt.053.001.02">
+  <BkToCstmrStmt><Stmt>
+    <Ntry>
+      <Amt Ccy="EUR">42.10</Amt>
+      <CdtDbtInd>DBIT</CdtDbtInd>
+      <BookgDt><Dt>2026-02-01</Dt></BookgDt>
+      <AcctSvcrRef>CAMT-1</AcctSvcrRef>
+      <NtryDtls><TxDtls>
+        <RltdPties><Cdtr><Nm>Utility Co</Nm></Cdtr></RltdPties>
+        <RmtInf><Ustrd>Electricity</Ustrd></RmtInf>
+      </TxDtls></NtryDtls>
+    </Ntry>
+    <Ntry>
+      <Amt Ccy="EUR">1500.00</Amt>
+      <CdtDbtInd>CRDT</CdtDbtInd>
+      <BookgDt><Dt>2026-02-02</Dt></BookgDt>
+      <AcctSvcrRef>CAMT-2</AcctSvcrRef>
+    </Ntry>
+  </Stmt></BkToCstmrStmt>
+</Document>
+"""
+
+
+def make_account(db_session):
+    user = User(name="John", lastname="Doe", username="jdoe", email="john@doe.com", password_hash="x")
+    db_session.add(user)
+    db_session.flush()
+    account = Account(user_id=user.id, name="Checking", type=AccountType.debit, currency="MXN")
+    db_session.add(account)
+    db_session.commit()
+    return user, account
+
+
+def chunks(data, size=7):
+    # Small chunks so records straddle chunk boundaries.
+    return read_chunks(io.BytesIO(data), size)
+
+
+def test_parse_csv_handles_records_split_across_chunks():
+    records = list(parse_csv(chunks(CSV_STATEMENT), CsvLayout()))
+
+    assert [r["external_id"] for r in records] == ["TX-1", "TX-2", "TX-3", "TX-4"]
+    assert records[3]["description"] == "Multi\nline"
+
+
+def test_parse_csv_debit_credit_columns_and_decimal_comma():
+    data = "Fecha;Cargo;Abono;Concepto\n05/01/2026;1.234,50;;Renta\n06/01/2026;;99,90;Reembolso\n".encode()
+    layout = CsvLayout(
+        date="Fecha", debit="Cargo", credit="Abono", description="Concepto",
+        delimiter=";", date_format="%d/%m/%Y", decimal_comma=True,
+    )
+    stats = PipelineStats(statement_format=StatementFormat.csv)
+
+    rows = list(normalize(parse_csv(chunks(data), layout), stats, timezone.utc, layout.date_format, True))
+
+    assert [(r.type, r.amount) for r in rows] == [
+        (TransactionType.expense, Decimal("1234.50")),
+        (TransactionType.income, Decimal("99.90")),
+    ]
+    assert rows[0].date == datetime(2026, 1, 5, tzinfo=timezone.utc)
+
+
+def test_parse_csv_debit_credit_columns_both_filled():
+    # Both columns always filled, the idle one with zero.
+    data = (
+        b"date,debit,credit,description\n"
+        b"2026-01-05,12.30,0.00,Coffee\n"
+        b"2026-01-06,0.00,12.00,Refund\n"
+        b"2026-01-07,0,0,Nothing\n"
+    )
+    stats = PipelineStats(statement_format=StatementFormat.csv)
+
+    rows = list(normalize(parse_csv(chunks(data), CsvLayout()), stats))
+
+    assert [(r.type, r.amount) for r in rows] == [
+        (TransactionType.expense, Decimal("12.30")),
+        (TransactionType.income, Decimal("12.00")),
+    ]
+    assert stats.rejected == 1
+
+
+def test_parse_ofx_sgml_blocks():
+    records = list(parse_ofx(chunks(OFX_STATEMENT)))
+    stats = PipelineStats(statement_format=StatementFormat.ofx)
+
+    rows = list(normalize(records, stats))
+
+    assert [r.external_id for r in rows] == ["OFX-1", "OFX-2"]
+    assert rows[0].type == TransactionType.expense
+    assert rows[0].description == "Weekly groceries"
+    assert rows[0].merchant == "GROCER"
+    assert rows[0].date == datetime(2026, 1, 5, 18, 0, tzinfo=timezone.utc)
+
+
+def test_parse_camt_entries():
+    records = list(parse_camt(chunks(CAMT_STATEMENT)))
+
+    assert records[0]["amount"] == "-42.10"
+    assert records[0]["merchant"] == "Utility Co"
+    assert records[0]["description"] == "Electricity"
+    assert records[1]["amount"] == "1500.00"
+    assert records[1]["external_id"] == "CAMT-2"
+
+
+def test_import_statement_reports_rejections_and_stages(db_session):
+    user, account = make_account(db_session)
+
+    result = StatementImportService.import_statement(
+        db=db_session,
+        user_id=user.id,
+        account_id=account.id,
+        stream=io.BytesIO(CSV_STATEMENT),
+        statement_format=StatementFormat.csv,
+        batch_size=2,
+        chunk_size=16,
+    )
+
+    assert (result.received, result.inserted, result.duplicates) == (3, 3, 0)
+    assert result.rejected == 1
+    assert result.errors == ["record 3: invalid date 'not-a-date'"]
+    assert [s.stage for s in result.stages] == ["read", "parse", "normalize", "hash", "batch", "load"]
+    assert result.stages[0].items == len(CSV_STATEMENT)
+    assert result.stages[1].items == 4
+    assert db_session.query(Transaction).count() == 3
+
+    again = StatementImportService.import_statement(
+        db=db_session,
+        user_id=user.id,
+        account_id=account.id,
+        stream=io.BytesIO(CSV_STATEMENT),
+        statement_format=StatementFormat.csv,
+    )
+    assert (again.inserted, again.duplicates) == (0, 3)
+
+
+def test_import_statement_applies_timezone_to_naive_dates(db_session):
+    user, account = make_account(db_session)
+
+    StatementImportService.import_statement(
+        db=db_session,
+        user_id=user.id,
+        account_id=account.id,
+        stream=io.BytesIO(b"date,amount\n2026-01-05T23:30:00,-1\n"),
+        statement_format=StatementFormat.csv,
+        timezone_name="America/Mexico_City",
+    )
+
+    tx = db_session.query(Transaction).one()
+    assert tx.date.replace(tzinfo=timezone.utc) == datetime(2026, 1, 6, 5, 30, tzinfo=timezone.utc)
+
+
+def test_import_statement_invalid_timezone(db_session):
+    user, account = make_account(db_session)
+
+    with pytest.raises(InvalidTimezoneError):
+        StatementImportService.import_statement(
+            db=db_session,
+            user_id=user.id,
+            account_id=account.id,
+            stream=io.BytesIO(CSV_STATEMENT),
+            statement_format=StatementFormat.csv,
+            timezone_name="Mars/Olympus",
+        )
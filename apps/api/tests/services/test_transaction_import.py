@@ -0,0 +1,169 @@
+# tests/services/test_transaction_import.py
+import uuid
+from dataclasses import replace
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.exceptions.account import AccountNotFoundError
+from app.models.account import Account, AccountType
+from app.models.transaction import Transaction, TransactionSource, TransactionType
+from app.models.user import User
+from app.services.transaction_import import (
+    ImportRow,
+    TransactionImportService,
+    _merge_with_insert,
+    _to_values,
+    compute_hash_dedupe,
+)
+
+
+def make_account(db_session, username="jdoe"):
+    user = User(
+        name="John",
+        lastname="Doe",
+        username=username,
+        email=f"{username}@doe.com",
+        password_hash="x",
+    )
+    db_session.add(user)
+    db_session.flush()
+    account = Account(user_id=user.id, name="Checking", type=AccountType.debit, currency="MXN")
+    db_session.add(account)
+    db_session.commit()
+    return user, account
+
+
+def make_rows(count):
+    return [
+        ImportRow(
+            type=TransactionType.expense,
+            amount=Decimal("10.50") + i,
+            date=datetime(2026, 1, 1 + i % 28, tzinfo=timezone.utc),
+            description=f"Coffee #{i}",
+            merchant="Cafe",
+        )
+        for i in range(count)
+    ]
+
+
+def test_import_inserts_rows_and_computes_hash(db_session):
+    user, account = make_account(db_session)
+
+    result = TransactionImportService.import_rows(
+        db=db_session, user_id=user.id, account_id=account.id, rows=make_rows(3)
+    )
+
+    assert (result.received, result.inserted, result.duplicates) == (3, 3, 0)
+    stored = db_session.query(Transaction).filter_by(user_id=user.id).all()
+    assert len(stored) == 3
+    assert all(t.source == TransactionSource.imported for t in stored)
+    assert all(len(t.hash_dedupe) == 64 for t in stored)
+
+
+def test_reimport_skips_duplicates_across_batches(db_session):
+    user, account = make_account(db_session)
+    TransactionImportService.import_rows(
+        db=db_session, user_id=user.id, account_id=account.id, rows=make_rows(3)
+    )
+
+    result = TransactionImportService.import_rows(
+        db=db_session,
+        user_id=user.id,
+        account_id=account.id,
+        rows=make_rows(5),
+        batch_size=2,
+    )
+
+    assert (result.received, result.inserted, result.duplicates) == (5, 2, 3)
+    assert db_session.query(Transaction).filter_by(user_id=user.id).count() == 5
+
+
+def test_duplicates_within_one_file_are_skipped(db_session):
+    user, account = make_account(db_session)
+    rows = make_rows(1) * 2
+
+    result = TransactionImportService.import_rows(
+        db=db_session, user_id=user.id, account_id=account.id, rows=rows
+    )
+
+    assert (result.inserted, result.duplicates) == (1, 1)
+
+
+def test_reexported_line_with_a_new_date_is_a_duplicate(db_session):
+    # Transactions are partitioned by date, so the dedupe key proper lives in
+    # transaction_dedupe_keys: a changed posting date must not let it through.
+    user, account = make_account(db_session)
+    posted = ImportRow(type=TransactionType.expense, amount=Decimal("12.00"),
+                       date=datetime(2026, 1, 30, tzinfo=timezone.utc), external_id="BANK-1")
+    TransactionImportService.import_rows(db=db_session, user_id=user.id, account_id=account.id, rows=[posted])
+
+    reexported = replace(posted, date=datetime(2026, 2, 2, tzinfo=timezone.utc))
+    result = TransactionImportService.import_rows(
+        db=db_session, user_id=user.id, account_id=account.id, rows=[reexported, reexported]
+    )
+
+    assert (result.inserted, result.duplicates) == (0, 2)
+    [stored] = db_session.query(Transaction).filter_by(user_id=user.id).all()
+    assert stored.date.day == 30
+
+    db_session.delete(stored)
+    db_session.commit()
+    result = TransactionImportService.import_rows(
+        db=db_session, user_id=user.id, account_id=account.id, rows=[reexported]
+    )
+    assert result.inserted == 1  # deleting a transaction releases its key
+
+
+class RecordingSession:
+    """A session on Postgres without psycopg (no COPY): claims every key, records the SQL."""
+    dialect = postgresql.psycopg2.dialect()
+
+    def __init__(self):
+        self.statements = []
+
+    def get_bind(self):
+        return self
+
+    def scalars(self, statement, params):
+        self.statements.append(str(statement.compile(dialect=self.dialect)))
+        return [p["hash_dedupe"] for p in params]
+
+    def execute(self, statement, params):
+        self.statements.append(str(statement.compile(dialect=self.dialect)))
+        return []
+
+
+def test_insert_fallback_builds_postgres_statements_on_other_drivers():
+    db = RecordingSession()
+    values = [_to_values(uuid.uuid4(), uuid.uuid4(), row) for row in make_rows(2)]
+
+    assert _merge_with_insert(db, values) == []
+
+    claim, insert = db.statements
+    assert claim.startswith("INSERT INTO transaction_dedupe_keys")
+    assert "ON CONFLICT DO NOTHING RETURNING transaction_dedupe_keys.hash_dedupe" in claim
+    assert "ON CONFLICT (user_id, hash_dedupe, date) DO NOTHING" in insert
+
+
+def test_hash_prefers_external_id_and_normalizes_dates():
+    account_id = uuid.uuid4()
+    naive = ImportRow(type=TransactionType.income, amount=Decimal("1"), date=datetime(2026, 1, 1))
+    aware = ImportRow(type=TransactionType.income, amount=Decimal("1.00"), date=datetime(2026, 1, 1, tzinfo=timezone.utc))
+    assert compute_hash_dedupe(account_id, naive) == compute_hash_dedupe(account_id, aware)
+
+    a = ImportRow(type=TransactionType.income, amount=Decimal("1"), date=datetime(2026, 1, 1), external_id="X1")
+    b = ImportRow(type=TransactionType.income, amount=Decimal("2"), date=datetime(2026, 2, 1), external_id="X1")
+    assert compute_hash_dedupe(account_id, a) == compute_hash_dedupe(account_id, b)
+
+
+def test_import_into_foreign_account_fails(db_session):
+    _, account = make_account(db_session)
+    other, _ = make_account(db_session, username="other")
+
+    with pytest.raises(AccountNotFoundError):
+        TransactionImportService.import_rows(
+            db=db_session, user_id=other.id, account_id=account.id, rows=make_rows(1)
+        )
@@ -0,0 +1,132 @@
+# tests/services/test_transaction_search.py
+import uuid
+from datetime import date, datetime, timezone
+from decimal import Decimal
+
+import pytest
+from sqlalchemy.dialects.postgresql import psycopg
+
+from app.exceptions.pagination import InvalidCursorError
+from app.models.account import Account, AccountType
+from app.models.transaction import SEARCH_DOCUMENT_SQL, Transaction, TransactionSource, TransactionType
+from app.models.user import User
+from app.services.transaction_import import ImportRow, TransactionImportService
+from app.services.transaction_search import TransactionSearchService, _search_query, fts5_query
+
+
+def make_account(db_session, username="jdoe"):
+    user = User(name="John", lastname="Doe", username=username, email=f"{username}@doe.com", password_hash="x")
+    db_session.add(user)
+    db_session.flush()
+    account = Account(user_id=user.id, name="Checking", type=AccountType.debit, currency="MXN")
+    db_session.add(account)
+    db_session.commit()
+    return user, account
+
+
+def add(db_session, account, day, merchant=None, description=None, notes=None):
+    transaction = Transaction(
+        user_id=account.user_id,
+        account_id=account.id,
+        type=TransactionType.expense,
+        amount=Decimal("10.00"),
+        date=datetime(2026, 1, day, tzinfo=timezone.utc),
+        merchant=merchant,
+        description=description,
+        notes=notes,
+        source=TransactionSource.manual,
+    )
+    db_session.add(transaction)
+    db_session.commit()
+    return transaction
+
+
+def merchants(page):
+    return [hit.merchant for hit in page.items]
+
+
+def test_matches_word_prefixes_in_any_field(db_session):
+    user, account = make_account(db_session)
+    add(db_session, account, 1, merchant="Starbucks Reforma")
+    add(db_session, account, 2, merchant="Oxxo", description="coffee at starbucks")
+    add(db_session, account, 3, merchant="Uber", notes="ride home")
+
+    page = TransactionSearchService.search(db_session, user.id, "starb")
+
+    assert sorted(merchants(page)) == ["Oxxo", "Starbucks Reforma"]
+    assert merchants(TransactionSearchService.search(db_session, user.id, "ride")) == ["Uber"]
+    assert TransactionSearchService.search(db_session, user.id, "starbucks ride").items == []
+
+
+def test_results_are_scoped_to_the_user_and_date_range(db_session):
+    user, account = make_account(db_session)
+    _, other = make_account(db_session, username="jane")
+    add(db_session, account, 5, merchant="Netflix")
+    add(db_session, account, 20, merchant="Netflix")
+    add(db_session, other, 5, merchant="Netflix")
+
+    page = TransactionSearchService.search(
+        db_session, user.id, "netflix", date_from=date(2026, 1, 1), date_to=date(2026, 1, 10)
+    )
+
+    assert [hit.date.day for hit in page.items] == [5]
+
+
+def test_pages_cover_every_hit_once(db_session):
+    user, account = make_account(db_session)
+    expected = {add(db_session, account, 1 + i % 28, merchant=f"Cafe {i}").id for i in range(23)}
+
+    seen, cursor = [], None
+    while True:
+        page = TransactionSearchService.search(db_session, user.id, "cafe", limit=5, cursor=cursor)
+        seen += [hit.id for hit in page.items]
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+
+    assert len(seen) == len(expected) and set(seen) == expected
+
+
+def test_index_follows_updates_deletes_and_bulk_imports(db_session):
+    user, account = make_account(db_session)
+    transaction = add(db_session, account, 1, merchant="Walmart")
+    transaction.merchant = "Costco"
+    db_session.commit()
+    assert TransactionSearchService.search(db_session, user.id, "walmart").items == []
+    assert merchants(TransactionSearchService.search(db_session, user.id, "costco")) == ["Costco"]
+
+    db_session.delete(transaction)
+    db_session.commit()
+    assert TransactionSearchService.search(db_session, user.id, "costco").items == []
+
+    TransactionImportService.import_rows(db_session, user.id, account.id, [
+        ImportRow(type=TransactionType.expense, amount=Decimal("5"), date=datetime(2026, 1, 2), merchant="Liverpool"),
+    ])
+    assert merchants(TransactionSearchService.search(db_session, user.id, "liverpool")) == ["Liverpool"]
+
+
+def test_search_syntax_in_input_is_not_interpreted(db_session):
+    user, account = make_account(db_session)
+    add(db_session, account, 1, merchant="AT&T")
+
+    assert fts5_query('"at" OR NEAR(') == '"at"* "OR"* "NEAR"*'
+    assert fts5_query("&& --") is None
+    assert TransactionSearchService.search(db_session, user.id, "&& --").items == []
+    assert merchants(TransactionSearchService.search(db_session, user.id, "at&t")) == ["AT&T"]
+
+
+def test_invalid_cursor(db_session):
+    user, _ = make_account(db_session)
+
+    with pytest.raises(InvalidCursorError):
+        TransactionSearchService.search(db_session, user.id, "x", cursor="nope")
+    with pytest.raises(InvalidCursorError):  # base64 of [1, 2, 3]: valid JSON, not strings
+        TransactionSearchService.search(db_session, user.id, "x", cursor="WzEsIDIsIDNd")
+
+
+def test_postgres_query_repeats_the_indexed_expression():
+    stmt = _search_query("postgresql", uuid.uuid4(), "starbucks", None, None, 20, None)
+    sql = str(stmt.compile(dialect=psycopg.dialect()))
+
+    assert SEARCH_DOCUMENT_SQL + " @@ websearch_to_tsquery('simple'" in sql
+    assert "<%% transactions.merchant" in sql
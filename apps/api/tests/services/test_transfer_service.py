@@ -0,0 +1,129 @@
+# tests/services/test_transfer_service.py
+import uuid
+from datetime import date, datetime, timezone
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import select
+
+from app.exceptions.account import AccountNotFoundError
+from app.exceptions.transfer import SameAccountTransferError
+from app.models.account import Account, AccountType
+from app.models.transaction import Transaction, TransactionSource, TransactionType
+from app.models.user import User
+from app.schemas.transfer import TransferCreate
+from app.services.analytics import AnalyticsService
+from app.services.balance import BalanceService
+from app.services.rollup import RollupService
+from app.services.transfer import TransferService
+
+
+@pytest.fixture
+def accounts(db_session):
+    user = User(name="John", lastname="Doe", username="jdoe", email="jdoe@doe.com", password_hash="x")
+    db_session.add(user)
+    db_session.flush()
+    checking = Account(user_id=user.id, name="Checking", type=AccountType.debit, currency="MXN")
+    savings = Account(user_id=user.id, name="Savings", type=AccountType.debit, currency="MXN")
+    dollars = Account(user_id=user.id, name="Dollars", type=AccountType.debit, currency="USD")
+    db_session.add_all([checking, savings, dollars])
+    db_session.commit()
+    return user, checking, savings, dollars
+
+
+def transfer(source, target, amount="100.00"):
+    return TransferCreate(
+        from_account_id=source.id,
+        to_account_id=target.id,
+        amount=Decimal(amount),
+        date=datetime(2026, 3, 1, tzinfo=timezone.utc),
+    )
+
+
+def balance(db_session, user, account):
+    balances = BalanceService.get_balances(db_session, user.id, account.id)
+    return balances[0].balance if balances else Decimal("0.00")
+
+
+def test_transfer_writes_both_legs_with_one_group(db_session, accounts):
+    user, checking, savings, _ = accounts
+
+    result = TransferService.create_transfer(db_session, user.id, transfer(checking, savings))
+
+    legs = db_session.scalars(
+        select(Transaction).where(Transaction.transfer_group_id == result.transfer_group_id)
+    ).all()
+    assert {(leg.account_id, leg.type) for leg in legs} == {
+        (checking.id, TransactionType.expense),
+        (savings.id, TransactionType.income),
+    }
+    assert balance(db_session, user, checking) == Decimal("-100.00")
+    assert balance(db_session, user, savings) == Decimal("100.00")
+
+
+def test_transfer_rejects_invalid_accounts(db_session, accounts):
+    user, checking, _, _ = accounts
+
+    with pytest.raises(SameAccountTransferError):
+        TransferService.create_transfer(db_session, user.id, transfer(checking, checking))
+    with pytest.raises(AccountNotFoundError):
+        TransferService.create_transfer(
+            db_session, user.id, transfer(checking, Account(id=uuid.uuid4()))
+        )
+    assert db_session.scalar(select(Transaction.id)) is None
+
+
+def test_batch_reports_failures_and_posts_the_rest(db_session, accounts, query_budget):
+    user, checking, savings, dollars = accounts
+    batch = [transfer(checking, savings, str(i + 1)) for i in range(200)]
+    batch[3] = transfer(checking, dollars)
+    batch[7] = transfer(savings, Account(id=uuid.uuid4()))
+
+    with query_budget(max_repeats=1):
+        result = TransferService.create_transfers(db_session, user.id, batch)
+
+    assert (result.created, result.failed) == (198, 2)
+    assert result.results[3].error.code == "transfer.currency_mismatch"
+    assert result.results[7].error.code == "account.not_found"
+    assert result.results[0].transfer.amount == Decimal("1.00")
+    assert len(db_session.scalars(select(Transaction.id)).all()) == 396
+    assert balance(db_session, user, savings) == sum(Decimal(i + 1) for i in range(200)) - 4 - 8
+    assert BalanceService.verify(db_session) == []
+
+
+def test_other_users_accounts_are_not_found(db_session, accounts):
+    user, checking, _, _ = accounts
+    other = User(name="Jane", lastname="Doe", username="jane", email="jane@doe.com", password_hash="x")
+    db_session.add(other)
+    db_session.flush()
+    foreign = Account(user_id=other.id, name="Checking", type=AccountType.debit, currency="MXN")
+    db_session.add(foreign)
+    db_session.commit()
+
+    result = TransferService.create_transfers(db_session, user.id, [transfer(checking, foreign)])
+
+    assert result.failed == 1
+    assert result.results[0].error.meta == {"account_ids": [str(foreign.id)]}
+
+
+def test_transfers_move_balances_but_not_income_or_expense(db_session, accounts):
+    user, checking, savings, _ = accounts
+    db_session.add(Transaction(
+        user_id=user.id, account_id=checking.id, type=TransactionType.income, amount=Decimal("500.00"),
+        date=datetime(2026, 3, 2, tzinfo=timezone.utc), source=TransactionSource.manual,
+    ))
+    db_session.commit()
+    result = TransferService.create_transfer(db_session, user.id, transfer(checking, savings))
+    leg = db_session.get(Transaction, result.expense_transaction_id)
+    leg.amount = Decimal("150.00")  # an ORM edit of a leg goes through the flush hooks
+    db_session.commit()
+
+    assert balance(db_session, user, checking) == Decimal("350.00")
+    report = RollupService.category_report(db_session, user.id, date(2026, 3, 1), date(2026, 3, 1))
+    assert [(row.type, row.total) for row in report.items] == [(TransactionType.income, Decimal("500.00"))]
+    [point] = AnalyticsService.cash_flow(db_session, user.id).points
+    assert (point.income, point.expense) == (Decimal("500.00"), Decimal("0.00"))
+
+    RollupService.rebuild_users(db_session, [user.id])
+    rebuilt = RollupService.category_report(db_session, user.id, date(2026, 3, 1), date(2026, 3, 1))
+    assert rebuilt.items == report.items
@@ -46,3 +46,29 @@ def test_create_user_duplicate_username(db_session):
 
     with pytest.raises(UsernameAlreadyExistsError):
         UserService.create_user(db=db_session, data=data2)
+
+
+def test_get_users_keyset_pages_break_ties_on_id(db_session):
+    from datetime import datetime, timezone
+
+    same_instant = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    for i in range(3):
+        db_session.add(User(
+            name="John",
+            lastname="Doe",
+            username=f"jdoe{i}",
+            email=f"john{i}@doe.com",
+            password_hash="x",
+            created_at=same_instant,
+        ))
+    db_session.commit()
+
+    first = UserService.get_users(db=db_session, limit=2)
+    second = UserService.get_users(db=db_session, limit=2, cursor=first.next_cursor)
+
+    assert len(first.items) == 2
+    assert first.next_cursor is not None
+    assert len(second.items) == 1
+    assert second.next_cursor is None
+    ids = [u.id for u in first.items + second.items]
+    assert ids == sorted(ids)
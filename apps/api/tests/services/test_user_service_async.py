@@ -0,0 +1,52 @@
+# tests/services/test_user_service_async.py
+import pytest
+
+from app.services.user import AsyncUserService
+from app.schemas.user import UserCreate
+from app.exceptions.user import UsernameAlreadyExistsError, EmailAlreadyExistsError
+
+pytestmark = pytest.mark.anyio
+
+
+def make_user(**overrides):
+    data = {
+        "name": "John",
+        "lastname": "Doe",
+        "username": "jdoe",
+        "email": "john@doe.com",
+        "password": "password123",
+    }
+    data.update(overrides)
+    return UserCreate(**data)
+
+
+async def test_create_user_success(async_db_session):
+    user = await AsyncUserService.create_user(db=async_db_session, data=make_user())
+
+    assert user.id is not None
+    assert user.username == "jdoe"
+    assert user.password_hash != "password123"
+
+    page = await AsyncUserService.get_users(db=async_db_session)
+    assert [u.username for u in page.items] == ["jdoe"]
+    assert page.next_cursor is None
+
+
+async def test_create_user_duplicate_username(async_db_session):
+    await AsyncUserService.create_user(db=async_db_session, data=make_user())
+
+    with pytest.raises(UsernameAlreadyExistsError):
+        await AsyncUserService.create_user(
+            db=async_db_session,
+            data=make_user(email="jane@doe.com"),
+        )
+
+
+async def test_create_user_duplicate_email(async_db_session):
+    await AsyncUserService.create_user(db=async_db_session, data=make_user())
+
+    with pytest.raises(EmailAlreadyExistsError):
+        await AsyncUserService.create_user(
+            db=async_db_session,
+            data=make_user(username="jane"),
+        )
@@ -15,6 +15,8 @@ uv sync
 # 2) Run migrations
 echo "[api] alembic upgrade head"
 uv run alembic upgrade head
+echo "[api] ensure transaction partitions"
+uv run python -m app.commands.partitions ensure || echo "[api] could not ensure partitions; new rows go to transactions_default"
 
 # 3) Start uvicorn in background (reload for code changes)
 echo "[api] starting uvicorn (reload)"